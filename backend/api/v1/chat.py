@@ -3,11 +3,16 @@ Chat API endpoint.
 
 Wraps KnowledgeGraphAgent for browser-based Q&A against the knowledge graph.
 Uses the shared ConnectionManager (via get_db dependency) instead of opening
-a separate database per request. Supports both blocking and streaming responses.
+a separate database per request, and a warm PackAgentPool for pack-scoped
+questions so pack databases and models are not reopened on every request.
+Supports both blocking and streaming responses; the streaming endpoint runs
+on the event loop and relays ``KnowledgeGraphAgent.aquery_stream()`` events
+(sources first, then answer tokens as Claude generates them).
 """
 
-import concurrent.futures
+import asyncio
 import contextlib
+import functools
 import json
 import logging
 import os
@@ -24,22 +29,85 @@ from backend.config import settings
 from backend.db import get_db
 from backend.models.chat import ChatRequest, ChatResponse
 from backend.rate_limit import limiter
+from wikigr.agent.federated import FederatedQueryEngine
+from wikigr.agent.pool import PackAgentPool, open_pack_agent
 from wikigr.packs.manifest import PACK_NAME_RE
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1", tags=["chat"])
 
-# Module-level Anthropic client (created once, reused across requests)
+# Module-level Anthropic clients (created once, reused across requests)
 _anthropic_client = None
+_async_anthropic_client = None
 _anthropic_client_lock = threading.Lock()
 
-# Maximum seconds to wait for agent.query() before emitting a timeout error (R-DOS-1)
+# Maximum lifetime of one SSE answer stream before emitting a timeout error (R-DOS-1)
 STREAM_TIMEOUT_S = int(os.environ.get("WIKIGR_STREAM_TIMEOUT_S", "60"))
 
-# Module-level bounded ThreadPoolExecutor for stream timeout management.
-# Reused across requests to avoid per-request thread pool creation overhead.
-_stream_executor = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+
+# Module-level pool of warm pack agents, keyed by pack name (shut down in lifespan).
+_pack_agent_pool = PackAgentPool(
+    max_agents=settings.pack_pool_max_agents,
+    max_bytes=(
+        settings.pack_pool_max_mb * 1024 * 1024 if settings.pack_pool_max_mb is not None else None
+    ),
+    idle_ttl_s=settings.pack_pool_idle_ttl_s,
+    agent_factory=functools.partial(
+        open_pack_agent, enable_answer_cache=settings.pack_answer_cache
+    ),
+)
+
+
+# Federated multi-pack engine over the same pool (created on first use).
+_federated_engine: FederatedQueryEngine | None = None
+_federated_engine_lock = threading.Lock()
+
+
+def _get_federated_engine() -> FederatedQueryEngine:
+    """Get or create the shared federated query engine (thread-safe)."""
+    global _federated_engine
+    if _federated_engine is None:
+        # Resolve the client first: _get_anthropic_client takes its own lock.
+        claude_client = _get_anthropic_client()
+        with _federated_engine_lock:
+            if _federated_engine is None:
+                _federated_engine = FederatedQueryEngine(
+                    _pack_agent_pool, claude_client=claude_client
+                )
+    return _federated_engine
+
+
+def _close_federated_engine() -> None:
+    """Shut down the federated engine's workers (called from the app lifespan)."""
+    global _federated_engine
+    engine, _federated_engine = _federated_engine, None
+    if engine is not None:
+        engine.close()
+
+
+def _pack_db_path(pack: str) -> str:
+    """Path of an installed pack's database (the name must already be validated)."""
+    return str(Path(settings.database_path).resolve().parent / "packs" / pack / "pack.db")
+
+
+def _invalid_pack_response() -> JSONResponse:
+    return JSONResponse(
+        status_code=400,
+        content={"error": {"code": "INVALID_PACK_NAME", "message": "Invalid pack name"}},
+    )
+
+
+def _pack_not_found_response() -> JSONResponse:
+    return JSONResponse(
+        status_code=404,
+        content={
+            "error": {
+                "code": "PACK_NOT_FOUND",
+                "message": "Requested pack was not found",
+            }
+        },
+    )
 
 
 def _get_anthropic_client():
@@ -54,6 +122,26 @@ def _get_anthropic_client():
     return _anthropic_client
 
 
+def _get_async_anthropic_client():
+    """Get or create a shared AsyncAnthropic client for streaming requests."""
+    global _async_anthropic_client
+    if _async_anthropic_client is None:
+        with _anthropic_client_lock:
+            if _async_anthropic_client is None:
+                from anthropic import AsyncAnthropic
+
+                _async_anthropic_client = AsyncAnthropic()
+    return _async_anthropic_client
+
+
+async def _aclose_async_anthropic_client() -> None:
+    """Close the shared AsyncAnthropic client (called from the app lifespan)."""
+    global _async_anthropic_client
+    client, _async_anthropic_client = _async_anthropic_client, None
+    if client is not None:
+        await client.close()
+
+
 @router.post(
     "/chat",
     response_model=ChatResponse,
@@ -91,44 +179,37 @@ def chat(
     start = time.perf_counter()
 
     try:
-        from wikigr.agent.kg_agent import KnowledgeGraphAgent
-
-        pack_agent = None
-        if request_body.pack:
+        if request_body.packs:
+            # Federated: retrieve from every pack concurrently, synthesize once
+            if not all(PACK_NAME_RE.match(pack) for pack in request_body.packs):
+                return _invalid_pack_response()
+            pack_dbs = {pack: _pack_db_path(pack) for pack in request_body.packs}
+            if not all(os.path.exists(db) for db in pack_dbs.values()):
+                return _pack_not_found_response()
+            result = _get_federated_engine().query(
+                request_body.question, pack_dbs, max_results=request_body.max_results
+            )
+        elif request_body.pack:
             # Validate pack name to prevent path traversal
             if not PACK_NAME_RE.match(request_body.pack):
-                return JSONResponse(
-                    status_code=400,
-                    content={
-                        "error": {"code": "INVALID_PACK_NAME", "message": "Invalid pack name"}
-                    },
-                )
-            pack_db = str(
-                Path(settings.database_path).resolve().parent
-                / "packs"
-                / request_body.pack
-                / "pack.db"
-            )
+                return _invalid_pack_response()
+            pack_db = _pack_db_path(request_body.pack)
             if not os.path.exists(pack_db):
-                return JSONResponse(
-                    status_code=404,
-                    content={
-                        "error": {
-                            "code": "PACK_NOT_FOUND",
-                            "message": "Requested pack was not found",
-                        }
-                    },
+                return _pack_not_found_response()
+            with _pack_agent_pool.acquire(request_body.pack, pack_db) as agent:
+                result = agent.query(
+                    question=request_body.question,
+                    max_results=request_body.max_results,
                 )
-            pack_agent = KnowledgeGraphAgent(pack_db, read_only=True)
-            agent = pack_agent
         else:
+            from wikigr.agent.kg_agent import KnowledgeGraphAgent
+
             # Use the shared connection (default database)
             agent = KnowledgeGraphAgent.from_connection(conn, _get_anthropic_client())
-
-        result = agent.query(
-            question=request_body.question,
-            max_results=request_body.max_results,
-        )
+            result = agent.query(
+                question=request_body.question,
+                max_results=request_body.max_results,
+            )
 
         elapsed_ms = (time.perf_counter() - start) * 1000
 
@@ -151,9 +232,6 @@ def chat(
                 }
             },
         )
-    finally:
-        if pack_agent is not None:
-            pack_agent.close()
 
 
 @router.get("/chat/stream")
@@ -170,60 +248,80 @@ def chat_stream(
     generator to ensure the connection stays alive for the full duration
     of the SSE stream (not closed early by FastAPI's dependency lifecycle).
 
-    Events:
-    - type=token: incremental answer text
-    - type=sources: JSON array of source article titles
-    - type=done: final metadata (query_type, execution_time_ms)
+    Events (in order):
+    - type=sources: JSON array of source article titles (sent when retrieval completes)
+    - type=token: incremental answer text (one event per streamed chunk)
+    - type=done: final metadata (query_type, execution_time_ms, time_to_first_token_ms)
     - type=error: error message
     """
     api_key = os.environ.get("ANTHROPIC_API_KEY")
     if not api_key:
         return JSONResponse(status_code=503, content={"error": {"code": "AGENT_UNAVAILABLE"}})
 
-    def generate():
+    async def generate():
         start = time.perf_counter()
         # Manage connection inside generator so it stays alive for the full stream.
         # Use the public API instead of accessing the private _manager.
         from backend.db.connection import get_long_lived_connection
 
         conn = get_long_lived_connection()
+        agent = None
         try:
             from wikigr.agent.kg_agent import KnowledgeGraphAgent
 
-            agent = KnowledgeGraphAgent.from_connection(conn, _get_anthropic_client())
-
-            # Run agent.query with a timeout to bound SSE connection lifetime (R-DOS-1).
-            # Use the module-level bounded executor instead of creating one per request.
-            future = _stream_executor.submit(
-                agent.query, question=question, max_results=max_results
+            agent = KnowledgeGraphAgent.from_connection(
+                conn, _get_anthropic_client(), _get_async_anthropic_client()
             )
-            try:
-                result = future.result(timeout=STREAM_TIMEOUT_S)
-            except concurrent.futures.TimeoutError:
-                future.cancel()
-                yield {"event": "error", "data": "TimeoutError"}
-                return
-
-            yield {"event": "sources", "data": json.dumps(result.get("sources", []))}
-            yield {"event": "token", "data": result.get("answer", "")}
-
-            elapsed_ms = (time.perf_counter() - start) * 1000
-            yield {
-                "event": "done",
-                "data": json.dumps(
-                    {
-                        "query_type": result.get("query_type", "unknown"),
-                        "execution_time_ms": round(elapsed_ms, 1),
-                    }
-                ),
-            }
+
+            # Bound SSE connection lifetime (R-DOS-1).  Retrieval results are sent
+            # as soon as they exist; answer tokens follow as Claude streams them.
+            # The deadline is enforced per event (never across a yield, which
+            # would cancel the SSE sender instead of the agent).
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + STREAM_TIMEOUT_S
+            first_token_ms = None
+            async with contextlib.aclosing(
+                agent.aquery_stream(question=question, max_results=max_results)
+            ) as events:
+                while True:
+                    try:
+                        event = await asyncio.wait_for(
+                            anext(events), timeout=max(0.0, deadline - loop.time())
+                        )
+                    except StopAsyncIteration:
+                        break
+                    except TimeoutError:
+                        yield {"event": "error", "data": "TimeoutError"}
+                        return
+
+                    if event["type"] == "sources":
+                        yield {"event": "sources", "data": json.dumps(event.get("sources", []))}
+                    elif event["type"] == "token":
+                        if first_token_ms is None:
+                            first_token_ms = round((time.perf_counter() - start) * 1000, 1)
+                        yield {"event": "token", "data": event.get("text", "")}
+                    elif event["type"] == "done":
+                        elapsed_ms = (time.perf_counter() - start) * 1000
+                        yield {
+                            "event": "done",
+                            "data": json.dumps(
+                                {
+                                    "query_type": event.get("query_type", "unknown"),
+                                    "execution_time_ms": round(elapsed_ms, 1),
+                                    "time_to_first_token_ms": first_token_ms,
+                                }
+                            ),
+                        }
 
         except Exception as e:
             logger.error(f"Streaming chat error: {e}", exc_info=True)
             yield {"event": "error", "data": "AgentError"}
         finally:
-            # Only close the connection after the future has completed or been cancelled,
-            # so we don't close it while the background thread may still be using it.
+            # aclose() waits for any in-flight DB work (e.g. after a timeout) so the
+            # connection is never closed while the agent's DB worker still uses it.
+            if agent is not None:
+                with contextlib.suppress(Exception):
+                    await agent.aclose()
             with contextlib.suppress(Exception):
                 conn.close()
 
@@ -12,7 +12,7 @@ from fastapi import APIRouter, Depends, Query, Request, Response
 from fastapi.responses import JSONResponse
 
 from backend.config import settings
-from backend.db import get_db
+from backend.db import get_db, get_graph_snapshot
 from backend.models.common import ErrorResponse
 from backend.models.graph import GraphResponse
 from backend.rate_limit import limiter
@@ -56,6 +56,7 @@ def get_graph(
             depth=depth,
             limit=limit,
             category=category,
+            snapshot=get_graph_snapshot(conn),
         )
         return result
 
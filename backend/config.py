@@ -47,6 +47,15 @@ class Settings(BaseSettings):
     cache_ttl_article: int = 86400  # 24 hours — individual article detail
     cache_ttl_stats: int = 300  # 5 minutes — database statistics
 
+    # Pack agent pool (warm KnowledgeGraphAgent instances for /chat with a pack)
+    pack_pool_max_agents: int = 8
+    pack_pool_max_mb: int | None = None  # None = no memory cap, only the agent count cap
+    pack_pool_idle_ttl_s: float = 600.0  # close agents idle for 10 minutes
+    pack_answer_cache: bool = False  # serve repeated /chat questions from the answer cache
+
+    # In-memory LINKS_TO adjacency for /graph (rebuilt when the database changes)
+    graph_snapshot: bool = True
+
     model_config = {"env_prefix": "WIKIGR_"}
 
 
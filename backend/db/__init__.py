@@ -1,5 +1,5 @@
 """Database connection management."""
 
-from .connection import ConnectionManager, get_db, get_long_lived_connection
+from .connection import ConnectionManager, get_db, get_graph_snapshot, get_long_lived_connection
 
-__all__ = ["get_db", "get_long_lived_connection", "ConnectionManager"]
+__all__ = ["get_db", "get_graph_snapshot", "get_long_lived_connection", "ConnectionManager"]
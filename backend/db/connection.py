@@ -44,6 +44,7 @@ class ConnectionManager:
 
         # Always read from settings (can be overridden by env var)
         self._database = None
+        self._graph_snapshot = None
         self._initialized = True
 
     @property
@@ -79,9 +80,31 @@ class ConnectionManager:
         _load_extensions(conn)
         return conn
 
+    def get_graph_snapshot(self, conn: kuzu.Connection):
+        """Return the in-memory graph snapshot of the database, or None if disabled.
+
+        Loaded through *conn* on first use and reloaded when the database
+        files change (see ``wikigr.agent.title_index.db_version``).
+        """
+        if not settings.graph_snapshot:
+            return None
+        from wikigr.agent.graph_snapshot import load_graph_snapshot
+        from wikigr.agent.title_index import db_version
+
+        version = db_version(self.db_path)
+        snapshot = self._graph_snapshot
+        if snapshot is None or snapshot.version != version:
+            with self._lock:
+                snapshot = self._graph_snapshot
+                if snapshot is None or snapshot.version != version:
+                    snapshot = load_graph_snapshot(conn, version)
+                    self._graph_snapshot = snapshot
+        return snapshot
+
     def close(self):
         """Close database (release Database instance)."""
         with self._lock:
+            self._graph_snapshot = None
             if self._database is not None:
                 self._database = None
                 logger.info("Closed LadybugDB database")
@@ -112,6 +135,14 @@ def get_long_lived_connection() -> kuzu.Connection:
     return _manager.get_connection()
 
 
+def get_graph_snapshot(conn: kuzu.Connection):
+    """Return the shared in-memory graph snapshot, loading it through *conn* if needed.
+
+    Returns None when ``settings.graph_snapshot`` is off or the graph cannot be read.
+    """
+    return _manager.get_graph_snapshot(conn)
+
+
 def get_db() -> Generator[kuzu.Connection, None, None]:
     """
     FastAPI dependency for database connection.
@@ -12,7 +12,7 @@ import real_ladybug as kuzu
 from fastapi import Depends, FastAPI, Request, Response
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
@@ -21,6 +21,7 @@ from backend.config import settings
 from backend.db import get_db
 from backend.models.common import HealthResponse
 from backend.rate_limit import limiter
+from wikigr.agent.telemetry import get_telemetry_registry
 
 # Configure logging
 logging.basicConfig(
@@ -39,10 +40,17 @@ async def lifespan(_app: FastAPI):
     logger.info(f"CORS origins: {settings.cors_origins}")
     yield
     logger.info("Shutting down WikiGR Visualization API")
-    # Shut down the chat streaming thread pool to avoid leaked threads
-    from backend.api.v1.chat import _stream_executor
+    # Release warm pack agents and the shared async Claude client
+    from backend.api.v1.chat import (
+        _aclose_async_anthropic_client,
+        _close_federated_engine,
+        _pack_agent_pool,
+    )
 
-    _stream_executor.shutdown(wait=False)
+    await _aclose_async_anthropic_client()
+    _close_federated_engine()
+    logger.info(f"Pack agent pool stats at shutdown: {_pack_agent_pool.stats()}")
+    _pack_agent_pool.close()
 
 
 # Create FastAPI app
@@ -132,6 +140,23 @@ def health_check(
     return health
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """
+    Query pipeline telemetry in the Prometheus text exposition format.
+
+    Per-stage latency histograms and Claude token/cost counters for every
+    agent query served by this process, plus the warm pack agent pool counters.
+    """
+    from backend.api.v1.chat import _pack_agent_pool
+
+    return PlainTextResponse(
+        get_telemetry_registry().prometheus_text() + _pack_agent_pool.prometheus_text(),
+        media_type="text/plain; version=0.0.4",
+        headers={"Cache-Control": "no-cache, no-store, must-revalidate"},
+    )
+
+
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(_request: Request, exc: RequestValidationError):
     """
@@ -13,6 +13,13 @@ class ChatRequest(BaseModel):
         None,
         description="Pack name to query (e.g. 'go-expert'). Uses default pack if not specified.",
     )
+    packs: list[str] | None = Field(
+        None,
+        min_length=1,
+        max_length=5,
+        description="Pack names to query together (federated); one answer is "
+        "synthesized from their merged context. Overrides 'pack'.",
+    )
     max_results: int = Field(10, ge=1, le=50, description="Maximum graph results to retrieve")
 
 
@@ -19,6 +19,7 @@ from backend.models.article import (
     Section,
     StatsResponse,
 )
+from bootstrap.src.query_result import fetch, iter_rows
 
 logger = logging.getLogger(__name__)
 
@@ -58,12 +59,12 @@ class ArticleService:
             {"title": title},
         )
 
-        df = result.get_as_df()
-        if len(df) == 0:
+        rows = fetch(result)
+        if rows.empty:
             raise ValueError("Article not found")
 
-        category = df.iloc[0]["category"]
-        word_count = int(df.iloc[0]["word_count"])
+        category, word_count = rows.rows[0]
+        word_count = int(word_count)
 
         # Get sections
         sections_result = conn.execute(
@@ -76,15 +77,14 @@ class ArticleService:
             {"title": title},
         )
 
-        sections_df = sections_result.get_as_df()
         sections = []
 
-        for _, row in sections_df.iterrows():
+        for section_title, content, section_words, level in iter_rows(sections_result):
             section = Section(
-                title=row["title"],
-                content=row["content"] or "",
-                word_count=int(row["word_count"]),
-                level=int(row["level"]),
+                title=section_title,
+                content=content or "",
+                word_count=int(section_words),
+                level=int(level),
             )
             sections.append(section)
 
@@ -99,8 +99,7 @@ class ArticleService:
             {"title": title},
         )
 
-        links_df = links_result.get_as_df()
-        links = links_df["title"].tolist() if len(links_df) > 0 else []
+        links = fetch(links_result).column("title")
 
         # Get backlinks
         backlinks_result = conn.execute(
@@ -113,8 +112,7 @@ class ArticleService:
             {"title": title},
         )
 
-        backlinks_df = backlinks_result.get_as_df()
-        backlinks = backlinks_df["title"].tolist() if len(backlinks_df) > 0 else []
+        backlinks = fetch(backlinks_result).column("title")
 
         # Get categories (for now, just return the main category)
         categories = [category] if category else []
@@ -162,13 +160,12 @@ class ArticleService:
             """
         )
 
-        df = result.get_as_df()
         categories = []
 
-        for _, row in df.iterrows():
+        for name, count in iter_rows(result):
             category = CategoryInfo(
-                name=row["category"],
-                article_count=int(row["count"]),
+                name=name,
+                article_count=int(count),
             )
             categories.append(category)
 
@@ -204,7 +201,7 @@ class ArticleService:
             RETURN count(*) AS total
             """
         )
-        total_articles = int(articles_result.get_as_df().iloc[0]["total"])
+        total_articles = int(fetch(articles_result).scalar("total", 0))
 
         # Articles by category
         category_result = conn.execute(
@@ -215,8 +212,7 @@ class ArticleService:
             ORDER BY count DESC
             """
         )
-        category_df = category_result.get_as_df()
-        by_category = {row["category"]: int(row["count"]) for _, row in category_df.iterrows()}
+        by_category = {name: int(count) for name, count in iter_rows(category_result)}
 
         # Articles by expansion depth (real query)
         depth_result = conn.execute(
@@ -227,8 +223,7 @@ class ArticleService:
             ORDER BY depth ASC
             """
         )
-        depth_df = depth_result.get_as_df()
-        by_depth = {str(int(row["depth"])): int(row["count"]) for _, row in depth_df.iterrows()}
+        by_depth = {str(int(depth)): int(count) for depth, count in iter_rows(depth_result)}
 
         articles = {
             "total": total_articles,
@@ -243,7 +238,7 @@ class ArticleService:
             RETURN count(*) AS total
             """
         )
-        total_sections = int(sections_result.get_as_df().iloc[0]["total"])
+        total_sections = int(fetch(sections_result).scalar("total", 0))
         avg_per_article = total_sections / total_articles if total_articles > 0 else 0
 
         sections = {
@@ -258,7 +253,7 @@ class ArticleService:
             RETURN count(r) AS total
             """
         )
-        total_links = int(links_result.get_as_df().iloc[0]["total"])
+        total_links = int(fetch(links_result).scalar("total", 0))
         avg_links_per_article = total_links / total_articles if total_articles > 0 else 0
 
         links = {
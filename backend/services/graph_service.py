@@ -4,16 +4,26 @@ Graph service for WikiGR visualization.
 Handles graph traversal and node/edge construction.
 """
 
+from __future__ import annotations
+
 import logging
 import time
+from typing import TYPE_CHECKING
 
 import real_ladybug as kuzu
 
 from backend.models.graph import Edge, GraphResponse, Node
 from backend.services.summary_utils import get_article_summaries
+from bootstrap.src.query_result import fetch, iter_rows
+
+if TYPE_CHECKING:
+    from wikigr.agent.graph_snapshot import GraphSnapshot
 
 logger = logging.getLogger(__name__)
 
+# Cap on edges returned between the result nodes (matches the Cypher LIMIT).
+MAX_EDGES = 1000
+
 
 class GraphService:
     """Service for graph operations."""
@@ -25,6 +35,7 @@ class GraphService:
         depth: int = 2,
         limit: int = 50,
         category: str | None = None,
+        snapshot: GraphSnapshot | None = None,
     ) -> GraphResponse:
         """
         Get graph structure around seed article.
@@ -35,6 +46,9 @@ class GraphService:
             depth: Maximum depth to traverse (1-3)
             limit: Maximum number of nodes to return (1-200)
             category: Optional category filter
+            snapshot: In-memory graph of the database; when given, the
+                traversal, link counts and edges come from it and only node
+                properties and summaries are read from the database
 
         Returns:
             GraphResponse with nodes and edges
@@ -50,6 +64,11 @@ class GraphService:
         if depth < 1 or depth > 3:
             raise ValueError(f"depth must be between 1 and 3, got {depth}")
 
+        if snapshot is not None:
+            return GraphService._snapshot_neighbors(
+                conn, snapshot, article, depth, limit, category, start_time
+            )
+
         # Validate seed article exists
         result = conn.execute("MATCH (a:Article {title: $title}) RETURN a", {"title": article})
         if not result.has_next():
@@ -89,14 +108,14 @@ class GraphService:
 
         # Execute query
         result = conn.execute(query, params)
-        df = result.get_as_df()
+        rows = fetch(result)
 
         # Build deduplicated node data, preserving traversal order
         nodes = []
         node_set = set()
         node_rows = []
 
-        for _, row in df.iterrows():
+        for row in rows.records():
             title = row["title"]
             if title in node_set:
                 continue
@@ -116,8 +135,8 @@ class GraphService:
                 """,
                 {"titles": titles},
             )
-            for _, lrow in links_result.get_as_df().iterrows():
-                link_counts[lrow["title"]] = int(lrow["links"])
+            for title, links in iter_rows(links_result):
+                link_counts[title] = int(links)
 
         # Batch query for summaries (shared helper avoids duplicated logic)
         summaries = get_article_summaries(conn, titles) if titles else {}
@@ -149,14 +168,12 @@ class GraphService:
                 MATCH (source:Article)-[link:LINKS_TO]->(target:Article)
                 WHERE source.title IN $titles AND target.title IN $titles
                 RETURN source.title AS source, target.title AS target
-                LIMIT 1000
+                LIMIT $max_edges
             """
-            edges_result = conn.execute(edges_query, {"titles": node_titles})
-            edges_df = edges_result.get_as_df()
-
-            for _, row in edges_df.iterrows():
-                source = row["source"]
-                target = row["target"]
+            edges_result = conn.execute(
+                edges_query, {"titles": node_titles, "max_edges": MAX_EDGES}
+            )
+            for source, target in iter_rows(edges_result):
                 edge_key = (source, target)
 
                 if edge_key not in edge_set:
@@ -179,3 +196,80 @@ class GraphService:
             total_edges=len(edges),
             execution_time_ms=execution_time_ms,
         )
+
+    @staticmethod
+    def _snapshot_neighbors(
+        conn: kuzu.Connection,
+        snapshot: GraphSnapshot,
+        article: str,
+        depth: int,
+        limit: int,
+        category: str | None,
+        start_time: float,
+    ) -> GraphResponse:
+        """Breadth-first traversal over the in-memory ``LINKS_TO`` adjacency.
+
+        Same ordering as the Cypher path (depth, then title), with one batch
+        query for node properties and one for summaries.
+        """
+        graph = snapshot.articles
+        if graph.id(article) is None:
+            raise ValueError("Article not found")
+
+        reached = [(article, 0), *graph.k_hop([article], depth)]
+        properties = {
+            title: (node_category, word_count)
+            for title, node_category, word_count in iter_rows(
+                conn.execute(
+                    """
+                    MATCH (a:Article)
+                    WHERE a.title IN $titles
+                    RETURN a.title AS title, a.category AS category, a.word_count AS word_count
+                    """,
+                    {"titles": [title for title, _ in reached]},
+                )
+            )
+        }
+        if category:
+            reached = [
+                (title, hop)
+                for title, hop in reached
+                if properties.get(title, (None, 0))[0] == category
+            ]
+        reached = reached[:limit]
+
+        titles = [title for title, _ in reached]
+        summaries = get_article_summaries(conn, titles) if titles else {}
+        nodes = []
+        for title, hop in reached:
+            node_category, word_count = properties.get(title, (None, 0))
+            nodes.append(
+                Node(
+                    id=title,
+                    title=title,
+                    category=node_category,
+                    word_count=int(word_count or 0),
+                    depth=hop,
+                    links_count=graph.degree(title, "out"),
+                    summary=summaries.get(title, ""),
+                )
+            )
+
+        node_set = set(titles)
+        edges = []
+        for source in titles:
+            for target in graph.neighbors(source):
+                if target in node_set:
+                    edges.append(Edge(source=source, target=target, type="internal", weight=1.0))
+            if len(edges) >= MAX_EDGES:
+                edges = edges[:MAX_EDGES]
+                break
+
+        return GraphResponse(
+            seed=article,
+            nodes=nodes,
+            edges=edges,
+            total_nodes=len(nodes),
+            total_edges=len(edges),
+            execution_time_ms=(time.time() - start_time) * 1000,
+        )
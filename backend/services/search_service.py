@@ -16,6 +16,7 @@ from backend.models.search import (
     SearchResult,
 )
 from backend.services.summary_utils import get_article_summaries
+from bootstrap.src.query_result import fetch, iter_rows
 
 logger = logging.getLogger(__name__)
 
@@ -95,14 +96,14 @@ class SearchService:
             {"query_title": query_title},
         )
 
-        query_df = query_result.get_as_df()
+        query_rows = fetch(query_result)
 
-        if len(query_df) == 0:
+        if query_rows.empty:
             return []
 
         # Step 2: Single vector query using lead section embedding
         all_matches = []
-        query_embedding = query_df.iloc[0]["embedding"]
+        query_embedding = query_rows.scalar("embedding")
 
         # Query vector index
         result = conn.execute(
@@ -120,12 +121,9 @@ class SearchService:
             },
         )
 
-        matches = result.get_as_df()
-
-        for _, match_row in matches.iterrows():
-            node = match_row["node"]
-            distance = match_row["distance"]
+        matches = fetch(result)
 
+        for node, distance in zip(matches.column("node"), matches.column("distance")):
             # Extract section info
             if isinstance(node, dict):
                 if "_properties" in node:
@@ -177,10 +175,10 @@ class SearchService:
                 """,
                 {"titles": candidate_titles},
             )
-            for _, drow in details_result.get_as_df().iterrows():
-                article_details[drow["title"]] = {
-                    "category": drow["category"],
-                    "word_count": int(drow["word_count"]),
+            for title, article_category, word_count in iter_rows(details_result):
+                article_details[title] = {
+                    "category": article_category,
+                    "word_count": int(word_count),
                 }
 
         # Batch query for summaries (shared helper)
@@ -247,13 +245,12 @@ class SearchService:
         """
 
         result = conn.execute(query, {"prefix": q, "limit": limit})
-        df = result.get_as_df()
 
         suggestions = []
-        for _, row in df.iterrows():
+        for title, article_category in iter_rows(result):
             suggestion = AutocompleteResult(
-                title=row["title"],
-                category=row["category"],
+                title=title,
+                category=article_category,
                 match_type="prefix",
             )
             suggestions.append(suggestion)
@@ -271,12 +268,11 @@ class SearchService:
             """
 
             result = conn.execute(contains_query, {"substring": q, "prefix": q, "limit": remaining})
-            df = result.get_as_df()
 
-            for _, row in df.iterrows():
+            for title, article_category in iter_rows(result):
                 suggestion = AutocompleteResult(
-                    title=row["title"],
-                    category=row["category"],
+                    title=title,
+                    category=article_category,
                     match_type="contains",
                 )
                 suggestions.append(suggestion)
@@ -7,6 +7,8 @@ to avoid duplicated summary-fetching logic.
 
 import real_ladybug as kuzu
 
+from bootstrap.src.query_result import iter_rows
+
 
 def get_article_summaries(
     conn: kuzu.Connection,
@@ -40,9 +42,7 @@ def get_article_summaries(
     )
 
     summaries: dict[str, str] = {}
-    for _, row in result.get_as_df().iterrows():
-        title = row["title"]
-        content = row["content"]
+    for title, content in iter_rows(result):
         if content and title not in summaries:
             summaries[title] = content[:200] + "..." if len(content) > 200 else content
 
@@ -184,6 +184,31 @@ class TestHealthCheck:
         assert "no-cache" in response.headers["Cache-Control"]
 
 
+class TestMetricsEndpoint:
+    """Tests for GET /metrics endpoint."""
+
+    def test_metrics_prometheus_text(self, client):
+        """Test that stage latencies are exported in Prometheus text format."""
+        from wikigr.agent.telemetry import get_telemetry_registry
+
+        get_telemetry_registry().observe("vector", 0.02)
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "# TYPE wikigr_stage_latency_seconds histogram" in response.text
+        assert 'wikigr_stage_latency_seconds_count{stage="vector"}' in response.text
+
+    def test_metrics_include_pack_agent_pool(self, client):
+        """Test that the warm pack agent pool counters are exported."""
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert "# TYPE wikigr_pack_pool_hits_total counter" in response.text
+        assert "# TYPE wikigr_pack_pool_idle_agents gauge" in response.text
+
+
 class TestCategoriesEndpoint:
     """Tests for GET /api/v1/categories endpoint."""
 
@@ -105,3 +105,69 @@ class TestChatEndpoint:
                 json={"question": ""},
             )
         assert response.status_code == 400
+
+    def test_federated_packs_validated(self, chat_client):
+        """Should reject invalid or missing pack names in 'packs'."""
+        with patch.dict(os.environ, {"ANTHROPIC_API_KEY": "test-key"}):
+            invalid = chat_client.post(
+                "/api/v1/chat",
+                json={"question": "test", "packs": ["go-expert", "../etc"]},
+            )
+            missing = chat_client.post(
+                "/api/v1/chat",
+                json={"question": "test", "packs": ["no-such-pack"]},
+            )
+            too_many = chat_client.post(
+                "/api/v1/chat",
+                json={"question": "test", "packs": [f"p{i}" for i in range(6)]},
+            )
+        assert invalid.status_code == 400
+        assert missing.status_code == 404
+        assert too_many.status_code == 400
+
+    def test_federated_packs_use_engine(self, chat_client):
+        """Should answer a 'packs' request through the federated engine."""
+        engine = MagicMock()
+        engine.query.return_value = {
+            "answer": "Both.",
+            "sources": ["asyncio", "Tools"],
+            "query_type": "federated",
+        }
+        with (
+            patch.dict(os.environ, {"ANTHROPIC_API_KEY": "test-key"}),
+            patch("backend.api.v1.chat.os.path.exists", return_value=True),
+            patch("backend.api.v1.chat._get_federated_engine", return_value=engine),
+        ):
+            response = chat_client.post(
+                "/api/v1/chat",
+                json={"question": "test", "packs": ["python-expert", "langchain-expert"]},
+            )
+        assert response.status_code == 200
+        assert response.json()["query_type"] == "federated"
+        packs = engine.query.call_args.args[1]
+        assert list(packs) == ["python-expert", "langchain-expert"]
+        assert packs["python-expert"].endswith("python-expert/pack.db")
+
+    def test_federated_engine_created_once_with_fresh_client(self):
+        """The real getter must not deadlock when no Anthropic client exists yet."""
+        import threading
+
+        from backend.api.v1 import chat
+
+        results = []
+        with (
+            patch.dict(os.environ, {"ANTHROPIC_API_KEY": "test-key"}),
+            patch.object(chat, "_anthropic_client", None),
+            patch.object(chat, "_federated_engine", None),
+        ):
+            worker = threading.Thread(
+                target=lambda: results.append(chat._get_federated_engine()), daemon=True
+            )
+            worker.start()
+            worker.join(timeout=5)
+            try:
+                assert not worker.is_alive(), "_get_federated_engine deadlocked"
+                assert results[0] is chat._get_federated_engine()
+                assert results[0]._claude is chat._anthropic_client
+            finally:
+                chat._close_federated_engine()
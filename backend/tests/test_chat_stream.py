@@ -2,9 +2,9 @@
 Tests for the GET /api/v1/chat/stream SSE endpoint.
 
 TDD specification for the chat_stream fix:
-- generator MUST call agent.query(), not the deleted private methods
+- generator MUST relay agent.aquery_stream(), not the deleted private methods
   _plan_query / _execute_query / _build_synthesis_context
-- SSE stream must emit: sources → token → done
+- SSE stream must emit: sources → token* → done
 - Error handling must emit an 'error' event on failure
 - Input validation must reject invalid query parameters
 
@@ -17,11 +17,12 @@ fixture (single TestClient per module) avoids the "different event loop" error
 that occurs when each test creates its own TestClient.
 """
 
+import asyncio
 import json
 import os
+import re
 import shutil
-import threading
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
@@ -37,7 +38,10 @@ def _parse_sse(text: str) -> list[tuple[str, str]]:
         if line.startswith("event:"):
             current_event = line[len("event:") :].strip()
         elif line.startswith("data:"):
-            current_data_lines.append(line[len("data:") :].strip())
+            # Per the SSE spec only a single leading space is stripped, so
+            # whitespace inside streamed answer chunks survives.
+            data = line[len("data:") :]
+            current_data_lines.append(data[1:] if data.startswith(" ") else data)
         elif line == "" and current_event is not None:
             events.append((current_event, "\n".join(current_data_lines)))
             current_event = None
@@ -114,10 +118,50 @@ def stream_client(tmp_path_factory):
     shutil.rmtree(db_path, ignore_errors=True)
 
 
+def _stream_events(result: dict) -> list[dict]:
+    """Translate a query()-style result into the events aquery_stream() yields.
+
+    The answer is split into word chunks (as Claude streams it).  Keys
+    missing from *result* are omitted from the events, to exercise the
+    endpoint's defaults.
+    """
+    sources = {"sources": result["sources"]} if "sources" in result else {}
+    events: list[dict] = [{"type": "sources", **sources}]
+    if "answer" in result:
+        chunks = re.findall(r"\S+\s*", result["answer"]) or [result["answer"]]
+        events += [{"type": "token", "text": chunk} for chunk in chunks]
+    else:
+        events.append({"type": "token"})
+    done = {"query_type": result["query_type"]} if "query_type" in result else {}
+    events.append({"type": "done", **done})
+    return events
+
+
+def _fake_stream(events: list[dict], delay_s: float = 0.0, fail_with=None):
+    """Return a stand-in for agent.aquery_stream yielding *events*."""
+
+    async def aquery_stream(**kwargs):
+        for event in events:
+            await asyncio.sleep(delay_s)
+            yield event
+        if fail_with is not None:
+            raise fail_with
+
+    return MagicMock(side_effect=aquery_stream)
+
+
+def _make_mock_agent() -> MagicMock:
+    """Mock KnowledgeGraphAgent with an async-generator aquery_stream and async aclose."""
+    mock_agent = MagicMock()
+    mock_agent.aquery_stream = _fake_stream([])
+    mock_agent.aclose = AsyncMock()
+    return mock_agent
+
+
 def _make_happy_path_mocks(mock_result: dict):
     """Return (mock_agent, mock_manager) for a happy-path stream test."""
-    mock_agent = MagicMock()
-    mock_agent.query.return_value = mock_result
+    mock_agent = _make_mock_agent()
+    mock_agent.aquery_stream = _fake_stream(_stream_events(mock_result))
 
     mock_conn = MagicMock()
     mock_manager = MagicMock()
@@ -233,14 +277,14 @@ class TestChatStreamInputValidation:
 
 
 class TestChatStreamAgentCall:
-    """The generator must delegate to agent.query(), not deleted private methods."""
+    """The generator must delegate to agent.aquery_stream(), not deleted private methods."""
 
     def test_calls_agent_query_with_correct_args(self, stream_client):
         """
-        CRITICAL regression: generator must call agent.query(question=..., max_results=...).
+        CRITICAL regression: generator must call agent.aquery_stream(question=..., max_results=...).
 
         If the old broken code were still present (calling _plan_query /
-        _execute_query / _build_synthesis_context), mock_agent.query would
+        _execute_query / _build_synthesis_context), mock_agent.aquery_stream would
         never be invoked and the test would fail.
         """
         mock_result = {
@@ -261,7 +305,9 @@ class TestChatStreamAgentCall:
                 params={"question": "What is AI?", "max_results": 15},
             )
 
-        mock_agent.query.assert_called_once_with(question="What is AI?", max_results=15)
+        mock_agent.aquery_stream.assert_called_once_with(question="What is AI?", max_results=15)
+        mock_agent.query.assert_not_called()
+        mock_agent.aclose.assert_awaited_once()
 
     def test_does_not_call_deleted_private_methods(self, stream_client):
         """
@@ -305,11 +351,11 @@ class TestChatStreamAgentCall:
                 params={"question": "What is AI?"},
             )
 
-        mock_agent.query.assert_called_once_with(question="What is AI?", max_results=10)
+        mock_agent.aquery_stream.assert_called_once_with(question="What is AI?", max_results=10)
 
 
 class TestChatStreamSSEEvents:
-    """SSE event contract: sources → token → done in that order."""
+    """SSE event contract: sources → token* → done in that order."""
 
     def _stream(self, stream_client, mock_result, question="What is AI?", **params):
         """Helper: run a stream request and return parsed SSE events."""
@@ -330,7 +376,7 @@ class TestChatStreamSSEEvents:
         return _parse_sse(response.text)
 
     def test_event_order_is_sources_token_done(self, stream_client):
-        """SSE events must arrive in order: sources → token → done."""
+        """SSE events must arrive in order: sources → token(s) → done."""
         events = self._stream(
             stream_client,
             {"answer": "Test answer.", "sources": ["Article A"], "query_type": "entity_search"},
@@ -339,8 +385,9 @@ class TestChatStreamSSEEvents:
         assert event_types == [
             "sources",
             "token",
+            "token",
             "done",
-        ], f"Expected ['sources', 'token', 'done'], got {event_types}"
+        ], f"Expected ['sources', 'token', 'token', 'done'], got {event_types}"
 
     def test_sources_event_contains_json_array(self, stream_client):
         """'sources' event data must be a JSON array of article title strings."""
@@ -357,8 +404,8 @@ class TestChatStreamSSEEvents:
         data = json.loads(sources_events[0][1])
         assert data == ["Artificial intelligence", "Machine learning"]
 
-    def test_token_event_contains_answer_text(self, stream_client):
-        """'token' event data must be the plain-text answer string."""
+    def test_token_events_concatenate_to_answer_text(self, stream_client):
+        """'token' events carry streamed chunks that concatenate to the answer."""
         events = self._stream(
             stream_client,
             {
@@ -367,9 +414,9 @@ class TestChatStreamSSEEvents:
                 "query_type": "entity_search",
             },
         )
-        token_events = [(t, d) for t, d in events if t == "token"]
-        assert len(token_events) == 1
-        assert token_events[0][1] == "AI is artificial intelligence."
+        tokens = [d for t, d in events if t == "token"]
+        assert tokens == ["AI ", "is ", "artificial ", "intelligence."]
+        assert "".join(tokens) == "AI is artificial intelligence."
 
     def test_done_event_contains_query_type(self, stream_client):
         """'done' event data must include 'query_type'."""
@@ -395,6 +442,15 @@ class TestChatStreamSSEEvents:
         assert isinstance(done_data["execution_time_ms"], int | float)
         assert done_data["execution_time_ms"] >= 0
 
+    def test_done_event_reports_time_to_first_token(self, stream_client):
+        """'done' reports when the first token was sent (at most the total time)."""
+        events = self._stream(
+            stream_client,
+            {"answer": "Streamed answer.", "sources": [], "query_type": "vector_search"},
+        )
+        done_data = json.loads([d for t, d in events if t == "done"][0])
+        assert 0 <= done_data["time_to_first_token_ms"] <= done_data["execution_time_ms"]
+
     def test_sources_defaults_to_empty_list(self, stream_client):
         """'sources' event should be [] when result dict has no 'sources' key."""
         events = self._stream(
@@ -440,13 +496,13 @@ class TestChatStreamErrorHandling:
     """The generator must emit an 'error' SSE event on failure."""
 
     def _stream_with_error(self, stream_client, exc):
-        """Helper: run a stream request where agent.query() raises exc."""
+        """Helper: run a stream request where agent.aquery() raises exc."""
         mock_conn = MagicMock()
         mock_manager = MagicMock()
         mock_manager.get_connection.return_value = mock_conn
 
-        mock_agent = MagicMock()
-        mock_agent.query.side_effect = exc
+        mock_agent = _make_mock_agent()
+        mock_agent.aquery_stream = _fake_stream([], fail_with=exc)
 
         with (
             patch.dict(os.environ, {"ANTHROPIC_API_KEY": "test-key"}),
@@ -461,7 +517,7 @@ class TestChatStreamErrorHandling:
         return _parse_sse(response.text)
 
     def test_emits_error_event_when_agent_raises(self, stream_client):
-        """Should emit a single 'error' event when agent.query() raises."""
+        """Should emit a single 'error' event when agent.aquery() raises."""
         events = self._stream_with_error(stream_client, RuntimeError("DB connection failed"))
         error_events = [(t, d) for t, d in events if t == "error"]
         assert len(error_events) == 1, f"Expected 1 error event, got {len(error_events)}"
@@ -482,22 +538,13 @@ class TestChatStreamErrorHandling:
         assert error_events[0][1] == "AgentError"
         assert "ConnectionError" not in error_events[0][1]
 
-    def test_emits_error_event_on_timeout(self, stream_client):
-        """
-        R-DOS-1: should emit a single 'error' SSE event with 'TimeoutError' data
-        when agent.query() does not complete within STREAM_TIMEOUT_S seconds.
-        """
-        release = threading.Event()
-
-        def slow_query(**kwargs):
-            release.wait(timeout=5)
-            return {"answer": "too late", "sources": [], "query_type": "entity_search"}
-
+    def _stream_with_timeout(self, stream_client, aquery_stream):
+        """Helper: run a stream request with STREAM_TIMEOUT_S patched to 0.1s."""
         mock_conn = MagicMock()
         mock_manager = MagicMock()
         mock_manager.get_connection.return_value = mock_conn
-        mock_agent = MagicMock()
-        mock_agent.query.side_effect = slow_query
+        mock_agent = _make_mock_agent()
+        mock_agent.aquery_stream = aquery_stream
 
         with (
             patch.dict(os.environ, {"ANTHROPIC_API_KEY": "test-key"}),
@@ -510,11 +557,32 @@ class TestChatStreamErrorHandling:
                 "/api/v1/chat/stream",
                 params={"question": "What is AI?"},
             )
+        return _parse_sse(response.text)
 
-        release.set()  # unblock the background thread
-        events = _parse_sse(response.text)
+    def test_emits_error_event_on_timeout(self, stream_client):
+        """
+        R-DOS-1: should emit a single 'error' SSE event with 'TimeoutError' data
+        when the answer stream does not complete within STREAM_TIMEOUT_S seconds.
+        """
+        events = self._stream_with_timeout(
+            stream_client, _fake_stream(_stream_events({"answer": "too late"}), delay_s=5)
+        )
         error_events = [(t, d) for t, d in events if t == "error"]
         assert len(error_events) == 1, f"Expected 1 error event, got {error_events}"
         assert "TimeoutError" in error_events[0][1]
         # No 'done' event should follow a timeout
         assert not any(t == "done" for t, _ in events)
+
+    def test_timeout_mid_stream_keeps_sent_events(self, stream_client):
+        """Sources already sent stay sent; the stream then ends with a timeout error."""
+
+        async def stalls_after_sources(**kwargs):
+            yield {"type": "sources", "sources": ["Article A"]}
+            await asyncio.sleep(5)
+            yield {"type": "token", "text": "too late"}
+
+        events = self._stream_with_timeout(
+            stream_client, MagicMock(side_effect=stalls_after_sources)
+        )
+        assert [t for t, _ in events] == ["sources", "error"]
+        assert events[1][1] == "TimeoutError"
@@ -205,3 +205,26 @@ class TestConnectionContext:
         # Should still be able to get connection
         conn = next(get_db())
         assert conn is not None
+
+
+class TestGraphSnapshot:
+    """Tests for the shared in-memory graph snapshot."""
+
+    def test_snapshot_is_reused_until_database_changes(self, connection_manager):
+        """The snapshot is loaded once and kept while the database is unchanged."""
+        conn = connection_manager.get_connection()
+
+        first = connection_manager.get_graph_snapshot(conn)
+        second = connection_manager.get_graph_snapshot(conn)
+
+        assert first is not None
+        assert first is second
+        assert len(first.articles) > 0
+
+    def test_snapshot_disabled_by_setting(self, connection_manager, monkeypatch):
+        """graph_snapshot=False turns the snapshot off."""
+        from backend.config import settings
+
+        monkeypatch.setattr(settings, "graph_snapshot", False)
+
+        assert connection_manager.get_graph_snapshot(connection_manager.get_connection()) is None
@@ -5,6 +5,11 @@ Tests the /api/v1/graph endpoint for retrieving graph structure around seed arti
 Following TDD methodology - these tests will fail until implementation is complete.
 """
 
+import pytest
+import real_ladybug as kuzu
+
+from backend.services.graph_service import GraphService
+from wikigr.agent.graph_snapshot import load_graph_snapshot
 
 # client fixture is now in conftest.py
 
@@ -224,3 +229,74 @@ class TestGraphCaching:
         # Public cache for read-only Wikipedia data
         assert "public" in response.headers["Cache-Control"]
         assert "max-age=3600" in response.headers["Cache-Control"]
+
+
+class TestGraphServiceSnapshot:
+    """The in-memory traversal returns what the Cypher traversal returns."""
+
+    @pytest.fixture
+    def conn(self, tmp_path):
+        db = kuzu.Database(str(tmp_path / "graph.db"))
+        conn = kuzu.Connection(db)
+        conn.execute(
+            "CREATE NODE TABLE Article(title STRING, category STRING, word_count INT64, "
+            "PRIMARY KEY(title))"
+        )
+        conn.execute(
+            "CREATE NODE TABLE Section(section_id STRING, content STRING, PRIMARY KEY(section_id))"
+        )
+        conn.execute("CREATE REL TABLE LINKS_TO(FROM Article TO Article)")
+        conn.execute("CREATE REL TABLE HAS_SECTION(FROM Article TO Section, section_index INT64)")
+        articles = {
+            "Python": "Languages",
+            "CPython": "Software",
+            "Guido": "People",
+            "Java": "Languages",
+            "JVM": "Software",
+        }
+        for title, category in articles.items():
+            conn.execute(
+                "CREATE (:Article {title: $t, category: $c, word_count: 100})",
+                {"t": title, "c": category},
+            )
+        for source, target in [
+            ("Python", "CPython"),
+            ("Python", "Guido"),
+            ("Python", "Java"),
+            ("CPython", "Guido"),
+            ("Java", "JVM"),
+            ("JVM", "Java"),
+        ]:
+            conn.execute(
+                "MATCH (a:Article {title: $s}), (b:Article {title: $t}) CREATE (a)-[:LINKS_TO]->(b)",
+                {"s": source, "t": target},
+            )
+        conn.execute("CREATE (:Section {section_id: 'Python#0', content: 'A language.'})")
+        conn.execute(
+            "MATCH (a:Article {title: 'Python'}), (s:Section {section_id: 'Python#0'}) "
+            "CREATE (a)-[:HAS_SECTION {section_index: 0}]->(s)"
+        )
+        yield conn
+        conn.close()
+        db.close()
+
+    @pytest.mark.parametrize(
+        ("depth", "limit", "category"),
+        [(1, 50, None), (2, 50, None), (2, 3, None), (2, 50, "Software")],
+    )
+    def test_matches_cypher_traversal(self, conn, depth, limit, category):
+        snapshot = load_graph_snapshot(conn)
+
+        expected = GraphService.get_graph_neighbors(conn, "Python", depth, limit, category)
+        actual = GraphService.get_graph_neighbors(
+            conn, "Python", depth, limit, category, snapshot=snapshot
+        )
+
+        assert [n.model_dump() for n in actual.nodes] == [n.model_dump() for n in expected.nodes]
+        assert sorted((e.source, e.target) for e in actual.edges) == sorted(
+            (e.source, e.target) for e in expected.edges
+        )
+
+    def test_unknown_seed_raises(self, conn):
+        with pytest.raises(ValueError, match="Article not found"):
+            GraphService.get_graph_neighbors(conn, "Rust", snapshot=load_graph_snapshot(conn))
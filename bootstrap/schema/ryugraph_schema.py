@@ -8,6 +8,7 @@ Creates the complete LadybugDB schema for Wikipedia knowledge graph:
 - Category nodes
 - Relationships (HAS_SECTION, LINKS_TO, IN_CATEGORY)
 - Vector index on Section embeddings
+- Full-text (BM25) indexes on Section and Fact content
 
 Usage:
     python bootstrap/schema/ryugraph_schema.py --db data/wikigr.db
@@ -32,6 +33,39 @@ def load_extensions(conn) -> None:
                 conn.execute(f"INSTALL {ext}; LOAD EXTENSION {ext};")
 
 
+# Section and Chunk embedding column type.  float32 is the precision the
+# embedding model produces and half the size of DOUBLE in pack.db; exact
+# and quantized search rescore from this column.
+EMBEDDING_COLUMN_TYPE = "FLOAT[768]"
+
+# (table, index name, indexed properties) for BM25 full-text search.
+FTS_INDEXES = (
+    ("Section", "section_fts_idx", ("content",)),
+    ("Fact", "fact_fts_idx", ("content",)),
+)
+
+
+def create_fts_indexes(conn) -> list[str]:
+    """Create the BM25 full-text indexes used by hybrid retrieval.
+
+    Requires the FTS extension.  Also usable on an existing pack to add the
+    indexes after the fact.  Returns the names of the indexes created;
+    failures (extension missing, index already exists) are printed and skipped.
+    """
+    created = []
+    for table, index_name, properties in FTS_INDEXES:
+        props = ", ".join(f"'{p}'" for p in properties)
+        try:
+            conn.execute(
+                f"CALL CREATE_FTS_INDEX('{table}', '{index_name}', [{props}], stemmer := 'porter')"
+            )
+            created.append(index_name)
+            print(f"   ✅ FTS index {index_name} created on {table}({', '.join(properties)})")
+        except Exception as e:
+            print(f"   ⚠️  FTS index {index_name}: {e}")
+    return created
+
+
 def create_schema(db_path: str, drop_existing: bool = False):
     """
     Create complete LadybugDB schema for WikiGR
@@ -109,12 +143,12 @@ def create_schema(db_path: str, drop_existing: bool = False):
     # Create Section node table
     print("\n2. Creating Section node table...")
     try:
-        conn.execute("""
+        conn.execute(f"""
             CREATE NODE TABLE Section(
                 section_id STRING,
                 title STRING,
                 content STRING,
-                embedding DOUBLE[768],
+                embedding {EMBEDDING_COLUMN_TYPE},
                 level INT32,
                 word_count INT32,
                 PRIMARY KEY(section_id)
@@ -216,11 +250,11 @@ def create_schema(db_path: str, drop_existing: bool = False):
     # Create Chunk node table (for fine-grained text retrieval)
     print("\n6d. Creating Chunk node table...")
     try:
-        conn.execute("""
+        conn.execute(f"""
             CREATE NODE TABLE Chunk(
                 chunk_id STRING,
                 content STRING,
-                embedding DOUBLE[768],
+                embedding {EMBEDDING_COLUMN_TYPE},
                 article_title STRING,
                 section_index INT32,
                 chunk_index INT32,
@@ -333,6 +367,10 @@ def create_schema(db_path: str, drop_existing: bool = False):
         print(f"   ❌ Failed to create chunk vector index: {e}")
         sys.exit(1)
 
+    # Create full-text (BM25) indexes; optional, retrieval falls back to vectors
+    print("\n7c. Creating FTS indexes on Section.content and Fact.content...")
+    create_fts_indexes(conn)
+
     # Verify schema
     print("\n8. Verifying schema...")
     try:
@@ -1,5 +1,14 @@
 """Embedding generation"""
 
 from .generator import EmbeddingGenerator
+from .query_cache import QueryEmbeddingCache, get_query_embedding_cache
+from .registry import ModelRegistry, SharedModel, get_model_registry
 
-__all__ = ["EmbeddingGenerator"]
+__all__ = [
+    "EmbeddingGenerator",
+    "ModelRegistry",
+    "QueryEmbeddingCache",
+    "SharedModel",
+    "get_model_registry",
+    "get_query_embedding_cache",
+]
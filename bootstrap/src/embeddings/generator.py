@@ -13,6 +13,9 @@ import numpy as np
 import torch
 from sentence_transformers import SentenceTransformer
 
+from .query_cache import get_query_embedding_cache
+from .registry import get_model_registry
+
 # BGE models require a query prefix for retrieval tasks
 BGE_QUERY_PREFIX = "Represent this sentence for searching relevant passages: "
 
@@ -24,6 +27,9 @@ class EmbeddingGenerator:
     Uses BAAI/bge-base-en-v1.5 (768 dimensions) optimized for retrieval.
     For queries (search), use generate_query() which adds the BGE prefix.
     For documents (indexing), use generate() without prefix.
+
+    The underlying model is shared through the process-wide ModelRegistry,
+    so every generator for the same (model, device) reuses one copy.
     """
 
     DEFAULT_MODEL = "BAAI/bge-base-en-v1.5"
@@ -45,7 +51,9 @@ class EmbeddingGenerator:
             use_gpu = torch.cuda.is_available()
 
         device = "cuda" if use_gpu else "cpu"
-        self.model = SentenceTransformer(model_name, device=device)
+        self.model = get_model_registry().acquire(
+            model_name, device=device, loader=SentenceTransformer
+        )
         self.device = device
         self.model_name = model_name
         self.embedding_dim = self.model.get_sentence_embedding_dimension()
@@ -73,7 +81,7 @@ class EmbeddingGenerator:
         )
         return embeddings
 
-    def generate_query(self, queries: list[str], batch_size=32) -> np.ndarray:
+    def generate_query(self, queries: list[str], batch_size=32, use_cache=True) -> np.ndarray:
         """
         Generate embeddings for search queries.
 
@@ -81,9 +89,13 @@ class EmbeddingGenerator:
         This improves retrieval accuracy by signaling the model that
         the input is a search query, not a document.
 
+        Embeddings are served from the process-wide query-embedding cache
+        when possible; only cache misses go through the model.
+
         Args:
             queries: List of query strings to embed.
             batch_size: Number of queries to process per batch.
+            use_cache: If False, always run the model (the cache is not read or written).
 
         Returns:
             numpy.ndarray: Array of shape (N, D) where D is the model's dimension.
@@ -92,15 +104,23 @@ class EmbeddingGenerator:
             raise ValueError("queries list cannot be empty")
 
         # Add BGE prefix for retrieval models
-        if "bge" in self.model_name.lower():
-            prefixed = [BGE_QUERY_PREFIX + q for q in queries]
-        else:
-            prefixed = queries
-
-        embeddings = self.model.encode(
-            prefixed, batch_size=batch_size, show_progress_bar=False, convert_to_numpy=True
-        )
-        return embeddings
+        prefix = BGE_QUERY_PREFIX if "bge" in self.model_name.lower() else ""
+
+        def encode(texts: list[str]) -> np.ndarray:
+            return self.model.encode(
+                [prefix + q for q in texts],
+                batch_size=batch_size,
+                show_progress_bar=False,
+                convert_to_numpy=True,
+            )
+
+        if not use_cache:
+            return encode(queries)
+        return get_query_embedding_cache().get_or_encode(self.model_name, prefix, queries, encode)
+
+    def close(self):
+        """Release this generator's reference to the shared model."""
+        self.model.release()
 
     def __repr__(self):
         """String representation showing model and device."""
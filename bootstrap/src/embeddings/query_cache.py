@@ -0,0 +1,169 @@
+"""
+Query Embedding Cache
+
+Byte-capped LRU cache of query embeddings keyed by
+(model name, query prefix, normalized text).  Eval runs and chat sessions
+repeat the same (or trivially re-spaced / re-cased) questions constantly;
+a cache hit skips the transformer forward pass entirely.
+
+API Contract:
+    get_query_embedding_cache() -> QueryEmbeddingCache
+    QueryEmbeddingCache(max_bytes=32 MiB)
+    get(model_name, prefix, text) -> np.ndarray | None
+    put(model_name, prefix, text, embedding) -> None
+    get_or_encode(model_name, prefix, texts, encode_fn) -> np.ndarray
+    stats() -> dict
+    clear() -> None
+
+Design Philosophy:
+    - One cache per process, shared by EmbeddingGenerator.generate_query and
+      FewShotManager, so a question encoded for vector search is never
+      encoded again for few-shot selection.
+    - Misses are encoded in a single batch; hits are served from memory.
+    - Cached arrays are read-only so a caller cannot corrupt later hits.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from typing import Any
+
+import numpy as np
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+CacheKey = tuple[str, str, str]
+
+
+def normalize_query(text: str) -> str:
+    """Normalize query text for cache keys (NFKC, casefold, collapse whitespace)."""
+    text = unicodedata.normalize("NFKC", text)
+    return _WHITESPACE_RE.sub(" ", text).strip().casefold()
+
+
+class QueryEmbeddingCache:
+    """Thread-safe LRU cache of query embeddings bounded by total bytes."""
+
+    DEFAULT_MAX_BYTES = 32 * 1024 * 1024  # ~10k BGE-base float32 embeddings
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        """Initialize an empty cache.
+
+        Args:
+            max_bytes: Upper bound on the summed ``nbytes`` of cached arrays.
+
+        Raises:
+            ValueError: If max_bytes is not positive.
+        """
+        if max_bytes < 1:
+            raise ValueError(f"max_bytes must be positive, got {max_bytes!r}")
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[CacheKey, np.ndarray] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(model_name: str, prefix: str, text: str) -> CacheKey:
+        return (model_name, prefix, normalize_query(text))
+
+    def get(self, model_name: str, prefix: str, text: str) -> np.ndarray | None:
+        """Return the cached embedding for *text*, or None on a miss."""
+        key = self._key(model_name, prefix, text)
+        with self._lock:
+            embedding = self._entries.get(key)
+            if embedding is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return embedding
+
+    def put(self, model_name: str, prefix: str, text: str, embedding: Any) -> None:
+        """Store *embedding* for *text*, evicting least-recently-used entries."""
+        array = np.array(embedding, dtype=np.float32)
+        array.flags.writeable = False
+        if array.nbytes > self.max_bytes:
+            return
+        key = self._key(model_name, prefix, text)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+            self._entries[key] = array
+            self._bytes += array.nbytes
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+
+    def get_or_encode(
+        self,
+        model_name: str,
+        prefix: str,
+        texts: Sequence[str],
+        encode_fn: Callable[[list[str]], Any],
+    ) -> np.ndarray:
+        """Return embeddings for *texts*, encoding only the cache misses.
+
+        Args:
+            model_name: Model identifier (part of the cache key).
+            prefix: Query prefix the model is given (part of the cache key).
+            texts: Raw query texts.
+            encode_fn: Callable encoding a list of raw texts (the prefix is
+                the callable's responsibility) into an (N, D) array.
+
+        Returns:
+            float32 array of shape (len(texts), D), in input order.
+        """
+        rows: list[np.ndarray | None] = [self.get(model_name, prefix, t) for t in texts]
+        missing = [i for i, row in enumerate(rows) if row is None]
+        if missing:
+            # Encode each distinct normalized miss once, even if repeated in *texts*.
+            unique: dict[str, int] = {}
+            for i in missing:
+                unique.setdefault(normalize_query(texts[i]), i)
+            encoded = np.asarray(encode_fn([texts[i] for i in unique.values()]))
+            by_norm = dict(zip(unique, encoded))
+            for i in missing:
+                rows[i] = by_norm[normalize_query(texts[i])]
+            for norm, first in unique.items():
+                self.put(model_name, prefix, texts[first], by_norm[norm])
+        return np.vstack(rows).astype(np.float32, copy=False)
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def clear(self) -> None:
+        """Drop every cached embedding and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+_cache = QueryEmbeddingCache()
+
+
+def get_query_embedding_cache() -> QueryEmbeddingCache:
+    """Return the process-wide QueryEmbeddingCache."""
+    return _cache
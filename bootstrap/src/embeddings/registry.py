@@ -0,0 +1,329 @@
+"""
+Shared Model Registry
+
+Process-level registry of sentence-transformers models keyed by
+(model name, device, backend).  Every consumer -- EmbeddingGenerator,
+FewShotManager, CrossEncoderReranker, worker threads, build scripts and
+eval runners -- acquires a handle from the same registry, so one process
+holds exactly one copy of BAAI/bge-base-en-v1.5 regardless of how many
+agents are open.
+
+API Contract:
+    get_model_registry() -> ModelRegistry
+    ModelRegistry.acquire(model_name, device=None, backend="sentence-transformers",
+                          loader=None) -> SharedModel
+    SharedModel.encode(...) / SharedModel.predict(...)   (concurrent)
+    SharedModel.release() -> None
+    ModelRegistry.unload(model_name, device=None, backend=..., force=False) -> bool
+    ModelRegistry.unload_unused() -> int
+    ModelRegistry.memory_report() -> dict
+    ModelRegistry.serialize_inference(backend, enabled=True) -> None
+
+Design Philosophy:
+    - Models are loaded once and reference counted; release() never frees
+      weights implicitly, unload()/unload_unused() do so explicitly.
+    - The registry lock guards loading, refcounts and unloading only.
+      Inference runs concurrently on the shared model; backends that are not
+      safe to call from several threads at once can opt in to a per-model
+      inference lock with ``serialize_inference()``.
+    - Loaders are resolved at load time (not import time) so tests can patch
+      ``sentence_transformers.SentenceTransformer`` / ``CrossEncoder``.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import threading
+from collections.abc import Callable, Iterable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+SENTENCE_TRANSFORMERS = "sentence-transformers"
+CROSS_ENCODER = "cross-encoder"
+
+ModelKey = tuple[str, str, str]
+
+
+def resolve_device(device: str | None = None) -> str:
+    """Return *device*, or "cuda" when available and "cpu" otherwise."""
+    if device is not None:
+        return device
+    try:
+        import torch
+
+        return "cuda" if torch.cuda.is_available() else "cpu"
+    except ImportError:
+        return "cpu"
+
+
+def _default_loader(backend: str) -> Callable[..., Any]:
+    """Return the sentence-transformers class that loads *backend* models."""
+    if backend == SENTENCE_TRANSFORMERS:
+        from sentence_transformers import SentenceTransformer
+
+        return SentenceTransformer
+    if backend == CROSS_ENCODER:
+        from sentence_transformers import CrossEncoder
+
+        return CrossEncoder
+    raise ValueError(f"Unknown model backend: {backend!r}")
+
+
+def _model_bytes(model: Any) -> int:
+    """Best-effort size of a model's parameters and buffers in bytes."""
+    # Older CrossEncoder versions wrap the torch module in ``.model``.
+    module = model if hasattr(model, "parameters") else getattr(model, "model", model)
+    try:
+        tensors = list(module.parameters()) + list(module.buffers())
+        return int(sum(t.numel() * t.element_size() for t in tensors))
+    except Exception:
+        return 0
+
+
+class _ModelEntry:
+    """A loaded model plus its reference count and (opt-in) inference lock."""
+
+    def __init__(self, key: ModelKey, model: Any):
+        self.key = key
+        self.model = model
+        self.refcount = 0
+        self.lock = threading.RLock()
+        self.size_bytes = _model_bytes(model)
+
+
+class SharedModel:
+    """Thread-safe handle to a model held by the ModelRegistry.
+
+    Exposes the subset of the sentence-transformers API used in this repo.
+    Any other attribute is forwarded to the underlying model.
+    """
+
+    def __init__(self, registry: ModelRegistry, entry: _ModelEntry):
+        self._registry = registry
+        self._entry = entry
+        self._released = False
+
+    @property
+    def model_name(self) -> str:
+        return self._entry.key[0]
+
+    @property
+    def device(self) -> str:
+        return self._entry.key[1]
+
+    @property
+    def backend(self) -> str:
+        return self._entry.key[2]
+
+    @property
+    def model(self) -> Any:
+        """The underlying model object (shared; do not mutate)."""
+        return self._entry.model
+
+    def encode(self, *args: Any, **kwargs: Any) -> Any:
+        """``SentenceTransformer.encode`` on the shared model."""
+        with self._inference_lock():
+            return self._entry.model.encode(*args, **kwargs)
+
+    def predict(self, *args: Any, **kwargs: Any) -> Any:
+        """``CrossEncoder.predict`` on the shared model."""
+        with self._inference_lock():
+            return self._entry.model.predict(*args, **kwargs)
+
+    def _inference_lock(self) -> contextlib.AbstractContextManager:
+        """The model's lock if its backend is serialized, else a no-op."""
+        if self.backend in self._registry._serialized_backends:
+            return self._entry.lock
+        return contextlib.nullcontext()
+
+    def get_sentence_embedding_dimension(self) -> int | None:
+        return self._entry.model.get_sentence_embedding_dimension()
+
+    def release(self) -> None:
+        """Drop this handle's reference.  Idempotent."""
+        if not self._released:
+            self._released = True
+            self._registry._release(self._entry)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._entry.model, name)
+
+    def __enter__(self) -> SharedModel:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.release()
+
+    def __repr__(self) -> str:
+        return (
+            f"SharedModel(model='{self.model_name}', device='{self.device}', "
+            f"backend='{self.backend}')"
+        )
+
+
+class ModelRegistry:
+    """Reference-counted registry of shared models, keyed by (name, device, backend)."""
+
+    def __init__(self, serialized_backends: Iterable[str] = ()) -> None:
+        """Create an empty registry.
+
+        Args:
+            serialized_backends: Backends whose inference calls are serialized
+                per model (see ``serialize_inference()``).
+        """
+        self._lock = threading.Lock()
+        self._serialized_backends = frozenset(serialized_backends)
+        self._models: dict[ModelKey, _ModelEntry] = {}
+        # Per-key load locks so two threads never load the same model twice,
+        # while different models can still load in parallel.
+        self._load_locks: dict[ModelKey, threading.Lock] = {}
+
+    def acquire(
+        self,
+        model_name: str,
+        device: str | None = None,
+        backend: str = SENTENCE_TRANSFORMERS,
+        loader: Callable[..., Any] | None = None,
+    ) -> SharedModel:
+        """Return a handle to the shared model, loading it on first use.
+
+        Args:
+            model_name: HuggingFace model identifier.
+            device: "cpu", "cuda", ... or None to auto-detect.
+            backend: SENTENCE_TRANSFORMERS or CROSS_ENCODER.
+            loader: Optional callable ``(model_name, device=...) -> model``.
+                Defaults to the sentence-transformers class for *backend*.
+
+        Returns:
+            SharedModel handle.  Call ``release()`` when done.
+
+        Raises:
+            Whatever the loader raises; failed loads are not cached.
+        """
+        key: ModelKey = (model_name, resolve_device(device), backend)
+
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is not None:
+                entry.refcount += 1
+                return SharedModel(self, entry)
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                entry = self._models.get(key)
+                if entry is not None:
+                    entry.refcount += 1
+                    return SharedModel(self, entry)
+
+            load = loader or _default_loader(backend)
+            model = load(model_name, device=key[1])
+            entry = _ModelEntry(key, model)
+            logger.info(
+                "ModelRegistry: loaded %s on %s (%s, %.1f MB)",
+                model_name,
+                key[1],
+                backend,
+                entry.size_bytes / 1e6,
+            )
+
+            with self._lock:
+                entry.refcount += 1
+                self._models[key] = entry
+            return SharedModel(self, entry)
+
+    def unload(
+        self,
+        model_name: str,
+        device: str | None = None,
+        backend: str = SENTENCE_TRANSFORMERS,
+        force: bool = False,
+    ) -> bool:
+        """Drop a model from the registry.
+
+        Args:
+            force: Unload even while handles are outstanding.  Existing
+                handles keep working (they hold their own reference to the
+                model object) but new acquires load a fresh copy.
+
+        Returns:
+            True if the model was unloaded.
+        """
+        key: ModelKey = (model_name, resolve_device(device), backend)
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is None or (entry.refcount > 0 and not force):
+                return False
+            del self._models[key]
+        logger.info("ModelRegistry: unloaded %s on %s (%s)", *key)
+        return True
+
+    def unload_unused(self) -> int:
+        """Unload every model with no outstanding handles.
+
+        Returns:
+            Number of models unloaded.
+        """
+        with self._lock:
+            unused = [key for key, entry in self._models.items() if entry.refcount <= 0]
+            for key in unused:
+                del self._models[key]
+        for key in unused:
+            logger.info("ModelRegistry: unloaded %s on %s (%s)", *key)
+        return len(unused)
+
+    def serialize_inference(self, backend: str, enabled: bool = True) -> None:
+        """Serialize (or stop serializing) inference on each *backend* model.
+
+        Off by default: sentence-transformers models run inference from
+        several threads at once.  Applies to loaded models immediately.
+        """
+        with self._lock:
+            if enabled:
+                self._serialized_backends |= {backend}
+            else:
+                self._serialized_backends -= {backend}
+
+    def memory_report(self) -> dict[str, Any]:
+        """Report resident models and their estimated memory.
+
+        Returns:
+            {"models": [{"model_name", "device", "backend", "refcount",
+            "size_bytes"}, ...], "total_bytes": int}
+        """
+        with self._lock:
+            models = [
+                {
+                    "model_name": key[0],
+                    "device": key[1],
+                    "backend": key[2],
+                    "refcount": entry.refcount,
+                    "size_bytes": entry.size_bytes,
+                }
+                for key, entry in self._models.items()
+            ]
+        return {"models": models, "total_bytes": sum(m["size_bytes"] for m in models)}
+
+    def clear(self) -> None:
+        """Forget every model regardless of refcount (used by tests)."""
+        with self._lock:
+            self._models.clear()
+            self._load_locks.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._models)
+
+    def _release(self, entry: _ModelEntry) -> None:
+        with self._lock:
+            entry.refcount = max(0, entry.refcount - 1)
+
+
+_registry = ModelRegistry()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Return the process-wide ModelRegistry."""
+    return _registry
@@ -0,0 +1,82 @@
+"""
+Unit tests for QueryEmbeddingCache.
+"""
+
+import numpy as np
+import pytest
+
+from bootstrap.src.embeddings.query_cache import QueryEmbeddingCache, normalize_query
+
+
+def _encoder(calls):
+    """Fake encoder: embedding is [len(text), 1.0]; records every batch."""
+
+    def encode(texts):
+        calls.append(list(texts))
+        return np.array([[float(len(t)), 1.0] for t in texts], dtype=np.float32)
+
+    return encode
+
+
+class TestQueryEmbeddingCache:
+    """Test suite for QueryEmbeddingCache."""
+
+    def test_normalize_query(self):
+        assert normalize_query("  What is\tGo?\n") == "what is go?"
+
+    def test_hit_skips_encoder(self):
+        cache = QueryEmbeddingCache()
+        calls = []
+
+        first = cache.get_or_encode("bge", "p:", ["What is Go?"], _encoder(calls))
+        second = cache.get_or_encode("bge", "p:", ["what is  go?"], _encoder(calls))
+
+        assert len(calls) == 1
+        np.testing.assert_array_equal(first, second)
+        assert cache.stats()["hits"] == 1
+
+    def test_key_includes_model_and_prefix(self):
+        cache = QueryEmbeddingCache()
+        calls = []
+
+        cache.get_or_encode("bge", "p:", ["q"], _encoder(calls))
+        cache.get_or_encode("bge", "", ["q"], _encoder(calls))
+        cache.get_or_encode("minilm", "p:", ["q"], _encoder(calls))
+
+        assert len(calls) == 3
+
+    def test_only_misses_are_encoded_in_one_batch(self):
+        cache = QueryEmbeddingCache()
+        calls = []
+        cache.get_or_encode("bge", "", ["a"], _encoder(calls))
+
+        out = cache.get_or_encode("bge", "", ["a", "bb", "ccc", "BB"], _encoder(calls))
+
+        assert calls[-1] == ["bb", "ccc"]
+        assert out.shape == (4, 2)
+        assert out[:, 0].tolist() == [1.0, 2.0, 3.0, 2.0]
+
+    def test_byte_cap_evicts_lru(self):
+        # Each entry is 2 float32 = 8 bytes; room for two.
+        cache = QueryEmbeddingCache(max_bytes=16)
+        calls = []
+        for text in ("a", "b"):
+            cache.get_or_encode("bge", "", [text], _encoder(calls))
+        cache.get("bge", "", "a")  # touch "a" so "b" is least recently used
+        cache.get_or_encode("bge", "", ["c"], _encoder(calls))
+
+        assert len(cache) == 2
+        assert cache.get("bge", "", "b") is None
+        assert cache.get("bge", "", "a") is not None
+        assert cache.stats()["bytes"] <= 16
+
+    def test_cached_arrays_are_read_only(self):
+        cache = QueryEmbeddingCache()
+        cache.put("bge", "", "q", [1.0, 2.0])
+
+        with pytest.raises(ValueError):
+            cache.get("bge", "", "q")[0] = 5.0
+
+    def test_rejects_non_positive_cap(self):
+        with pytest.raises(ValueError):
+            QueryEmbeddingCache(max_bytes=0)
@@ -0,0 +1,192 @@
+"""
+Unit tests for the shared ModelRegistry.
+
+All tests use fake loaders -- no model download is needed.
+"""
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from bootstrap.src.embeddings.registry import (
+    CROSS_ENCODER,
+    ModelRegistry,
+    get_model_registry,
+)
+
+
+def _counting_loader():
+    """Return (loader, calls) where calls records every (name, device) loaded."""
+    calls = []
+
+    def loader(model_name, device=None):
+        calls.append((model_name, device))
+        model = MagicMock(name=f"{model_name}@{device}")
+        model.encode.side_effect = lambda texts, **kw: [[float(len(t))] for t in texts]
+        return model
+
+    return loader, calls
+
+
+class TestModelRegistry:
+    """Test suite for ModelRegistry."""
+
+    def test_same_key_loads_once(self):
+        registry = ModelRegistry()
+        loader, calls = _counting_loader()
+
+        a = registry.acquire("bge", device="cpu", loader=loader)
+        b = registry.acquire("bge", device="cpu", loader=loader)
+
+        assert len(calls) == 1
+        assert a.model is b.model
+        assert registry.memory_report()["models"][0]["refcount"] == 2
+
+    def test_different_device_or_backend_loads_separately(self):
+        registry = ModelRegistry()
+        loader, calls = _counting_loader()
+
+        registry.acquire("bge", device="cpu", loader=loader)
+        registry.acquire("bge", device="cuda", loader=loader)
+        registry.acquire("bge", device="cpu", backend=CROSS_ENCODER, loader=loader)
+
+        assert len(calls) == 3
+        assert len(registry) == 3
+
+    def test_handle_forwards_encode(self):
+        registry = ModelRegistry()
+        loader, _ = _counting_loader()
+
+        handle = registry.acquire("bge", device="cpu", loader=loader)
+
+        assert handle.encode(["ab", "abcd"], convert_to_numpy=True) == [[2.0], [4.0]]
+        assert handle.model_name == "bge"
+        assert handle.device == "cpu"
+
+    def test_release_is_idempotent_and_keeps_model_loaded(self):
+        registry = ModelRegistry()
+        loader, calls = _counting_loader()
+
+        handle = registry.acquire("bge", device="cpu", loader=loader)
+        handle.release()
+        handle.release()
+
+        report = registry.memory_report()
+        assert report["models"][0]["refcount"] == 0
+        registry.acquire("bge", device="cpu", loader=loader)
+        assert len(calls) == 1
+
+    def test_unload_refuses_while_referenced(self):
+        registry = ModelRegistry()
+        loader, _ = _counting_loader()
+
+        handle = registry.acquire("bge", device="cpu", loader=loader)
+
+        assert registry.unload("bge", device="cpu") is False
+        handle.release()
+        assert registry.unload("bge", device="cpu") is True
+        assert len(registry) == 0
+
+    def test_force_unload_and_unload_unused(self):
+        registry = ModelRegistry()
+        loader, calls = _counting_loader()
+
+        registry.acquire("bge", device="cpu", loader=loader)
+        with registry.acquire("minilm", device="cpu", loader=loader):
+            pass
+
+        assert registry.unload_unused() == 1
+        assert registry.unload("bge", device="cpu", force=True) is True
+        registry.acquire("bge", device="cpu", loader=loader)
+        assert len(calls) == 3
+
+    def test_failed_load_is_not_cached(self):
+        registry = ModelRegistry()
+        failing = MagicMock(side_effect=OSError("download failed"))
+
+        with pytest.raises(OSError):
+            registry.acquire("bge", device="cpu", loader=failing)
+
+        loader, calls = _counting_loader()
+        registry.acquire("bge", device="cpu", loader=loader)
+        assert len(calls) == 1
+
+    def test_memory_report_counts_tensor_bytes(self):
+        torch = pytest.importorskip("torch")
+        registry = ModelRegistry()
+
+        registry.acquire("tiny", device="cpu", loader=lambda name, device: torch.nn.Linear(4, 2))
+
+        report = registry.memory_report()
+        # 4*2 weights + 2 biases, float32
+        assert report["total_bytes"] == 10 * 4
+        assert report["models"][0]["size_bytes"] == 40
+
+    def test_concurrent_acquire_loads_once(self):
+        registry = ModelRegistry()
+        calls = []
+
+        def slow_loader(model_name, device=None):
+            calls.append(model_name)
+            time.sleep(0.05)
+            return MagicMock()
+
+        handles = []
+        threads = [
+            threading.Thread(
+                target=lambda: handles.append(
+                    registry.acquire("bge", device="cpu", loader=slow_loader)
+                )
+            )
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(calls) == 1
+        assert len({id(h.model) for h in handles}) == 1
+
+    @pytest.mark.parametrize("serialized", [False, True])
+    def test_inference_concurrent_unless_backend_serialized(self, serialized):
+        registry = ModelRegistry(serialized_backends=[CROSS_ENCODER] if serialized else [])
+        active, peak = [0], [0]
+        counter_lock = threading.Lock()
+
+        def predict(pairs):
+            with counter_lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            with counter_lock:
+                active[0] -= 1
+            return [0.0] * len(pairs)
+
+        model = MagicMock()
+        model.predict.side_effect = predict
+        handle = registry.acquire(
+            "rerank", device="cpu", backend=CROSS_ENCODER, loader=lambda name, device: model
+        )
+        threads = [threading.Thread(target=handle.predict, args=([("q", "d")],)) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert (peak[0] == 1) is serialized
+
+    def test_serialize_inference_toggles_backend(self):
+        registry = ModelRegistry()
+        loader, _ = _counting_loader()
+        handle = registry.acquire("bge", device="cpu", loader=loader)
+
+        registry.serialize_inference("sentence-transformers")
+        assert handle._inference_lock() is handle._entry.lock
+        registry.serialize_inference("sentence-transformers", enabled=False)
+        assert handle._inference_lock() is not handle._entry.lock
+
+    def test_get_model_registry_is_process_wide(self):
+        assert get_model_registry() is get_model_registry()
@@ -9,6 +9,8 @@ import logging
 
 import real_ladybug as kuzu
 
+from ..query_result import fetch
+
 logger = logging.getLogger(__name__)
 
 
@@ -211,9 +213,9 @@ class LinkDiscovery:
             {"title": title},
         )
 
-        df = result.get_as_df()
-        if len(df) > 0:
-            return (True, df.iloc[0]["state"])
+        rows = fetch(result)
+        if not rows.empty:
+            return (True, rows.scalar("state"))
         else:
             return (False, None)
 
@@ -236,8 +238,8 @@ class LinkDiscovery:
             {"titles": titles},
         )
 
-        df = result.get_as_df()
-        return dict(zip(df["title"], df["state"]))
+        rows = fetch(result)
+        return dict(zip(rows.column("title"), rows.column("state")))
 
     def _insert_discovered_article(self, title: str, depth: int):
         """
@@ -272,8 +274,7 @@ class LinkDiscovery:
         """,
             {"source": source_title},
         )
-        df = result.get_as_df()
-        return set(df["title"].tolist()) if not df.empty else set()
+        return set(fetch(result).column("title"))
 
     def _create_link(self, source_title: str, target_title: str):
         """
@@ -308,7 +309,4 @@ class LinkDiscovery:
             RETURN COUNT(a) AS count
         """)
 
-        df = result.get_as_df()
-        if len(df) > 0:
-            return df.iloc[0]["count"]
-        return 0
+        return fetch(result).scalar("count", 0)
@@ -18,6 +18,7 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import real_ladybug as kuzu
 
+from ..query_result import fetch
 from .link_discovery import LinkDiscovery
 from .processor import ArticleProcessor
 from .work_queue import WorkQueueManager
@@ -118,7 +119,7 @@ class RyuGraphOrchestrator:
                 {"title": title},
             )
 
-            if result.get_as_df().iloc[0]["count"] > 0:
+            if fetch(result).scalar("count", 0) > 0:
                 logger.warning(f"  Seed already exists: {title}, skipping")
                 continue
 
@@ -257,7 +258,7 @@ class RyuGraphOrchestrator:
                     WHERE a.word_count > 0
                     RETURN COUNT(a) AS count
                 """)
-                current_count = result.get_as_df().iloc[0]["count"]
+                current_count = fetch(result).scalar("count", 0)
 
                 logger.info(f"\nIteration {iteration}: {current_count}/{target_count} loaded")
 
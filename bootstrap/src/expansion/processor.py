@@ -17,6 +17,7 @@ import numpy as np
 import real_ladybug as kuzu
 
 from ..embeddings import EmbeddingGenerator
+from ..query_result import fetch
 from ..sources.base import Article, ArticleNotFoundError, ContentSource
 
 logger = logging.getLogger(__name__)
@@ -294,7 +295,7 @@ class ArticleProcessor:
             {"title": article.title},
         )
 
-        article_exists = result.get_as_df().iloc[0]["count"] > 0
+        article_exists = fetch(result).scalar("count", 0) > 0
 
         if article_exists:
             # Article exists (probably a seed stub), update it
@@ -10,6 +10,8 @@ from datetime import UTC, datetime, timedelta
 
 import real_ladybug as kuzu
 
+from ..query_result import fetch, iter_rows
+
 logger = logging.getLogger(__name__)
 
 
@@ -79,7 +81,7 @@ class WorkQueueManager:
         )
 
         # Get articles as list
-        articles = result.get_as_df().to_dict("records")
+        articles = fetch(result).records()
 
         if not articles:
             logger.debug("No work available to claim")
@@ -104,7 +106,7 @@ class WorkQueueManager:
                     {"title": title, "now": now},
                 )
 
-                if result.get_as_df().empty:
+                if fetch(result).empty:
                     logger.debug(f"Claim lost race for article: {title}")
                     continue
 
@@ -182,7 +184,7 @@ class WorkQueueManager:
                 {"cutoff": cutoff},
             )
 
-            stale_articles = result.get_as_df().to_dict("records")
+            stale_articles = fetch(result).records()
 
             if not stale_articles:
                 logger.debug("No stale claims to reclaim")
@@ -306,12 +308,12 @@ class WorkQueueManager:
                 {"title": article_title},
             )
 
-            df = result.get_as_df()
-            if df.empty:
+            rows = fetch(result)
+            if rows.empty:
                 logger.warning(f"Article not found: {article_title}")
                 return
 
-            new_retry_count = int(df.iloc[0]["retry_count"]) + 1
+            new_retry_count = int(rows.scalar("retry_count", 0)) + 1
 
             # Increment retry count and set state in a single query
             if new_retry_count >= self.max_retries:
@@ -373,8 +375,6 @@ class WorkQueueManager:
                 RETURN a.expansion_state AS state, COUNT(a) AS count
             """)
 
-            df = result.get_as_df()
-
             stats = {
                 "discovered": 0,
                 "claimed": 0,
@@ -384,9 +384,7 @@ class WorkQueueManager:
                 "total": 0,
             }
 
-            for _, row in df.iterrows():
-                state = row["state"]
-                count = row["count"]
+            for state, count in iter_rows(result):
                 if state in stats:
                     stats[state] = int(count)
                 stats["total"] += int(count)
@@ -0,0 +1,102 @@
+"""Pandas-free access to LadybugDB query results.
+
+``QueryResult.get_as_df()`` builds a pandas DataFrame for every query.  For
+the small results on retrieval hot paths (a handful of titles, a count, a
+few neighbours) the DataFrame construction costs several times more than
+the query itself, and callers immediately unpack it again with
+``iterrows()`` or ``.tolist()``.  These helpers read the result directly.
+
+API Contract:
+    fetch(result) -> QueryRows
+    iter_rows(result) -> Iterator[tuple]
+    fetch_arrow(result, chunk_size=None) -> pyarrow.Table
+    QueryRows.columns, .rows, .empty, len(rows), iter(rows) -> tuples
+        .column(name) -> list
+        .records() -> list[dict]
+        .scalar(name=None, default=None) -> Any
+
+Design Philosophy:
+    - ``fetch`` materialises with ``get_all()`` in one native call; rows
+      are plain tuples and NULLs stay ``None`` (no NaN coercion).
+    - ``iter_rows`` streams row by row for large scans that should not be
+      held in memory.
+    - Arrow output is optional (``pyarrow`` is not a core dependency) and
+      is meant for bulk columnar consumers such as embedding export.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import Any
+
+
+class QueryRows:
+    """Materialised query result: column names plus row tuples."""
+
+    __slots__ = ("columns", "rows", "_positions")
+
+    def __init__(self, columns: list[str], rows: list[tuple]):
+        self.columns = list(columns)
+        self.rows = rows
+        self._positions = {name: i for i, name in enumerate(self.columns)}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self) -> Iterator[tuple]:
+        return iter(self.rows)
+
+    def __repr__(self) -> str:
+        return f"QueryRows(columns={self.columns!r}, rows={len(self.rows)})"
+
+    @property
+    def empty(self) -> bool:
+        """True when the result has no rows (mirrors ``DataFrame.empty``)."""
+        return not self.rows
+
+    def _position(self, name: str) -> int:
+        try:
+            return self._positions[name]
+        except KeyError:
+            raise KeyError(f"no column {name!r} in result columns {self.columns}") from None
+
+    def column(self, name: str) -> list:
+        """Return the values of column *name* as a list."""
+        i = self._position(name)
+        return [row[i] for row in self.rows]
+
+    def records(self) -> list[dict[str, Any]]:
+        """Return the rows as dicts keyed by column name."""
+        columns = self.columns
+        return [dict(zip(columns, row)) for row in self.rows]
+
+    def scalar(self, name: str | None = None, default: Any = None) -> Any:
+        """Return the first row's *name* column (first column if None), or *default*."""
+        if not self.rows:
+            return default
+        value = self.rows[0][0 if name is None else self._position(name)]
+        return default if value is None else value
+
+
+def fetch(result) -> QueryRows:
+    """Materialise a LadybugDB ``QueryResult`` without building a DataFrame."""
+    return QueryRows(result.get_column_names(), [tuple(row) for row in result.get_all()])
+
+
+def iter_rows(result) -> Iterator[tuple]:
+    """Yield the rows of a LadybugDB ``QueryResult`` one at a time."""
+    while result.has_next():
+        yield tuple(result.get_next())
+
+
+def fetch_arrow(result, chunk_size: int | None = None):
+    """Return a LadybugDB ``QueryResult`` as a ``pyarrow.Table``.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+    """
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:
+        raise ImportError("pyarrow is required for Arrow query results: pip install pyarrow") from e
+    return result.get_as_arrow(chunk_size)
@@ -9,3 +9,22 @@ import sys
 _workstream_root = os.path.dirname(os.path.abspath(__file__))
 if _workstream_root not in sys.path:
     sys.path.insert(0, _workstream_root)
+
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _reset_model_registry():
+    """Give every test a fresh ModelRegistry and query-embedding cache.
+
+    Otherwise a mocked model loaded (or embedding cached) by one test would be
+    served to the next, and patched model loaders would never take effect.
+    """
+    yield
+    registry_module = sys.modules.get("bootstrap.src.embeddings.registry")
+    if registry_module is not None:
+        registry_module.get_model_registry().clear()
+    cache_module = sys.modules.get("bootstrap.src.embeddings.query_cache")
+    if cache_module is not None:
+        cache_module.get_query_embedding_cache().clear()
@@ -31,6 +31,8 @@ Configure for Claude Desktop (claude_desktop_config.json):
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import json
 import logging
 from pathlib import Path
@@ -45,8 +47,9 @@ mcp = FastMCP(
     name="agent-kgpacks",
     instructions=(
         "Knowledge-pack query server. Use list_packs to discover available packs, "
-        "pack_info to inspect a specific pack, and query_knowledge_pack to ask "
-        "questions against a pack's knowledge graph."
+        "pack_info to inspect a specific pack, and query_knowledge_pack to retrieve "
+        "ranked sources, passages and facts from a pack's knowledge graph. "
+        "query_knowledge_packs retrieves from several packs at once."
     ),
 )
 
@@ -74,6 +77,23 @@ def _load_manifest(pack_dir: Path) -> dict:
     return json.loads(manifest_path.read_text())
 
 
+_federated_engine = None
+
+
+def _get_federated_engine():
+    """Federated engine over a warm agent pool (created on first use)."""
+    global _federated_engine
+    if _federated_engine is None:
+        from wikigr.agent.federated import FederatedQueryEngine
+        from wikigr.agent.pool import PackAgentPool, open_pack_agent
+
+        pool = PackAgentPool(
+            agent_factory=functools.partial(open_pack_agent, use_enhancements=False)
+        )
+        _federated_engine = FederatedQueryEngine(pool)
+    return _federated_engine
+
+
 # ---------------------------------------------------------------------------
 # Tools
 # ---------------------------------------------------------------------------
@@ -120,19 +140,21 @@ def pack_info(pack_name: str) -> str:
 
 
 @mcp.tool()
-def query_knowledge_pack(
+async def query_knowledge_pack(
     pack_name: str,
     question: str,
     max_results: int = 5,
 ) -> str:
-    """Query a knowledge pack's graph and return an answer with sources.
+    """Query a knowledge pack's graph and return ranked sources, passages and facts.
 
     Uses the KnowledgeGraphAgent to perform vector + graph search over the
-    pack's LadybugDB database and synthesize a natural-language answer.
+    pack's LadybugDB database (``aretrieve``).  No answer is synthesized:
+    the calling model answers from the returned passages, so a tool call
+    costs no extra generation.
 
     Args:
         pack_name: Directory name of the pack (e.g. 'python-expert').
-        question: Natural language question to answer.
+        question: Natural language question to retrieve context for.
         max_results: Maximum number of graph results to retrieve (1-1000).
     """
     pack_dir = _get_pack_dir(pack_name)
@@ -144,17 +166,59 @@ def query_knowledge_pack(
     from wikigr.agent.kg_agent import KnowledgeGraphAgent
 
     try:
-        with KnowledgeGraphAgent(
+        # Opening the database blocks; keep it off the event loop.
+        agent = await asyncio.to_thread(
+            KnowledgeGraphAgent,
             db_path=str(db_path),
             read_only=True,
             use_enhancements=False,
-        ) as agent:
-            result = agent.query(question, max_results=max_results)
+        )
+        async with agent:
+            result = await agent.aretrieve(question, max_results=max_results)
     except Exception as exc:
         logger.exception("Query failed for pack '%s'", pack_name)
         return json.dumps({"error": str(exc), "pack": pack_name})
 
-    # Return the agent result directly — it already has answer, sources, etc.
+    # Return the retrieval result directly — sources, passages, facts, scores.
+    return json.dumps(result, indent=2, default=str)
+
+
+@mcp.tool()
+async def query_knowledge_packs(
+    pack_names: list[str],
+    question: str,
+    max_results: int = 5,
+) -> str:
+    """Query several knowledge packs at once and return one merged ranking.
+
+    Retrieval runs on every pack concurrently; passages are merged with
+    cross-pack score calibration and each carries its pack name.  Use this
+    when a question spans packs (e.g. python-expert and langchain-expert).
+    No answer is synthesized.
+
+    Args:
+        pack_names: Directory names of the packs (1-5).
+        question: Natural language question to retrieve context for.
+        max_results: Maximum number of graph results to retrieve per pack (1-1000).
+    """
+    if not 1 <= len(pack_names) <= 5:
+        return json.dumps({"error": "pack_names must list 1 to 5 packs"})
+    packs = {}
+    for pack_name in pack_names:
+        db_path = _get_pack_dir(pack_name) / "pack.db"
+        if not db_path.exists():
+            return json.dumps({"error": f"Database not found at {db_path}"})
+        packs[pack_name] = str(db_path)
+
+    try:
+        # Pack retrieval blocks; keep it off the event loop.
+        result = await asyncio.to_thread(
+            _get_federated_engine().retrieve, question, packs, max_results=max_results
+        )
+    except Exception as exc:
+        logger.exception("Federated query failed for packs %s", pack_names)
+        return json.dumps({"error": str(exc), "packs": pack_names})
+
     return json.dumps(result, indent=2, default=str)
 
 
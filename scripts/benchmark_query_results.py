@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: pandas DataFrame vs. direct LadybugDB result access.
+
+Builds a throwaway graph (or opens an existing pack read-only) and times the
+small queries that dominate retrieval hot paths, materialising each result
+with ``get_as_df()`` and with the helpers in ``bootstrap.src.query_result``.
+
+Usage:
+    # Synthetic 2,000-article graph
+    python scripts/benchmark_query_results.py
+
+    # Against a real pack
+    python scripts/benchmark_query_results.py --db data/packs/go-expert/pack.db
+
+    # More repetitions, JSON output
+    python scripts/benchmark_query_results.py --repeat 2000 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import real_ladybug as kuzu
+
+# Add project root to path for bootstrap imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bootstrap.src.query_result import fetch, iter_rows  # noqa: E402
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+DEFAULT_ARTICLES = 2000
+DEFAULT_REPEAT = 500
+LINKS_PER_ARTICLE = 5
+
+# name -> (cypher, params); a None param value is replaced by the probe article title
+QUERIES: dict[str, tuple[str, dict]] = {
+    "count": ("MATCH (a:Article) RETURN count(a) AS count", {}),
+    "title_lookup": (
+        "MATCH (a:Article) WHERE a.title = $title RETURN a.title AS title",
+        {"title": None},
+    ),
+    "neighbours": (
+        "MATCH (a:Article {title: $title})-[:LINKS_TO]->(b:Article) "
+        "RETURN b.title AS title LIMIT 5",
+        {"title": None},
+    ),
+    "titles_100": ("MATCH (a:Article) RETURN a.title AS title LIMIT 100", {}),
+}
+
+METHODS = {
+    "get_as_df": lambda result: result.get_as_df(),
+    "fetch": fetch,
+    "iter_rows": lambda result: list(iter_rows(result)),
+}
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def build_synthetic_db(path: Path, articles: int) -> None:
+    """Create *articles* Article nodes, each linking to the next few."""
+    db = kuzu.Database(str(path))
+    conn = kuzu.Connection(db)
+    conn.execute("CREATE NODE TABLE Article(title STRING, PRIMARY KEY(title))")
+    conn.execute("CREATE REL TABLE LINKS_TO(FROM Article TO Article)")
+    conn.execute(
+        "UNWIND $titles AS t CREATE (:Article {title: t})",
+        {"titles": [f"Article {i}" for i in range(articles)]},
+    )
+    conn.execute(
+        "UNWIND $pairs AS p MATCH (a:Article {title: p[1]}), (b:Article {title: p[2]}) "
+        "CREATE (a)-[:LINKS_TO]->(b)",
+        {
+            "pairs": [
+                [f"Article {i}", f"Article {(i + k) % articles}"]
+                for i in range(articles)
+                for k in range(1, LINKS_PER_ARTICLE + 1)
+            ]
+        },
+    )
+    db.close()
+
+
+def probe_title(conn) -> str:
+    """Return the title of an article with outgoing links (or any article)."""
+    rows = fetch(conn.execute("MATCH (a:Article)-[:LINKS_TO]->() RETURN a.title AS title LIMIT 1"))
+    if rows.empty:
+        rows = fetch(conn.execute("MATCH (a:Article) RETURN a.title AS title LIMIT 1"))
+    return rows.scalar("title", "")
+
+
+def time_method(conn, cypher: str, params: dict, method, repeat: int) -> float:
+    """Median microseconds for execute + materialise over *repeat* runs."""
+    for _ in range(min(20, repeat)):  # warm-up
+        method(conn.execute(cypher, params))
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        method(conn.execute(cypher, params))
+        samples.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(samples)
+
+
+def run(conn, repeat: int) -> dict[str, dict[str, float]]:
+    """Time every query with every method; returns {query: {method: median_us}}."""
+    title = probe_title(conn)
+    report: dict[str, dict[str, float]] = {}
+    for name, (cypher, params) in QUERIES.items():
+        bound = {k: title if v is None else v for k, v in params.items()}
+        report[name] = {
+            method_name: time_method(conn, cypher, bound, method, repeat)
+            for method_name, method in METHODS.items()
+        }
+    return report
+
+
+def print_report(report: dict[str, dict[str, float]]) -> None:
+    header = f"{'query':<14}" + "".join(f"{m:>12}" for m in METHODS) + f"{'saved/query':>14}"
+    print(header)
+    print("-" * len(header))
+    for name, timings in report.items():
+        saved = timings["get_as_df"] - timings["fetch"]
+        cells = "".join(f"{timings[m]:>10.0f}us" for m in METHODS)
+        print(f"{name:<14}{cells}{saved:>12.0f}us")
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Compare get_as_df() with pandas-free query result access.",
+        epilog=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--db", type=Path, help="Existing database to open read-only")
+    parser.add_argument(
+        "--articles",
+        type=int,
+        default=DEFAULT_ARTICLES,
+        help=f"Articles in the synthetic graph (default: {DEFAULT_ARTICLES})",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=DEFAULT_REPEAT,
+        help=f"Timed runs per query and method (default: {DEFAULT_REPEAT})",
+    )
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.db is not None:
+            if not args.db.exists():
+                print(f"Database not found: {args.db}", file=sys.stderr)
+                return 1
+            db = kuzu.Database(str(args.db), read_only=True)
+        else:
+            path = Path(tmp) / "bench.db"
+            build_synthetic_db(path, args.articles)
+            db = kuzu.Database(str(path), read_only=True)
+        try:
+            report = run(kuzu.Connection(db), args.repeat)
+        finally:
+            db.close()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,7 +6,11 @@ question to both a plain LLM (training baseline) and the KG Agent backed
 by the pack database, then uses a judge model to score answers 0-10.
 
 Usage:
-    python scripts/eval_single_pack.py <pack_name> [--sample N]
+    python scripts/eval_single_pack.py <pack_name> [--sample N] [--batch]
+
+With --batch the pack answers are synthesized through the Message Batches
+API (``KnowledgeGraphAgent.query_batch``): half the price, but results can
+take minutes to hours.
 """
 
 from __future__ import annotations
@@ -85,6 +89,39 @@ def judge_score(
         return 0
 
 
+def pack_answers(
+    db_path: Path, few_shot_path: Path, questions: list[str], batch: bool = False
+) -> list[str]:
+    """Answer *questions* with one KG Agent for the pack ("" for failures).
+
+    Args:
+        db_path: Path to the pack database.
+        few_shot_path: Few-shot examples file for the agent.
+        questions: Question texts.
+        batch: Synthesize all answers in one Message Batch via query_batch().
+
+    Returns:
+        One answer per question, in order.
+    """
+    from wikigr.agent.kg_agent import KnowledgeGraphAgent
+
+    try:
+        with KnowledgeGraphAgent(str(db_path), few_shot_path=str(few_shot_path)) as agent:
+            if batch:
+                return [result.get("answer", "") for result in agent.query_batch(questions)]
+            answers = []
+            for question_text in questions:
+                try:
+                    answers.append(agent.query(question_text).get("answer", ""))
+                except Exception:
+                    logger.exception("KG Agent failed for: %s", question_text[:80])
+                    answers.append("")
+            return answers
+    except Exception:
+        logger.exception("KG Agent failed for pack at %s", db_path)
+        return [""] * len(questions)
+
+
 def validate_pack_name(name: str) -> str:
     """Validate pack name to prevent path traversal.
 
@@ -107,6 +144,11 @@ def main() -> None:
     parser = argparse.ArgumentParser(description="Evaluate a single knowledge pack")
     parser.add_argument("pack", help="Pack name (e.g. 'rust-expert')")
     parser.add_argument("--sample", type=int, default=0, help="Limit to N questions (0 = all)")
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Synthesize pack answers through the Message Batches API (slower, half price)",
+    )
     args = parser.parse_args()
 
     pack_name = validate_pack_name(args.pack)
@@ -124,13 +166,13 @@ def main() -> None:
 
     client = Anthropic()
 
-    from wikigr.agent.kg_agent import KnowledgeGraphAgent
+    question_texts = [q.get("question", q.get("query", "")) for q in questions]
+    answers = pack_answers(db_path, questions_path, question_texts, batch=args.batch)
 
     training_scores: list[int] = []
     pack_scores: list[int] = []
 
-    for question_data in questions:
-        question_text = question_data.get("question", question_data.get("query", ""))
+    for question_data, question_text, pack_answer in zip(questions, question_texts, answers):
         expected_answer = question_data.get("ground_truth", question_data.get("answer", ""))
 
         # Training baseline: plain LLM answer
@@ -147,16 +189,6 @@ def main() -> None:
 
         training_scores.append(judge_score(client, question_text, expected_answer, training_answer))
 
-        # Pack: KG Agent answer
-        try:
-            agent = KnowledgeGraphAgent(str(db_path), few_shot_path=str(questions_path))
-            result = agent.query(question_text)
-            pack_answer = result.get("answer", "")
-            agent.close()
-        except Exception:
-            logger.exception("KG Agent failed for: %s", question_text[:80])
-            pack_answer = ""
-
         pack_scores.append(judge_score(client, question_text, expected_answer, pack_answer))
 
     num_questions = len(questions)
@@ -91,6 +91,17 @@ def rebuild_pack(script_path: Path, test_mode: bool = False) -> dict:
 
         if result.returncode == 0:
             logger.info(f"[{pack_name}] Built successfully in {elapsed:.0f}s")
+            built_dir = next((d for d in possible_dirs if (d / "pack.db").exists()), None)
+            if built_dir is not None:
+                from wikigr.packs.centrality import build_pack_centrality
+                from wikigr.packs.embedding_sidecar import export_pack_embeddings
+                from wikigr.packs.router import build_pack_routing
+
+                build_pack_centrality(built_dir)
+                export_pack_embeddings(built_dir)
+                if (built_dir / "manifest.json").exists():
+                    build_pack_routing(built_dir)
+                logger.info(f"[{pack_name}] Centrality, embedding and routing sidecars written")
             return {"pack": pack_name, "status": "success", "elapsed": elapsed}
         else:
             stderr_tail = result.stderr[-500:] if result.stderr else ""
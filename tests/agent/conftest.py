@@ -0,0 +1,37 @@
+"""Shared fixtures for KnowledgeGraphAgent unit tests."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from wikigr.agent.kg_agent import KnowledgeGraphAgent
+
+
+@pytest.fixture
+def make_agent():
+    """Factory for agents on a mocked connection and Claude client.
+
+    Agents are built with ``KnowledgeGraphAgent.from_connection``, so every
+    attribute ``__init__`` sets exists with its real default.  Keyword
+    arguments are assigned as attributes afterwards.  Agents are closed at
+    teardown.
+
+    Usage: ``agent = make_agent(claude=client, async_claude=aclient, answer_cache=cache)``
+    """
+    agents: list[KnowledgeGraphAgent] = []
+
+    def make(claude=None, async_claude=None, **attrs) -> KnowledgeGraphAgent:
+        agent = KnowledgeGraphAgent.from_connection(
+            MagicMock(), claude if claude is not None else MagicMock(), async_claude
+        )
+        agent.synthesis_model = "mock-model"
+        for name, value in attrs.items():
+            setattr(agent, name, value)
+        agents.append(agent)
+        return agent
+
+    yield make
+    for agent in agents:
+        agent.close()
@@ -0,0 +1,268 @@
+"""Unit tests for wikigr.agent.pool.PackAgentPool.
+
+All tests use a fake agent factory -- no real DB, model, or network calls.
+"""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from wikigr.agent.pool import PackAgentPool, open_pack_agent
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def _make_pack_db(tmp_path: Path, name: str, size: int = 1024) -> str:
+    """Create a fake pack.db file of the given size and return its path."""
+    pack_dir = tmp_path / name
+    pack_dir.mkdir(parents=True, exist_ok=True)
+    db = pack_dir / "pack.db"
+    db.write_bytes(b"\0" * size)
+    return str(db)
+
+
+def _factory():
+    """Return (factory, created) where created collects every agent opened."""
+    created: list[MagicMock] = []
+
+    def factory(db_path: str) -> MagicMock:
+        agent = MagicMock()
+        agent.db_path = db_path
+        created.append(agent)
+        return agent
+
+    return factory, created
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+
+class TestPackAgentPoolReuse:
+    """Warm reuse and hit/miss accounting."""
+
+    def test_second_acquire_reuses_agent(self, tmp_path):
+        factory, created = _factory()
+        pool = PackAgentPool(agent_factory=factory)
+        db = _make_pack_db(tmp_path, "go-expert")
+
+        with pool.acquire("go-expert", db) as first:
+            pass
+        with pool.acquire("go-expert", db) as second:
+            pass
+
+        assert first is second
+        assert len(created) == 1
+        stats = pool.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == pytest.approx(0.5)
+        assert stats["idle"] == 1
+
+    def test_concurrent_checkouts_get_distinct_agents(self, tmp_path):
+        factory, created = _factory()
+        pool = PackAgentPool(agent_factory=factory)
+        db = _make_pack_db(tmp_path, "go-expert")
+
+        with pool.acquire("go-expert", db) as a, pool.acquire("go-expert", db) as b:
+            assert a is not b
+            assert pool.stats()["in_use"] == 2
+        assert len(created) == 2
+        assert pool.stats()["idle"] == 2
+
+    def test_agent_returned_after_exception(self, tmp_path):
+        factory, _created = _factory()
+        pool = PackAgentPool(agent_factory=factory)
+        db = _make_pack_db(tmp_path, "go-expert")
+
+        with pytest.raises(RuntimeError), pool.acquire("go-expert", db):
+            raise RuntimeError("query failed")
+
+        assert pool.stats()["in_use"] == 0
+        assert pool.stats()["idle"] == 1
+
+    def test_closed_agent_is_not_recycled(self, tmp_path):
+        factory, created = _factory()
+        pool = PackAgentPool(agent_factory=factory)
+        db = _make_pack_db(tmp_path, "go-expert")
+
+        with pool.acquire("go-expert", db) as agent:
+            agent.conn = None  # caller closed the agent
+        assert pool.stats()["idle"] == 0
+        with pool.acquire("go-expert", db):
+            pass
+        assert len(created) == 2
+
+    def test_factory_failure_does_not_leak_in_use(self, tmp_path):
+        pool = PackAgentPool(agent_factory=MagicMock(side_effect=RuntimeError("boom")))
+        db = _make_pack_db(tmp_path, "go-expert")
+
+        with pytest.raises(RuntimeError, match="boom"), pool.acquire("go-expert", db):
+            pass
+        assert pool.stats()["in_use"] == 0
+        assert len(pool) == 0
+
+    def test_prometheus_text_exports_stats(self, tmp_path):
+        factory, _created = _factory()
+        pool = PackAgentPool(max_agents=3, agent_factory=factory)
+        db = _make_pack_db(tmp_path, "go-expert", size=2048)
+
+        with pool.acquire("go-expert", db):
+            pass
+        with pool.acquire("go-expert", db):
+            text = pool.prometheus_text()
+
+        assert "# TYPE wikigr_pack_pool_hits_total counter" in text
+        assert "wikigr_pack_pool_hits_total 1\n" in text
+        assert "wikigr_pack_pool_misses_total 1\n" in text
+        assert "wikigr_pack_pool_in_use_agents 1\n" in text
+        assert "wikigr_pack_pool_resident_bytes 2048\n" in text
+        assert "wikigr_pack_pool_max_agents 3\n" in text
+
+
+class TestOpenPackAgent:
+    """The shared default factory."""
+
+    def test_opens_read_only_agent_with_extra_options(self):
+        with patch("wikigr.agent.kg_agent.KnowledgeGraphAgent") as agent_cls:
+            agent = open_pack_agent("/packs/go/pack.db", enable_answer_cache=True)
+
+        agent_cls.assert_called_once_with(
+            "/packs/go/pack.db", read_only=True, enable_answer_cache=True
+        )
+        assert agent is agent_cls.return_value
+
+    def test_is_the_pool_default(self):
+        assert PackAgentPool()._factory is open_pack_agent
+
+
+class TestPackAgentPoolEviction:
+    """LRU, memory cap, idle TTL and on-disk change invalidation."""
+
+    def test_lru_eviction_over_max_agents(self, tmp_path):
+        factory, created = _factory()
+        pool = PackAgentPool(max_agents=2, agent_factory=factory)
+        dbs = {name: _make_pack_db(tmp_path, name) for name in ("a", "b", "c")}
+
+        for name in ("a", "b", "c"):
+            with pool.acquire(name, dbs[name]):
+                pass
+
+        stats = pool.stats()
+        assert stats["open_agents"] == 2
+        assert stats["evictions"] == 1
+        assert stats["packs"] == ["b", "c"]
+        created[0].close.assert_called_once()
+
+    def test_memory_cap_evicts_least_recently_used(self, tmp_path):
+        factory, created = _factory()
+        pool = PackAgentPool(max_bytes=2500, agent_factory=factory)
+        db_a = _make_pack_db(tmp_path, "a", size=1000)
+        db_b = _make_pack_db(tmp_path, "b", size=1000)
+        db_c = _make_pack_db(tmp_path, "c", size=1000)
+
+        for name, db in (("a", db_a), ("b", db_b), ("a", db_a), ("c", db_c)):
+            with pool.acquire(name, db):
+                pass
+
+        stats = pool.stats()
+        assert stats["packs"] == ["a", "c"]
+        assert stats["resident_bytes"] == 2000
+        created[1].close.assert_called_once()
+
+    def test_idle_ttl_eviction(self, tmp_path, monkeypatch):
+        factory, created = _factory()
+        pool = PackAgentPool(idle_ttl_s=10.0, agent_factory=factory)
+        db = _make_pack_db(tmp_path, "go-expert")
+
+        clock = [1000.0]
+        monkeypatch.setattr("wikigr.agent.pool.time.monotonic", lambda: clock[0])
+
+        with pool.acquire("go-expert", db):
+            pass
+        clock[0] += 11.0
+        assert pool.evict_idle() == 1
+        assert pool.stats()["idle"] == 0
+        created[0].close.assert_called_once()
+
+    def test_changed_database_is_not_served(self, tmp_path):
+        factory, created = _factory()
+        pool = PackAgentPool(agent_factory=factory)
+        db = _make_pack_db(tmp_path, "go-expert", size=100)
+
+        with pool.acquire("go-expert", db):
+            pass
+        Path(db).write_bytes(b"\0" * 200)  # pack re-installed
+        with pool.acquire("go-expert", db) as agent:
+            assert agent is created[1]
+
+        created[0].close.assert_called_once()
+        assert pool.stats()["misses"] == 2
+
+
+class TestPackAgentPoolLifecycle:
+    """close() and validation."""
+
+    def test_close_closes_idle_and_rejects_new_checkouts(self, tmp_path):
+        factory, created = _factory()
+        pool = PackAgentPool(agent_factory=factory)
+        db = _make_pack_db(tmp_path, "go-expert")
+
+        with pool.acquire("go-expert", db):
+            pass
+        pool.close()
+
+        created[0].close.assert_called_once()
+        with pytest.raises(RuntimeError, match="closed"), pool.acquire("go-expert", db):
+            pass
+
+    def test_agent_checked_out_during_close_is_closed_on_return(self, tmp_path):
+        factory, created = _factory()
+        pool = PackAgentPool(agent_factory=factory)
+        db = _make_pack_db(tmp_path, "go-expert")
+
+        with pool.acquire("go-expert", db):
+            pool.close()
+            created[0].close.assert_not_called()
+        created[0].close.assert_called_once()
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [{"max_agents": 0}, {"max_bytes": 0}, {"idle_ttl_s": 0}],
+    )
+    def test_rejects_invalid_limits(self, kwargs):
+        with pytest.raises(ValueError):
+            PackAgentPool(**kwargs)
+
+    def test_thread_safety_under_contention(self, tmp_path):
+        factory, _created = _factory()
+        pool = PackAgentPool(max_agents=4, agent_factory=factory)
+        db = _make_pack_db(tmp_path, "go-expert")
+        errors: list[BaseException] = []
+
+        def worker():
+            try:
+                for _ in range(50):
+                    with pool.acquire("go-expert", db):
+                        pass
+            except BaseException as e:  # pragma: no cover - surfaced below
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert not errors
+        stats = pool.stats()
+        assert stats["in_use"] == 0
+        assert stats["hits"] + stats["misses"] == 400
+        assert stats["open_agents"] <= 4
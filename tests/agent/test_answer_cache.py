@@ -0,0 +1,380 @@
+"""Unit tests for wikigr.agent.answer_cache and its use in KnowledgeGraphAgent.
+
+Uses a temporary pack directory and hand-made embeddings; no DB, model or
+network access.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from anthropic import APIConnectionError
+
+from wikigr.agent.answer_cache import (
+    EXACT,
+    SEMANTIC,
+    AnswerCache,
+    answer_cache_path,
+    pack_content_version,
+)
+
+PARAMS = {"max_results": 10, "use_enhancements": False}
+RESULT = {
+    "answer": "Goroutines are lightweight threads.",
+    "sources": ["Goroutine"],
+    "token_usage": {"input_tokens": 100, "output_tokens": 20, "api_calls": 1},
+    "stage_timings": {"vector": 0.2},
+}
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture(autouse=True)
+def user_cache_dir(tmp_path, monkeypatch):
+    """Keep cache files out of the real ~/.wikigr."""
+    cache_dir = tmp_path / "user-cache"
+    monkeypatch.setenv("WIKIGR_ANSWER_CACHE_DIR", str(cache_dir))
+    return cache_dir
+
+
+@pytest.fixture()
+def pack_dir(tmp_path):
+    pack = tmp_path / "go-expert"
+    pack.mkdir()
+    (pack / "manifest.json").write_text(json.dumps({"name": "go-expert", "version": "1.0"}))
+    return pack
+
+
+@pytest.fixture()
+def cache(pack_dir):
+    c = AnswerCache(pack_dir)
+    yield c
+    c.close()
+
+
+def _embed(mapping: dict[str, list[float]]):
+    """Return an embed_fn looking questions up in *mapping* and recording calls."""
+    calls = []
+
+    def embed_fn(question):
+        calls.append(question)
+        return mapping[question]
+
+    embed_fn.calls = calls
+    return embed_fn
+
+
+def _fake_synthesis(agent, answer="answer"):
+    def synthesize(*args, **kwargs):
+        agent.token_usage["api_calls"] += 1
+        return answer, True
+
+    return synthesize
+
+
+# ---------------------------------------------------------------------------
+# AnswerCache
+# ---------------------------------------------------------------------------
+
+
+class TestAnswerCache:
+    """Keying, approximate matching, invalidation and eviction."""
+
+    def test_exact_hit_uses_normalized_question(self, cache) -> None:
+        cache.put("query", "What is a goroutine?", "m", PARAMS, RESULT)
+
+        hit = cache.get("query", "  what IS a   goroutine? ", "m", PARAMS)
+
+        assert hit["answer"] == RESULT["answer"]
+        assert hit["answer_cache"]["match"] == EXACT
+        assert "token_usage" not in hit and "stage_timings" not in hit
+
+    @pytest.mark.parametrize(
+        ("kind", "model", "params"),
+        [
+            ("graph_query", "m", PARAMS),
+            ("query", "other-model", PARAMS),
+            ("query", "m", {**PARAMS, "max_results": 5}),
+        ],
+    )
+    def test_key_includes_kind_model_and_params(self, cache, kind, model, params) -> None:
+        cache.put("query", "What is a goroutine?", "m", PARAMS, RESULT)
+
+        assert cache.get(kind, "What is a goroutine?", model, params) is None
+
+    def test_semantic_hit_above_threshold(self, cache) -> None:
+        embed = _embed({"What is a goroutine?": [1.0, 0.0], "Explain goroutines": [0.99, 0.05]})
+        cache.put("query", "What is a goroutine?", "m", PARAMS, RESULT, embedding=[1.0, 0.0])
+
+        hit = cache.get("query", "Explain goroutines", "m", PARAMS, embed_fn=embed)
+
+        assert hit["answer_cache"]["match"] == SEMANTIC
+        assert hit["answer_cache"]["cached_question"] == "What is a goroutine?"
+        assert hit["answer_cache"]["similarity"] >= 0.95
+
+    def test_semantic_miss_below_threshold(self, cache) -> None:
+        embed = _embed({"What is a channel?": [0.6, 0.8]})
+        cache.put("query", "What is a goroutine?", "m", PARAMS, RESULT, embedding=[1.0, 0.0])
+
+        assert cache.get("query", "What is a channel?", "m", PARAMS, embed_fn=embed) is None
+        assert cache.stats()["misses"] == 1
+
+    def test_embed_fn_not_called_without_candidates(self, cache) -> None:
+        embed = _embed({})
+        cache.put("query", "What is a goroutine?", "m", PARAMS, RESULT)  # no embedding
+
+        assert cache.get("query", "Other question", "m", PARAMS, embed_fn=embed) is None
+        assert embed.calls == []
+
+    def test_threshold_above_one_disables_semantic_matching(self, pack_dir, make_agent) -> None:
+        cache = AnswerCache(pack_dir, similarity_threshold=1.01)
+        embed = _embed({"Explain goroutines": [1.0, 0.0]})
+        cache.put("query", "What is a goroutine?", "m", PARAMS, RESULT, embedding=[1.0, 0.0])
+
+        assert cache.get("query", "Explain goroutines", "m", PARAMS, embed_fn=embed) is None
+        cache.close()
+
+    def test_manifest_change_invalidates_entries(self, cache, pack_dir) -> None:
+        cache.put("query", "What is a goroutine?", "m", PARAMS, RESULT)
+        old_version = cache.pack_version
+
+        (pack_dir / "manifest.json").write_text(json.dumps({"name": "go-expert", "version": "2"}))
+
+        assert cache.get("query", "What is a goroutine?", "m", PARAMS) is None
+        assert cache.pack_version != old_version
+        assert cache.stats()["entries"] == 0
+
+    def test_entries_persist_across_instances(self, pack_dir) -> None:
+        first = AnswerCache(pack_dir)
+        first.put("query", "What is a goroutine?", "m", PARAMS, RESULT)
+        first.close()
+
+        second = AnswerCache(pack_dir)
+        assert second.get("query", "What is a goroutine?", "m", PARAMS) is not None
+        second.close()
+
+    def test_file_lives_outside_the_pack(self, pack_dir, user_cache_dir, tmp_path) -> None:
+        cache = AnswerCache(pack_dir)
+        explicit = AnswerCache(pack_dir, cache_dir=tmp_path / "elsewhere")
+
+        assert cache.path.parent == user_cache_dir
+        assert cache.path.name.startswith("go-expert-")
+        assert explicit.path == answer_cache_path(pack_dir, tmp_path / "elsewhere")
+        assert not (pack_dir / "cache").exists()
+        # Two packs with the same directory name do not share a file.
+        other = tmp_path / "mirror" / "go-expert"
+        assert answer_cache_path(other) != cache.path
+        cache.close()
+        explicit.close()
+
+    def test_hits_are_written_in_batches(self, cache) -> None:
+        cache.put("query", "q1", "m", PARAMS, RESULT)
+        statements = []
+        cache._db.set_trace_callback(statements.append)
+
+        for _ in range(5):
+            cache.get("query", "q1", "m", PARAMS)
+
+        assert not [s for s in statements if s.startswith(("UPDATE", "COMMIT"))]
+        cache._db.set_trace_callback(None)
+        (hits,) = cache._db.execute("SELECT hits FROM answers").fetchone()
+        assert hits == 0
+        cache.stats()  # flushes
+        (hits,) = cache._db.execute("SELECT hits FROM answers").fetchone()
+        assert hits == 5
+
+    def test_buffered_hits_survive_close(self, pack_dir) -> None:
+        first = AnswerCache(pack_dir)
+        first.put("query", "q1", "m", PARAMS, RESULT)
+        first.get("query", "q1", "m", PARAMS)
+        first.close()
+
+        second = AnswerCache(pack_dir)
+        (hits,) = second._db.execute("SELECT hits FROM answers").fetchone()
+        assert hits == 1
+        second.close()
+
+    def test_evicts_least_recently_hit(self, pack_dir, make_agent) -> None:
+        cache = AnswerCache(pack_dir, max_entries=2)
+        cache.put("query", "q1", "m", PARAMS, RESULT)
+        cache.put("query", "q2", "m", PARAMS, RESULT)
+        cache.get("query", "q1", "m", PARAMS)  # q2 is now the least recently hit
+        cache.put("query", "q3", "m", PARAMS, RESULT)
+
+        assert cache.get("query", "q2", "m", PARAMS) is None
+        assert cache.get("query", "q1", "m", PARAMS) is not None
+        assert cache.stats()["entries"] == 2
+        cache.close()
+
+    def test_rejects_invalid_arguments(self, pack_dir) -> None:
+        with pytest.raises(ValueError):
+            AnswerCache(pack_dir, similarity_threshold=0)
+        with pytest.raises(ValueError):
+            AnswerCache(pack_dir, max_entries=0)
+
+    def test_pack_content_version_without_manifest(self, tmp_path) -> None:
+        assert pack_content_version(tmp_path) == "unversioned"
+        (tmp_path / "manifest.json").write_text("{}")
+        assert pack_content_version(tmp_path).startswith("m-")
+
+
+# ---------------------------------------------------------------------------
+# KnowledgeGraphAgent integration
+# ---------------------------------------------------------------------------
+
+
+class TestAgentAnswerCache:
+    """query()/graph_query() consult the cache before retrieval and synthesis."""
+
+    VECTOR = {"sources": ["Go"], "entities": [], "facts": [], "raw": []}
+
+    def _query(self, agent, question):
+        with (
+            patch.object(agent, "_vector_primary_retrieve", return_value=(self.VECTOR, 0.9)) as vec,
+            patch.object(agent, "_direct_title_lookup", return_value=[]),
+            patch.object(agent, "_hybrid_retrieve", return_value={}),
+            patch.object(agent, "_synthesize_answer", side_effect=_fake_synthesis(agent)),
+            patch.object(agent, "_embed_query", return_value=[1.0, 0.0]),
+        ):
+            return agent.query(question), vec
+
+    def test_repeated_query_served_from_cache(self, cache, make_agent) -> None:
+        agent = make_agent(async_claude=MagicMock(), answer_cache=cache)
+
+        first, _ = self._query(agent, "What is Go?")
+        second, vec = self._query(agent, "what is go?")
+
+        assert "answer_cache" not in first
+        assert second["answer"] == first["answer"]
+        assert second["answer_cache"]["match"] == EXACT
+        assert second["stage_timings"] == {}
+        assert second["token_usage"]["api_calls"] == 1
+        vec.assert_not_called()
+
+    def test_degraded_result_is_not_cached(self, cache, make_agent) -> None:
+        agent = make_agent(async_claude=MagicMock(), answer_cache=cache)
+        with (
+            patch.object(agent, "_vector_primary_retrieve", return_value=(self.VECTOR, 0.9)),
+            patch.object(agent, "_direct_title_lookup", return_value=[]),
+            patch.object(agent, "_hybrid_retrieve", side_effect=RuntimeError("graph down")),
+            patch.object(agent, "_synthesize_answer", side_effect=_fake_synthesis(agent)),
+            patch.object(agent, "_embed_query", return_value=[1.0, 0.0]),
+        ):
+            agent.query("What is Go?")
+
+        assert cache.stats()["entries"] == 0
+
+    def test_fallback_answer_is_not_cached(self, cache, make_agent) -> None:
+        agent = make_agent(async_claude=MagicMock(), answer_cache=cache)
+        with (
+            patch.object(agent, "_vector_primary_retrieve", return_value=(self.VECTOR, 0.9)),
+            patch.object(agent, "_direct_title_lookup", return_value=[]),
+            patch.object(agent, "_hybrid_retrieve", return_value={}),
+            patch.object(agent, "_synthesize_answer", return_value=("Sources: Go", False)),
+        ):
+            agent.query("What is Go?")
+
+        assert cache.stats()["entries"] == 0
+
+    def test_graph_query_fallback_after_seed_call_is_not_cached(self, cache, make_agent) -> None:
+        agent = make_agent(answer_cache=cache, seed_resolution="llm")
+        agent.claude.messages.create.side_effect = APIConnectionError(
+            request=httpx.Request("POST", "https://api.anthropic.com")
+        )
+
+        def seeds(question):
+            agent.token_usage["api_calls"] += 1  # the seed call succeeded
+            return ["Go"]
+
+        with (
+            patch.object(agent, "_identify_seed_articles", side_effect=seeds),
+            patch.object(agent, "_gather_graph_context", return_value=(["Go"], ["## Go"], [])),
+            patch.object(agent, "_embed_query", return_value=[1.0, 0.0]),
+        ):
+            result = agent.graph_query("What is Go?")
+
+        assert "Go" in result["answer"]
+        assert cache.stats()["entries"] == 0
+
+    def test_aquery_fallback_is_not_cached_despite_concurrent_calls(
+        self, cache, make_agent
+    ) -> None:
+        agent = make_agent(async_claude=MagicMock(), answer_cache=cache)
+
+        async def synthesize(*args, **kwargs):
+            agent.token_usage["api_calls"] += 1  # another in-flight query's call
+            return "Found relevant sources: Go", False
+
+        with (
+            patch.object(agent, "_vector_primary_retrieve", return_value=(self.VECTOR, 0.9)),
+            patch.object(agent, "_direct_title_lookup", return_value=[]),
+            patch.object(agent, "_hybrid_retrieve", return_value={}),
+            patch.object(agent, "_asynthesize_answer", side_effect=synthesize),
+            patch.object(agent, "_embed_query", return_value=[1.0, 0.0]),
+        ):
+            asyncio.run(agent.aquery("What is Go?"))
+            agent._db_executor.shutdown()
+
+        assert cache.stats()["entries"] == 0
+
+    def test_graph_query_cached_separately(self, cache, make_agent) -> None:
+        agent = make_agent(answer_cache=cache, seed_resolution="llm")
+
+        def seeds(question):
+            agent.token_usage["api_calls"] += 1
+            return ["Go"]
+
+        with (
+            patch.object(agent, "_identify_seed_articles", side_effect=seeds) as identify,
+            patch.object(agent, "_gather_graph_context", return_value=(["Go"], ["## Go"], [])),
+            patch.object(
+                agent, "_synthesize_graph_rag_answer", return_value=("graph answer", True)
+            ),
+            patch.object(agent, "_embed_query", return_value=[1.0, 0.0]),
+        ):
+            agent.graph_query("What is Go?")
+            hit = agent.graph_query("What is Go?")
+
+        assert hit["answer"] == "graph answer"
+        assert hit["answer_cache"]["match"] == EXACT
+        identify.assert_called_once()
+        assert cache.get("query", "What is Go?", "mock-model", PARAMS) is None
+
+    def test_aquery_uses_cache(self, cache, make_agent) -> None:
+        agent = make_agent(async_claude=MagicMock(), answer_cache=cache)
+        self._query(agent, "What is Go?")
+
+        with (
+            patch.object(agent, "_retrieve_context") as retrieve,
+            patch.object(agent, "_asynthesize_answer", new=AsyncMock()),
+            patch.object(agent, "_embed_query", return_value=[1.0, 0.0]),
+        ):
+            result = asyncio.run(agent.aquery("What is Go?"))
+        agent.close()
+
+        assert result["answer_cache"]["match"] == EXACT
+        retrieve.assert_not_called()
+
+    def test_cache_disabled_by_default(self, make_agent) -> None:
+        agent = make_agent()
+
+        result, vec = self._query(agent, "What is Go?")
+
+        assert "answer_cache" not in result
+        vec.assert_called_once()
+
+    def test_close_closes_cache(self, pack_dir, make_agent) -> None:
+        cache = AnswerCache(pack_dir)
+        agent = make_agent(async_claude=MagicMock(), answer_cache=cache)
+        with patch.object(cache, "close") as close:
+            agent.close()
+
+        close.assert_called_once()
+        assert agent.answer_cache is None
+        cache.close()
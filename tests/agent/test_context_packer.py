@@ -0,0 +1,213 @@
+"""Unit tests for wikigr.agent.context_packer (pure functions, no DB)."""
+
+from __future__ import annotations
+
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from wikigr.agent.context_packer import (
+    ClaudeTokenCounter,
+    chunk_text,
+    estimate_tokens,
+    pack_context,
+)
+from wikigr.agent.retriever import fetch_source_text
+
+
+def _filler(n: int, word: str = "lorem") -> str:
+    return " ".join([word] * n)
+
+
+class TestEstimateTokens:
+    """BPE-style estimate: word pieces, digit groups, punctuation."""
+
+    @pytest.mark.parametrize(
+        ("text", "expected"),
+        [
+            ("", 0),
+            ("the cat sat", 3),
+            ("Hello, world!", 4),
+            ("internationalization", 4),  # 20 letters -> 4 pieces
+            ("1234567", 3),  # digits grouped in threes
+            ("   \n\n  ", 0),
+        ],
+    )
+    def test_counts(self, text, expected) -> None:
+        assert estimate_tokens(text) == expected
+
+    def test_not_proportional_to_characters(self) -> None:
+        assert estimate_tokens("a b c d e f") > estimate_tokens("abcdef")
+
+
+def _count_tokens_client(overhead: int = 7, delay: float = 0.0) -> MagicMock:
+    """Client whose count_tokens reports one token per word plus *overhead*."""
+    client = MagicMock()
+
+    def count_tokens(model, messages):
+        time.sleep(delay)
+        return SimpleNamespace(input_tokens=len(messages[0]["content"].split()) + overhead)
+
+    client.messages.count_tokens.side_effect = count_tokens
+    return client
+
+
+class TestClaudeTokenCounter:
+    """Exact counts from the count_tokens endpoint, cached per text."""
+
+    def test_subtracts_message_overhead_and_caches(self) -> None:
+        client = _count_tokens_client()
+        counter = ClaudeTokenCounter(client, "mock-model")
+
+        assert counter("one two three") == 3
+        assert counter("one two three") == 3
+        assert counter("") == 0
+        # One call for the overhead probe, one for the text.
+        assert client.messages.count_tokens.call_count == 2
+        assert client.messages.count_tokens.call_args.kwargs["model"] == "mock-model"
+
+    def test_evicts_least_recently_used(self) -> None:
+        client = _count_tokens_client()
+        counter = ClaudeTokenCounter(client, "mock-model", max_entries=1)
+
+        counter("a b")
+        counter("c")
+        counter("a b")
+
+        assert client.messages.count_tokens.call_count == 4
+
+    def test_falls_back_to_estimate_when_endpoint_fails(self) -> None:
+        client = MagicMock()
+        client.messages.count_tokens.side_effect = RuntimeError("offline")
+        counter = ClaudeTokenCounter(client, "mock-model")
+
+        assert counter("Hello, world!") == estimate_tokens("Hello, world!")
+        assert counter("the cat sat") == 3
+        client.messages.count_tokens.assert_called_once()  # not retried right away
+
+    def test_count_many_dedupes_and_runs_concurrently(self) -> None:
+        client = _count_tokens_client(delay=0.1)
+        counter = ClaudeTokenCounter(client, "mock-model", max_workers=8)
+        texts = [_filler(i + 1) for i in range(8)] * 2
+
+        started = time.perf_counter()
+        counts = counter.count_many(texts)
+        elapsed = time.perf_counter() - started
+
+        assert counts == [i + 1 for i in range(8)] * 2
+        assert client.messages.count_tokens.call_count == 9  # probe + 8 distinct
+        assert elapsed < 0.5  # 9 serial calls would take 0.9s
+
+    def test_pack_context_counts_budget_with_counter(self) -> None:
+        counter = ClaudeTokenCounter(_count_tokens_client(), "mock-model")
+        calls = []
+        original = counter.count_many
+        counter.count_many = lambda texts: calls.append(len(texts)) or original(texts)
+        articles = [("A", [_filler(30)]), ("B", [_filler(30, "ipsum")])]
+
+        packed = pack_context(
+            articles, frozenset(), 40, count_tokens=counter, split_tokens=estimate_tokens
+        )
+
+        assert calls == [4]  # 2 chunks + 2 headers, counted in one batch
+        # 30 words + "##", title header = 32 counted tokens per article
+        assert [p["title"] for p in packed] == ["A"]
+
+
+class TestChunkText:
+    """Paragraph-merging chunker with word and hard splits."""
+
+    def test_merges_paragraphs_up_to_limit(self) -> None:
+        text = "\n\n".join([_filler(30), _filler(30), _filler(30)])
+
+        chunks = chunk_text(text, 64)
+
+        assert len(chunks) == 2
+        assert all(estimate_tokens(c) <= 64 for c in chunks)
+
+    def test_splits_long_paragraph_and_long_word(self) -> None:
+        chunks = chunk_text(_filler(150) + " " + "x" * 600, 50)
+
+        assert all(estimate_tokens(c) <= 50 for c in chunks)
+        assert "".join(c.replace(" ", "") for c in chunks).count("x") == 600
+
+    def test_rejects_non_positive_limit(self) -> None:
+        with pytest.raises(ValueError):
+            chunk_text("text", 0)
+
+
+class TestPackContext:
+    """Greedy selection of the highest-value chunks within the budget."""
+
+    def test_prefers_relevant_chunks_across_articles(self) -> None:
+        articles = [
+            ("Go", [_filler(80), _filler(60) + " goroutine scheduler"]),
+            ("Rust", [_filler(80, "ipsum")]),
+        ]
+
+        packed = pack_context(articles, frozenset({"goroutine", "scheduler?"}), 90)
+
+        assert [p["title"] for p in packed] == ["Go"]
+        assert "goroutine scheduler" in packed[0]["text"]
+        assert _filler(80) not in packed[0]["text"]  # the irrelevant lead did not fit
+
+    def test_keeps_source_and_document_order(self) -> None:
+        articles = [
+            ("A", ["alpha one", "alpha two"]),
+            ("B", ["beta one"]),
+        ]
+
+        packed = pack_context(articles, frozenset({"beta"}), 1000, max_chunk_tokens=2)
+
+        assert [p["title"] for p in packed] == ["A", "B"]
+        assert packed[0]["text"] == "alpha one\n\nalpha two"
+
+    def test_stays_within_budget(self) -> None:
+        articles = [(f"Article {i}", [_filler(300)]) for i in range(5)]
+
+        packed = pack_context(articles, frozenset({"lorem"}), 500)
+        text = "\n\n".join(f"## {p['title']}\n{p['text']}" for p in packed)
+
+        assert estimate_tokens(text) <= 500
+
+    def test_truncates_when_nothing_fits_whole(self) -> None:
+        packed = pack_context([("A", [_filler(100)])], frozenset(), 20, max_chunk_tokens=100)
+
+        assert packed[0]["text"].endswith("...")
+        assert estimate_tokens("## A\n" + packed[0]["text"]) <= 20
+
+    def test_rejects_non_positive_budget(self) -> None:
+        with pytest.raises(ValueError):
+            pack_context([("A", ["x"])], frozenset(), 0)
+
+
+class TestFetchSourceTextBudget:
+    """retriever.fetch_source_text packs with token_budget instead of char cuts."""
+
+    def test_budget_replaces_per_article_char_cut(self) -> None:
+        conn = MagicMock()
+        conn.execute.return_value.get_column_names.return_value = ["title", "content"]
+        conn.execute.return_value.get_all.return_value = [["A", _filler(2000)], ["B", _filler(10)]]
+        args = (conn, MagicMock(return_value=1.0), frozenset(), 3000, 0.3, ["A", "B"])
+
+        legacy = fetch_source_text(*args)
+        packed = fetch_source_text(*args, token_budget=300)
+
+        assert estimate_tokens(packed) <= 300 < estimate_tokens(legacy)
+        assert "## B" in packed
+
+    def test_budget_counted_with_given_counter(self) -> None:
+        conn = MagicMock()
+        conn.execute.return_value.get_column_names.return_value = ["title", "content"]
+        conn.execute.return_value.get_all.return_value = [["A", _filler(50)], ["B", _filler(50)]]
+        args = (conn, MagicMock(return_value=1.0), frozenset(), 3000, 0.3, ["A", "B"])
+
+        def counter(text):
+            return 1000 if "## B" in text else 1
+
+        packed = fetch_source_text(*args, token_budget=300, count_tokens=counter)
+
+        assert "## A" in packed
+        assert "## B" not in packed
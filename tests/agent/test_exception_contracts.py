@@ -30,23 +30,8 @@ from wikigr.agent.kg_agent import KnowledgeGraphAgent
 
 def _make_agent() -> KnowledgeGraphAgent:
     """Build a KnowledgeGraphAgent with fully mocked internals."""
-    agent = KnowledgeGraphAgent.__new__(KnowledgeGraphAgent)
-    agent.db = None
-    agent.conn = MagicMock()
-    agent.claude = MagicMock()
+    agent = KnowledgeGraphAgent.from_connection(MagicMock(), MagicMock())
     agent.synthesis_model = "mock-model"
-    agent._embedding_generator = None
-    agent._plan_cache = {}
-    agent.token_usage = {"input_tokens": 0, "output_tokens": 0, "api_calls": 0}
-    agent.use_enhancements = False
-    agent.enable_reranker = True
-    agent.enable_multidoc = True
-    agent.enable_fewshot = True
-    agent.enable_multi_query = False
-    agent.reranker = None
-    agent.synthesizer = None
-    agent.few_shot = None
-    agent.cross_encoder = None
     return agent
 
 
@@ -234,6 +219,7 @@ class TestGraphQueryPropagatesIdentifySeedErrors:
     def test_api_connection_error_propagates_from_graph_query(self) -> None:
         """APIConnectionError in _identify_seed_articles propagates from graph_query()."""
         agent = _make_agent()
+        agent.seed_resolution = "llm"  # always ask Claude for seeds
         with (
             patch.object(
                 agent,
@@ -249,6 +235,7 @@ class TestGraphQueryPropagatesIdentifySeedErrors:
     def test_value_error_propagates_from_graph_query(self) -> None:
         """ValueError from _identify_seed_articles propagates from graph_query()."""
         agent = _make_agent()
+        agent.seed_resolution = "llm"  # always ask Claude for seeds
         with (
             patch.object(
                 agent,
@@ -262,6 +249,7 @@ class TestGraphQueryPropagatesIdentifySeedErrors:
     def test_api_timeout_error_propagates_from_graph_query(self) -> None:
         """APITimeoutError in _identify_seed_articles propagates from graph_query()."""
         agent = _make_agent()
+        agent.seed_resolution = "llm"  # always ask Claude for seeds
         with (
             patch.object(
                 agent,
@@ -346,7 +334,7 @@ class TestDirectTitleLookupExceptionNarrowing:
                 "_hybrid_retrieve",
                 return_value={"sources": [], "facts": [], "entities": [], "raw": []},
             ),
-            patch.object(agent, "_synthesize_answer", return_value="synthesized answer"),
+            patch.object(agent, "_synthesize_answer", return_value=("synthesized answer", True)),
         ):
             result = agent.query("What is Python?")
 
@@ -425,7 +413,7 @@ class TestHybridRetrieveExceptionNarrowing:
                 "_hybrid_retrieve",
                 side_effect=RuntimeError("Kuzu connection reset during hybrid"),
             ),
-            patch.object(agent, "_synthesize_answer", return_value="partial answer"),
+            patch.object(agent, "_synthesize_answer", return_value=("partial answer", True)),
         ):
             result = agent.query("What is Python?")
 
@@ -501,7 +489,9 @@ class TestPipelineStageNames:
 
         with (
             patch.object(agent, "_vector_primary_retrieve", return_value=(low_sim_results, 0.1)),
-            patch.object(agent, "_synthesize_answer_minimal", return_value="training answer"),
+            patch.object(
+                agent, "_synthesize_answer_minimal", return_value=("training answer", True)
+            ),
         ):
             result = agent.query("completely off-topic question")
 
@@ -520,7 +510,7 @@ class TestPipelineStageNames:
                 "_hybrid_retrieve",
                 return_value={"sources": [], "facts": [], "entities": [], "raw": []},
             ),
-            patch.object(agent, "_synthesize_answer", return_value="synthesized"),
+            patch.object(agent, "_synthesize_answer", return_value=("synthesized", True)),
         ):
             result = agent.query("What is Python?")
 
@@ -0,0 +1,147 @@
+"""Tests for FederatedQueryEngine (multi-pack retrieval, one synthesis)."""
+
+from __future__ import annotations
+
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from wikigr.agent.federated import FederatedQueryEngine, calibrate_passages
+from wikigr.agent.pool import PackAgentPool
+
+
+def _retrieved(max_similarity: float, *titles: str, confident: bool = True) -> dict:
+    return {
+        "sources": list(titles),
+        "passages": [
+            {"title": t, "text": f"About {t}.", "score": max_similarity - 0.01 * i}
+            for i, t in enumerate(titles)
+        ],
+        "facts": [f"{titles[0]} fact"] if titles else [],
+        "max_similarity": max_similarity,
+        "confident": confident,
+    }
+
+
+def _response(text: str) -> MagicMock:
+    response = MagicMock()
+    response.content = [MagicMock(text=text)]
+    response.usage = MagicMock(input_tokens=100, output_tokens=20)
+    return response
+
+
+@pytest.fixture
+def results() -> dict[str, dict]:
+    return {
+        "python-expert": _retrieved(0.82, "asyncio", "Coroutines"),
+        "langchain-expert": _retrieved(0.9, "Tools", "Agents"),
+        "go-expert": _retrieved(0.4, "Goroutines", confident=False),
+    }
+
+
+def _engine(results: dict[str, dict], delay_s: float = 0.0, claude=None) -> FederatedQueryEngine:
+    def factory(db_path: str):
+        agent = MagicMock()
+
+        def retrieve(question, max_results=10, max_passages=5):
+            time.sleep(delay_s)
+            outcome = results[db_path]
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        agent.retrieve.side_effect = retrieve
+        return agent
+
+    return FederatedQueryEngine(PackAgentPool(agent_factory=factory), claude_client=claude)
+
+
+class TestCalibratePassages:
+    """Rank within each pack, weighted by the pack's best similarity."""
+
+    def test_interleaves_packs_by_confidence(self, results) -> None:
+        merged = calibrate_passages(results)
+
+        assert [(p["pack"], p["title"]) for p in merged] == [
+            ("langchain-expert", "Tools"),
+            ("python-expert", "asyncio"),
+            ("langchain-expert", "Agents"),
+            ("python-expert", "Coroutines"),
+        ]
+        assert merged[0]["similarity"] == pytest.approx(0.9)
+
+    def test_gated_pack_contributes_nothing(self, results) -> None:
+        assert all(p["pack"] != "go-expert" for p in calibrate_passages(results))
+
+
+class TestFederatedQueryEngine:
+    """Concurrent fan-out over pooled agents and a single synthesis call."""
+
+    def test_retrieval_runs_concurrently(self, results) -> None:
+        engine = _engine(results, delay_s=0.3)
+        packs = {name: name for name in results}
+
+        start = time.perf_counter()
+        merged = engine.retrieve("How do I call a tool from asyncio?", packs)
+        elapsed = time.perf_counter() - start
+        engine.close()
+
+        assert elapsed < 0.6
+        assert merged["sources"] == ["Tools", "asyncio", "Agents", "Coroutines"]
+        assert merged["facts"] == ["asyncio fact", "Tools fact"]
+        assert merged["packs"]["go-expert"]["confident"] is False
+        assert merged["degraded_packs"] == []
+
+    def test_failed_pack_is_degraded(self, results) -> None:
+        results["go-expert"] = RuntimeError("corrupt pack.db")
+        engine = _engine(results)
+
+        merged = engine.retrieve("q", {name: name for name in results})
+        engine.close()
+
+        assert merged["degraded_packs"] == ["go-expert"]
+        assert set(merged["packs"]) == {"python-expert", "langchain-expert"}
+
+    def test_query_synthesizes_once_from_merged_context(self, results) -> None:
+        claude = MagicMock()
+        claude.messages.create.return_value = _response("Use an async tool.")
+
+        with _engine(results, claude=claude) as engine:
+            result = engine.query("How do I call a tool from asyncio?", {n: n for n in results})
+
+        assert claude.messages.create.call_count == 1
+        prompt = claude.messages.create.call_args.kwargs["messages"][0]["content"]
+        assert "## Tools [langchain-expert]" in prompt
+        assert "## asyncio [python-expert]" in prompt
+        assert "Goroutines" not in prompt
+        assert result["answer"] == "Use an async tool."
+        assert result["query_type"] == "federated"
+        assert result["token_usage"]["api_calls"] == 1
+        assert "synthesis" in result["stage_timings"]
+
+    def test_token_usage_is_per_call(self, results) -> None:
+        claude = MagicMock()
+        claude.messages.create.return_value = _response("Use an async tool.")
+
+        with _engine(results, claude=claude) as engine:
+            packs = {n: n for n in results}
+            engine.query("q1", packs)
+            second = engine.query("q2", packs)
+
+        assert second["token_usage"] == {"input_tokens": 100, "output_tokens": 20, "api_calls": 1}
+
+    def test_no_confident_pack_answers_from_training(self, results) -> None:
+        claude = MagicMock()
+        claude.messages.create.return_value = _response("From memory.")
+
+        with _engine({"go-expert": results["go-expert"]}, claude=claude) as engine:
+            result = engine.query("q", {"go-expert": "go-expert"})
+
+        assert result["query_type"] == "training_only_response"
+        assert result["passages"] == []
+        assert result["answer"] == "From memory."
+
+    def test_requires_packs(self) -> None:
+        with _engine({}) as engine, pytest.raises(ValueError, match="packs"):
+            engine.retrieve("q", {})
@@ -0,0 +1,192 @@
+"""Tests for the batched graph_query traversal (_gather_graph_context)."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+import real_ladybug as kuzu
+
+from wikigr.agent.kg_agent import KnowledgeGraphAgent
+
+# title -> lead-section embedding
+ARTICLES = {
+    "Go": [1.0, 0.0],
+    "Goroutine": [0.9, 0.1],
+    "Channel": [0.7, 0.7],
+    "Gopher": [0.0, 1.0],
+    "Rust": [0.1, 0.9],
+    "Borrow Checker": [0.5, 0.5],
+}
+LINKS = [
+    ("Go", "Goroutine"),
+    ("Go", "Gopher"),
+    ("Goroutine", "Channel"),
+    ("Rust", "Borrow Checker"),
+]
+
+
+@pytest.fixture
+def conn(tmp_path):
+    db = kuzu.Database(str(tmp_path / "pack.db"))
+    conn = kuzu.Connection(db)
+    conn.execute("CREATE NODE TABLE Article(title STRING, word_count INT64, PRIMARY KEY(title))")
+    conn.execute(
+        "CREATE NODE TABLE Section(section_id STRING, content STRING, embedding DOUBLE[2], "
+        "PRIMARY KEY(section_id))"
+    )
+    conn.execute("CREATE REL TABLE LINKS_TO(FROM Article TO Article)")
+    conn.execute("CREATE REL TABLE HAS_SECTION(FROM Article TO Section, section_index INT64)")
+    for title, embedding in ARTICLES.items():
+        conn.execute("CREATE (:Article {title: $t, word_count: 100})", {"t": title})
+        conn.execute(
+            "MATCH (a:Article {title: $t}) "
+            "CREATE (a)-[:HAS_SECTION {section_index: 0}]->"
+            "(:Section {section_id: $id, content: $c, embedding: $e})",
+            {"t": title, "id": f"{title}#0", "c": f"About {title}.", "e": embedding},
+        )
+    for source, target in LINKS:
+        conn.execute(
+            "MATCH (a:Article {title: $a}), (b:Article {title: $b}) CREATE (a)-[:LINKS_TO]->(b)",
+            {"a": source, "b": target},
+        )
+    yield conn
+    db.close()
+
+
+@pytest.fixture
+def agent(conn):
+    return KnowledgeGraphAgent.from_connection(conn, MagicMock())
+
+
+class TestGatherGraphContext:
+    """All seeds and hops cost a constant number of database round-trips."""
+
+    def test_two_round_trips_for_many_seeds(self, agent) -> None:
+        with patch.object(agent, "_safe_query", wraps=agent._safe_query) as safe_query:
+            titles, context, cypher = agent._gather_graph_context(["Go", "Rust"], 2, 5)
+
+        assert safe_query.call_count == 2
+        assert len(cypher) == 2
+        assert titles[:2] == ["Go", "Rust"]
+        assert set(titles) == {"Go", "Rust", "Goroutine", "Gopher", "Channel", "Borrow Checker"}
+        assert "## Channel\nAbout Channel." in context
+        assert len(context) == len(titles)
+
+    def test_hub_seed_does_not_starve_other_seeds(self, conn, agent) -> None:
+        for i in range(30):
+            conn.execute("CREATE (:Article {title: $t, word_count: 10})", {"t": f"Spoke {i:02d}"})
+            conn.execute(
+                "MATCH (a:Article {title: 'Go'}), (b:Article {title: $t}) "
+                "CREATE (a)-[:LINKS_TO]->(b)",
+                {"t": f"Spoke {i:02d}"},
+            )
+
+        titles, _, _ = agent._gather_graph_context(["Go", "Rust"], 1, 5)
+
+        assert "Borrow Checker" in titles
+        assert len([t for t in titles if t.startswith("Spoke")]) <= 5
+
+    def test_seeds_match_case_insensitively(self, agent) -> None:
+        titles, context, _ = agent._gather_graph_context(["go"], 1, 5)
+
+        assert titles[0] == "Go"
+        assert set(titles) == {"Go", "Goroutine", "Gopher"}
+        assert context[0] == "## Go\nAbout Go."
+
+    def test_case_insensitive_without_title_index(self, agent) -> None:
+        agent.enable_title_index = False
+
+        titles, _, cypher = agent._gather_graph_context(["go"], 1, 5)
+
+        assert set(titles) == {"go", "Goroutine", "Gopher"}
+        assert "lower(seed.title)" in cypher[0]
+
+    def test_frontier_pruned_by_question_similarity(self, agent) -> None:
+        with patch.object(agent, "_embed_query", return_value=[0.0, 1.0]) as embed:
+            titles, _, _ = agent._gather_graph_context(["Go"], 2, 1, "Who is the mascot?")
+
+        embed.assert_called_once_with("Who is the mascot?")
+        assert titles == ["Go", "Gopher"]
+
+    def test_no_embedding_when_frontier_fits(self, agent) -> None:
+        with patch.object(agent, "_embed_query") as embed:
+            agent._gather_graph_context(["Go"], 2, 5, "What is Go?")
+
+        embed.assert_not_called()
+
+    def test_unknown_seed_kept_without_context(self, agent) -> None:
+        titles, context, _ = agent._gather_graph_context(["Nope"], 2, 5)
+
+        assert titles == ["Nope"]
+        assert context == []
+
+    def test_snapshot_traversal_makes_one_round_trip(self, agent) -> None:
+        agent.enable_graph_snapshot = True
+        agent._get_graph_snapshot()
+
+        with patch.object(agent, "_safe_query", wraps=agent._safe_query) as safe_query:
+            titles, context, cypher = agent._gather_graph_context(["go", "Rust"], 2, 5)
+
+        assert safe_query.call_count == 1
+        assert len(cypher) == 1
+        assert titles[:2] == ["Go", "Rust"]
+        assert set(titles) == {"Go", "Rust", "Goroutine", "Gopher", "Channel", "Borrow Checker"}
+        assert len(context) == len(titles)
+
+
+class TestLocalSeedResolution:
+    """graph_query() seeds come from title mentions and vector hits before Claude."""
+
+    def _hits(self, *pairs):
+        return [{"title": t, "similarity": s} for t, s in pairs]
+
+    def test_title_mentions_first_then_confident_hits(self, agent) -> None:
+        hits = self._hits(("Channel", 0.8), ("Gopher", 0.4))
+        with patch.object(agent, "semantic_search", return_value=hits):
+            seeds = agent._resolve_local_seeds("How do goroutine schedulers work in go?")
+
+        assert seeds == ["Goroutine", "Go", "Channel"]
+
+    def test_low_confidence_defers_to_claude(self, agent) -> None:
+        with patch.object(agent, "semantic_search", return_value=self._hits(("Gopher", 0.5))):
+            assert agent._resolve_local_seeds("Which mascot is blue?") == []
+
+    def test_llm_mode_skips_local_resolution(self, conn) -> None:
+        agent = KnowledgeGraphAgent(
+            use_enhancements=False, seed_resolution="llm", _conn=conn, _claude_client=MagicMock()
+        )
+
+        with patch.object(agent, "semantic_search") as search:
+            assert agent._resolve_local_seeds("What is Go?") == []
+        search.assert_not_called()
+
+    def test_rejects_unknown_mode(self, conn) -> None:
+        with pytest.raises(ValueError, match="seed_resolution"):
+            KnowledgeGraphAgent(seed_resolution="oracle", _conn=conn, _claude_client=MagicMock())
+
+    def test_graph_query_makes_one_claude_call(self, agent) -> None:
+        response = MagicMock()
+        response.content = [MagicMock(text="Go uses goroutines.")]
+        response.usage = MagicMock(input_tokens=10, output_tokens=5)
+        agent.claude.messages.create.return_value = response
+
+        with (
+            patch.object(agent, "semantic_search", return_value=[]),
+            patch.object(agent, "_identify_seed_articles") as identify,
+        ):
+            result = agent.graph_query("What is a Goroutine?", max_hops=1)
+
+        identify.assert_not_called()
+        assert agent.claude.messages.create.call_count == 1
+        assert result["sources"] == ["Goroutine", "Channel"]
+        assert result["answer"] == "Go uses goroutines."
+
+    def test_graph_query_falls_back_to_claude(self, agent) -> None:
+        with (
+            patch.object(agent, "semantic_search", return_value=[]),
+            patch.object(agent, "_identify_seed_articles", return_value=["Rust"]) as identify,
+            patch.object(agent, "_synthesize_graph_rag_answer", return_value=("answer", True)),
+        ):
+            result = agent.graph_query("Which language prevents data races?", max_hops=1)
+
+        identify.assert_called_once()
+        assert result["sources"] == ["Rust", "Borrow Checker"]
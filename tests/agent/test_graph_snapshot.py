@@ -0,0 +1,261 @@
+"""Tests for the in-memory CSR graph snapshot."""
+
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+import real_ladybug as kuzu
+
+from wikigr.agent.graph_snapshot import CSRGraph, load_graph_snapshot
+from wikigr.agent.kg_agent import KnowledgeGraphAgent
+from wikigr.agent.multi_doc_synthesis import MultiDocSynthesizer
+from wikigr.agent.reranker import GraphReranker
+
+LINKS = [
+    ("Go", "Goroutine"),
+    ("Go", "Gopher"),
+    ("Goroutine", "Channel"),
+    ("Channel", "Go"),
+    ("Rust", "Borrow Checker"),
+]
+# Stubs are link targets without content (word_count 0).
+WORD_COUNTS = {
+    "Go": 100,
+    "Goroutine": 80,
+    "Gopher": 0,
+    "Channel": 50,
+    "Rust": 90,
+    "Borrow Checker": 0,
+}
+RELATIONS = [
+    ("Google", "Go", "created"),
+    ("Google", "Gopher", "owns"),
+    ("Go", "Goroutine", "has_feature"),
+    ("Gopher", "Goroutine", "illustrates"),
+    ("Goroutine", "Channel", "communicates_via"),
+    ("Mozilla", "Rust", "created"),
+]
+
+
+def _graph(links=LINKS) -> CSRGraph:
+    names = sorted({n for edge in links for n in edge})
+    pos = {n: i for i, n in enumerate(names)}
+    return CSRGraph(names, [pos[s] for s, _ in links], [pos[t] for _, t in links])
+
+
+@pytest.fixture
+def conn(tmp_path):
+    db = kuzu.Database(str(tmp_path / "pack.db"))
+    conn = kuzu.Connection(db)
+    conn.execute("CREATE NODE TABLE Article(title STRING, word_count INT64, PRIMARY KEY(title))")
+    conn.execute("CREATE NODE TABLE Entity(entity_id STRING, name STRING, PRIMARY KEY(entity_id))")
+    conn.execute("CREATE REL TABLE LINKS_TO(FROM Article TO Article)")
+    conn.execute("CREATE REL TABLE ENTITY_RELATION(FROM Entity TO Entity, relation STRING)")
+    for title, word_count in WORD_COUNTS.items():
+        conn.execute("CREATE (:Article {title: $t, word_count: $w})", {"t": title, "w": word_count})
+    for source, target in LINKS:
+        conn.execute(
+            "MATCH (a:Article {title: $a}), (b:Article {title: $b}) CREATE (a)-[:LINKS_TO]->(b)",
+            {"a": source, "b": target},
+        )
+    for name in sorted({n for s, t, _ in RELATIONS for n in (s, t)}):
+        conn.execute("CREATE (:Entity {entity_id: $id, name: $n})", {"id": name.lower(), "n": name})
+    for source, target, relation in RELATIONS:
+        conn.execute(
+            "MATCH (a:Entity {name: $a}), (b:Entity {name: $b}) "
+            "CREATE (a)-[:ENTITY_RELATION {relation: $r}]->(b)",
+            {"a": source, "b": target, "r": relation},
+        )
+    yield conn
+    db.close()
+
+
+class TestCSRGraph:
+    """Neighbourhoods, degrees and BFS over the compressed adjacency."""
+
+    def test_neighbors_in_both_directions(self) -> None:
+        graph = _graph()
+
+        assert graph.neighbors("Go") == ["Gopher", "Goroutine"]
+        assert graph.neighbors("Go", direction="in") == ["Channel"]
+        assert graph.neighbors("Go", direction="both", limit=2) == ["Channel", "Gopher"]
+        assert graph.neighbors("Python") == []
+
+    def test_degree(self) -> None:
+        graph = _graph()
+
+        assert graph.degree("Go", "out") == 2
+        assert graph.degree("Go", "in") == 1
+        assert graph.degree("Go") == 3
+        assert graph.degree("Python") == 0
+        with pytest.raises(ValueError, match="direction"):
+            graph.degree("Go", "sideways")
+
+    def test_k_hop_orders_by_hop_then_name(self) -> None:
+        graph = _graph()
+
+        assert graph.k_hop(["Go"], 3) == [("Gopher", 1), ("Goroutine", 1), ("Channel", 2)]
+        assert graph.k_hop(["Go", "Rust"], 1, limit=2) == [("Borrow Checker", 1), ("Gopher", 1)]
+        assert graph.k_hop(["Go"], 0) == []
+
+    def test_k_hop_filters_reported_nodes_but_traverses_them(self) -> None:
+        graph = _graph()
+        where = np.array([name != "Goroutine" for name in graph.names])
+
+        assert graph.k_hop(["Go"], 2, where=where) == [("Gopher", 1), ("Channel", 2)]
+
+    def test_distance(self) -> None:
+        graph = _graph()
+
+        assert graph.distance("Go", "Channel", 3) == 2
+        assert graph.distance("Go", "Channel", 1) is None
+        assert graph.distance("Channel", "Goroutine", 3) == 2
+        assert graph.distance("Channel", "Goroutine", 3, direction="both") == 1
+        assert graph.distance("Go", "Rust", 5) is None
+        assert graph.distance("Go", "Go", 1) == 0
+
+    def test_shortest_paths_lists_every_minimum_path(self) -> None:
+        names = ["a", "b", "c", "d", "e"]
+        edges = [(0, 1, "x"), (0, 2, "z"), (1, 3, "y"), (2, 3, "w"), (3, 4, "v"), (0, 4, None)]
+        graph = CSRGraph(names, *zip(*edges))
+
+        assert graph.shortest_paths("a", "e", 3) == [(["a", "e"], [None])]
+        assert graph.shortest_paths("b", "e", 3) == [(["b", "d", "e"], ["y", "v"])]
+        assert graph.shortest_paths("a", "d", 3) == [
+            (["a", "b", "d"], ["x", "y"]),
+            (["a", "c", "d"], ["z", "w"]),
+        ]
+        assert graph.shortest_paths("a", "d", 3, k=1) == [(["a", "b", "d"], ["x", "y"])]
+        assert graph.shortest_paths("a", "d", 1) == []
+        assert graph.shortest_paths("d", "a", 3) == []
+        assert graph.shortest_paths("d", "a", 3, direction="both")[0][0] == ["d", "b", "a"]
+
+    def test_shortest_paths_bounded_on_long_chains(self) -> None:
+        # A 3-hop chain to "m" beside 200 two-hop routes through a dense hub layer.
+        hub = [f"h{i:03d}" for i in range(200)]
+        names = ["s", "a1", "a2", "m", "b1", "t", *hub]
+        pos = {n: i for i, n in enumerate(names)}
+        edges = [("s", "a1"), ("a1", "a2"), ("a2", "m"), ("m", "b1"), ("b1", "t")]
+        edges += [("s", h) for h in hub] + [(h, "t") for h in hub]
+        edges += [(h, g) for h in hub[:50] for g in hub[:50]]
+        graph = CSRGraph(names, [pos[a] for a, _ in edges], [pos[b] for _, b in edges])
+
+        paths = graph.shortest_paths("s", "t", 5, k=3)
+        assert len(paths) == 3
+        assert all(len(nodes) == 3 for nodes, _ in paths)
+        assert graph.shortest_paths("s", "m", 5) == [(["s", "a1", "a2", "m"], [None] * 3)]
+
+    def test_rejects_mismatched_edges(self) -> None:
+        with pytest.raises(ValueError, match="same length"):
+            CSRGraph(["a", "b"], [0, 1], [1])
+
+
+class TestLoadGraphSnapshot:
+    """Both edge sets are read once from the pack database."""
+
+    def test_loads_articles_and_entities(self, conn) -> None:
+        snapshot = load_graph_snapshot(conn, version=(1, 2))
+
+        assert len(snapshot.articles) == len(WORD_COUNTS)
+        assert snapshot.articles.num_edges == len(LINKS)
+        assert snapshot.entities.num_edges == len(RELATIONS)
+        assert snapshot.entities.label_names == [
+            "communicates_via",
+            "created",
+            "has_feature",
+            "illustrates",
+            "owns",
+        ]
+        assert snapshot.version == (1, 2)
+        stubs = {n for n, flag in zip(snapshot.articles.names, snapshot.has_content) if not flag}
+        assert stubs == {"Gopher", "Borrow Checker"}
+
+    def test_pack_without_entities(self, tmp_path) -> None:
+        db = kuzu.Database(str(tmp_path / "bare.db"))
+        conn = kuzu.Connection(db)
+        conn.execute(
+            "CREATE NODE TABLE Article(title STRING, word_count INT64, PRIMARY KEY(title))"
+        )
+        conn.execute("CREATE (:Article {title: 'Go', word_count: 1})")
+        try:
+            snapshot = load_graph_snapshot(conn)
+        finally:
+            db.close()
+
+        assert snapshot.articles.names == ["Go"]
+        assert len(snapshot.entities) == 0
+
+
+class TestAgentGraphSnapshot:
+    """Agent traversals answered from the snapshot instead of Cypher."""
+
+    @pytest.fixture
+    def agent(self, conn):
+        agent = KnowledgeGraphAgent.from_connection(conn, MagicMock())
+        agent.enable_graph_snapshot = True
+        return agent
+
+    def test_disabled_for_borrowed_connections(self, conn) -> None:
+        agent = KnowledgeGraphAgent.from_connection(conn, MagicMock())
+
+        assert agent._get_graph_snapshot() is None
+
+    def test_find_relationship_path_without_queries(self, agent) -> None:
+        agent._get_graph_snapshot()
+        with patch.object(agent, "_safe_query") as safe_query:
+            paths = agent.find_relationship_path("Google", "Channel", max_hops=3)
+            unreachable = agent.find_relationship_path("Google", "Channel", max_hops=2)
+
+        safe_query.assert_not_called()
+        assert [(p["path"], p["relations"]) for p in paths] == [
+            (
+                ["Google", "Go", "Goroutine", "Channel"],
+                ["created", "has_feature", "communicates_via"],
+            ),
+            (
+                ["Google", "Gopher", "Goroutine", "Channel"],
+                ["owns", "illustrates", "communicates_via"],
+            ),
+        ]
+        assert paths[0]["hops"] == 3
+        assert unreachable == []
+
+    def test_cypher_fallback_returns_same_paths(self, conn, agent) -> None:
+        cypher_agent = KnowledgeGraphAgent.from_connection(conn, MagicMock())
+
+        expected = agent.find_relationship_path("Google", "Channel", max_hops=4)
+        actual = cypher_agent.find_relationship_path("Google", "Channel", max_hops=4)
+
+        assert sorted(p["path"] for p in actual) == sorted(p["path"] for p in expected)
+        assert cypher_agent.find_relationship_path("Google", "Channel", max_paths=1)[0]["hops"] == 3
+        assert cypher_agent.find_relationship_path("Channel", "Google") == []
+        with pytest.raises(ValueError, match="max_paths"):
+            cypher_agent.find_relationship_path("Google", "Channel", max_paths=0)
+
+    def test_snapshot_shared_with_reranker_and_synthesizer(self, agent) -> None:
+        agent.reranker = GraphReranker(agent.conn)
+        agent.synthesizer = MultiDocSynthesizer(agent.conn)
+
+        snapshot = agent._get_graph_snapshot()
+
+        assert agent.reranker.graph is snapshot.articles
+        assert agent.synthesizer.graph is snapshot.articles
+        assert agent.synthesizer.related_titles(["Go"], max_hops=2) == [
+            "Gopher",
+            "Goroutine",
+            "Channel",
+        ]
+
+    @pytest.mark.parametrize("per_seed", [1, 2])
+    def test_cypher_traversal_keeps_nearest_neighbours_like_snapshot(
+        self, conn, agent, per_seed
+    ) -> None:
+        cypher_agent = KnowledgeGraphAgent.from_connection(conn, MagicMock())
+        snapshot = agent._get_graph_snapshot()
+
+        titles, _, _ = cypher_agent._gather_graph_context(["Go"], 2, per_seed)
+
+        # Channel (2 hops) sorts before Goroutine (1 hop) by title alone.
+        nearest = snapshot.articles.k_hop(["Go"], 2, where=snapshot.has_content)
+        assert titles == ["Go"] + [title for title, _hop in nearest][:per_seed]
+        assert titles[1] == "Goroutine"
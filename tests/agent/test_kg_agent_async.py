@@ -0,0 +1,212 @@
+"""Tests for the asyncio API of KnowledgeGraphAgent (aquery, agraph_query).
+
+Claude is an AsyncMock; no real DB or network calls.  Coroutines are driven
+with ``asyncio.run`` (no async pytest plugin needed).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
+
+import pytest
+
+from bootstrap.src.query_result import QueryRows
+from wikigr.agent.reranker import GraphReranker
+
+
+def _response(text: str) -> MagicMock:
+    block = MagicMock()
+    block.text = text
+    resp = MagicMock()
+    resp.content = [block]
+    resp.usage = MagicMock(input_tokens=10, output_tokens=5)
+    return resp
+
+
+_VECTOR = {"sources": ["Go"], "entities": [], "facts": [], "raw": []}
+
+
+class TestAquery:
+    """aquery() mirrors query() but awaits AsyncAnthropic."""
+
+    def test_returns_same_shape_as_query(self, make_agent) -> None:
+        agent = make_agent(async_claude=AsyncMock())
+        agent._async_claude.messages.create.return_value = _response("async answer")
+        retrieval_threads = []
+
+        def vector(question, max_results):
+            retrieval_threads.append(threading.current_thread().name)
+            return dict(_VECTOR), 0.9
+
+        with (
+            patch.object(agent, "_vector_primary_retrieve", side_effect=vector),
+            patch.object(agent, "_direct_title_lookup", return_value=[]),
+            patch.object(agent, "_hybrid_retrieve", return_value={}),
+            patch.object(agent, "_fetch_source_text", return_value=""),
+        ):
+            result = asyncio.run(agent.aquery("What is Go?"))
+            agent.close()
+
+        assert result["answer"] == "async answer"
+        assert result["sources"] == ["Go"]
+        assert result["query_type"] == "vector_search"
+        assert "synthesis" in result["stage_timings"]
+        assert result["token_usage"]["api_calls"] == 1
+        agent.claude.messages.create.assert_not_called()
+        # Retrieval ran on the DB pool, not on the event loop thread.
+        assert retrieval_threads[0].startswith("kg-db")
+
+    def test_gated_query_uses_async_minimal_synthesis(self, make_agent) -> None:
+        agent = make_agent(async_claude=AsyncMock())
+        agent._async_claude.messages.create.return_value = _response("from training")
+
+        with (
+            patch.object(agent, "_vector_primary_retrieve", return_value=(dict(_VECTOR), 0.1)),
+            patch.object(agent, "_direct_title_lookup", return_value=[]),
+        ):
+            result = asyncio.run(agent.aquery("Unrelated?"))
+            agent.close()
+
+        assert result["answer"] == "from training"
+        assert result["query_type"] == "training_only_response"
+        assert result["sources"] == []
+
+    def test_concurrent_questions_overlap_on_claude(self, make_agent) -> None:
+        async def slow_create(**kwargs):
+            await asyncio.sleep(0.2)
+            return _response("ok")
+
+        agent = make_agent(async_claude=AsyncMock())
+        agent._async_claude.messages.create.side_effect = slow_create
+
+        async def run_many():
+            return await asyncio.gather(*(agent.aquery(f"Question {i}?") for i in range(20)))
+
+        with (
+            patch.object(agent, "_vector_primary_retrieve", return_value=(dict(_VECTOR), 0.9)),
+            patch.object(agent, "_direct_title_lookup", return_value=[]),
+            patch.object(agent, "_hybrid_retrieve", return_value={}),
+            patch.object(agent, "_fetch_source_text", return_value=""),
+        ):
+            t0 = time.perf_counter()
+            results = asyncio.run(run_many())
+            elapsed = time.perf_counter() - t0
+            agent.close()
+
+        assert len(results) == 20
+        # 20 x 0.2s of Claude latency, serialized, would take 4s.
+        assert elapsed < 2.0
+
+    def test_concurrent_questions_rerank_on_worker_connections(self, make_agent) -> None:
+        agent = make_agent(async_claude=AsyncMock(), db=MagicMock(), use_enhancements=True)
+        main_conn = agent.conn
+        agent.reranker = GraphReranker(main_conn)
+        agent.reranker._sparse_graph = False  # skip the density check
+        agent._async_claude.messages.create.return_value = _response("ok")
+        both_retrieving = threading.Barrier(2, timeout=5)
+        used = []  # (thread, connection) per centrality query
+
+        def vector(question, max_results):
+            both_retrieving.wait()
+            return dict(_VECTOR, sources=["Go", "Goroutine"]), 0.9
+
+        def worker_connection(db):
+            conn = MagicMock()
+
+            def execute(query, params=None):
+                used.append((threading.get_ident(), conn))
+                result = MagicMock()
+                result.get_column_names.return_value = ["article_id", "degree"]
+                result.get_all.return_value = [["Go", 3], ["Goroutine", 1]]
+                return result
+
+            conn.execute.side_effect = execute
+            return conn
+
+        async def run_both():
+            return await asyncio.gather(agent.aquery("What is Go?"), agent.aquery("Why Go?"))
+
+        with (
+            patch("wikigr.agent.kg_agent.kuzu.Connection", side_effect=worker_connection),
+            patch("bootstrap.schema.ryugraph_schema.load_extensions"),
+            patch.object(agent, "_vector_primary_retrieve", side_effect=vector),
+            patch.object(agent, "_direct_title_lookup", return_value=[]),
+            patch.object(agent, "_hybrid_retrieve", return_value={}),
+            patch.object(agent, "_fetch_source_text", return_value=""),
+        ):
+            results = asyncio.run(run_both())
+            agent.close()
+
+        assert [r["answer"] for r in results] == ["ok", "ok"]
+        assert len(used) == 2
+        main_conn.execute.assert_not_called()
+        # Each centrality query ran on its own thread's private connection.
+        assert len({conn for _, conn in used}) == len({thread for thread, _ in used}) == 2
+
+    def test_validates_max_results(self, make_agent) -> None:
+        agent = make_agent(async_claude=AsyncMock())
+
+        with pytest.raises(ValueError):
+            asyncio.run(agent.aquery("q", max_results=0))
+
+    def test_closed_agent_raises(self, make_agent) -> None:
+        agent = make_agent(async_claude=AsyncMock())
+        agent.close()
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(agent.aquery("q"))
+
+
+class TestAgraphQuery:
+    """agraph_query() extracts seeds and synthesizes via AsyncAnthropic."""
+
+    def test_traverses_and_synthesizes(self, make_agent) -> None:
+        agent = make_agent(async_claude=AsyncMock(), seed_resolution="llm")
+        agent._async_claude.messages.create.side_effect = [
+            _response('["Go"]'),
+            _response("graph answer"),
+        ]
+
+        def safe_query(cypher, params=None, *, log_context=""):
+            if "LINKS_TO" in cypher:
+                return QueryRows(["seed", "titles"], [("Go", ["Goroutine"])])
+            return QueryRows(
+                ["title", "content", "embedding"],
+                [(t, f"About {t}", None) for t in params["titles"]],
+            )
+
+        with patch.object(agent, "_safe_query", side_effect=safe_query):
+            result = asyncio.run(agent.agraph_query("How does Go do concurrency?"))
+            agent.close()
+
+        assert result["answer"] == "graph answer"
+        assert result["sources"] == ["Go", "Goroutine"]
+        assert result["articles_consulted"] == 2
+        assert len(result["cypher_queries"]) == 2
+        agent.claude.messages.create.assert_not_called()
+
+    def test_aquery_delegates_when_use_graph_rag(self, make_agent) -> None:
+        agent = make_agent(async_claude=AsyncMock())
+
+        with patch.object(agent, "agraph_query", new=AsyncMock(return_value={"answer": "g"})):
+            result = asyncio.run(agent.aquery("q", use_graph_rag=True))
+
+        assert result == {"answer": "g", "telemetry": ANY}
+
+
+class TestAclose:
+    """aclose() closes only an agent-owned AsyncAnthropic client."""
+
+    @pytest.mark.parametrize("owned", [True, False])
+    def test_closes_owned_client_only(self, owned, make_agent) -> None:
+        client = AsyncMock()
+        agent = make_agent(async_claude=client)
+        agent._owns_async_claude = owned
+
+        asyncio.run(agent.aclose())
+
+        assert agent.conn is None
+        assert client.close.await_count == (1 if owned else 0)
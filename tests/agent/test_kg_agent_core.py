@@ -28,30 +28,16 @@ from wikigr.agent.kg_agent import KnowledgeGraphAgent, _safe_json_loads
 
 def _make_agent() -> KnowledgeGraphAgent:
     """Build a KnowledgeGraphAgent with fully mocked internals."""
-    agent = KnowledgeGraphAgent.__new__(KnowledgeGraphAgent)
-    agent.db = None
-    agent.conn = MagicMock()
-    agent.claude = MagicMock()
+    agent = KnowledgeGraphAgent.from_connection(MagicMock(), MagicMock())
     agent.synthesis_model = "mock-model"
-    agent._embedding_generator = None
-    agent._plan_cache = {}
-    agent.use_enhancements = False
-    agent.enable_reranker = True
-    agent.enable_multidoc = True
-    agent.enable_fewshot = True
-    agent.enable_multi_query = False
-    agent.token_usage = {"input_tokens": 0, "output_tokens": 0, "api_calls": 0}
-    agent.reranker = None
-    agent.synthesizer = None
-    agent.few_shot = None
-    agent.cross_encoder = None
     return agent
 
 
 def _mock_execute_result(df: pd.DataFrame) -> MagicMock:
-    """Wrap a DataFrame in a mock Kuzu query result."""
+    """Wrap a DataFrame's rows in a mock Kuzu query result."""
     result = MagicMock()
-    result.get_as_df.return_value = df
+    result.get_column_names.return_value = list(df.columns)
+    result.get_all.return_value = df.values.tolist()
     return result
 
 
@@ -143,6 +129,7 @@ class TestFetchSourceText:
 
     def test_truncates_long_content(self) -> None:
         agent = _make_agent()
+        agent.CONTEXT_TOKEN_BUDGET = None  # per-article MAX_ARTICLE_CHARS cut
         long_content = "x" * 5000
         df = pd.DataFrame({"title": ["Big Article"], "content": [long_content]})
         agent.conn.execute.return_value = _mock_execute_result(df)
@@ -154,6 +141,36 @@ class TestFetchSourceText:
         # The full 5000-char string should not appear
         assert long_content not in text
 
+    def test_packs_long_content_into_token_budget(self) -> None:
+        from wikigr.agent.context_packer import estimate_tokens
+
+        agent = _make_agent()
+        agent.CONTEXT_TOKEN_BUDGET = 100
+        long_content = " ".join(f"word{i}" for i in range(1000))
+        df = pd.DataFrame({"title": ["Big Article"], "content": [long_content]})
+        agent.conn.execute.return_value = _mock_execute_result(df)
+
+        text = agent._fetch_source_text(["Big Article"])
+
+        assert text.startswith("## Big Article\nword0 word1")
+        assert estimate_tokens(text) <= 100
+
+    def test_budget_counted_in_synthesis_model_tokens(self) -> None:
+        agent = _make_agent()
+        agent.claude.messages.count_tokens.return_value = MagicMock(input_tokens=12)
+        df = pd.DataFrame({"title": ["Go"], "content": ["Go is a language."]})
+        agent.conn.execute.return_value = _mock_execute_result(df)
+
+        agent._fetch_source_text(["Go"])
+        count_calls = agent.claude.messages.count_tokens.call_args_list
+        agent.claude.messages.count_tokens.reset_mock()
+        agent.CONTEXT_TOKEN_COUNTER = "estimate"
+        agent._fetch_source_text(["Go"])
+
+        assert count_calls
+        assert all(c.kwargs["model"] == "mock-model" for c in count_calls)
+        agent.claude.messages.count_tokens.assert_not_called()
+
     def test_respects_max_articles(self) -> None:
         agent = _make_agent()
         titles = [f"Article {i}" for i in range(10)]
@@ -243,6 +260,7 @@ class TestHybridRetrieve:
 
     def test_combines_vector_and_keyword_signals(self) -> None:
         agent = _make_agent()
+        agent.enable_bm25 = False  # the mocked conn has no FTS results
 
         # Mock semantic_search for vector signal
         vector_results = [
@@ -287,6 +305,7 @@ class TestHybridRetrieve:
 
     def test_handles_vector_search_failure(self) -> None:
         agent = _make_agent()
+        agent.enable_bm25 = False  # the mocked conn has no FTS results
 
         # Vector search raises
         with patch.object(agent, "semantic_search", side_effect=RuntimeError("embedding failed")):
@@ -304,6 +323,7 @@ class TestHybridRetrieve:
 
     def test_handles_all_db_failures(self) -> None:
         agent = _make_agent()
+        agent.enable_bm25 = False  # the mocked conn has no FTS results
 
         with patch.object(agent, "semantic_search", return_value=[]):
             agent.conn.execute.side_effect = RuntimeError("DB down")
@@ -316,6 +336,7 @@ class TestHybridRetrieve:
 
     def test_keyword_weight_affects_ranking(self) -> None:
         agent = _make_agent()
+        agent.enable_bm25 = False  # the mocked conn has no FTS results
 
         with patch.object(agent, "semantic_search", return_value=[]):
             # Keyword search returns results
@@ -341,6 +362,16 @@ class TestHybridRetrieve:
 
         assert "Thermodynamics" in result["sources"]
 
+    def test_passes_bm25_flag(self) -> None:
+        agent = KnowledgeGraphAgent.from_connection(MagicMock(), MagicMock())
+
+        with patch("wikigr.agent.retriever.hybrid_retrieve", return_value={}) as hybrid:
+            agent._hybrid_retrieve("q")
+            agent.enable_bm25 = False
+            agent._hybrid_retrieve("q")
+
+        assert [c.kwargs["use_bm25"] for c in hybrid.call_args_list] == [True, False]
+
 
 # ===================================================================
 # 5. Confidence-gated context injection
@@ -360,7 +391,7 @@ class TestConfidenceGatedContextInjection:
         with (
             patch.object(agent, "_vector_primary_retrieve", return_value=(low_sim_results, 0.1)),
             patch.object(
-                agent, "_synthesize_answer_minimal", return_value="fallback answer"
+                agent, "_synthesize_answer_minimal", return_value=("fallback answer", True)
             ) as mock_minimal,
             patch.object(agent, "_synthesize_answer") as mock_synth,
         ):
@@ -386,7 +417,7 @@ class TestConfidenceGatedContextInjection:
             patch.object(agent, "_direct_title_lookup", return_value=[]),
             patch.object(agent, "_hybrid_retrieve", return_value={"sources": [], "facts": []}),
             patch.object(
-                agent, "_synthesize_answer", return_value="synthesized answer"
+                agent, "_synthesize_answer", return_value=("synthesized answer", True)
             ) as mock_synth,
             patch.object(agent, "_synthesize_answer_minimal") as mock_minimal,
         ):
@@ -408,7 +439,7 @@ class TestConfidenceGatedContextInjection:
 
         result = agent._synthesize_answer_minimal("What is recursion?")
 
-        assert result == "My own answer"
+        assert result == ("My own answer", True)
 
         create_call = agent.claude.messages.create.call_args
         content = create_call.kwargs["messages"][0]["content"]
@@ -428,7 +459,7 @@ class TestConfidenceGatedContextInjection:
 
         result = agent._synthesize_answer_minimal("What is recursion?")
 
-        assert result == "Unable to answer: API error."
+        assert result == ("Unable to answer: API error.", False)
 
     def test_exact_threshold_similarity_does_not_trigger_gate(self) -> None:
         """max_similarity == 0.5 is NOT < threshold — gate must not fire."""
@@ -441,7 +472,7 @@ class TestConfidenceGatedContextInjection:
             patch.object(agent, "_vector_primary_retrieve", return_value=(boundary_results, 0.5)),
             patch.object(agent, "_direct_title_lookup", return_value=[]),
             patch.object(agent, "_hybrid_retrieve", return_value={"sources": [], "facts": []}),
-            patch.object(agent, "_synthesize_answer", return_value="normal answer"),
+            patch.object(agent, "_synthesize_answer", return_value=("normal answer", True)),
             patch.object(agent, "_synthesize_answer_minimal") as mock_minimal,
         ):
             result = agent.query("What is Python?")
@@ -460,4 +491,4 @@ class TestConfidenceGatedContextInjection:
 
         result = agent._synthesize_answer_minimal("What is entropy?")
 
-        assert result == "Unable to synthesize answer: empty response from Claude."
+        assert result == ("Unable to synthesize answer: empty response from Claude.", False)
@@ -27,9 +27,10 @@ def agent():
 
 
 def _make_execute_result(df: pd.DataFrame) -> MagicMock:
-    """Build a mock Kuzu query result that returns the given DataFrame."""
+    """Build a mock Kuzu query result that returns the given DataFrame's rows."""
     result = MagicMock()
-    result.get_as_df.return_value = df
+    result.get_column_names.return_value = list(df.columns)
+    result.get_all.return_value = df.values.tolist()
     return result
 
 
@@ -409,3 +410,69 @@ class TestABTestingFlags:
         assert ag.reranker is None
         assert ag.synthesizer is None
         assert ag.few_shot is None
+
+
+# --------------------------------------------------------------------------
+# Chunk retrieval mode
+# --------------------------------------------------------------------------
+class TestChunkRetrievalMode:
+    """retrieval_mode="chunk" searches the Chunk index and synthesizes from passages."""
+
+    def _chunk_agent(self):
+        from wikigr.agent.kg_agent import KnowledgeGraphAgent
+
+        return KnowledgeGraphAgent.from_connection(MagicMock(), MagicMock())
+
+    def test_semantic_search_queries_chunk_index(self):
+        agent = self._chunk_agent()
+        agent.retrieval_mode = "chunk"
+        chunk_df = pd.DataFrame(
+            {
+                "node": [
+                    {
+                        "chunk_id": "Goroutine|s0|c0",
+                        "article_title": "Goroutine",
+                        "section_index": 0,
+                        "chunk_index": 0,
+                        "content": "A goroutine is a lightweight thread.",
+                    }
+                ],
+                "distance": [0.1],
+            }
+        )
+        agent.conn.execute.return_value = _make_execute_result(chunk_df)
+
+        results = agent.semantic_search("q", top_k=3, query_embedding=[0.1] * 4)
+
+        assert results[0]["title"] == "Goroutine"
+        assert results[0]["passages"][0]["text"] == "A goroutine is a lightweight thread."
+        assert "chunk_embedding_idx" in agent.conn.execute.call_args[0][0]
+
+    def test_synthesis_context_uses_passages(self):
+        agent = self._chunk_agent()
+        kg_results = {
+            "sources": ["Goroutine", "Go"],
+            "passages": {"Goroutine": ["Chunk passage about goroutines."]},
+        }
+
+        with (
+            patch.object(agent, "_fetch_article_sections", return_value={"Go": ["Go lead."]}) as f,
+            patch.object(agent, "_fetch_source_text", return_value="text") as fetch_text,
+        ):
+            agent._build_synthesis_context("q", kg_results, {"type": "vector_search"})
+
+        f.assert_called_once_with(["Go"])  # only sources without chunk passages
+        assert fetch_text.call_args.kwargs["sections"] == {
+            "Go": ["Go lead."],
+            "Goroutine": ["Chunk passage about goroutines."],
+        }
+
+    def test_invalid_mode_rejected(self):
+        with (
+            patch("wikigr.agent.kg_agent.kuzu"),
+            patch("wikigr.agent.kg_agent.Anthropic"),
+            pytest.raises(ValueError, match="retrieval_mode"),
+        ):
+            from wikigr.agent.kg_agent import KnowledgeGraphAgent
+
+            KnowledgeGraphAgent(db_path="/fake/db", retrieval_mode="paragraph")
@@ -0,0 +1,232 @@
+"""Unit tests for KnowledgeGraphAgent.query_batch() and wikigr.agent.batch_synthesis.
+
+Synthesis goes through LocalBatchClient (no network); retrieval stages and
+the DB are mocked.
+"""
+
+from __future__ import annotations
+
+import copy
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from wikigr.agent.batch_synthesis import BatchPrompt, LocalBatchClient, run_message_batch
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def _generator() -> MagicMock:
+    generator = MagicMock()
+    generator.generate_query.return_value = np.zeros((2, 4), dtype=np.float32)
+    return generator
+
+
+def _vector(question, max_results):
+    sources = {"What is Go?": ["Go", "Goroutine"], "What is Rust?": ["Rust", "Go"]}
+    titles = sources.get(question, [])
+    result = {
+        "sources": list(titles),
+        "entities": [],
+        "facts": [],
+        "raw": [{"title": t, "score": 0.9} for t in titles],
+    }
+    similarity = 0.9 if titles else 0.1  # unknown questions trip the confidence gate
+    return copy.deepcopy(result), similarity
+
+
+def _echo_question(params):
+    prompt = params["messages"][0]["content"]
+    return "answer to " + prompt.split("Question: ", 1)[1].splitlines()[0]
+
+
+class _NeverEndingBatches:
+    """messages.batches stub whose batch stays in_progress until canceled."""
+
+    def __init__(self):
+        self.canceled = False
+
+    def create(self, *, requests):
+        return SimpleNamespace(id="b1", processing_status="in_progress")
+
+    def retrieve(self, batch_id):
+        return SimpleNamespace(id=batch_id, processing_status="in_progress")
+
+    def cancel(self, batch_id):
+        self.canceled = True
+        return SimpleNamespace(id=batch_id, processing_status="canceling")
+
+
+# ---------------------------------------------------------------------------
+# run_message_batch
+# ---------------------------------------------------------------------------
+
+
+class TestRunMessageBatch:
+    """Submit / poll / collect against the local stand-in client."""
+
+    def test_collects_results_by_custom_id(self) -> None:
+        client = LocalBatchClient(lambda params: params["messages"][0]["content"].upper())
+
+        outcomes = run_message_batch(
+            client, "m", [BatchPrompt("a", "hello", 64), BatchPrompt("b", "bye", 64)]
+        )
+
+        assert outcomes["a"].text == "HELLO"
+        assert outcomes["b"].text == "BYE"
+        (submitted,) = client.messages.batches.created
+        assert submitted[0]["params"] == {
+            "model": "m",
+            "max_tokens": 64,
+            "messages": [{"role": "user", "content": "hello"}],
+        }
+
+    def test_errored_request_has_no_text(self) -> None:
+        def responder(params):
+            if params["messages"][0]["content"] == "bad":
+                raise RuntimeError("overloaded")
+            return "ok"
+
+        outcomes = run_message_batch(
+            LocalBatchClient(responder),
+            "m",
+            [BatchPrompt("a", "bad", 8), BatchPrompt("b", "good", 8)],
+        )
+
+        assert outcomes["a"].text is None
+        assert "overloaded" in outcomes["a"].error
+        assert outcomes["b"].text == "ok"
+
+    def test_timeout_cancels_batch(self) -> None:
+        batches = _NeverEndingBatches()
+        client = SimpleNamespace(messages=SimpleNamespace(batches=batches))
+
+        outcomes = run_message_batch(
+            client, "m", [BatchPrompt("a", "q", 8)], poll_interval_s=0.01, timeout_s=0.03
+        )
+
+        assert batches.canceled
+        assert outcomes["a"].text is None
+        assert outcomes["a"].error == "timed out"
+
+    def test_rejects_duplicate_custom_ids(self) -> None:
+        with pytest.raises(ValueError):
+            run_message_batch(
+                LocalBatchClient(), "m", [BatchPrompt("a", "x", 8), BatchPrompt("a", "y", 8)]
+            )
+
+
+# ---------------------------------------------------------------------------
+# KnowledgeGraphAgent.query_batch
+# ---------------------------------------------------------------------------
+
+
+class TestQueryBatch:
+    """Batched encoding, shared section fetch and one Message Batch."""
+
+    def _run(self, agent, questions, client):
+        sections = {"Go": ["Go is a language."], "Goroutine": ["Lightweight thread."]}
+        with (
+            patch.object(agent, "_vector_primary_retrieve", side_effect=_vector),
+            patch.object(agent, "_direct_title_lookup", return_value=[]),
+            patch.object(agent, "_hybrid_retrieve", return_value={}),
+            patch.object(agent, "_fetch_article_sections", return_value=sections) as fetch,
+            patch.object(agent, "_score_section_quality", return_value=1.0),
+        ):
+            return agent.query_batch(questions, max_results=5, batch_client=client), fetch
+
+    def test_answers_in_input_order_with_one_batch(self, make_agent) -> None:
+        agent = make_agent(_embedding_generator=_generator())
+        client = LocalBatchClient(_echo_question)
+
+        results, fetch = self._run(agent, ["What is Go?", "What is Rust?"], client)
+
+        assert [r["answer"] for r in results] == [
+            "answer to What is Go?",
+            "answer to What is Rust?",
+        ]
+        assert results[0]["sources"] == ["Go", "Goroutine"]
+        assert "synthesis" in results[0]["stage_timings"]
+        assert len(client.messages.batches.created) == 1
+        assert agent.token_usage["api_calls"] == 2
+        agent.claude.messages.create.assert_not_called()
+        # One section fetch for the union of sources; one encoder pass.
+        fetch.assert_called_once_with(["Go", "Goroutine", "Rust"])
+        agent._embedding_generator.generate_query.assert_called_once_with(
+            ["What is Go?", "What is Rust?"]
+        )
+
+    def test_prompts_use_prefetched_sections(self, make_agent) -> None:
+        agent = make_agent(_embedding_generator=_generator())
+        client = LocalBatchClient(_echo_question)
+
+        self._run(agent, ["What is Go?"], client)
+
+        (requests,) = client.messages.batches.created
+        prompt = requests[0]["params"]["messages"][0]["content"]
+        assert "Go is a language." in prompt
+        agent.conn.execute.assert_not_called()  # no per-question section query
+
+    def test_gated_question_uses_minimal_prompt(self, make_agent) -> None:
+        agent = make_agent(_embedding_generator=_generator())
+        client = LocalBatchClient(lambda params: "from training")
+
+        results, _ = self._run(agent, ["Unknown topic?"], client)
+
+        (requests,) = client.messages.batches.created
+        assert "no relevant content" in requests[0]["params"]["messages"][0]["content"]
+        assert results[0]["query_type"] == "training_only_response"
+        assert results[0]["answer"] == "from training"
+
+    def test_failed_request_falls_back_and_is_marked_degraded(self, make_agent) -> None:
+        agent = make_agent(_embedding_generator=_generator())
+
+        def responder(params):
+            if "What is Rust?" in params["messages"][0]["content"]:
+                raise RuntimeError("overloaded")
+            return "fine"
+
+        results, _ = self._run(agent, ["What is Go?", "What is Rust?"], LocalBatchClient(responder))
+
+        assert results[0]["answer"] == "fine"
+        assert results[1]["answer"] == "Found relevant sources: Rust, Go"
+        assert results[1]["degraded_stages"] == ["synthesis"]
+        assert agent.token_usage["api_calls"] == 1
+
+    def test_vector_lookups_run_together(self, make_agent) -> None:
+        agent = make_agent(_embedding_generator=_generator(), db=MagicMock())
+        hits = {
+            "What is Go?": [{"title": "Go", "similarity": 0.9, "content": "Go is a language."}],
+            "What is Rust?": [{"title": "Rust", "similarity": 0.8, "content": "Rust is safe."}],
+        }
+        client = LocalBatchClient(_echo_question)
+
+        with (
+            patch.object(
+                agent, "_search_many", side_effect=lambda qs, top_k: [hits[q] for q in qs]
+            ) as search_many,
+            patch.object(agent, "semantic_search") as semantic_search,
+            patch.object(agent, "_direct_title_lookup", return_value=[]),
+            patch.object(agent, "_hybrid_retrieve", return_value={}),
+            patch.object(agent, "_fetch_article_sections", return_value={}),
+        ):
+            results = agent.query_batch(
+                ["What is Go?", "What is Rust?", "What is Go?"], max_results=5, batch_client=client
+            )
+            agent.close()
+
+        search_many.assert_called_once_with(["What is Go?", "What is Rust?"], 5)
+        semantic_search.assert_not_called()
+        assert [r["sources"] for r in results] == [["Go"], ["Rust"], ["Go"]]
+        assert results[1]["answer"] == "answer to What is Rust?"
+
+    def test_empty_and_invalid_input(self, make_agent) -> None:
+        agent = make_agent(_embedding_generator=_generator())
+
+        assert agent.query_batch([], batch_client=LocalBatchClient()) == []
+        with pytest.raises(ValueError):
+            agent.query_batch("What is Go?")
@@ -0,0 +1,82 @@
+"""Tests for pandas-free query result access (bootstrap.src.query_result)."""
+
+import pytest
+import real_ladybug as kuzu
+
+from bootstrap.src.query_result import QueryRows, fetch, fetch_arrow, iter_rows
+
+
+@pytest.fixture
+def conn(tmp_path):
+    """A connection to a tiny graph: three articles, one with a NULL word count."""
+    db = kuzu.Database(str(tmp_path / "test.db"))
+    conn = kuzu.Connection(db)
+    conn.execute("CREATE NODE TABLE Article(title STRING, word_count INT64, PRIMARY KEY(title))")
+    conn.execute("CREATE (:Article {title: 'Go', word_count: 120})")
+    conn.execute("CREATE (:Article {title: 'Rust', word_count: 80})")
+    conn.execute("CREATE (:Article {title: 'Zig'})")
+    yield conn
+    conn.close()
+    db.close()
+
+
+_ALL = "MATCH (a:Article) RETURN a.title AS title, a.word_count AS words ORDER BY a.title"
+
+
+class TestFetch:
+    """fetch() materialises rows as tuples with column access."""
+
+    def test_rows_and_columns(self, conn):
+        rows = fetch(conn.execute(_ALL))
+
+        assert rows.columns == ["title", "words"]
+        assert rows.rows == [("Go", 120), ("Rust", 80), ("Zig", None)]
+        assert len(rows) == 3
+        assert not rows.empty
+        assert rows.column("title") == ["Go", "Rust", "Zig"]
+
+    def test_nulls_stay_none(self, conn):
+        rows = fetch(conn.execute(_ALL))
+
+        assert rows.records()[2] == {"title": "Zig", "words": None}
+
+    def test_iterates_tuples(self, conn):
+        assert [title for title, _words in fetch(conn.execute(_ALL))] == ["Go", "Rust", "Zig"]
+
+    def test_scalar(self, conn):
+        count = fetch(conn.execute("MATCH (a:Article) RETURN count(a) AS count"))
+
+        assert count.scalar() == 3
+        assert count.scalar("count") == 3
+
+    def test_empty_result(self, conn):
+        rows = fetch(conn.execute("MATCH (a:Article) WHERE a.title = 'C' RETURN a.title AS t"))
+
+        assert rows.empty
+        assert rows.column("t") == []
+        assert rows.scalar("t", default="none") == "none"
+
+    def test_unknown_column_raises_key_error(self):
+        with pytest.raises(KeyError, match="no column 'missing'"):
+            QueryRows(["title"], [("Go",)]).column("missing")
+
+
+class TestIterRows:
+    """iter_rows() streams the same tuples fetch() returns."""
+
+    def test_matches_fetch(self, conn):
+        assert list(iter_rows(conn.execute(_ALL))) == fetch(conn.execute(_ALL)).rows
+
+
+class TestFetchArrow:
+    """fetch_arrow() needs the optional pyarrow dependency."""
+
+    def test_returns_table_or_explains_missing_pyarrow(self, conn):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            with pytest.raises(ImportError, match="pip install pyarrow"):
+                fetch_arrow(conn.execute(_ALL))
+        else:
+            table = fetch_arrow(conn.execute(_ALL))
+            assert table.column("title").to_pylist() == ["Go", "Rust", "Zig"]
@@ -0,0 +1,238 @@
+"""Tests for token-streaming synthesis (query_stream / aquery_stream).
+
+Claude's ``messages.stream`` is replaced by small fakes; no real DB or
+network calls.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import threading
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+from anthropic import APIConnectionError
+
+from wikigr.agent.kg_agent import KnowledgeGraphAgent
+from wikigr.agent.synthesizer import astream_synthesis, stream_synthesis
+
+# ---------------------------------------------------------------------------
+# Fakes
+# ---------------------------------------------------------------------------
+
+
+def _final_message() -> MagicMock:
+    message = MagicMock()
+    message.usage = MagicMock(input_tokens=30, output_tokens=3)
+    return message
+
+
+class _FakeStream:
+    """Stands in for both MessageStream and AsyncMessageStream."""
+
+    def __init__(self, chunks: list[str], fail_after: int | None = None):
+        self._chunks = chunks
+        self._fail_after = fail_after
+
+    def _error(self) -> APIConnectionError:
+        return APIConnectionError(request=httpx.Request("POST", "https://api.anthropic.com"))
+
+    @property
+    def text_stream(self):
+        return self
+
+    def __iter__(self):
+        for i, chunk in enumerate(self._chunks):
+            if i == self._fail_after:
+                raise self._error()
+            yield chunk
+
+    async def __aiter__(self):
+        for chunk in self:
+            yield chunk
+
+    def get_final_message(self):
+        return _final_message()
+
+    def __enter__(self):
+        if self._fail_after == -1:
+            raise self._error()
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _AsyncFakeStream(_FakeStream):
+    async def get_final_message(self):
+        return _final_message()
+
+
+def _client(chunks: list[str], fail_after: int | None = None, is_async: bool = False):
+    client = MagicMock()
+    stream_cls = _AsyncFakeStream if is_async else _FakeStream
+    client.messages.stream.side_effect = lambda **kw: stream_cls(chunks, fail_after)
+    return client
+
+
+@pytest.fixture
+def agent(make_agent) -> KnowledgeGraphAgent:
+    return make_agent(
+        claude=_client(["Go ", "uses ", "goroutines."]),
+        async_claude=_client(["Go ", "uses ", "goroutines."], is_async=True),
+    )
+
+
+_VECTOR = {"sources": ["Go"], "entities": [], "facts": [], "raw": []}
+
+
+@contextlib.contextmanager
+def _retrieval_patches(agent: KnowledgeGraphAgent, similarity: float = 0.9):
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(
+            patch.object(
+                agent, "_vector_primary_retrieve", return_value=(dict(_VECTOR), similarity)
+            )
+        )
+        stack.enter_context(patch.object(agent, "_direct_title_lookup", return_value=[]))
+        stack.enter_context(patch.object(agent, "_hybrid_retrieve", return_value={}))
+        stack.enter_context(patch.object(agent, "_fetch_source_text", return_value=""))
+        yield
+
+
+# ---------------------------------------------------------------------------
+# synthesizer.stream_synthesis / astream_synthesis
+# ---------------------------------------------------------------------------
+
+
+class TestStreamSynthesis:
+    def test_yields_chunks_and_tracks_final_usage(self) -> None:
+        tracker = MagicMock()
+
+        chunks = list(stream_synthesis(_client(["a", "b"]), "m", 16, tracker, "p", "fallback"))
+
+        assert chunks == ["a", "b"]
+        tracker.assert_called_once()
+
+    def test_error_before_output_yields_fallback(self) -> None:
+        client = _client(["a"], fail_after=-1)
+
+        assert list(stream_synthesis(client, "m", 16, MagicMock(), "p", "fallback")) == ["fallback"]
+
+    def test_error_mid_stream_keeps_partial_answer(self) -> None:
+        client = _client(["a", "b", "c"], fail_after=2)
+
+        assert list(stream_synthesis(client, "m", 16, MagicMock(), "p", "fallback")) == [
+            "a",
+            "b",
+        ]
+
+    def test_async_twin_yields_same_chunks(self) -> None:
+        tracker = MagicMock()
+        client = _client(["a", "b"], is_async=True)
+
+        async def collect():
+            return [c async for c in astream_synthesis(client, "m", 16, tracker, "p", "f")]
+
+        assert asyncio.run(collect()) == ["a", "b"]
+        tracker.assert_called_once()
+
+
+# ---------------------------------------------------------------------------
+# KnowledgeGraphAgent.query_stream / aquery_stream
+# ---------------------------------------------------------------------------
+
+
+class TestQueryStream:
+    def test_emits_sources_then_tokens_then_done(self, agent) -> None:
+        with _retrieval_patches(agent):
+            events = list(agent.query_stream("What is Go?"))
+
+        assert [e["type"] for e in events] == ["sources", "token", "token", "token", "done"]
+        assert events[0]["sources"] == ["Go"]
+        assert "".join(e["text"] for e in events if e["type"] == "token") == "Go uses goroutines."
+        done = events[-1]
+        assert done["query_type"] == "vector_search"
+        assert "synthesis" in done["stage_timings"]
+        assert done["token_usage"]["api_calls"] == 1
+
+    def test_sources_emitted_before_synthesis_starts(self, agent) -> None:
+        with _retrieval_patches(agent):
+            stream = agent.query_stream("What is Go?")
+            first = next(stream)
+            agent.claude.messages.stream.assert_not_called()
+            rest = list(stream)
+
+        assert first["type"] == "sources"
+        assert rest[-1]["type"] == "done"
+
+    def test_gated_query_streams_training_only_answer(self, agent) -> None:
+        with _retrieval_patches(agent, similarity=0.1):
+            events = list(agent.query_stream("Unrelated?"))
+
+        assert events[0] == {
+            "type": "sources",
+            "sources": [],
+            "query_type": "training_only_response",
+        }
+        prompt = agent.claude.messages.stream.call_args.kwargs["messages"][0]["content"]
+        assert "no relevant content" in prompt
+
+    def test_validates_max_results_before_retrieval(self, agent) -> None:
+        with pytest.raises(ValueError):
+            next(agent.query_stream("q", max_results=0))
+
+    def test_aquery_stream_matches_query_stream(self, agent) -> None:
+        async def collect():
+            return [e async for e in agent.aquery_stream("What is Go?")]
+
+        with _retrieval_patches(agent):
+            events = asyncio.run(collect())
+            agent.close()
+
+        assert [e["type"] for e in events] == ["sources", "token", "token", "token", "done"]
+        agent.claude.messages.stream.assert_not_called()
+
+    def test_done_event_carries_telemetry(self, agent) -> None:
+        with _retrieval_patches(agent):
+            events = list(agent.query_stream("What is Go?"))
+
+        tel = events[-1]["telemetry"]
+        assert {"vector", "synthesis"} <= set(tel["spans"])
+        (call,) = tel["llm_calls"]
+        assert call["stage"] == "synthesis"
+        assert (tel["input_tokens"], tel["output_tokens"]) == (30, 3)
+        assert "telemetry" not in events[0]
+
+    def test_stream_resumed_from_other_threads_keeps_one_trace(self, agent) -> None:
+        events = []
+
+        with _retrieval_patches(agent):
+            stream = agent.query_stream("What is Go?")
+            # Servers iterate sync streams in a thread pool, one step per thread.
+            while not events or events[-1]["type"] != "done":
+                worker = threading.Thread(target=lambda: events.append(next(stream)))
+                worker.start()
+                worker.join()
+
+        assert events[-1]["telemetry"]["llm_calls"][0]["stage"] == "synthesis"
+
+    def test_aquery_stream_done_event_carries_telemetry(self, agent) -> None:
+        async def collect():
+            return [e async for e in agent.aquery_stream("What is Go?")]
+
+        with _retrieval_patches(agent):
+            events = asyncio.run(collect())
+            agent.close()
+
+        tel = events[-1]["telemetry"]
+        assert {"vector", "synthesis"} <= set(tel["spans"])
+        assert tel["llm_calls"][0]["stage"] == "synthesis"
@@ -6,6 +6,7 @@ All tests mock Kuzu connections and the Claude API -- no real DB or network call
 from __future__ import annotations
 
 import json
+import threading
 from unittest.mock import MagicMock, patch
 
 import pandas as pd
@@ -21,25 +22,12 @@ from wikigr.agent.kg_agent import KnowledgeGraphAgent
 
 def _make_agent(enable_multi_query: bool = False) -> KnowledgeGraphAgent:
     """Build a KnowledgeGraphAgent with fully mocked internals."""
-    agent = KnowledgeGraphAgent.__new__(KnowledgeGraphAgent)
-    agent.db = None
-    agent.conn = MagicMock()
-    agent.claude = MagicMock()
+    agent = KnowledgeGraphAgent.from_connection(MagicMock(), MagicMock())
     agent.synthesis_model = "mock-model"
-    agent._embedding_generator = None
-    agent._plan_cache = {}
-    agent.use_enhancements = False
     agent.enable_reranker = False
     agent.enable_multidoc = False
     agent.enable_fewshot = False
     agent.enable_multi_query = enable_multi_query
-    agent.reranker = None
-    agent.synthesizer = None
-    agent.few_shot = None
-    agent.cross_encoder = None
-    agent.cypher_rag = None
-    agent.cross_encoder = None
-    agent.token_usage = {"input_tokens": 0, "output_tokens": 0, "api_calls": 0}
     return agent
 
 
@@ -254,7 +242,8 @@ class TestBuildSynthesisContextQualityFiltering:
     def _make_df_result(self, rows: list[dict]) -> MagicMock:
         df = pd.DataFrame(rows)
         result = MagicMock()
-        result.get_as_df.return_value = df
+        result.get_column_names.return_value = list(df.columns)
+        result.get_all.return_value = df.values.tolist()
         return result
 
     def test_filters_sections_below_threshold(self) -> None:
@@ -449,3 +438,114 @@ class TestMultiQueryRetrieveExternalServiceResilience:
 
         call_kwargs = agent.claude.messages.create.call_args[1]
         assert call_kwargs.get("timeout") == pytest.approx(10.0)
+
+
+# ---------------------------------------------------------------------------
+# Query-embedding reuse across retrieval stages
+# ---------------------------------------------------------------------------
+
+
+class TestQueryEmbeddingReuse:
+    """One question embedding serves vector search and few-shot selection."""
+
+    def test_semantic_search_uses_precomputed_embedding(self) -> None:
+        """A supplied query_embedding skips the title fast path and the model."""
+        agent = _make_agent()
+        result = agent.conn.execute.return_value
+        result.get_column_names.return_value = ["node", "distance"]
+        result.get_all.return_value = [[{"section_id": "Go#intro"}, 0.1]]
+
+        results = agent.semantic_search("what is go", top_k=1, query_embedding=[0.1] * 768)
+
+        assert [r["title"] for r in results] == ["Go"]
+        assert agent.conn.execute.call_count == 1
+        assert agent._embedding_generator is None
+
+    def test_few_shot_receives_question_embedding(self) -> None:
+        """query() threads the cached question embedding into few-shot lookup."""
+        import numpy as np
+
+        agent = _make_agent()
+        agent.use_enhancements = True
+        agent.few_shot = MagicMock()
+        agent.few_shot.find_similar_examples.return_value = []
+        agent._embedding_generator = MagicMock()
+        agent._embedding_generator.generate_query.return_value = np.array([[0.5] * 768])
+
+        high_sim = {"sources": ["Go"], "entities": [], "facts": [], "raw": []}
+        with (
+            patch.object(agent, "_vector_primary_retrieve", return_value=(high_sim, 0.9)),
+            patch.object(agent, "_direct_title_lookup", return_value=[]),
+            patch.object(agent, "_hybrid_retrieve", return_value={"sources": [], "facts": []}),
+            patch.object(agent, "_synthesize_answer", return_value=("answer", True)),
+        ):
+            agent.query("What is Go?")
+
+        kwargs = agent.few_shot.find_similar_examples.call_args.kwargs
+        assert kwargs["query_embedding"] == [0.5] * 768
+
+
+# ---------------------------------------------------------------------------
+# Batched multi-query search on worker connections
+# ---------------------------------------------------------------------------
+
+
+class TestSearchMany:
+    """_search_many: one encoder batch, concurrent lookups on per-thread connections."""
+
+    def _vector_result(self, title: str) -> MagicMock:
+        result = MagicMock()
+        result.get_column_names.return_value = ["node", "distance"]
+        result.get_all.return_value = [[{"section_id": f"{title}#intro", "content": "c"}, 0.2]]
+        return result
+
+    def test_encodes_once_and_searches_on_worker_connections(self) -> None:
+        import numpy as np
+
+        agent = _make_agent(enable_multi_query=True)
+        agent.db = MagicMock()
+        agent._search_executor = None
+        agent._worker_local = threading.local()
+        agent._worker_conns = []
+        agent._worker_lock = threading.Lock()
+        generator = MagicMock()
+        generator.generate_query.return_value = np.array([[1.0, 0.0], [0.0, 1.0], [0.5, 0.5]])
+        agent._embedding_generator = generator
+        opened = []
+
+        def make_conn(db):
+            conn = MagicMock()
+            conn.execute.side_effect = lambda cypher, params: self._vector_result(
+                f"Doc{params['emb'][0]}"
+            )
+            opened.append(conn)
+            return conn
+
+        with (
+            patch("wikigr.agent.kg_agent.kuzu.Connection", side_effect=make_conn),
+            patch("bootstrap.schema.ryugraph_schema.load_extensions"),
+        ):
+            results = agent._search_many(["q", "alt 1", "alt 2"], top_k=2)
+            agent.close()
+
+        generator.generate_query.assert_called_once_with(["q", "alt 1", "alt 2"])
+        assert [r[0]["title"] for r in results] == ["Doc1.0", "Doc0.0", "Doc0.5"]
+        assert 1 <= len(opened) <= KnowledgeGraphAgent.SEARCH_WORKERS
+        for conn in opened:
+            conn.close.assert_called_once()
+
+    def test_multi_query_uses_batched_path_only_with_database(self) -> None:
+        agent = _make_agent(enable_multi_query=True)
+        agent.claude.messages.create.return_value = _mock_haiku_response(["a1", "a2"])
+
+        with (
+            patch.object(agent, "_search_many", return_value=[[], [], []]) as mock_many,
+            patch.object(agent, "semantic_search", return_value=[]) as mock_search,
+        ):
+            agent._multi_query_retrieve("q", max_results=5)
+            mock_many.assert_not_called()
+            assert mock_search.call_count == 3
+
+            agent.db = MagicMock()
+            agent._multi_query_retrieve("q", max_results=5)
+            mock_many.assert_called_once_with(["q", "a1", "a2"], 5)
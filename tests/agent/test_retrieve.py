@@ -0,0 +1,90 @@
+"""Unit tests for KnowledgeGraphAgent.retrieve() / aretrieve().
+
+Retrieval stages and the DB are mocked; the tests assert that no Claude
+call is made and that the result carries ranked sources, passages and scores.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+from unittest.mock import patch
+
+import pytest
+
+VECTOR = {
+    "sources": ["Goroutine", "Channel"],
+    "entities": [],
+    "facts": ["[Goroutine] A goroutine is a lightweight thread."],
+    "raw": [{"title": "Goroutine", "score": 0.91}, {"title": "Channel", "score": 0.74}],
+}
+
+
+def _patches(agent, similarity=0.91):
+    passages = [
+        {"title": "Goroutine", "text": "A goroutine is a lightweight thread."},
+        {"title": "Go", "text": "Go is a programming language."},
+    ]
+    return (
+        patch.object(
+            agent, "_vector_primary_retrieve", return_value=(copy.deepcopy(VECTOR), similarity)
+        ),
+        patch.object(agent, "_direct_title_lookup", return_value=["Go"]),
+        patch.object(agent, "_hybrid_retrieve", return_value={"sources": ["Select"]}),
+        patch.object(agent, "_fetch_source_passages", return_value=passages),
+    )
+
+
+class TestRetrieve:
+    """retrieve() runs the query() retrieval stages and stops before synthesis."""
+
+    def test_returns_ranked_context_without_claude_call(self, make_agent) -> None:
+        agent = make_agent()
+        p1, p2, p3, p4 = _patches(agent)
+
+        with p1, p2, p3, p4 as fetch:
+            result = agent.retrieve("What is a goroutine?", max_results=5, max_passages=3)
+
+        assert result["sources"] == ["Go", "Goroutine", "Channel", "Select"]
+        assert result["scores"] == {"Goroutine": 0.91, "Channel": 0.74}
+        assert result["passages"][0] == {
+            "title": "Goroutine",
+            "text": "A goroutine is a lightweight thread.",
+            "score": 0.91,
+        }
+        assert result["passages"][1]["score"] is None  # title match, no vector score
+        assert result["confident"] is True
+        assert {"vector", "title", "hybrid", "passages"} <= set(result["stage_timings"])
+        assert "answer" not in result
+        fetch.assert_called_once_with(
+            result["sources"], max_articles=3, question="What is a goroutine?", sections=None
+        )
+        agent.claude.messages.create.assert_not_called()
+        assert agent.token_usage["api_calls"] == 0
+
+    def test_low_similarity_reports_not_confident(self, make_agent) -> None:
+        agent = make_agent()
+        p1, p2, p3, p4 = _patches(agent, similarity=0.2)
+
+        with p1, p2, p3, p4:
+            result = agent.retrieve("What is a goroutine?")
+
+        assert result["confident"] is False
+        assert result["sources"] == []
+        assert result["max_similarity"] == 0.2
+
+    @pytest.mark.parametrize("max_passages", [-1, 51, "3"])
+    def test_rejects_invalid_max_passages(self, max_passages, make_agent) -> None:
+        with pytest.raises(ValueError, match="max_passages"):
+            make_agent().retrieve("q", max_passages=max_passages)
+
+    def test_aretrieve_matches_retrieve(self, make_agent) -> None:
+        agent = make_agent()
+        p1, p2, p3, p4 = _patches(agent)
+
+        with p1, p2, p3, p4:
+            result = asyncio.run(agent.aretrieve("What is a goroutine?"))
+        agent.close()
+
+        assert result["sources"][0] == "Go"
+        agent.claude.messages.create.assert_not_called()
@@ -24,10 +24,14 @@ from anthropic import APIConnectionError, APIStatusError, APITimeoutError
 
 from wikigr.agent.retriever import (
     _safe_query,
+    bm25_search,
+    chunk_vector_search,
     direct_title_lookup,
+    fetch_source_passages,
     fetch_source_text,
     hybrid_retrieve,
     multi_query_retrieve,
+    reciprocal_rank_fusion,
     score_section_quality,
     vector_primary_retrieve,
 )
@@ -48,9 +52,10 @@ def mock_conn() -> MagicMock:
 
 
 def _mock_execute_result(df: pd.DataFrame) -> MagicMock:
-    """Wrap a DataFrame in a mock Kuzu query result."""
+    """Wrap a DataFrame's rows in a mock Kuzu query result."""
     result = MagicMock()
-    result.get_as_df.return_value = df
+    result.get_column_names.return_value = list(df.columns)
+    result.get_all.return_value = df.values.tolist()
     return result
 
 
@@ -70,16 +75,16 @@ def _mock_haiku_response(alternatives: list[str]) -> MagicMock:
 
 
 class TestSafeQuery:
-    """_safe_query: wraps conn.execute and returns DataFrame or None."""
+    """_safe_query: wraps conn.execute and returns QueryRows or None."""
 
-    def test_returns_dataframe_on_success(self, mock_conn: MagicMock) -> None:
+    def test_returns_rows_on_success(self, mock_conn: MagicMock) -> None:
         df = pd.DataFrame({"col": [1, 2, 3]})
         mock_conn.execute.return_value = _mock_execute_result(df)
 
         result = _safe_query(mock_conn, "MATCH (n) RETURN n")
 
         assert result is not None
-        assert list(result["col"]) == [1, 2, 3]
+        assert result.column("col") == [1, 2, 3]
 
     def test_returns_none_on_empty_dataframe(self, mock_conn: MagicMock) -> None:
         mock_conn.execute.return_value = _mock_execute_result(pd.DataFrame())
@@ -338,6 +343,44 @@ class TestMultiQueryRetrieve:
 
         assert results == []
 
+    def test_search_many_fn_used_for_all_phrasings(self) -> None:
+        claude_client = MagicMock()
+        claude_client.messages.create.return_value = _mock_haiku_response(["alt 1", "alt 2"])
+        serial_search = MagicMock()
+        batches = []
+
+        def _search_many(queries, top_k):
+            batches.append((list(queries), top_k))
+            return [
+                [{"title": "A", "similarity": 0.6}],
+                [{"title": "A", "similarity": 0.9}, {"title": "B", "similarity": 0.5}],
+                [],
+            ]
+
+        results = multi_query_retrieve(
+            claude_client, serial_search, MagicMock(), "q", search_many_fn=_search_many
+        )
+
+        assert batches == [(["q", "alt 1", "alt 2"], 5)]
+        serial_search.assert_not_called()
+        assert [(r["title"], r["similarity"]) for r in results] == [("A", 0.9), ("B", 0.5)]
+
+    def test_search_many_failure_falls_back_to_serial(self) -> None:
+        claude_client = MagicMock()
+        claude_client.messages.create.return_value = _mock_haiku_response(["alt"])
+
+        def _search_many(queries, top_k):
+            raise OSError("model unavailable")
+
+        serial_search = MagicMock(return_value=[{"title": "S", "similarity": 0.4}])
+
+        results = multi_query_retrieve(
+            claude_client, serial_search, MagicMock(), "q", search_many_fn=_search_many
+        )
+
+        assert serial_search.call_count == 2
+        assert [r["title"] for r in results] == ["S"]
+
 
 # ===================================================================
 # 4. vector_primary_retrieve
@@ -803,3 +846,224 @@ class TestFetchSourceText:
 
         assert "Article 0" in text
         assert "Article 1" in text
+
+
+class TestFetchSourcePassages:
+    """fetch_source_passages: same selection as fetch_source_text, per article."""
+
+    def test_returns_one_passage_per_article_in_source_order(self, mock_conn: MagicMock) -> None:
+        df = pd.DataFrame(
+            {
+                "title": ["Alpha", "Beta", "Beta"],
+                "content": ["Alpha text.", "Beta lead.", "Beta body."],
+            }
+        )
+        mock_conn.execute.return_value = _mock_execute_result(df)
+
+        with patch("wikigr.packs.content_cleaner.clean_content", side_effect=lambda x: x):
+            passages = fetch_source_passages(
+                mock_conn,
+                score_section_quality_fn=lambda c, q, _q_keywords=None: 1.0,
+                stop_words=STOP_WORDS,
+                max_article_chars=3000,
+                content_quality_threshold=0.3,
+                source_titles=["Beta", "Alpha"],
+            )
+
+        assert passages == [
+            {"title": "Beta", "text": "Beta lead.\n\nBeta body."},
+            {"title": "Alpha", "text": "Alpha text."},
+        ]
+
+    def test_empty_titles_returns_empty_list(self, mock_conn: MagicMock) -> None:
+        passages = fetch_source_passages(
+            mock_conn,
+            score_section_quality_fn=MagicMock(),
+            stop_words=STOP_WORDS,
+            max_article_chars=3000,
+            content_quality_threshold=0.3,
+            source_titles=[],
+        )
+
+        assert passages == []
+        mock_conn.execute.assert_not_called()
+
+
+# ===================================================================
+# chunk_vector_search
+# ===================================================================
+
+
+def _chunk(title: str, section: int, index: int, content: str) -> dict:
+    return {
+        "chunk_id": f"{title}|s{section}|c{index}",
+        "article_title": title,
+        "section_index": section,
+        "chunk_index": index,
+        "content": content,
+    }
+
+
+class TestChunkVectorSearch:
+    """chunk_vector_search: Chunk index hits merged into passages per article."""
+
+    def test_merges_overlapping_neighbour_chunks(self, mock_conn: MagicMock) -> None:
+        first = "Goroutines are lightweight threads. They are multiplexed onto OS threads by the runtime."
+        second = "They are multiplexed onto OS threads by the runtime. Channels connect them."
+        df = pd.DataFrame(
+            {
+                "node": [
+                    _chunk("Go", 1, 1, second),
+                    _chunk("Go", 1, 0, first),
+                    _chunk("Go", 3, 0, "Generics arrived in Go 1.18."),
+                    _chunk("Rust", 0, 0, "Rust has async tasks."),
+                ],
+                "distance": [0.1, 0.2, 0.4, 0.3],
+            }
+        )
+        mock_conn.execute.return_value = _mock_execute_result(df)
+
+        results = chunk_vector_search(mock_conn, [0.1] * 4, top_k=5)
+
+        assert [r["title"] for r in results] == ["Go", "Rust"]
+        go = results[0]
+        assert go["similarity"] == pytest.approx(0.9)
+        merged = go["passages"][0]
+        assert merged["chunk_indices"] == [0, 1]
+        assert merged["text"] == (
+            "Goroutines are lightweight threads. They are multiplexed onto OS threads "
+            "by the runtime. Channels connect them."
+        )
+        assert go["content"] == merged["text"]
+        assert go["passages"][1]["section_index"] == 3
+        cypher, params = mock_conn.execute.call_args[0]
+        assert "'Chunk', 'chunk_embedding_idx'" in cypher
+        assert params["k"] == 20
+
+    def test_non_adjacent_chunks_stay_separate(self, mock_conn: MagicMock) -> None:
+        df = pd.DataFrame(
+            {
+                "node": [_chunk("Go", 0, 0, "Lead text."), _chunk("Go", 0, 2, "Later text.")],
+                "distance": [0.2, 0.3],
+            }
+        )
+        mock_conn.execute.return_value = _mock_execute_result(df)
+
+        (go,) = chunk_vector_search(mock_conn, [0.1] * 4, top_k=5)
+
+        assert [p["chunk_indices"] for p in go["passages"]] == [[0], [2]]
+
+    def test_empty_index_returns_empty_list(self, mock_conn: MagicMock) -> None:
+        mock_conn.execute.return_value = _mock_execute_result(pd.DataFrame())
+
+        assert chunk_vector_search(mock_conn, [0.1] * 4, top_k=5) == []
+
+    def test_primary_retrieve_exposes_passages(self) -> None:
+        def _search(q, top_k=5):
+            return [
+                {
+                    "title": "Go",
+                    "similarity": 0.9,
+                    "content": "Merged passage.",
+                    "passages": [{"text": "Merged passage.", "similarity": 0.9}],
+                }
+            ]
+
+        result, _ = vector_primary_retrieve(
+            semantic_search_fn=_search,
+            multi_query_retrieve_fn=MagicMock(),
+            cross_encoder=None,
+            enable_multi_query=False,
+            question="What is Go?",
+            max_results=5,
+        )
+
+        assert result["passages"] == {"Go": ["Merged passage."]}
+
+
+# ===================================================================
+# bm25_search / reciprocal_rank_fusion
+# ===================================================================
+
+
+def _fts_side_effect(section_df: pd.DataFrame, fact_df: pd.DataFrame):
+    def execute(query, params=None):
+        if "section_fts_idx" in query:
+            return _mock_execute_result(section_df)
+        if "fact_fts_idx" in query:
+            return _mock_execute_result(fact_df)
+        return _mock_execute_result(pd.DataFrame())
+
+    return execute
+
+
+class TestBm25Search:
+    """bm25_search: FTS hits aggregated by article, sections and facts fused."""
+
+    SECTIONS = pd.DataFrame(
+        {
+            "section_id": ["Errors#2", "Errors#0", "Retry#1"],
+            "content": ["ERR_CONNECTION_RESET means...", "Intro", "Retry on reset"],
+            "score": [7.5, 1.0, 3.2],
+        }
+    )
+
+    def test_aggregates_sections_and_fuses_facts(self, mock_conn: MagicMock) -> None:
+        facts = pd.DataFrame({"title": ["Sockets", "Retry"], "content": ["RST", "backoff"]})
+        mock_conn.execute.side_effect = _fts_side_effect(self.SECTIONS, facts)
+
+        results = bm25_search(mock_conn, "ERR_CONNECTION_RESET", top_k=5)
+
+        assert [r["title"] for r in results] == ["Retry", "Errors", "Sockets"]
+        errors = next(r for r in results if r["title"] == "Errors")
+        assert errors["score"] == 7.5
+        assert errors["content"].startswith("ERR_CONNECTION_RESET")
+        assert mock_conn.execute.call_args_list[0].args[1] == {"q": "ERR_CONNECTION_RESET"}
+
+    def test_sections_only(self, mock_conn: MagicMock) -> None:
+        mock_conn.execute.side_effect = _fts_side_effect(self.SECTIONS, pd.DataFrame())
+
+        results = bm25_search(mock_conn, "reset", top_k=1, include_facts=False)
+
+        assert [r["title"] for r in results] == ["Errors"]
+        assert mock_conn.execute.call_count == 1
+
+    def test_empty_without_fts_index(self, mock_conn: MagicMock) -> None:
+        mock_conn.execute.side_effect = RuntimeError("function QUERY_FTS_INDEX is not defined")
+
+        assert bm25_search(mock_conn, "anything", top_k=5) == []
+
+    def test_reciprocal_rank_fusion(self) -> None:
+        fused = dict(reciprocal_rank_fusion([["A", "B"], ["B", "C"]], k=1))
+
+        assert fused == pytest.approx({"A": 1 / 2, "B": 1 / 3 + 1 / 2, "C": 1 / 3})
+
+    def test_hybrid_fuses_bm25_with_vector(self, mock_conn: MagicMock) -> None:
+        mock_conn.execute.side_effect = _fts_side_effect(self.SECTIONS, pd.DataFrame())
+        vector = [
+            {"title": "Networking", "similarity": 0.9},
+            {"title": "Errors", "similarity": 0.8},
+        ]
+
+        result = hybrid_retrieve(
+            mock_conn,
+            lambda q, top_k=10: vector,
+            STOP_WORDS,
+            "ERR_CONNECTION_RESET",
+            graph_weight=0.0,
+            keyword_weight=0.0,
+            use_bm25=True,
+        )
+
+        # Errors is ranked by both signals; Retry is found lexically only.
+        assert result["sources"][:2] == ["Errors", "Networking"]
+        assert "Retry" in result["sources"]
+        assert result["raw"][0]["score"] == pytest.approx(0.5 * (1 / 62 + 1 / 61) / (2 / 61))
+
+    def test_hybrid_without_bm25_skips_fts(self, mock_conn: MagicMock) -> None:
+        mock_conn.execute.return_value = _mock_execute_result(pd.DataFrame())
+
+        hybrid_retrieve(mock_conn, lambda q, top_k=10: [], STOP_WORDS, "anything")
+
+        queries = [c.args[0] for c in mock_conn.execute.call_args_list]
+        assert not any("QUERY_FTS_INDEX" in q for q in queries)
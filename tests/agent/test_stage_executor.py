@@ -0,0 +1,184 @@
+"""Unit tests for wikigr.agent.stage_executor.StageRunner and its use in query().
+
+No real DB or network calls; concurrency is exercised with a real thread pool.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from wikigr.agent.stage_executor import ERROR, OK, SKIPPED, TIMEOUT, StageRunner
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture()
+def pool():
+    executor = ThreadPoolExecutor(max_workers=4)
+    yield executor
+    executor.shutdown(wait=True)
+
+
+# ---------------------------------------------------------------------------
+# StageRunner
+# ---------------------------------------------------------------------------
+
+
+class TestStageRunner:
+    """Timing, degradation and budget semantics."""
+
+    def test_independent_stages_run_concurrently(self, pool) -> None:
+        barrier = threading.Barrier(2, timeout=2)
+        runner = StageRunner(executor=pool)
+
+        # Each stage waits for the other: only passes if both run at once.
+        runner.submit("a", barrier.wait)
+        runner.submit("b", barrier.wait)
+
+        runner.result("a")
+        runner.result("b")
+        assert runner.statuses == {"a": OK, "b": OK}
+        assert set(runner.timings) == {"a", "b"}
+
+    def test_stage_timeout_returns_default(self, pool) -> None:
+        release = threading.Event()
+        runner = StageRunner(executor=pool, timeouts={"slow": 0.05})
+
+        runner.submit("slow", release.wait, 5, default="fallback")
+        value = runner.result("slow")
+        release.set()
+
+        assert value == "fallback"
+        assert runner.statuses["slow"] == TIMEOUT
+        assert runner.degraded == ["slow"]
+
+    def test_overall_budget_bounds_waits_and_skips_late_stages(self, pool) -> None:
+        release = threading.Event()
+        runner = StageRunner(executor=pool, budget_s=0.05)
+
+        runner.submit("slow", release.wait, 5, default=[])
+        assert runner.result("slow") == []
+        runner.submit("late", lambda: "never", default="skipped")
+        release.set()
+
+        assert runner.result("late") == "skipped"
+        assert runner.statuses == {"slow": TIMEOUT, "late": SKIPPED}
+
+    @pytest.mark.parametrize("use_pool", [True, False])
+    def test_failed_stage_returns_default(self, pool, use_pool) -> None:
+        runner = StageRunner(executor=pool if use_pool else None)
+
+        def boom():
+            raise RuntimeError("db gone")
+
+        runner.submit("broken", boom, default={})
+
+        assert runner.result("broken") == {}
+        assert runner.statuses["broken"] == ERROR
+
+    def test_unexpected_exceptions_propagate(self) -> None:
+        runner = StageRunner()
+
+        def bug():
+            raise ValueError("programming error")
+
+        with pytest.raises(ValueError):
+            runner.submit("bug", bug)
+
+    def test_run_executes_on_calling_thread(self, pool) -> None:
+        runner = StageRunner(executor=pool)
+
+        assert runner.run("inline", threading.get_ident) == threading.get_ident()
+
+    def test_inline_overrun_reported_as_timeout(self) -> None:
+        runner = StageRunner(timeouts={"slow": 0.01})
+
+        assert runner.run("slow", lambda: time.sleep(0.03) or "done") == "done"
+        assert runner.statuses["slow"] == TIMEOUT
+
+    def test_duplicate_and_unknown_stage_names(self) -> None:
+        runner = StageRunner()
+        runner.submit("a", lambda: 1)
+
+        with pytest.raises(ValueError):
+            runner.submit("a", lambda: 2)
+        with pytest.raises(KeyError):
+            runner.result("missing")
+
+    def test_rejects_non_positive_budget(self) -> None:
+        with pytest.raises(ValueError):
+            StageRunner(budget_s=0)
+
+
+# ---------------------------------------------------------------------------
+# KnowledgeGraphAgent.query() stage graph
+# ---------------------------------------------------------------------------
+
+
+class TestQueryStageGraph:
+    """query() reports stage timings and degrades when a stage fails."""
+
+    def test_result_includes_stage_timings(self, make_agent) -> None:
+        agent = make_agent()
+        vector = {"sources": ["Go"], "entities": [], "facts": [], "raw": []}
+
+        with (
+            patch.object(agent, "_vector_primary_retrieve", return_value=(vector, 0.9)),
+            patch.object(agent, "_direct_title_lookup", return_value=["Goroutine"]),
+            patch.object(agent, "_hybrid_retrieve", return_value={"sources": ["Channel"]}),
+            patch.object(agent, "_synthesize_answer", return_value=("answer", True)),
+        ):
+            result = agent.query("What is Go?")
+
+        assert result["sources"] == ["Goroutine", "Go", "Channel"]
+        assert {"vector", "title", "hybrid", "synthesis"} <= set(result["stage_timings"])
+        assert result["degraded_stages"] == []
+
+    def test_failed_stage_degrades_instead_of_failing(self, make_agent) -> None:
+        agent = make_agent()
+        vector = {"sources": ["Go"], "entities": [], "facts": [], "raw": []}
+
+        with (
+            patch.object(agent, "_vector_primary_retrieve", return_value=(vector, 0.9)),
+            patch.object(agent, "_direct_title_lookup", return_value=[]),
+            patch.object(agent, "_hybrid_retrieve", side_effect=RuntimeError("graph down")),
+            patch.object(agent, "_synthesize_answer", return_value=("answer", True)),
+        ):
+            result = agent.query("What is Go?")
+
+        assert result["answer"] == "answer"
+        assert result["sources"] == ["Go"]
+        assert result["degraded_stages"] == ["hybrid"]
+
+    def test_stages_use_worker_connections_when_database_present(self, make_agent) -> None:
+        agent = make_agent()
+        agent.db = MagicMock()
+        main_conn = agent.conn
+        seen = {}
+
+        def title_lookup(question):
+            seen["title"] = agent.conn
+            return []
+
+        vector = {"sources": ["Go"], "entities": [], "facts": [], "raw": []}
+        with (
+            patch("wikigr.agent.kg_agent.kuzu.Connection", side_effect=lambda db: MagicMock()),
+            patch("bootstrap.schema.ryugraph_schema.load_extensions"),
+            patch.object(agent, "_vector_primary_retrieve", return_value=(vector, 0.9)),
+            patch.object(agent, "_direct_title_lookup", side_effect=title_lookup),
+            patch.object(agent, "_hybrid_retrieve", return_value={}),
+            patch.object(agent, "_synthesize_answer", return_value=("answer", True)),
+        ):
+            agent.query("What is Go?")
+            assert agent.conn is main_conn
+            agent.close()
+
+        assert seen["title"] is not main_conn
+        seen["title"].close.assert_called_once()  # worker connections closed with the agent
@@ -4,18 +4,22 @@ Targets:
   1. build_synthesis_context — builds the full synthesis prompt string
   2. synthesize_answer_minimal — Claude-only answer without KG context
   3. synthesize_answer — full synthesis using KG results + Claude
+  4. asynthesize_answer / asynthesize_answer_minimal — AsyncAnthropic twins
 
 All tests mock the Anthropic client — no real DB or network calls.
 """
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
 
 import httpx
 from anthropic import APIConnectionError, APIStatusError, APITimeoutError
 
 from wikigr.agent.synthesizer import (
+    asynthesize_answer,
+    asynthesize_answer_minimal,
     build_synthesis_context,
     synthesize_answer,
     synthesize_answer_minimal,
@@ -288,7 +292,7 @@ class TestSynthesizeAnswerMinimal:
             question="What is recursion?",
         )
 
-        assert result == "My own answer"
+        assert result == ("My own answer", True)
         tracker.assert_called_once()
 
     def test_prompt_contains_question_and_no_relevant_content(self) -> None:
@@ -342,7 +346,7 @@ class TestSynthesizeAnswerMinimal:
             question="test",
         )
 
-        assert result == "Unable to answer: API error."
+        assert result == ("Unable to answer: API error.", False)
 
     def test_api_status_error_returns_fallback(self) -> None:
         """APIStatusError (e.g. 429) returns the fallback string."""
@@ -361,7 +365,7 @@ class TestSynthesizeAnswerMinimal:
             question="test",
         )
 
-        assert result == "Unable to answer: API error."
+        assert result == ("Unable to answer: API error.", False)
 
     def test_api_timeout_error_returns_fallback(self) -> None:
         """APITimeoutError returns the fallback string."""
@@ -378,7 +382,7 @@ class TestSynthesizeAnswerMinimal:
             question="test",
         )
 
-        assert result == "Unable to answer: API error."
+        assert result == ("Unable to answer: API error.", False)
 
     def test_empty_response_returns_fallback(self) -> None:
         """Empty content list from Claude returns the empty-response fallback."""
@@ -393,7 +397,7 @@ class TestSynthesizeAnswerMinimal:
             question="test",
         )
 
-        assert result == "Unable to synthesize answer: empty response from Claude."
+        assert result == ("Unable to synthesize answer: empty response from Claude.", False)
 
     def test_tracker_not_called_on_api_error(self) -> None:
         """track_response_fn is not called when the API raises."""
@@ -442,7 +446,7 @@ class TestSynthesizeAnswer:
             query_plan={"type": "entity_search"},
         )
 
-        assert result == "Synthesized answer"
+        assert result == ("Synthesized answer", True)
         tracker.assert_called_once()
 
     def test_error_in_kg_results_returns_error_message(self) -> None:
@@ -460,7 +464,7 @@ class TestSynthesizeAnswer:
             query_plan={"type": "entity_search"},
         )
 
-        assert result == "Query execution failed: Cypher syntax error"
+        assert result == ("Query execution failed: Cypher syntax error", False)
         client.messages.create.assert_not_called()
 
     def test_calls_build_synthesis_context_fn(self) -> None:
@@ -526,7 +530,7 @@ class TestSynthesizeAnswer:
             query_plan={"type": "entity_search"},
         )
 
-        assert result == "Found relevant sources: Article A, Article B"
+        assert result == ("Found relevant sources: Article A, Article B", False)
 
     def test_api_error_no_sources_returns_no_results(self) -> None:
         """APIConnectionError with no sources returns 'No results found.'."""
@@ -546,7 +550,7 @@ class TestSynthesizeAnswer:
             query_plan={"type": "entity_search"},
         )
 
-        assert result == "No results found."
+        assert result == ("No results found.", False)
 
     def test_api_status_error_returns_fallback(self) -> None:
         """APIStatusError returns the sources fallback."""
@@ -568,7 +572,7 @@ class TestSynthesizeAnswer:
             query_plan={"type": "entity_search"},
         )
 
-        assert result == "Found relevant sources: Source1"
+        assert result == ("Found relevant sources: Source1", False)
 
     def test_api_timeout_error_returns_fallback(self) -> None:
         """APITimeoutError returns the sources fallback."""
@@ -588,7 +592,7 @@ class TestSynthesizeAnswer:
             query_plan={"type": "entity_search"},
         )
 
-        assert result == "Found relevant sources: TimeoutSource"
+        assert result == ("Found relevant sources: TimeoutSource", False)
 
     def test_empty_response_returns_fallback(self) -> None:
         """Empty content list from Claude returns the empty-response fallback."""
@@ -606,7 +610,7 @@ class TestSynthesizeAnswer:
             query_plan={"type": "entity_search"},
         )
 
-        assert result == "Unable to synthesize answer: empty response from Claude."
+        assert result == ("Unable to synthesize answer: empty response from Claude.", False)
 
     def test_sources_fallback_caps_at_five(self) -> None:
         """API error fallback lists at most 5 sources."""
@@ -627,9 +631,9 @@ class TestSynthesizeAnswer:
             query_plan={"type": "entity_search"},
         )
 
-        assert "Source_0" in result
-        assert "Source_4" in result
-        assert "Source_5" not in result
+        assert "Source_0" in result[0]
+        assert "Source_4" in result[0]
+        assert "Source_5" not in result[0]
 
     def test_tracker_not_called_on_api_error(self) -> None:
         """track_response_fn is not called when the API raises."""
@@ -670,3 +674,71 @@ class TestSynthesizeAnswer:
 
         tracker.assert_not_called()
         client.messages.create.assert_not_called()
+
+
+# ===================================================================
+# 4. Async twins
+# ===================================================================
+
+
+class TestAsyncSynthesis:
+    """asynthesize_answer / asynthesize_answer_minimal await an AsyncAnthropic client."""
+
+    def test_asynthesize_answer_awaits_client_and_prompt_builder(self) -> None:
+        client = AsyncMock()
+        client.messages.create.return_value = _mock_claude_response("Async answer")
+        build_ctx = AsyncMock(return_value="built prompt")
+        tracker = MagicMock()
+
+        result = asyncio.run(
+            asynthesize_answer(
+                async_claude_client=client,
+                synthesis_model="mock",
+                synthesis_max_tokens=1024,
+                track_response_fn=tracker,
+                abuild_synthesis_context_fn=build_ctx,
+                question="What is gravity?",
+                kg_results=_make_kg_results(sources=["Gravity"]),
+                query_plan={"type": "vector_search"},
+            )
+        )
+
+        assert result == ("Async answer", True)
+        build_ctx.assert_awaited_once()
+        assert client.messages.create.await_args.kwargs["messages"][0]["content"] == (
+            "built prompt"
+        )
+        tracker.assert_called_once()
+
+    def test_asynthesize_answer_api_error_returns_sources_fallback(self) -> None:
+        client = AsyncMock()
+        client.messages.create.side_effect = APIConnectionError(
+            request=httpx.Request("POST", "https://api.anthropic.com")
+        )
+
+        result = asyncio.run(
+            asynthesize_answer(
+                async_claude_client=client,
+                synthesis_model="mock",
+                synthesis_max_tokens=1024,
+                track_response_fn=_noop_track,
+                abuild_synthesis_context_fn=AsyncMock(return_value="prompt"),
+                question="test",
+                kg_results=_make_kg_results(sources=["A", "B"]),
+                query_plan={"type": "vector_search"},
+            )
+        )
+
+        assert result == ("Found relevant sources: A, B", False)
+
+    def test_asynthesize_answer_minimal_empty_response(self) -> None:
+        client = AsyncMock()
+        client.messages.create.return_value = _mock_empty_response()
+
+        result = asyncio.run(
+            asynthesize_answer_minimal(client, "mock", 1024, _noop_track, "What is X?")
+        )
+
+        assert result == ("Unable to synthesize answer: empty response from Claude.", False)
+        prompt = client.messages.create.await_args.kwargs["messages"][0]["content"]
+        assert "Question: What is X?" in prompt
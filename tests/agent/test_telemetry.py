@@ -0,0 +1,194 @@
+"""Unit tests for wikigr.agent.telemetry and its use in KnowledgeGraphAgent.
+
+Retrieval stages and Claude are mocked; the registry is reset per test.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from wikigr.agent import telemetry
+from wikigr.agent.stage_executor import StageRunner
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture(autouse=True)
+def registry():
+    reg = telemetry.get_telemetry_registry()
+    reg.reset()
+    yield reg
+    reg.reset()
+
+
+def _response(model="claude-haiku-4-5-20251001", input_tokens=1000, output_tokens=200):
+    return SimpleNamespace(
+        model=model,
+        usage=SimpleNamespace(input_tokens=input_tokens, output_tokens=output_tokens),
+        content=[SimpleNamespace(text="answer")],
+    )
+
+
+# ---------------------------------------------------------------------------
+# Traces, spans and cost
+# ---------------------------------------------------------------------------
+
+
+class TestQueryTrace:
+    """Spans and Claude calls are collected per query."""
+
+    def test_spans_and_calls_recorded_in_trace(self) -> None:
+        with telemetry.trace_query("query") as trace:
+            with telemetry.span("synthesis"):
+                telemetry.record_llm_call(_response())
+            telemetry.record_span("vector", 0.25)
+            telemetry.record_span("vector", 0.25)
+
+        summary = trace.summary()
+        assert summary["spans"]["vector"] == 0.5
+        assert "synthesis" in summary["spans"]
+        (call,) = summary["llm_calls"]
+        assert call["stage"] == "synthesis"
+        assert call["model"] == "claude-haiku-4-5-20251001"
+        assert call["cost_usd"] == pytest.approx(0.002)
+        assert summary["input_tokens"] == 1000
+        assert summary["cost_usd"] == pytest.approx(0.002)
+
+    def test_nested_trace_reuses_outer(self) -> None:
+        with (
+            telemetry.trace_query("query") as outer,
+            telemetry.trace_query("graph_query") as inner,
+        ):
+            assert inner is outer
+        assert telemetry.current_trace() is None
+
+    def test_unknown_model_has_no_cost(self) -> None:
+        assert telemetry.estimate_cost_usd("some-other-model", 10, 10) is None
+        assert telemetry.estimate_cost_usd("claude-opus-4-6", 1_000_000, 0) == 5.0
+
+    def test_span_outside_trace_feeds_registry_only(self, registry) -> None:
+        with telemetry.span("embed"):
+            pass
+
+        assert registry.snapshot()["latency"]["embed"]["count"] == 1
+
+    def test_stage_runner_threads_report_into_caller_trace(self) -> None:
+        def stage():
+            telemetry.record_llm_call(_response())
+            return "ok"
+
+        with ThreadPoolExecutor(max_workers=2) as pool, telemetry.trace_query("query") as trace:
+            runner = StageRunner(executor=pool)
+            runner.submit("rerank", stage)
+            assert runner.result("rerank") == "ok"
+
+        summary = trace.summary()
+        assert "rerank" in summary["spans"]
+        assert summary["llm_calls"][0]["stage"] == "rerank"
+
+
+# ---------------------------------------------------------------------------
+# Registry aggregation and export
+# ---------------------------------------------------------------------------
+
+
+class TestTelemetryRegistry:
+    """Latency histograms, percentiles and Prometheus / OpenTelemetry export."""
+
+    def test_snapshot_percentiles(self, registry) -> None:
+        for _ in range(99):
+            registry.observe("vector", 0.03)
+        registry.observe("vector", 4.0)
+
+        latency = registry.snapshot()["latency"]["vector"]
+        assert latency["count"] == 100
+        assert 0.025 <= latency["p50_s"] <= 0.05
+        assert latency["p99_s"] <= 0.05
+        assert latency["sum_s"] == pytest.approx(99 * 0.03 + 4.0, abs=1e-3)
+
+    def test_prometheus_text(self, registry) -> None:
+        registry.observe("synthesis", 0.3)
+        registry.record_llm_call("synthesis", "claude-opus-4-6", 1000, 100)
+
+        text = registry.prometheus_text()
+
+        assert 'wikigr_stage_latency_seconds_bucket{stage="synthesis",le="0.25"} 0' in text
+        assert 'wikigr_stage_latency_seconds_bucket{stage="synthesis",le="0.5"} 1' in text
+        assert 'wikigr_stage_latency_seconds_bucket{stage="synthesis",le="+Inf"} 1' in text
+        assert 'wikigr_stage_latency_seconds_count{stage="synthesis"} 1' in text
+        assert (
+            'wikigr_llm_input_tokens_total{stage="synthesis",model="claude-opus-4-6"} 1000' in text
+        )
+        assert "# TYPE wikigr_llm_cost_usd_total counter" in text
+
+    def test_opentelemetry_instruments_receive_observations(self, registry) -> None:
+        meter = MagicMock()
+        registry.enable_opentelemetry(meter)
+        try:
+            registry.observe("vector", 0.1)
+            registry.record_llm_call("synthesis", "claude-opus-4-6", 10, 5)
+        finally:
+            registry._otel = None
+
+        meter.create_histogram.return_value.record.assert_called_once_with(0.1, {"stage": "vector"})
+        assert meter.create_counter.return_value.add.call_count == 3
+
+
+# ---------------------------------------------------------------------------
+# KnowledgeGraphAgent integration
+# ---------------------------------------------------------------------------
+
+
+class TestAgentTelemetry:
+    """query()/aquery() return a "telemetry" summary and feed the registry."""
+
+    VECTOR = {"sources": ["Go"], "entities": [], "facts": [], "raw": []}
+
+    def _patches(self, agent):
+        return (
+            patch.object(agent, "_vector_primary_retrieve", return_value=(self.VECTOR, 0.9)),
+            patch.object(agent, "_direct_title_lookup", return_value=[]),
+            patch.object(agent, "_hybrid_retrieve", return_value={}),
+            patch.object(agent, "_fetch_source_text", return_value="## Go\nGo is a language."),
+        )
+
+    def test_query_result_carries_telemetry(self, registry, make_agent) -> None:
+        agent = make_agent(synthesis_model="claude-opus-4-6")
+        agent.claude.messages.create.return_value = _response("claude-opus-4-6", 2000, 300)
+        p1, p2, p3, p4 = self._patches(agent)
+
+        with p1, p2, p3, p4:
+            result = agent.query("What is Go?")
+
+        tel = result["telemetry"]
+        assert {"vector", "title", "hybrid", "synthesis"} <= set(tel["spans"])
+        (call,) = tel["llm_calls"]
+        assert call["stage"] == "synthesis"
+        assert call["cost_usd"] == pytest.approx((2000 * 5 + 300 * 25) / 1e6)
+        latency = registry.snapshot()["latency"]
+        assert latency["query.total"]["count"] == 1
+        assert latency["synthesis"]["count"] == 1
+
+    def test_aquery_result_carries_telemetry(self, make_agent) -> None:
+        async def create(**kwargs):
+            return _response("claude-opus-4-6")
+
+        async_claude = MagicMock()
+        async_claude.messages.create = create
+        agent = make_agent(async_claude=async_claude, synthesis_model="claude-opus-4-6")
+        p1, p2, p3, p4 = self._patches(agent)
+
+        with p1, p2, p3, p4:
+            result = asyncio.run(agent.aquery("What is Go?"))
+        agent.close()
+
+        # Retrieval ran on the DB pool thread yet reported into the same trace.
+        assert {"vector", "synthesis"} <= set(result["telemetry"]["spans"])
+        assert result["telemetry"]["llm_calls"][0]["stage"] == "synthesis"
@@ -0,0 +1,177 @@
+"""Unit tests for wikigr.agent.title_index and its use by the retriever and agent."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+from wikigr.agent.kg_agent import KnowledgeGraphAgent
+from wikigr.agent.retriever import (
+    direct_title_lookup,
+    hybrid_retrieve,
+    load_title_index,
+    title_mentions,
+)
+from wikigr.agent.title_index import TitleIndex, db_version
+
+TITLES = [
+    "Quantum Mechanics",
+    "Quantum Computing",
+    "Quantum",
+    "Loop Quantum Gravity",
+    "Python (programming language)",
+    "Go",
+    "",
+]
+
+
+def _conn_returning(titles: list[str]) -> MagicMock:
+    conn = MagicMock()
+    result = conn.execute.return_value
+    result.get_column_names.return_value = ["title"]
+    result.get_all.return_value = [[title] for title in titles]
+    return conn
+
+
+class TestTitleIndex:
+    """Exact, prefix and substring lookup mirror the Cypher they replace."""
+
+    def test_exact_is_case_insensitive(self) -> None:
+        index = TitleIndex(TITLES + ["quantum"])
+
+        assert sorted(index.exact("QUANTUM")) == ["Quantum", "quantum"]
+        assert index.exact("quantum physics") == []
+        assert len(index) == 7  # empty title dropped
+
+    def test_contains_orders_shortest_first(self) -> None:
+        index = TitleIndex(TITLES)
+
+        assert index.contains("quantum") == [
+            "Quantum",
+            "Quantum Computing",
+            "Quantum Mechanics",
+            "Loop Quantum Gravity",
+        ]
+        assert index.contains("quantum", limit=2) == ["Quantum", "Quantum Computing"]
+        assert index.contains("tum grav") == ["Loop Quantum Gravity"]
+        assert index.contains("xyz") == []
+
+    def test_contains_short_query_scans(self) -> None:
+        index = TitleIndex(TITLES)
+
+        assert index.contains("go") == ["Go"]
+        assert index.contains("y") == ["Loop Quantum Gravity", "Python (programming language)"]
+
+    def test_contains_matches_naive_substring(self) -> None:
+        index = TitleIndex(TITLES)
+
+        for q in ("an", "ant", "uantum c", "(pro", "n", "ity"):
+            expected = {t for t in TITLES if t and q in t.lower()}
+            assert set(index.contains(q)) == expected, q
+
+    def test_prefix(self) -> None:
+        index = TitleIndex(TITLES)
+
+        assert index.prefix("quantum ") == ["Quantum Computing", "Quantum Mechanics"]
+        assert index.prefix("Py") == ["Python (programming language)"]
+        assert index.prefix("zz") == []
+
+    def test_db_version_changes_on_write(self, tmp_path) -> None:
+        db = tmp_path / "pack.db"
+        db.write_bytes(b"a")
+        before = db_version(db)
+
+        (tmp_path / "pack.db.wal").write_bytes(b"log")
+
+        assert db_version(db) != before
+        assert db_version(None) is None
+
+
+class TestRetrieverWithTitleIndex:
+    """direct_title_lookup / hybrid_retrieve answer title matches from memory."""
+
+    def test_load_title_index(self) -> None:
+        index = load_title_index(_conn_returning(["A", "B"]), version=("v",))
+
+        assert len(index) == 2
+        assert index.version == ("v",)
+
+    def test_load_title_index_none_on_db_error(self) -> None:
+        conn = MagicMock()
+        conn.execute.side_effect = RuntimeError("DB down")
+
+        assert load_title_index(conn) is None
+
+    def test_direct_lookup_without_db_round_trip(self) -> None:
+        conn = MagicMock()
+        index = TitleIndex(TITLES)
+
+        assert direct_title_lookup(conn, "What is Quantum Mechanics?", index) == [
+            "Quantum Mechanics"
+        ]
+        assert direct_title_lookup(conn, "What is quantum?", index) == ["Quantum"]
+        assert direct_title_lookup(conn, "quant", index) == [
+            "Quantum",
+            "Quantum Computing",
+            "Quantum Mechanics",
+        ]
+        conn.execute.assert_not_called()
+
+    def test_hybrid_keyword_signal_uses_index(self) -> None:
+        conn = MagicMock()
+        conn.execute.return_value.get_column_names.return_value = ["content"]
+        conn.execute.return_value.get_all.return_value = []
+
+        result = hybrid_retrieve(
+            conn,
+            lambda q, top_k=10: [],
+            frozenset(),
+            "Quantum gravity",
+            title_index=TitleIndex(TITLES),
+        )
+
+        # Matches both keywords, then the shortest "quantum" titles.
+        assert result["sources"][:2] == ["Loop Quantum Gravity", "Quantum"]
+        queries = [c.args[0] for c in conn.execute.call_args_list]
+        assert not any("CONTAINS" in q for q in queries)
+
+    def test_title_mentions_prefer_longest_span(self) -> None:
+        index = TitleIndex(TITLES)
+
+        mentions = title_mentions(
+            "Does loop quantum gravity extend quantum mechanics, or go further?",
+            index,
+            stop_words={"or"},
+        )
+
+        assert mentions == ["Loop Quantum Gravity", "Quantum Mechanics", "Go"]
+        assert title_mentions("What is it?", index, stop_words={"is"}) == []
+
+
+class TestAgentTitleIndex:
+    """The agent builds the index once and rebuilds it when the DB changes."""
+
+    def test_rebuilds_on_version_change(self) -> None:
+        conn = _conn_returning(["Go"])
+        agent = KnowledgeGraphAgent.from_connection(conn, MagicMock())
+        versions = iter([("v1",), ("v1",), ("v2",)])
+
+        with patch("wikigr.agent.title_index.db_version", side_effect=lambda p: next(versions)):
+            assert agent._direct_title_lookup("What is Go?") == ["Go"]
+            assert agent._direct_title_lookup("Go") == ["Go"]
+            assert conn.execute.call_count == 1
+            agent._direct_title_lookup("Go")
+
+        assert conn.execute.call_count == 2
+
+    def test_disabled_falls_back_to_cypher(self) -> None:
+        conn = _conn_returning([])
+        agent = KnowledgeGraphAgent(
+            use_enhancements=False,
+            enable_title_index=False,
+            _conn=conn,
+            _claude_client=MagicMock(),
+        )
+
+        agent._direct_title_lookup("What is Go?")
+
+        assert "lower(a.title) = $q" in conn.execute.call_args_list[0].args[0]
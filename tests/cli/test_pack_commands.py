@@ -513,3 +513,72 @@ class TestPackIntegration:
         result = run_cli("pack", "remove", "integration-test-pack", "--force")
         assert result.returncode == 0
         assert not pack_path.exists()
+
+
+class TestPackOptimize:
+    """Tests for 'wikigr pack optimize' command."""
+
+    def test_optimize_missing_database(self, tmp_path):
+        """Test optimize fails for a directory without pack.db."""
+        result = run_cli("pack", "optimize", str(tmp_path))
+
+        assert result.returncode != 0
+        assert "not found" in result.stderr.lower()
+
+    def test_optimize_records_embedding_storage(self, tmp_path):
+        """Test --embedding-storage exports int8 sidecars and updates the manifest."""
+        import real_ladybug as kuzu
+
+        db = kuzu.Database(str(tmp_path / "pack.db"))
+        conn = kuzu.Connection(db)
+        conn.execute("CREATE NODE TABLE Article(title STRING, PRIMARY KEY(title))")
+        conn.execute("CREATE REL TABLE LINKS_TO(FROM Article TO Article)")
+        conn.execute(
+            "CREATE NODE TABLE Section(section_id STRING, embedding DOUBLE[2], "
+            "PRIMARY KEY(section_id))"
+        )
+        conn.execute("CREATE (:Article {title: 'Go'})")
+        conn.execute("CREATE (:Section {section_id: 'Go#0', embedding: [1.0, 0.5]})")
+        conn.close()
+        db.close()
+        (tmp_path / "manifest.json").write_text(
+            json.dumps(
+                {
+                    "name": "test-pack",
+                    "version": "1.0.0",
+                    "description": "Test pack",
+                    "graph_stats": {"articles": 1, "entities": 0, "relationships": 0, "size_mb": 1},
+                    "created": "2026-02-24T10:00:00Z",
+                    "license": "CC-BY-SA-4.0",
+                }
+            )
+        )
+
+        result = run_cli("pack", "optimize", str(tmp_path), "--embedding-storage", "int8")
+
+        assert result.returncode == 0, result.stderr
+        assert (tmp_path / "embeddings" / "section.int8.npy").exists()
+        manifest = json.loads((tmp_path / "manifest.json").read_text())
+        assert manifest["embedding_storage"] == "int8"
+        assert len(manifest["routing"]["representatives"]) == 1
+
+        result = run_cli("pack", "quantization-report", str(tmp_path), "--format", "json")
+
+        assert result.returncode == 0, result.stderr
+        report = json.loads(result.stdout)
+        assert report["embedding_storage"] == "int8"
+        assert set(report["kinds"]["section"]["storages"]) == {"float32", "int8", "binary"}
+        assert (tmp_path / "quantization_report.json").exists()
+
+
+class TestPackRoute:
+    """Tests for 'wikigr pack route' command."""
+
+    def test_route_requires_routing_profiles(self, temp_home, sample_pack_dir):
+        """Test route fails when no installed pack has a routing profile."""
+        shutil.copytree(sample_pack_dir, temp_home / ".wikigr/packs/test-pack")
+
+        result = run_cli("pack", "route", "What is entropy?", env={"HOME": str(temp_home)})
+
+        assert result.returncode != 0
+        assert "pack optimize" in result.stderr
@@ -27,9 +27,9 @@ def test_retrieve_from_pack_success(mock_kg_agent_class: Mock, tmp_path: Path):
 
     # Mock KG agent result
     mock_agent = Mock()
-    mock_agent.query.return_value = {
-        "answer": "Gravity is a force",
+    mock_agent.retrieve.return_value = {
         "sources": ["Isaac Newton", "Albert Einstein"],
+        "passages": [{"title": "Isaac Newton", "text": "Newton formulated gravitation."}],
         "entities": [
             {"name": "Gravity", "type": "concept"},
             {"name": "Force", "type": "concept"},
@@ -50,12 +50,15 @@ def test_retrieve_from_pack_success(mock_kg_agent_class: Mock, tmp_path: Path):
 
     # Verify KG agent was called correctly
     mock_kg_agent_class.assert_called_once_with(db_path=str(db_path), read_only=True)
-    mock_agent.query.assert_called_once_with("What is gravity?", max_results=5)
+    mock_agent.retrieve.assert_called_once_with("What is gravity?", max_results=5)
+    mock_agent.query.assert_not_called()
 
     # Verify formatted context
     assert "## Sources" in context
     assert "Isaac Newton" in context
     assert "Albert Einstein" in context
+    assert "## Passages" in context
+    assert "Newton formulated gravitation." in context
     assert "## Entities" in context
     assert "**Gravity**" in context
     assert "## Facts" in context
@@ -74,7 +77,7 @@ def test_retrieve_from_pack_error_handling(mock_kg_agent_class: Mock, tmp_path:
 
     # Mock KG agent to raise exception
     mock_agent = Mock()
-    mock_agent.query.side_effect = RuntimeError("Database error")
+    mock_agent.retrieve.side_effect = RuntimeError("Database error")
     mock_agent.__enter__ = Mock(return_value=mock_agent)
     mock_agent.__exit__ = Mock(return_value=False)
     mock_kg_agent_class.return_value = mock_agent
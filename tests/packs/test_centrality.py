@@ -0,0 +1,99 @@
+"""Tests for precomputed pack centrality (wikigr.packs.centrality)."""
+
+import json
+
+import pytest
+import real_ladybug as kuzu
+
+from wikigr.packs.centrality import (
+    CENTRALITY_FILENAME,
+    PackCentrality,
+    build_pack_centrality,
+    compute_centrality,
+    load_centrality,
+    save_centrality,
+)
+
+
+@pytest.fixture
+def pack_dir(tmp_path):
+    """A pack with a small LINKS_TO graph: A <-> B, A -> C, C -> A, D isolated."""
+    db = kuzu.Database(str(tmp_path / "pack.db"))
+    conn = kuzu.Connection(db)
+    conn.execute("CREATE NODE TABLE Article(title STRING, PRIMARY KEY(title))")
+    conn.execute("CREATE REL TABLE LINKS_TO(FROM Article TO Article)")
+    for title in ("A", "B", "C", "D"):
+        conn.execute("CREATE (:Article {title: $t})", {"t": title})
+    for src, dst in (("A", "B"), ("B", "A"), ("A", "C"), ("C", "A")):
+        conn.execute(
+            "MATCH (a:Article {title: $s}), (b:Article {title: $d}) CREATE (a)-[:LINKS_TO]->(b)",
+            {"s": src, "d": dst},
+        )
+    conn.close()
+    db.close()
+    return tmp_path
+
+
+class TestComputeCentrality:
+    """Degree and PageRank from a real LadybugDB graph."""
+
+    def test_degree_and_pagerank(self, pack_dir):
+        db = kuzu.Database(str(pack_dir / "pack.db"), read_only=True)
+        centrality = compute_centrality(kuzu.Connection(db))
+        db.close()
+
+        assert centrality.total_links == 4
+        assert centrality.avg_links == 1.0
+        assert centrality.get("A") == 4.0
+        assert centrality.get("B") == 2.0
+        assert centrality.get("D") == 0.0
+        assert sum(centrality.pagerank) == pytest.approx(1.0)
+        assert centrality.get("A", "pagerank") > centrality.get("B", "pagerank")
+        assert centrality.get("B", "pagerank") == pytest.approx(centrality.get("C", "pagerank"))
+        assert centrality.get("B", "pagerank") > centrality.get("D", "pagerank")
+        assert centrality.get("missing") is None
+
+
+class TestSidecar:
+    """centrality.json round trip and tolerance of bad files."""
+
+    def test_build_and_load_round_trip(self, pack_dir):
+        path = build_pack_centrality(pack_dir)
+
+        loaded = load_centrality(pack_dir)
+
+        assert path == pack_dir / CENTRALITY_FILENAME
+        assert loaded.get("A") == 4.0
+        assert loaded.total_links == 4
+
+    def test_missing_or_malformed_sidecar(self, tmp_path):
+        assert load_centrality(tmp_path) is None
+
+        (tmp_path / CENTRALITY_FILENAME).write_text("{not json")
+        assert load_centrality(tmp_path) is None
+
+        (tmp_path / CENTRALITY_FILENAME).write_text(json.dumps({"format_version": 99}))
+        assert load_centrality(tmp_path) is None
+
+    def test_load_rejects_misaligned_columns(self, tmp_path):
+        save_centrality(PackCentrality(["A"], [1], [1.0], 0), tmp_path)
+        payload = json.loads((tmp_path / CENTRALITY_FILENAME).read_text())
+        payload["degree"] = []
+        (tmp_path / CENTRALITY_FILENAME).write_text(json.dumps(payload))
+
+        assert load_centrality(tmp_path) is None
+
+    def test_build_requires_database(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            build_pack_centrality(tmp_path)
+
+
+def test_agent_loads_sidecar_next_to_database(pack_dir):
+    from wikigr.agent.kg_agent import KnowledgeGraphAgent
+
+    build_pack_centrality(pack_dir)
+
+    centrality = KnowledgeGraphAgent._load_centrality(str(pack_dir / "pack.db"))
+
+    assert centrality.get("A") == 4.0
+    assert KnowledgeGraphAgent._load_centrality(None) is None
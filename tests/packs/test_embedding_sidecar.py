@@ -0,0 +1,285 @@
+"""Tests for the memory-mapped exact-search embedding sidecar."""
+
+import json
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+import real_ladybug as kuzu
+
+from wikigr.agent.kg_agent import KnowledgeGraphAgent
+from wikigr.agent.retriever import chunk_vector_search, vector_search
+from wikigr.packs import embedding_sidecar
+from wikigr.packs.embedding_sidecar import (
+    ExactSearchIndex,
+    QuantizedSearchIndex,
+    export_embeddings,
+    export_pack_embeddings,
+    load_exact_index,
+    pack_quantization_report,
+    quantize_binary,
+    quantize_int8,
+)
+
+SECTIONS = {
+    "Go#0": ("Go is a language.", [1.0, 0.0, 0.0, 0.0]),
+    "Go#1": ("Go has goroutines.", [0.8, 0.6, 0.0, 0.0]),
+    "Rust#0": ("Rust is a language.", [0.0, 2.0, 0.0, 0.0]),
+    "Zig#0": ("Zig is a language.", [0.0, 0.0, 0.0, 3.0]),
+}
+
+
+@pytest.fixture
+def pack_dir(tmp_path):
+    """A pack with four embedded sections and two embedded chunks."""
+    db = kuzu.Database(str(tmp_path / "pack.db"))
+    conn = kuzu.Connection(db)
+    conn.execute(
+        "CREATE NODE TABLE Section(section_id STRING, content STRING, embedding FLOAT[4], "
+        "PRIMARY KEY(section_id))"
+    )
+    conn.execute(
+        "CREATE NODE TABLE Chunk(chunk_id STRING, content STRING, embedding FLOAT[4], "
+        "article_title STRING, section_index INT32, chunk_index INT32, PRIMARY KEY(chunk_id))"
+    )
+    for section_id, (content, embedding) in SECTIONS.items():
+        conn.execute(
+            "CREATE (:Section {section_id: $id, content: $c, embedding: $e})",
+            {"id": section_id, "c": content, "e": embedding},
+        )
+    for index, embedding in enumerate(([1.0, 0.1, 0.0, 0.0], [0.9, 0.2, 0.0, 0.0])):
+        conn.execute(
+            "CREATE (:Chunk {chunk_id: $id, content: $c, embedding: $e, article_title: 'Go', "
+            "section_index: 0, chunk_index: $i})",
+            {"id": f"Go|s0|c{index}", "c": f"chunk {index}", "e": embedding, "i": index},
+        )
+    conn.close()
+    db.close()
+    return tmp_path
+
+
+@pytest.fixture
+def conn(pack_dir):
+    db = kuzu.Database(str(pack_dir / "pack.db"), read_only=True)
+    yield kuzu.Connection(db)
+    db.close()
+
+
+class TestExactSearchIndex:
+    """argpartition top-k over normalized rows."""
+
+    def test_top_k_best_first(self) -> None:
+        rows = np.eye(3, dtype=np.float32)
+        index = ExactSearchIndex(rows, ["a", "b", "c"])
+
+        hits = index.search([0.1, 0.9, 0.5], 2)
+
+        assert [i for i, _ in hits] == ["b", "c"]
+        assert hits[0][1] == pytest.approx(0.9 / np.linalg.norm([0.1, 0.9, 0.5]))
+        assert len(index.search([1, 0, 0], 10)) == 3
+
+    def test_rejects_misaligned_ids(self) -> None:
+        with pytest.raises(ValueError):
+            ExactSearchIndex(np.zeros((2, 3), dtype=np.float32), ["a"])
+
+
+class TestQuantizedSearchIndex:
+    """Quantized candidates, then exact rescoring."""
+
+    def test_int8_round_trip(self) -> None:
+        rows = np.array([[0.6, -0.8, 0.0], [0.0, 0.0, 0.0]], dtype=np.float32)
+
+        codes, scale = quantize_int8(rows)
+
+        assert codes.dtype == np.int8
+        assert codes[0].tolist() == [95, -127, 0]
+        assert codes * scale[:, None] == pytest.approx(rows, abs=0.01)
+
+    def test_binary_codes_pack_sign_bits(self) -> None:
+        codes = quantize_binary(np.array([[1.0, -1.0, 0.5] + [-1.0] * 6]))
+
+        assert codes.shape == (1, 2)
+        assert codes.tolist() == [[0b10100000, 0]]
+
+    @pytest.mark.parametrize("storage", ["int8", "binary"])
+    def test_rescoring_restores_exact_order(self, storage) -> None:
+        rng = np.random.default_rng(1)
+        rows = rng.normal(size=(200, 32)).astype(np.float32)
+        rows /= np.linalg.norm(rows, axis=1, keepdims=True)
+        ids = [f"n{i}" for i in range(len(rows))]
+        codes, scale = quantize_int8(rows)
+        index = (
+            QuantizedSearchIndex(codes, ids, scale=scale)
+            if storage == "int8"
+            else QuantizedSearchIndex(quantize_binary(rows), ids)
+        )
+        query = rows[7] + 0.1 * rows[8]
+        fetched: list[list[str]] = []
+
+        def rescore(candidates):
+            fetched.append(candidates)
+            return {i: rows[int(i[1:])] for i in candidates}
+
+        hits = index.search(query, 3, rescore=rescore)
+        exact = ExactSearchIndex(rows, ids).search(query, 3)
+
+        assert index.storage == storage
+        assert len(fetched[0]) == 3 * embedding_sidecar.RESCORE_OVERSAMPLE
+        assert hits[0][0] == "n7"
+        assert hits[0][1] == pytest.approx(exact[0][1])
+
+    def test_missing_rescore_vectors_keep_approximate_score(self) -> None:
+        rows = np.eye(4, dtype=np.float32)
+        codes, scale = quantize_int8(rows)
+        index = QuantizedSearchIndex(codes, ["a", "b", "c", "d"], scale=scale)
+
+        hits = index.search([1.0, 0.0, 0.0, 0.0], 1, rescore=lambda ids: {})
+
+        assert hits == [("a", pytest.approx(1.0, abs=0.01))]
+
+
+class TestExport:
+    """Sections and chunks exported, normalized, and memory-mapped back."""
+
+    def test_export_and_load(self, conn, pack_dir, monkeypatch) -> None:
+        monkeypatch.setattr(embedding_sidecar, "EXPORT_BATCH_ROWS", 3)  # force two batches
+
+        paths = export_embeddings(conn, pack_dir)
+        section = load_exact_index(pack_dir, "section")
+
+        assert [p.name for p in paths] == ["section.npy", "chunk.npy"]
+        assert isinstance(section.embeddings, np.memmap)
+        assert sorted(section.ids) == sorted(SECTIONS)
+        assert np.linalg.norm(section.embeddings, axis=1) == pytest.approx([1.0] * 4)
+        assert len(load_exact_index(pack_dir, "chunk")) == 2
+
+    @pytest.mark.parametrize("storage", ["int8", "binary"])
+    def test_quantized_export_replaces_float_sidecar(self, conn, pack_dir, storage) -> None:
+        export_embeddings(conn, pack_dir, kinds=("section",))
+        paths = export_embeddings(conn, pack_dir, kinds=("section",), storage=storage)
+        index = load_exact_index(pack_dir, "section")
+
+        assert paths[0].name == f"section.{storage}.npy"
+        assert not (pack_dir / "embeddings" / "section.npy").exists()
+        assert isinstance(index, QuantizedSearchIndex)
+        assert index.storage == storage
+        assert index.search([0.0, 0.0, 0.0, 1.0], 1)[0][0] == "Zig#0"
+
+    def test_export_pack_embeddings_uses_manifest_storage(self, pack_dir) -> None:
+        (pack_dir / "manifest.json").write_text(json.dumps({"embedding_storage": "int8"}))
+
+        paths = export_pack_embeddings(pack_dir)
+
+        assert [p.name for p in paths] == ["section.int8.npy", "chunk.int8.npy"]
+
+    def test_export_pack_embeddings_requires_database(self, tmp_path) -> None:
+        with pytest.raises(FileNotFoundError):
+            export_pack_embeddings(tmp_path)
+
+    def test_load_missing_or_bad_sidecar(self, conn, pack_dir) -> None:
+        assert load_exact_index(pack_dir, "section") is None
+
+        export_embeddings(conn, pack_dir, kinds=("section",))
+        ids_path = pack_dir / "embeddings" / "section_ids.json"
+        ids_path.write_text(json.dumps({"format_version": 1, "ids": ["only-one"]}))
+
+        assert load_exact_index(pack_dir, "section") is None
+
+
+class TestExactVectorSearch:
+    """vector_search / chunk_vector_search with exact_index fetch only winners."""
+
+    def test_section_search_matches_shape(self, conn, pack_dir) -> None:
+        export_embeddings(conn, pack_dir)
+        index = load_exact_index(pack_dir, "section")
+
+        results = vector_search(conn, [1.0, 0.2, 0.0, 0.0], 2, exact_index=index)
+
+        assert [r["title"] for r in results] == ["Go", "Rust"]
+        assert results[0]["content"] in ("Go is a language.", "Go has goroutines.")
+        assert results[0]["distance"] == pytest.approx(1.0 - results[0]["similarity"])
+
+    def test_chunk_search_merges_passages(self, conn, pack_dir) -> None:
+        export_embeddings(conn, pack_dir)
+        index = load_exact_index(pack_dir, "chunk")
+
+        results = chunk_vector_search(conn, [1.0, 0.0, 0.0, 0.0], 1, exact_index=index)
+
+        assert results[0]["title"] == "Go"
+        assert results[0]["passages"][0]["chunk_indices"] == [0, 1]
+
+
+class TestQuantizationReport:
+    """Recall-vs-size report per sidecar kind."""
+
+    def test_report_covers_every_storage(self, pack_dir) -> None:
+        report = pack_quantization_report(pack_dir, k=2, sample=10)
+
+        assert report["embedding_storage"] == "float32"
+        section = report["kinds"]["section"]
+        assert (section["rows"], section["dim"], section["sample"]) == (4, 4, 10)
+        storages = section["storages"]
+        assert storages["float32"]["recall"] == 1.0
+        assert storages["int8"]["bytes"] < storages["float32"]["bytes"]
+        assert storages["binary"]["bytes"] < storages["int8"]["bytes"]
+        assert storages["binary"]["recall_rescored"] >= storages["binary"]["recall"]
+
+    def test_report_measures_pack_db(self, pack_dir) -> None:
+        export_pack_embeddings(pack_dir, storage="int8")
+
+        report = pack_quantization_report(pack_dir, k=2, sample=10)
+
+        section = report["kinds"]["section"]
+        assert section["column_type"] == "FLOAT[4]"
+        assert section["column_bytes"] == 4 * 4 * 4
+        int8 = section["storages"]["int8"]
+        assert int8["pack_bytes"] == section["column_bytes"] + int8["bytes"]
+        assert report["pack_db_bytes"] > 0
+        assert report["sidecar_bytes"] > 0
+
+
+class TestAgentSelection:
+    """The agent picks exact search by sidecar size and freshness."""
+
+    def _agent(self, conn, pack_dir) -> KnowledgeGraphAgent:
+        agent = KnowledgeGraphAgent.from_connection(conn, MagicMock())
+        agent._db_path = str(pack_dir / "pack.db")
+        return agent
+
+    def test_small_fresh_sidecar_used(self, conn, pack_dir) -> None:
+        export_embeddings(conn, pack_dir)
+        agent = self._agent(conn, pack_dir)
+
+        results = agent.semantic_search("q", top_k=1, query_embedding=[0.0, 0.0, 0.0, 1.0])
+
+        assert agent._exact_index() is not None
+        assert results[0]["title"] == "Zig"
+
+    def test_large_sidecar_uses_vector_index(self, conn, pack_dir) -> None:
+        export_embeddings(conn, pack_dir)
+        agent = self._agent(conn, pack_dir)
+        agent.EXACT_SEARCH_MAX_ROWS = 3
+
+        assert agent._exact_index() is None
+        assert agent._vector_search_fn() is vector_search
+
+    def test_quantized_sidecar_rescored_with_database_embeddings(self, conn, pack_dir) -> None:
+        export_embeddings(conn, pack_dir, storage="binary")
+        agent = self._agent(conn, pack_dir)
+        agent.EXACT_SEARCH_MAX_ROWS = 3
+
+        results = agent.semantic_search("q", top_k=1, query_embedding=[1.0, 0.2, 0.0, 0.0])
+
+        assert agent._exact_index().storage == "binary"
+        assert results[0]["title"] == "Go"
+        # Go#1 matches every sign bit, but Go#0 wins on the exact score.
+        assert results[0]["similarity"] == pytest.approx(1.0 / np.linalg.norm([1.0, 0.2]))
+
+    def test_stale_sidecar_ignored(self, conn, pack_dir) -> None:
+        export_embeddings(conn, pack_dir, kinds=("section",))
+        ids_path = pack_dir / "embeddings" / "section_ids.json"
+        meta = json.loads(ids_path.read_text())
+        np.save(pack_dir / "embeddings" / "section.npy", np.eye(3, 4, dtype=np.float32))
+        ids_path.write_text(json.dumps({**meta, "ids": meta["ids"][:3]}))
+
+        assert self._agent(conn, pack_dir)._exact_index() is None
@@ -231,6 +231,24 @@ class TestEmbeddingComputation:
             # Only query embeddings change
             assert call_count_2 == call_count_1 + 1  # One additional call for new query
 
+    def test_repeated_query_served_from_cache(self, few_shot_manager, mock_embedding_model):
+        """Re-asking the same (re-spaced, re-cased) question skips the model."""
+        few_shot_manager.find_similar_examples("What is  Quantum Mechanics?", k=1)
+        call_count = mock_embedding_model.encode.call_count
+
+        few_shot_manager.find_similar_examples("what is quantum mechanics?", k=1)
+
+        assert mock_embedding_model.encode.call_count == call_count
+
+    def test_precomputed_query_embedding_skips_model(self, few_shot_manager, mock_embedding_model):
+        """A query embedding threaded in from vector search is used as-is."""
+        call_count = mock_embedding_model.encode.call_count
+
+        results = few_shot_manager.find_similar_examples("Test", k=2, query_embedding=np.ones(384))
+
+        assert len(results) == 2
+        assert mock_embedding_model.encode.call_count == call_count
+
 
 class TestCosineSimilarity:
     """Test cosine similarity calculation."""
@@ -374,3 +374,20 @@ class TestValidateManifest:
         assert not any(
             "source_url" in e.lower() and "https" in e.lower() for e in errors
         ), f"Unexpected HTTPS error for valid source_urls: {errors}"
+
+    def test_validate_manifest_rejects_unknown_embedding_storage(self):
+        """validate_manifest() should reject an embedding_storage outside EMBEDDING_STORAGES."""
+        manifest = PackManifest(
+            name="test-pack",
+            version="1.0.0",
+            description="Test pack",
+            graph_stats=GraphStats(articles=100, entities=200, relationships=300, size_mb=10),
+            license="CC-BY-SA-4.0",
+            embedding_storage="float16",
+        )
+        errors = validate_manifest(manifest)
+        assert any("embedding_storage" in e for e in errors)
+
+        manifest.embedding_storage = "int8"
+        assert PackManifest.from_dict(manifest.to_dict()).embedding_storage == "int8"
+        assert not any("embedding_storage" in e for e in validate_manifest(manifest))
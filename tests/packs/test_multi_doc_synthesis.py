@@ -8,7 +8,6 @@ TDD Approach: These tests are written BEFORE implementation and will fail initia
 
 from unittest.mock import MagicMock, Mock
 
-import pandas as pd
 import pytest
 
 from wikigr.agent.multi_doc_synthesis import MultiDocSynthesizer
@@ -27,6 +26,14 @@ def synthesizer(mock_kuzu_conn):
     return MultiDocSynthesizer(mock_kuzu_conn)
 
 
+def _query_result(columns: dict[str, list]) -> Mock:
+    """Create a mock Kuzu query result holding *columns* (name -> values)."""
+    result = Mock()
+    result.get_column_names.return_value = list(columns)
+    result.get_all.return_value = [list(row) for row in zip(*columns.values())]
+    return result
+
+
 class TestExpandToRelatedArticles:
     """Test MultiDocSynthesizer.expand_to_related_articles() with various graph structures."""
 
@@ -35,8 +42,7 @@ class TestExpandToRelatedArticles:
         seed_articles = [1, 2, 3]
 
         # Mock article content retrieval
-        mock_result = Mock()
-        mock_result.get_as_df.return_value = pd.DataFrame(
+        mock_result = _query_result(
             {
                 "article_id": [1, 2, 3],
                 "title": ["Article 1", "Article 2", "Article 3"],
@@ -56,11 +62,9 @@ class TestExpandToRelatedArticles:
 
         # First call: Get neighbors
         # Second call: Get article content
-        neighbor_result = Mock()
-        neighbor_result.get_as_df.return_value = pd.DataFrame({"article_id": [2, 3], "hop": [1, 1]})
+        neighbor_result = _query_result({"article_id": [2, 3], "hop": [1, 1]})
 
-        content_result = Mock()
-        content_result.get_as_df.return_value = pd.DataFrame(
+        content_result = _query_result(
             {
                 "article_id": [1, 2, 3],
                 "title": ["Seed", "Neighbor 1", "Neighbor 2"],
@@ -82,13 +86,9 @@ class TestExpandToRelatedArticles:
         seed_articles = [1]
 
         # BFS traversal: discover articles at each hop level
-        neighbor_result = Mock()
-        neighbor_result.get_as_df.return_value = pd.DataFrame(
-            {"article_id": [2, 3, 4, 5], "hop": [1, 1, 2, 2]}
-        )
+        neighbor_result = _query_result({"article_id": [2, 3, 4, 5], "hop": [1, 1, 2, 2]})
 
-        content_result = Mock()
-        content_result.get_as_df.return_value = pd.DataFrame(
+        content_result = _query_result(
             {
                 "article_id": [1, 2, 3, 4, 5],
                 "title": ["Seed", "Hop1-A", "Hop1-B", "Hop2-A", "Hop2-B"],
@@ -107,13 +107,9 @@ class TestExpandToRelatedArticles:
         """Test expansion from multiple seed articles."""
         seed_articles = [1, 2]
 
-        neighbor_result = Mock()
-        neighbor_result.get_as_df.return_value = pd.DataFrame(
-            {"article_id": [3, 4, 5], "hop": [1, 1, 1]}
-        )
+        neighbor_result = _query_result({"article_id": [3, 4, 5], "hop": [1, 1, 1]})
 
-        content_result = Mock()
-        content_result.get_as_df.return_value = pd.DataFrame(
+        content_result = _query_result(
             {
                 "article_id": [1, 2, 3, 4, 5],
                 "title": ["Seed1", "Seed2", "N1", "N2", "N3"],
@@ -132,16 +128,14 @@ class TestExpandToRelatedArticles:
         seed_articles = [1, 2]
 
         # Article 3 is neighbor to both seeds
-        neighbor_result = Mock()
-        neighbor_result.get_as_df.return_value = pd.DataFrame(
+        neighbor_result = _query_result(
             {
                 "article_id": [3, 3, 4],  # Duplicate 3
                 "hop": [1, 1, 1],
             }
         )
 
-        content_result = Mock()
-        content_result.get_as_df.return_value = pd.DataFrame(
+        content_result = _query_result(
             {
                 "article_id": [1, 2, 3, 4],
                 "title": ["Seed1", "Seed2", "Shared", "N1"],
@@ -162,11 +156,9 @@ class TestExpandToRelatedArticles:
         seed_articles = [1, 2]
 
         # No neighbors found
-        neighbor_result = Mock()
-        neighbor_result.get_as_df.return_value = pd.DataFrame({"article_id": [], "hop": []})
+        neighbor_result = _query_result({"article_id": [], "hop": []})
 
-        content_result = Mock()
-        content_result.get_as_df.return_value = pd.DataFrame(
+        content_result = _query_result(
             {
                 "article_id": [1, 2],
                 "title": ["Isolated1", "Isolated2"],
@@ -182,6 +174,22 @@ class TestExpandToRelatedArticles:
         assert len(expanded) == 2
         assert all(aid in [1, 2] for aid in expanded)
 
+    def test_expand_queries_given_connection(self, synthesizer, mock_kuzu_conn):
+        """Traversal and content queries run on *conn* when one is passed."""
+        caller_conn = MagicMock()
+        caller_conn.execute.side_effect = [
+            _query_result({"article_id": [2], "hop": [1]}),
+            _query_result(
+                {"article_id": [1, 2], "title": ["Seed", "Neighbor"], "content": ["a", "b"]}
+            ),
+        ]
+
+        expanded = synthesizer.expand_to_related_articles([1], max_hops=1, conn=caller_conn)
+
+        assert set(expanded) == {1, 2}
+        assert caller_conn.execute.call_count == 2
+        mock_kuzu_conn.execute.assert_not_called()
+
 
 class TestSynthesizeWithCitations:
     """Test MultiDocSynthesizer.synthesize_with_citations() for citation formatting."""
@@ -267,16 +275,14 @@ class TestBFSTraversal:
         seed_articles = [1]
 
         # Graph has 3 hop levels, but we limit to 2
-        neighbor_result = Mock()
-        neighbor_result.get_as_df.return_value = pd.DataFrame(
+        neighbor_result = _query_result(
             {
                 "article_id": [2, 3, 4, 5, 6],
                 "hop": [1, 1, 2, 2, 3],  # Hop 3 should be excluded
             }
         )
 
-        content_result = Mock()
-        content_result.get_as_df.return_value = pd.DataFrame(
+        content_result = _query_result(
             {
                 "article_id": [1, 2, 3, 4, 5],  # No article 6
                 "title": ["S", "H1-A", "H1-B", "H2-A", "H2-B"],
@@ -297,13 +303,9 @@ class TestBFSTraversal:
         seed_articles = [1]
 
         # Neighbors at different hop levels
-        neighbor_result = Mock()
-        neighbor_result.get_as_df.return_value = pd.DataFrame(
-            {"article_id": [2, 3, 4, 5], "hop": [1, 1, 2, 2]}
-        )
+        neighbor_result = _query_result({"article_id": [2, 3, 4, 5], "hop": [1, 1, 2, 2]})
 
-        content_result = Mock()
-        content_result.get_as_df.return_value = pd.DataFrame(
+        content_result = _query_result(
             {
                 "article_id": [1, 2, 3, 4, 5],
                 "title": ["S", "H1-A", "H1-B", "H2-A", "H2-B"],
@@ -373,11 +375,9 @@ class TestIntegration:
         seed_articles = [1]
 
         # Mock expansion
-        neighbor_result = Mock()
-        neighbor_result.get_as_df.return_value = pd.DataFrame({"article_id": [2, 3], "hop": [1, 1]})
+        neighbor_result = _query_result({"article_id": [2, 3], "hop": [1, 1]})
 
-        content_result = Mock()
-        content_result.get_as_df.return_value = pd.DataFrame(
+        content_result = _query_result(
             {
                 "article_id": [1, 2, 3],
                 "title": ["Main", "Related1", "Related2"],
@@ -404,11 +404,9 @@ class TestIntegration:
         """Test handling of stub articles (very short content)."""
         seed_articles = [1]
 
-        neighbor_result = Mock()
-        neighbor_result.get_as_df.return_value = pd.DataFrame({"article_id": [2], "hop": [1]})
+        neighbor_result = _query_result({"article_id": [2], "hop": [1]})
 
-        content_result = Mock()
-        content_result.get_as_df.return_value = pd.DataFrame(
+        content_result = _query_result(
             {
                 "article_id": [1, 2],
                 "title": ["Main", "Stub"],
@@ -430,16 +428,14 @@ class TestIntegration:
         seed_articles = [1]
 
         # Many neighbors available
-        neighbor_result = Mock()
-        neighbor_result.get_as_df.return_value = pd.DataFrame(
+        neighbor_result = _query_result(
             {
                 "article_id": list(range(2, 102)),  # 100 neighbors
                 "hop": [1] * 100,
             }
         )
 
-        content_result = Mock()
-        content_result.get_as_df.return_value = pd.DataFrame(
+        content_result = _query_result(
             {
                 "article_id": list(range(1, 52)),  # Limit to 51
                 "title": [f"Article {i}" for i in range(1, 52)],
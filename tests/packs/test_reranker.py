@@ -8,10 +8,10 @@ TDD Approach: These tests are written BEFORE implementation and will fail initia
 
 from unittest.mock import MagicMock, Mock
 
-import pandas as pd
 import pytest
 
 from wikigr.agent.reranker import GraphReranker
+from wikigr.packs.centrality import PackCentrality
 
 
 @pytest.fixture
@@ -27,14 +27,21 @@ def reranker(mock_kuzu_conn):
     return GraphReranker(mock_kuzu_conn)
 
 
+def _query_result(columns: dict[str, list]) -> Mock:
+    """Create a mock Kuzu query result holding *columns* (name -> values)."""
+    result = Mock()
+    result.get_column_names.return_value = list(columns)
+    result.get_all.return_value = [list(row) for row in zip(*columns.values())]
+    return result
+
+
 class TestGraphRerankerCalculateCentrality:
     """Test GraphReranker.calculate_centrality() with various graph structures."""
 
     def test_calculate_centrality_single_node(self, reranker, mock_kuzu_conn):
         """Test centrality calculation for single isolated node."""
         # Mock Kuzu query result
-        mock_result = Mock()
-        mock_result.get_as_df.return_value = pd.DataFrame(
+        mock_result = _query_result(
             {
                 "article_id": [1],
                 "degree": [0.0],  # Isolated node has zero centrality
@@ -50,8 +57,7 @@ class TestGraphRerankerCalculateCentrality:
     def test_calculate_centrality_star_graph(self, reranker, mock_kuzu_conn):
         """Test centrality calculation for star topology (central hub node)."""
         # Central node should have highest centrality
-        mock_result = Mock()
-        mock_result.get_as_df.return_value = pd.DataFrame(
+        mock_result = _query_result(
             {
                 "article_id": [1, 2, 3, 4],
                 "degree": [1.0, 0.333, 0.333, 0.333],  # Node 1 is hub
@@ -68,8 +74,7 @@ class TestGraphRerankerCalculateCentrality:
     def test_calculate_centrality_chain_graph(self, reranker, mock_kuzu_conn):
         """Test centrality calculation for linear chain topology."""
         # Middle nodes should have higher centrality than endpoints
-        mock_result = Mock()
-        mock_result.get_as_df.return_value = pd.DataFrame(
+        mock_result = _query_result(
             {
                 "article_id": [1, 2, 3, 4, 5],
                 "degree": [0.2, 0.5, 0.8, 0.5, 0.2],  # Peak in middle
@@ -93,8 +98,7 @@ class TestGraphRerankerCalculateCentrality:
     def test_calculate_centrality_disconnected_components(self, reranker, mock_kuzu_conn):
         """Test centrality calculation for graph with multiple disconnected components."""
         # Two separate clusters
-        mock_result = Mock()
-        mock_result.get_as_df.return_value = pd.DataFrame(
+        mock_result = _query_result(
             {
                 "article_id": [1, 2, 3, 4, 5, 6],
                 "degree": [0.5, 0.5, 0.0, 0.7, 0.7, 0.0],  # Two components
@@ -110,10 +114,7 @@ class TestGraphRerankerCalculateCentrality:
 
     def test_calculate_centrality_normalization(self, reranker, mock_kuzu_conn):
         """Test that centrality scores are normalized to [0, 1] range."""
-        mock_result = Mock()
-        mock_result.get_as_df.return_value = pd.DataFrame(
-            {"article_id": [1, 2, 3], "degree": [0.1, 0.5, 1.0]}
-        )
+        mock_result = _query_result({"article_id": [1, 2, 3], "degree": [0.1, 0.5, 1.0]})
         mock_kuzu_conn.execute.return_value = mock_result
 
         centrality = reranker.calculate_centrality([1, 2, 3])
@@ -135,15 +136,10 @@ class TestGraphRerankerRerank:
         ]
 
         # Dense graph density check (2.0+ avg links/article → centrality enabled)
-        dense_links = Mock()
-        dense_links.get_as_df.return_value = pd.DataFrame({"total_links": [20]})
-        dense_articles = Mock()
-        dense_articles.get_as_df.return_value = pd.DataFrame({"total_articles": [10]})
+        dense_links = _query_result({"total_links": [20]})
+        dense_articles = _query_result({"total_articles": [10]})
         # Mock centrality calculation
-        mock_result = Mock()
-        mock_result.get_as_df.return_value = pd.DataFrame(
-            {"article_id": [1, 2, 3], "degree": [0.3, 0.8, 0.6]}
-        )
+        mock_result = _query_result({"article_id": [1, 2, 3], "degree": [0.3, 0.8, 0.6]})
         mock_kuzu_conn.execute.side_effect = [dense_links, dense_articles, mock_result]
 
         reranked = reranker.rerank(vector_results)
@@ -166,14 +162,9 @@ class TestGraphRerankerRerank:
             {"article_id": 2, "score": 0.7, "title": "Article 2"},
         ]
 
-        dense_links = Mock()
-        dense_links.get_as_df.return_value = pd.DataFrame({"total_links": [20]})
-        dense_articles = Mock()
-        dense_articles.get_as_df.return_value = pd.DataFrame({"total_articles": [10]})
-        mock_result = Mock()
-        mock_result.get_as_df.return_value = pd.DataFrame(
-            {"article_id": [1, 2], "degree": [0.3, 0.8]}
-        )
+        dense_links = _query_result({"total_links": [20]})
+        dense_articles = _query_result({"total_articles": [10]})
+        mock_result = _query_result({"article_id": [1, 2], "degree": [0.3, 0.8]})
         mock_kuzu_conn.execute.side_effect = [dense_links, dense_articles, mock_result]
 
         # Heavy graph weight: 0.2 vector, 0.8 graph
@@ -192,10 +183,7 @@ class TestGraphRerankerRerank:
             {"article_id": 2, "score": 0.7, "title": "Article 2"},
         ]
 
-        mock_result = Mock()
-        mock_result.get_as_df.return_value = pd.DataFrame(
-            {"article_id": [1, 2], "degree": [0.3, 0.8]}
-        )
+        mock_result = _query_result({"article_id": [1, 2], "degree": [0.3, 0.8]})
         mock_kuzu_conn.execute.return_value = mock_result
 
         reranked = reranker.rerank(vector_results, vector_weight=1.0, graph_weight=0.0)
@@ -211,14 +199,9 @@ class TestGraphRerankerRerank:
             {"article_id": 2, "score": 0.7, "title": "Article 2"},
         ]
 
-        dense_links = Mock()
-        dense_links.get_as_df.return_value = pd.DataFrame({"total_links": [20]})
-        dense_articles = Mock()
-        dense_articles.get_as_df.return_value = pd.DataFrame({"total_articles": [10]})
-        mock_result = Mock()
-        mock_result.get_as_df.return_value = pd.DataFrame(
-            {"article_id": [1, 2], "degree": [0.3, 0.8]}
-        )
+        dense_links = _query_result({"total_links": [20]})
+        dense_articles = _query_result({"total_articles": [10]})
+        mock_result = _query_result({"article_id": [1, 2], "degree": [0.3, 0.8]})
         mock_kuzu_conn.execute.side_effect = [dense_links, dense_articles, mock_result]
 
         reranked = reranker.rerank(vector_results, vector_weight=0.0, graph_weight=1.0)
@@ -229,6 +212,25 @@ class TestGraphRerankerRerank:
         assert reranked[0]["article_id"] == 2
         assert reranked[0]["score"] == pytest.approx(1.0, rel=0.01)
 
+    def test_rerank_queries_given_connection(self, reranker, mock_kuzu_conn):
+        """Density and centrality queries run on *conn* when one is passed."""
+        caller_conn = MagicMock()
+        caller_conn.execute.side_effect = [
+            _query_result({"total_links": [50]}),
+            _query_result({"total_articles": [10]}),
+            _query_result({"article_id": [1, 2], "degree": [0.2, 0.9]}),
+        ]
+        vector_results = [
+            {"article_id": 1, "score": 0.8, "title": "Article 1"},
+            {"article_id": 2, "score": 0.6, "title": "Article 2"},
+        ]
+
+        reranked = reranker.rerank(vector_results, conn=caller_conn)
+
+        assert reranked[0]["article_id"] == 2
+        assert caller_conn.execute.call_count == 3
+        mock_kuzu_conn.execute.assert_not_called()
+
     def test_rerank_empty_results(self, reranker, mock_kuzu_conn):
         """Test reranking with empty vector results."""
         reranked = reranker.rerank([])
@@ -245,10 +247,7 @@ class TestGraphRerankerRerank:
         ]
 
         # Only articles 1 and 2 in graph
-        mock_result = Mock()
-        mock_result.get_as_df.return_value = pd.DataFrame(
-            {"article_id": [1, 2], "degree": [0.6, 0.8]}
-        )
+        mock_result = _query_result({"article_id": [1, 2], "degree": [0.6, 0.8]})
         mock_kuzu_conn.execute.return_value = mock_result
 
         reranked = reranker.rerank(vector_results)
@@ -266,10 +265,7 @@ class TestGraphRerankerRerank:
             {"article_id": 2, "score": 0.7, "title": "Article 2"},
         ]
 
-        mock_result = Mock()
-        mock_result.get_as_df.return_value = pd.DataFrame(
-            {"article_id": [1, 2], "degree": [0.0, 0.0]}
-        )
+        mock_result = _query_result({"article_id": [1, 2], "degree": [0.0, 0.0]})
         mock_kuzu_conn.execute.return_value = mock_result
 
         reranked = reranker.rerank(vector_results)
@@ -297,10 +293,7 @@ class TestGraphRerankerRerank:
             },
         ]
 
-        mock_result = Mock()
-        mock_result.get_as_df.return_value = pd.DataFrame(
-            {"article_id": [1, 2], "degree": [0.5, 0.5]}
-        )
+        mock_result = _query_result({"article_id": [1, 2], "degree": [0.5, 0.5]})
         mock_kuzu_conn.execute.return_value = mock_result
 
         reranked = reranker.rerank(vector_results)
@@ -339,14 +332,9 @@ class TestGraphRerankerIntegration:
         ]
 
         # Article 2 is central hub despite lower vector score
-        dense_links = Mock()
-        dense_links.get_as_df.return_value = pd.DataFrame({"total_links": [20]})
-        dense_articles = Mock()
-        dense_articles.get_as_df.return_value = pd.DataFrame({"total_articles": [10]})
-        mock_result = Mock()
-        mock_result.get_as_df.return_value = pd.DataFrame(
-            {"article_id": [1, 2, 3], "degree": [0.2, 0.95, 0.5]}
-        )
+        dense_links = _query_result({"total_links": [20]})
+        dense_articles = _query_result({"total_articles": [10]})
+        mock_result = _query_result({"article_id": [1, 2, 3], "degree": [0.2, 0.95, 0.5]})
         mock_kuzu_conn.execute.side_effect = [dense_links, dense_articles, mock_result]
 
         reranked = reranker.rerank(vector_results)
@@ -366,10 +354,7 @@ class TestGraphRerankerIntegration:
             {"article_id": 2, "score": 0.8, "title": "Article 2"},
         ]
 
-        mock_result = Mock()
-        mock_result.get_as_df.return_value = pd.DataFrame(
-            {"article_id": [1, 2], "degree": [0.5, 0.5]}
-        )
+        mock_result = _query_result({"article_id": [1, 2], "degree": [0.5, 0.5]})
         mock_kuzu_conn.execute.return_value = mock_result
 
         reranked = reranker.rerank(vector_results)
@@ -385,10 +370,8 @@ class TestSparseGraphDetection:
     def test_sparse_graph_disables_centrality(self, reranker, mock_kuzu_conn):
         """When avg links/article < 2.0, centrality scores should be zeroed out."""
         # Sparse: 5 links / 10 articles = 0.5 avg
-        links_result = Mock()
-        links_result.get_as_df.return_value = pd.DataFrame({"total_links": [5]})
-        articles_result = Mock()
-        articles_result.get_as_df.return_value = pd.DataFrame({"total_articles": [10]})
+        links_result = _query_result({"total_links": [5]})
+        articles_result = _query_result({"total_articles": [10]})
         mock_kuzu_conn.execute.side_effect = [links_result, articles_result]
 
         vector_results = [
@@ -406,15 +389,10 @@ class TestSparseGraphDetection:
     def test_dense_graph_uses_centrality(self, reranker, mock_kuzu_conn):
         """When avg links/article >= 2.0, centrality should be applied normally."""
         # Dense: 50 links / 10 articles = 5.0 avg
-        links_result = Mock()
-        links_result.get_as_df.return_value = pd.DataFrame({"total_links": [50]})
-        articles_result = Mock()
-        articles_result.get_as_df.return_value = pd.DataFrame({"total_articles": [10]})
+        links_result = _query_result({"total_links": [50]})
+        articles_result = _query_result({"total_articles": [10]})
         # Centrality query result
-        centrality_result = Mock()
-        centrality_result.get_as_df.return_value = pd.DataFrame(
-            {"article_id": [1, 2], "degree": [0.2, 0.9]}
-        )
+        centrality_result = _query_result({"article_id": [1, 2], "degree": [0.2, 0.9]})
         mock_kuzu_conn.execute.side_effect = [links_result, articles_result, centrality_result]
 
         vector_results = [
@@ -433,10 +411,8 @@ class TestSparseGraphDetection:
 
     def test_density_cached_per_session(self, reranker, mock_kuzu_conn):
         """Graph density only queried once per session (cached)."""
-        links_result = Mock()
-        links_result.get_as_df.return_value = pd.DataFrame({"total_links": [3]})
-        articles_result = Mock()
-        articles_result.get_as_df.return_value = pd.DataFrame({"total_articles": [10]})
+        links_result = _query_result({"total_links": [3]})
+        articles_result = _query_result({"total_articles": [10]})
         mock_kuzu_conn.execute.side_effect = [links_result, articles_result]
         vector_results = [{"article_id": 1, "score": 0.8, "title": "A"}]
         reranker.rerank(vector_results)  # triggers density check
@@ -445,10 +421,8 @@ class TestSparseGraphDetection:
 
     def test_zero_articles_no_division_error(self, reranker, mock_kuzu_conn):
         """Zero articles returns 0.0 (no division by zero)."""
-        links_result = Mock()
-        links_result.get_as_df.return_value = pd.DataFrame({"total_links": [0]})
-        articles_result = Mock()
-        articles_result.get_as_df.return_value = pd.DataFrame({"total_articles": [0]})
+        links_result = _query_result({"total_links": [0]})
+        articles_result = _query_result({"total_articles": [0]})
         mock_kuzu_conn.execute.side_effect = [links_result, articles_result]
         assert reranker._check_graph_density() == 0.0
 
@@ -456,3 +430,45 @@ class TestSparseGraphDetection:
         """DB error during density check returns 0.0."""
         mock_kuzu_conn.execute.side_effect = Exception("DB error")
         assert reranker._check_graph_density() == 0.0
+
+
+class TestPrecomputedCentrality:
+    """GraphReranker with a pack centrality sidecar runs no queries."""
+
+    @pytest.fixture
+    def centrality(self):
+        return PackCentrality(
+            titles=["Hub", "Leaf", "Mid"],
+            degree=[10, 1, 4],
+            pagerank=[0.2, 0.5, 0.3],
+            total_links=30,
+        )
+
+    def test_degree_read_from_memory(self, mock_kuzu_conn, centrality):
+        reranker = GraphReranker(mock_kuzu_conn, centrality=centrality)
+
+        scores = reranker.calculate_centrality(["Leaf", "Mid", "Unknown"])
+
+        assert scores == {"Leaf": 0.25, "Mid": 1.0, "Unknown": 0.0}
+        mock_kuzu_conn.execute.assert_not_called()
+
+    def test_pagerank_metric(self, mock_kuzu_conn, centrality):
+        reranker = GraphReranker(mock_kuzu_conn, centrality=centrality, metric="pagerank")
+
+        scores = reranker.calculate_centrality(["Hub", "Leaf"])
+
+        assert scores == {"Hub": pytest.approx(0.4), "Leaf": 1.0}
+
+    def test_density_from_sidecar(self, mock_kuzu_conn, centrality):
+        reranker = GraphReranker(mock_kuzu_conn, centrality=centrality)
+
+        reranked = reranker.rerank(
+            [{"title": "Leaf", "score": 0.9}, {"title": "Hub", "score": 0.8}]
+        )
+
+        assert [r["title"] for r in reranked] == ["Hub", "Leaf"]
+        mock_kuzu_conn.execute.assert_not_called()
+
+    def test_unknown_metric_rejected(self, mock_kuzu_conn):
+        with pytest.raises(ValueError):
+            GraphReranker(mock_kuzu_conn, metric="betweenness")
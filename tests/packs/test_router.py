@@ -0,0 +1,138 @@
+"""Tests for embedding-based pack routing."""
+
+import json
+import time
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+import real_ladybug as kuzu
+
+from wikigr.packs.manifest import PackManifest, validate_manifest
+from wikigr.packs.router import PackRouter, build_pack_routing, compute_routing_profile
+
+# Two topics: sections along axis 0 and sections along axis 2.
+SECTIONS = {
+    "Go#0": [1.0, 0.1, 0.0, 0.0],
+    "Go#1": [0.9, 0.0, 0.1, 0.0],
+    "Go#2": [1.0, 0.0, 0.0, 0.1],
+    "Zig#0": [0.0, 0.1, 1.0, 0.0],
+    "Zig#1": [0.0, 0.0, 0.9, 0.1],
+}
+
+MANIFEST = {
+    "name": "lang-pack",
+    "version": "1.0.0",
+    "description": "Languages",
+    "graph_stats": {"articles": 2, "entities": 0, "relationships": 0, "size_mb": 1},
+    "license": "MIT",
+    "created_at": "2026-01-01T00:00:00Z",
+}
+
+
+@pytest.fixture
+def pack_dir(tmp_path):
+    db = kuzu.Database(str(tmp_path / "pack.db"))
+    conn = kuzu.Connection(db)
+    conn.execute(
+        "CREATE NODE TABLE Section(section_id STRING, embedding DOUBLE[4], PRIMARY KEY(section_id))"
+    )
+    for section_id, embedding in SECTIONS.items():
+        conn.execute(
+            "CREATE (:Section {section_id: $id, embedding: $e})", {"id": section_id, "e": embedding}
+        )
+    conn.close()
+    db.close()
+    (tmp_path / "manifest.json").write_text(json.dumps(MANIFEST))
+    return tmp_path
+
+
+def _profile(*representatives: list[float]) -> dict:
+    centroid = np.mean(representatives, axis=0).tolist()
+    return {"centroid": centroid, "representatives": [list(r) for r in representatives]}
+
+
+class TestComputeRoutingProfile:
+    """Centroid over all sections, one representative per topic cluster."""
+
+    def test_profile_separates_topics(self, pack_dir) -> None:
+        db = kuzu.Database(str(pack_dir / "pack.db"), read_only=True)
+        try:
+            profile = compute_routing_profile(kuzu.Connection(db), clusters=2)
+        finally:
+            db.close()
+
+        assert profile["sections"] == 5
+        assert sorted(profile["weights"]) == [0.4, 0.6]
+        dominant = sorted(int(np.argmax(r)) for r in profile["representatives"])
+        assert dominant == [0, 2]
+        assert np.linalg.norm(profile["centroid"]) == pytest.approx(1.0, abs=1e-3)
+
+    def test_sampling_keeps_exact_centroid(self, pack_dir) -> None:
+        db = kuzu.Database(str(pack_dir / "pack.db"), read_only=True)
+        try:
+            full = compute_routing_profile(kuzu.Connection(db), clusters=2)
+            sampled = compute_routing_profile(kuzu.Connection(db), clusters=2, sample_rows=2)
+        finally:
+            db.close()
+
+        assert sampled["centroid"] == full["centroid"]
+        assert len(sampled["representatives"]) <= 2
+
+    def test_build_stores_profile_in_manifest(self, pack_dir) -> None:
+        profile = build_pack_routing(pack_dir)
+
+        saved = json.loads((pack_dir / "manifest.json").read_text())
+        assert saved["routing"] == profile
+        assert validate_manifest(PackManifest.from_dict(saved)) == []
+
+
+class TestPackRouter:
+    """Per-pack max over representatives from one matrix-vector product."""
+
+    @pytest.fixture
+    def router(self) -> PackRouter:
+        return PackRouter(
+            {
+                "go-expert": _profile([1.0, 0.0, 0.0]),
+                "systems": _profile([0.0, 1.0, 0.0], [0.7, 0.0, 0.7]),
+                "physics": _profile([0.0, 0.0, 1.0]),
+            }
+        )
+
+    def test_ranks_by_best_representative(self, router) -> None:
+        ranked = router.route_embedding([0.6, 0.0, 0.8], k=2)
+
+        assert [name for name, _ in ranked] == ["systems", "physics"]
+        assert ranked[0][1] == pytest.approx(0.99, abs=0.01)
+
+    def test_route_embeds_question(self) -> None:
+        embedder = MagicMock()
+        embedder.generate_query.return_value = np.array([[0.0, 0.0, 2.0]])
+        router = PackRouter({"physics": _profile([0.0, 0.0, 1.0])}, embedder=embedder)
+
+        assert router.route("What is entropy?", k=1)[0][0] == "physics"
+        embedder.generate_query.assert_called_once_with(["What is entropy?"])
+
+    def test_skips_mismatched_profiles(self) -> None:
+        router = PackRouter({"a": _profile([1.0, 0.0]), "b": _profile([1.0, 0.0, 0.0])})
+
+        assert router.names == ["a"]
+        with pytest.raises(ValueError, match="dimensions"):
+            router.route_embedding([1.0, 0.0, 0.0])
+
+    def test_empty_router_returns_nothing(self) -> None:
+        assert PackRouter({}).route_embedding([1.0, 0.0]) == []
+
+    def test_routing_is_sub_millisecond(self) -> None:
+        rng = np.random.default_rng(0)
+        router = PackRouter(
+            {f"pack-{i}": _profile(*rng.normal(size=(8, 768)).tolist()) for i in range(50)}
+        )
+        query = rng.normal(size=768)
+
+        router.route_embedding(query)
+        start = time.perf_counter()
+        for _ in range(100):
+            router.route_embedding(query)
+        assert (time.perf_counter() - start) / 100 < 1e-3
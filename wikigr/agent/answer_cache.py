@@ -0,0 +1,454 @@
+"""Persistent per-pack answer cache for KnowledgeGraphAgent.
+
+Stores synthesized answers of ``query()`` / ``graph_query()`` in one SQLite
+file per pack, keyed by normalized question, synthesis model, call
+parameters and the pack content version.  Eval reruns and repeated user
+questions are answered in milliseconds without a synthesis call.
+
+The file lives in a user cache directory, not in the pack: packs may be
+read-only, shared or replaced on update.  It defaults to
+``~/.wikigr/cache/answers`` (override with ``WIKIGR_ANSWER_CACHE_DIR`` or
+``cache_dir``) and is named after the pack plus a hash of its resolved path.
+
+API Contract:
+    AnswerCache(pack_dir, similarity_threshold=0.95, max_entries=2048, cache_dir=None)
+    get(kind, question, model, params, embed_fn=None) -> dict | None
+    put(kind, question, model, params, result, embedding=None) -> None
+    pack_version -> str
+    stats() -> dict
+    clear() -> None
+    close() -> None
+    pack_content_version(pack_dir) -> str
+    answer_cache_path(pack_dir, cache_dir=None) -> Path
+
+Design Philosophy:
+    - Lookup is exact first (normalized question), then approximate: cosine
+      similarity of the question embedding against a small in-memory matrix
+      of cached question vectors for the same kind/model/params, accepted at
+      or above ``similarity_threshold``.
+    - The pack content version is a hash of ``manifest.json``.  Any change
+      to the manifest (rebuild, version bump) is detected on the next call
+      via a cheap ``stat`` and purges every entry of the old version.
+    - Hits do not write: last-hit times and hit counts are buffered in
+      memory and flushed with the next ``put()``, once ``TOUCH_FLUSH_EVERY``
+      entries have unwritten hits or ``TOUCH_FLUSH_INTERVAL_S`` seconds have
+      passed, and on ``stats()`` / ``close()``.  A crash loses at most that
+      much LRU bookkeeping, never an answer.
+    - The cache is an optimization: storage errors are logged and treated
+      as misses, never raised to the caller.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from bootstrap.src.embeddings.query_cache import normalize_query
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path.home() / ".wikigr/cache/answers"
+
+EXACT = "exact"
+SEMANTIC = "semantic"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS answers (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    question TEXT NOT NULL,
+    model TEXT NOT NULL,
+    params TEXT NOT NULL,
+    pack_version TEXT NOT NULL,
+    embedding BLOB,
+    result TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_hit_at REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+)
+"""
+
+GroupKey = tuple[str, str, str]  # (kind, model, params JSON)
+
+
+def pack_content_version(pack_dir: str | Path) -> str:
+    """Return the content version of a pack: a hash of its ``manifest.json``.
+
+    Packs without a manifest fall back to the size and mtime of ``pack.db``.
+    """
+    pack_dir = Path(pack_dir)
+    manifest = pack_dir / "manifest.json"
+    try:
+        return "m-" + hashlib.sha256(manifest.read_bytes()).hexdigest()[:16]
+    except OSError:
+        pass
+    try:
+        st = (pack_dir / "pack.db").stat()
+        return f"db-{st.st_size}-{st.st_mtime_ns}"
+    except OSError:
+        return "unversioned"
+
+
+def answer_cache_path(pack_dir: str | Path, cache_dir: str | Path | None = None) -> Path:
+    """Return the cache file of the pack at *pack_dir*.
+
+    Args:
+        pack_dir: Pack directory.
+        cache_dir: Directory holding the cache files.  Defaults to
+            ``$WIKIGR_ANSWER_CACHE_DIR`` or ``~/.wikigr/cache/answers``.
+    """
+    if cache_dir is None:
+        cache_dir = os.environ.get("WIKIGR_ANSWER_CACHE_DIR", DEFAULT_CACHE_DIR)
+    pack_dir = Path(pack_dir).resolve()
+    digest = hashlib.sha256(str(pack_dir).encode("utf-8")).hexdigest()[:12]
+    return Path(cache_dir) / f"{pack_dir.name}-{digest}.sqlite3"
+
+
+def _params_json(params: dict[str, Any]) -> str:
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+class AnswerCache:
+    """SQLite-backed answer cache for one pack, with approximate question matching."""
+
+    DEFAULT_SIMILARITY_THRESHOLD = 0.95
+    DEFAULT_MAX_ENTRIES = 2048
+    TOUCH_FLUSH_EVERY = 64
+    TOUCH_FLUSH_INTERVAL_S = 30.0
+
+    def __init__(
+        self,
+        pack_dir: str | Path,
+        similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        cache_dir: str | Path | None = None,
+    ):
+        """Open (or create) the answer cache of the pack at *pack_dir*.
+
+        Args:
+            pack_dir: Pack directory (the one containing manifest.json / pack.db).
+            similarity_threshold: Minimum cosine similarity for an approximate hit.
+                Values above 1.0 disable approximate matching.
+            max_entries: Maximum stored answers; least recently hit are evicted.
+            cache_dir: Directory for the cache file (see :func:`answer_cache_path`).
+
+        Raises:
+            ValueError: If similarity_threshold is not positive or max_entries < 1.
+            OSError / sqlite3.Error: If the cache file cannot be created.
+        """
+        if similarity_threshold <= 0:
+            raise ValueError(f"similarity_threshold must be positive, got {similarity_threshold!r}")
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be >= 1, got {max_entries!r}")
+        self.pack_dir = Path(pack_dir)
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self.path = answer_cache_path(self.pack_dir, cache_dir)
+        self.path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(_SCHEMA)
+        self._db.commit()
+
+        self._manifest_sig: tuple[int, int] | None = None
+        self.pack_version = ""
+        # Question vectors per (kind, model, params): (keys, unit-norm float32 matrix)
+        self._matrices: dict[GroupKey, tuple[list[str], np.ndarray]] = {}
+        # Unwritten hits: key -> (hit count, last hit time)
+        self._touches: dict[str, tuple[int, float]] = {}
+        self._touches_since = time.monotonic()
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        with self._lock:
+            self._refresh_version()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get(
+        self,
+        kind: str,
+        question: str,
+        model: str,
+        params: dict[str, Any],
+        embed_fn: Callable[[str], Any] | None = None,
+    ) -> dict[str, Any] | None:
+        """Return a cached result for *question*, or None on a miss.
+
+        Args:
+            kind: "query" or "graph_query".
+            question: Raw question text.
+            model: Synthesis model identifier.
+            params: Call parameters that change the answer (e.g. max_results).
+            embed_fn: Callable returning the question's embedding; only called
+                on an exact miss when approximate candidates exist.
+
+        Returns:
+            The cached result dict plus an ``"answer_cache"`` entry
+            ``{"match": "exact"|"semantic", "similarity": float,
+            "cached_question": str}``, or None.
+        """
+        params_json = _params_json(params)
+        try:
+            with self._lock:
+                self._refresh_version()
+                key = self._key(kind, question, model, params_json)
+                row = self._db.execute(
+                    "SELECT question, result FROM answers WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    self.exact_hits += 1
+                    self._touch(key)
+                    return self._hit(row, EXACT, 1.0)
+                group = self._group_matrix((kind, model, params_json))
+
+            if group is not None and embed_fn is not None:
+                hit = self._semantic_lookup(group, question, embed_fn)
+                if hit is not None:
+                    return hit
+        except sqlite3.Error as e:
+            logger.warning("Answer cache lookup failed (%s): %s", self.path, e)
+            return None
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(
+        self,
+        kind: str,
+        question: str,
+        model: str,
+        params: dict[str, Any],
+        result: dict[str, Any],
+        embedding: Any = None,
+    ) -> None:
+        """Store *result* for *question* (replacing any previous entry).
+
+        ``token_usage`` and ``stage_timings`` describe the original call, not
+        the answer, and are not stored.
+        """
+        params_json = _params_json(params)
+        stored = {
+            k: v
+            for k, v in result.items()
+            if k not in ("token_usage", "stage_timings", "answer_cache")
+        }
+        vec = self._unit(embedding) if embedding is not None else None
+        now = time.time()
+        try:
+            payload = json.dumps(stored, default=str)
+            with self._lock:
+                self._refresh_version()
+                key = self._key(kind, question, model, params_json)
+                self._db.execute(
+                    "INSERT OR REPLACE INTO answers (key, kind, question, model, params, "
+                    "pack_version, embedding, result, created_at, last_hit_at, hits) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)",
+                    (
+                        key,
+                        kind,
+                        question,
+                        model,
+                        params_json,
+                        self.pack_version,
+                        vec.tobytes() if vec is not None else None,
+                        payload,
+                        now,
+                        now,
+                    ),
+                )
+                self._touches.pop(key, None)
+                self._write_touches()
+                self._evict_over_capacity()
+                self._db.commit()
+                self._matrices.clear()
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning("Answer cache store failed (%s): %s", self.path, e)
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters, entry count and the current pack version."""
+        with self._lock:
+            try:
+                self._flush_touches()
+                (entries,) = self._db.execute("SELECT COUNT(*) FROM answers").fetchone()
+            except sqlite3.Error:
+                entries = 0
+            lookups = self.exact_hits + self.semantic_hits + self.misses
+            return {
+                "entries": entries,
+                "exact_hits": self.exact_hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses,
+                "hit_rate": (self.exact_hits + self.semantic_hits) / lookups if lookups else 0.0,
+                "pack_version": self.pack_version,
+                "path": str(self.path),
+            }
+
+    def clear(self) -> None:
+        """Delete every cached answer and reset counters."""
+        with self._lock:
+            self._db.execute("DELETE FROM answers")
+            self._db.commit()
+            self._matrices.clear()
+            self._touches.clear()
+            self.exact_hits = self.semantic_hits = self.misses = 0
+
+    def close(self) -> None:
+        """Write buffered hits and close the SQLite connection."""
+        with self._lock:
+            try:
+                self._flush_touches()
+            except sqlite3.Error as e:
+                logger.warning("Answer cache: could not save hit times (%s): %s", self.path, e)
+            self._db.close()
+
+    # ------------------------------------------------------------------
+    # Internals (call with self._lock held, except _semantic_lookup)
+    # ------------------------------------------------------------------
+
+    def _semantic_lookup(
+        self,
+        group: tuple[list[str], np.ndarray],
+        question: str,
+        embed_fn: Callable[[str], Any],
+    ) -> dict[str, Any] | None:
+        """Return the closest cached answer at or above the similarity threshold."""
+        if self.similarity_threshold > 1.0:
+            return None
+        keys, matrix = group
+        try:
+            query_vec = self._unit(embed_fn(question))
+        except (RuntimeError, OSError) as e:
+            logger.warning("Answer cache: question embedding failed: %s", e)
+            return None
+        if query_vec is None or query_vec.shape[0] != matrix.shape[1]:
+            return None
+        scores = matrix @ query_vec
+        best = int(np.argmax(scores))
+        if float(scores[best]) < self.similarity_threshold:
+            return None
+        with self._lock:
+            row = self._db.execute(
+                "SELECT question, result FROM answers WHERE key = ?", (keys[best],)
+            ).fetchone()
+            if row is None:  # evicted or invalidated since the matrix was built
+                return None
+            self.semantic_hits += 1
+            self._touch(keys[best])
+            return self._hit(row, SEMANTIC, float(scores[best]))
+
+    def _key(self, kind: str, question: str, model: str, params_json: str) -> str:
+        raw = "\x1f".join((kind, normalize_query(question), model, params_json, self.pack_version))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _refresh_version(self) -> None:
+        """Purge entries of an older pack version when manifest.json has changed."""
+        try:
+            st = (self.pack_dir / "manifest.json").stat()
+            sig: tuple[int, int] | None = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            sig = None
+        if sig == self._manifest_sig and self.pack_version:
+            return
+        self._manifest_sig = sig
+        version = pack_content_version(self.pack_dir)
+        if version == self.pack_version:
+            return
+        self.pack_version = version
+        deleted = self._db.execute(
+            "DELETE FROM answers WHERE pack_version != ?", (version,)
+        ).rowcount
+        self._db.commit()
+        self._matrices.clear()
+        if deleted:
+            logger.info(
+                "Answer cache: pack %s changed (version %s), dropped %d stale answers",
+                self.pack_dir.name,
+                version,
+                deleted,
+            )
+
+    def _group_matrix(self, group: GroupKey) -> tuple[list[str], np.ndarray] | None:
+        if group not in self._matrices:
+            rows = self._db.execute(
+                "SELECT key, embedding FROM answers WHERE kind = ? AND model = ? AND params = ? "
+                "AND embedding IS NOT NULL",
+                group,
+            ).fetchall()
+            vectors = [np.frombuffer(blob, dtype=np.float32) for _, blob in rows]
+            dims = {v.shape[0] for v in vectors}
+            if not vectors or len(dims) != 1:
+                self._matrices[group] = ([], np.empty((0, 0), dtype=np.float32))
+            else:
+                self._matrices[group] = ([k for k, _ in rows], np.vstack(vectors))
+        keys, matrix = self._matrices[group]
+        return (keys, matrix) if keys else None
+
+    def _touch(self, key: str) -> None:
+        """Record a hit in memory; written by ``_flush_touches``."""
+        hits, _ = self._touches.get(key, (0, 0.0))
+        self._touches[key] = (hits + 1, time.time())
+        if (
+            len(self._touches) >= self.TOUCH_FLUSH_EVERY
+            or time.monotonic() - self._touches_since >= self.TOUCH_FLUSH_INTERVAL_S
+        ):
+            self._flush_touches()
+
+    def _flush_touches(self) -> None:
+        if self._touches:
+            self._write_touches()
+            self._db.commit()
+        self._touches_since = time.monotonic()
+
+    def _write_touches(self) -> None:
+        """Apply buffered hits in the current transaction (caller commits)."""
+        if not self._touches:
+            return
+        self._db.executemany(
+            "UPDATE answers SET hits = hits + ?, last_hit_at = ? WHERE key = ?",
+            [(hits, last, key) for key, (hits, last) in self._touches.items()],
+        )
+        self._touches.clear()
+
+    def _evict_over_capacity(self) -> None:
+        (count,) = self._db.execute("SELECT COUNT(*) FROM answers").fetchone()
+        if count > self.max_entries:
+            self._db.execute(
+                "DELETE FROM answers WHERE key IN "
+                "(SELECT key FROM answers ORDER BY last_hit_at ASC LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+    @staticmethod
+    def _unit(embedding: Any) -> np.ndarray | None:
+        vec = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        norm = float(np.linalg.norm(vec))
+        if not vec.size or norm == 0.0:
+            return None
+        return vec / norm
+
+    @staticmethod
+    def _hit(row: tuple[str, str], match: str, similarity: float) -> dict[str, Any]:
+        cached_question, payload = row
+        result = json.loads(payload)
+        result["answer_cache"] = {
+            "match": match,
+            "similarity": round(similarity, 4),
+            "cached_question": cached_question,
+        }
+        return result
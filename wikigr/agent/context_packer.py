@@ -0,0 +1,356 @@
+"""Token-budget context packing for synthesis prompts.
+
+Instead of concatenating every section of the top articles and cutting
+each article at a character limit, :func:`pack_context` splits the
+candidate sections of all sources into chunks, scores every chunk against
+the question, and greedily fills a token budget with the highest-value
+chunks.  The packed text is what ``fetch_source_text`` hands to synthesis
+when ``KnowledgeGraphAgent.CONTEXT_TOKEN_BUDGET`` is set.
+
+API Contract:
+    estimate_tokens(text) -> int
+    ClaudeTokenCounter(client, model)(text) -> int
+    ClaudeTokenCounter.count_many(texts) -> list[int]
+    chunk_text(text, max_chunk_tokens, count_tokens=estimate_tokens) -> list[str]
+    pack_context(articles, question_keywords, token_budget, *,
+                 max_chunk_tokens=200, count_tokens=estimate_tokens,
+                 split_tokens=None)
+        -> list[{"title": str, "text": str}]
+
+Design Philosophy:
+    - Budget accounting uses ``count_tokens``.  ``KnowledgeGraphAgent``
+      passes a :class:`ClaudeTokenCounter`, which asks the Messages
+      ``count_tokens`` endpoint once per distinct chunk and caches the
+      result, so the budget is measured in the synthesis model's own tokens.
+    - Chunk splitting and truncation call their counter many times per
+      article, so they use ``split_tokens`` (the cheap
+      :func:`estimate_tokens` when ``count_tokens`` is remote).  The estimate
+      is a BPE-style pre-tokenizer heuristic (word pieces, digit groups,
+      punctuation), not a tokenizer; chunk sizes are a soft limit.
+    - Chunk score = source rank weight x (0.2 + 0.8 x question-keyword
+      coverage), with a small bonus for an article's first chunk (its lead).
+    - Output keeps source order and, within an article, document order, so
+      the prompt reads like the articles rather than a bag of snippets.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Letter runs, digit runs and single symbols: the units BPE tokenizers split on.
+_PRETOKEN_RE = re.compile(r"[^\W\d_]+|\d+|[^\w\s]|_")
+_WORD_RE = re.compile(r"\w+")
+_PARAGRAPH_RE = re.compile(r"\n\s*\n")
+
+# Characters per token inside letter runs (common words are a single token)
+# and per token inside digit runs (digits are grouped in threes).
+_LETTERS_PER_TOKEN = 6
+_DIGITS_PER_TOKEN = 3
+
+RANK_DECAY = 0.25  # rank weight = 1 / (1 + rank * RANK_DECAY)
+LEAD_BONUS = 0.1  # added to the score of each article's first chunk
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of model tokens in *text*.
+
+    Counts pre-tokenizer pieces the way BPE vocabularies split them: a
+    letter run is one token per ``_LETTERS_PER_TOKEN`` characters, a digit
+    run one per three digits, and every punctuation mark its own token.
+    """
+    tokens = 0
+    for piece in _PRETOKEN_RE.findall(text):
+        if piece[0].isdigit():
+            tokens += math.ceil(len(piece) / _DIGITS_PER_TOKEN)
+        elif piece[0].isalpha():
+            tokens += math.ceil(len(piece) / _LETTERS_PER_TOKEN)
+        else:
+            tokens += 1
+    return tokens
+
+
+class ClaudeTokenCounter:
+    """Token counter backed by the Messages ``count_tokens`` endpoint.
+
+    Counts are cached per text (LRU, keyed by a digest), so each distinct
+    chunk costs one API call per counter.  When the endpoint fails or
+    returns no count, :func:`estimate_tokens` is used (and not cached), and
+    the endpoint is not tried again for ``RETRY_AFTER`` seconds.
+    """
+
+    RETRY_AFTER = 60.0
+
+    def __init__(
+        self, client: Any, model: str, max_entries: int = 100_000, max_workers: int = 8
+    ) -> None:
+        """Create a counter for *model*.
+
+        Args:
+            client: Synchronous Anthropic client.
+            model: Model whose tokenizer is counted.
+            max_entries: Cached counts kept (least recently used evicted).
+            max_workers: Concurrent API calls made by :meth:`count_many`.
+        """
+        if max_entries < 1 or max_workers < 1:
+            raise ValueError("max_entries and max_workers must be >= 1")
+        self.client = client
+        self.model = model
+        self.max_entries = max_entries
+        self.max_workers = max_workers
+        self._counts: OrderedDict[bytes, int] = OrderedDict()
+        self._lock = threading.Lock()
+        self._overhead: int | None = None
+        self._retry_at = 0.0
+        self._warned = False
+
+    def __call__(self, text: str) -> int:
+        """Tokens in *text*, excluding the fixed per-message overhead."""
+        if not text:
+            return 0
+        key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+        with self._lock:
+            count = self._counts.get(key)
+            if count is not None:
+                self._counts.move_to_end(key)
+                return count
+        overhead = self._message_overhead()
+        raw = self._count_message(text)
+        if overhead is None or raw is None:
+            return estimate_tokens(text)
+        count = max(0, raw - overhead)
+        with self._lock:
+            self._counts[key] = count
+            while len(self._counts) > self.max_entries:
+                self._counts.popitem(last=False)
+        return count
+
+    def count_many(self, texts: list[str]) -> list[int]:
+        """Count *texts*, calling the API for uncached ones concurrently."""
+        distinct = list(dict.fromkeys(texts))
+        if len(distinct) <= 1 or self.max_workers == 1:
+            return [self(t) for t in texts]
+        self._message_overhead()
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(distinct)),
+            thread_name_prefix="token-count",
+        ) as pool:
+            counts = dict(zip(distinct, pool.map(self, distinct)))
+        return [counts[t] for t in texts]
+
+    def _message_overhead(self) -> int | None:
+        """Tokens the endpoint adds around a one-token user message."""
+        if self._overhead is None:
+            raw = self._count_message("x")
+            if raw is not None:
+                self._overhead = max(0, raw - 1)
+        return self._overhead
+
+    def _count_message(self, text: str) -> int | None:
+        if time.monotonic() < self._retry_at:
+            return None
+        try:
+            response = self.client.messages.count_tokens(
+                model=self.model, messages=[{"role": "user", "content": text}]
+            )
+        except Exception as e:
+            self._warn(e)
+            return None
+        tokens = getattr(response, "input_tokens", None)
+        if not isinstance(tokens, int):
+            self._warn(f"unexpected response {response!r}")
+            return None
+        return tokens
+
+    def _warn(self, reason: object) -> None:
+        self._retry_at = time.monotonic() + self.RETRY_AFTER
+        if not self._warned:
+            self._warned = True
+            logger.warning("Token counting via the API failed, estimating instead: %s", reason)
+
+
+def chunk_text(
+    text: str,
+    max_chunk_tokens: int,
+    count_tokens: Callable[[str], int] = estimate_tokens,
+) -> list[str]:
+    """Split *text* into chunks of at most *max_chunk_tokens* tokens.
+
+    Paragraphs are merged while they fit; a paragraph that is too long on
+    its own is split on word boundaries (and a word longer than the limit
+    is hard-split).
+    """
+    if max_chunk_tokens < 1:
+        raise ValueError(f"max_chunk_tokens must be >= 1, got {max_chunk_tokens!r}")
+    chunks: list[str] = []
+    current: list[str] = []
+    current_tokens = 0
+    for paragraph in _PARAGRAPH_RE.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        tokens = count_tokens(paragraph)
+        if tokens > max_chunk_tokens:
+            if current:
+                chunks.append("\n\n".join(current))
+                current, current_tokens = [], 0
+            chunks.extend(_split_long(paragraph, max_chunk_tokens, count_tokens))
+            continue
+        if current and current_tokens + tokens > max_chunk_tokens:
+            chunks.append("\n\n".join(current))
+            current, current_tokens = [], 0
+        current.append(paragraph)
+        current_tokens += tokens
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+def _split_long(
+    paragraph: str, max_chunk_tokens: int, count_tokens: Callable[[str], int]
+) -> list[str]:
+    pieces: list[str] = []
+    words: list[str] = []
+    tokens = 0
+    for word in paragraph.split():
+        word_tokens = count_tokens(word)
+        while word_tokens > max_chunk_tokens:
+            # Hard-split a single oversized "word" (URLs, base64, tables).
+            cut = max(1, len(word) * max_chunk_tokens // word_tokens)
+            if words:
+                pieces.append(" ".join(words))
+                words, tokens = [], 0
+            pieces.append(word[:cut])
+            word = word[cut:]
+            word_tokens = count_tokens(word)
+        if words and tokens + word_tokens > max_chunk_tokens:
+            pieces.append(" ".join(words))
+            words, tokens = [], 0
+        if word:
+            words.append(word)
+            tokens += word_tokens
+    if words:
+        pieces.append(" ".join(words))
+    return pieces
+
+
+def pack_context(
+    articles: list[tuple[str, list[str]]],
+    question_keywords: frozenset[str],
+    token_budget: int,
+    *,
+    max_chunk_tokens: int = 200,
+    count_tokens: Callable[[str], int] = estimate_tokens,
+    split_tokens: Callable[[str], int] | None = None,
+) -> list[dict[str, str]]:
+    """Select the highest-value chunks of *articles* that fit in *token_budget*.
+
+    Args:
+        articles: ``(title, sections)`` pairs in source rank order.
+        question_keywords: Lower-cased question words (stop words removed).
+        token_budget: Maximum tokens of packed text, including the
+            ``## title`` header of every article that contributes a chunk.
+        max_chunk_tokens: Chunk size limit.
+        count_tokens: Token counter for the budget: every candidate chunk
+            and article header is counted once (default :func:`estimate_tokens`).
+            Counters with a ``count_many(texts)`` method count them in one call.
+        split_tokens: Counter used while splitting articles into chunks and
+            truncating an oversized chunk, which call it many times.
+            Defaults to *count_tokens*.
+
+    Returns:
+        ``[{"title": ..., "text": ...}]`` in source order; each text is the
+        article's selected chunks in document order.  If even the best chunk
+        does not fit, it is truncated to the budget (as measured by
+        *split_tokens*) and ends with ``...``.
+
+    Raises:
+        ValueError: If token_budget or max_chunk_tokens is not positive.
+    """
+    if token_budget < 1:
+        raise ValueError(f"token_budget must be >= 1, got {token_budget!r}")
+    if max_chunk_tokens < 1:
+        raise ValueError(f"max_chunk_tokens must be >= 1, got {max_chunk_tokens!r}")
+
+    if split_tokens is None:
+        split_tokens = count_tokens
+    keywords = frozenset(w for k in question_keywords for w in _WORD_RE.findall(k.lower()))
+    # (score, rank, position, text)
+    scored: list[tuple[float, int, int, str]] = []
+    for rank, (_title, sections) in enumerate(articles):
+        rank_weight = 1.0 / (1.0 + rank * RANK_DECAY)
+        chunks = [c for s in sections for c in chunk_text(s, max_chunk_tokens, split_tokens)]
+        for position, chunk in enumerate(chunks):
+            score = rank_weight * (0.2 + 0.8 * _coverage(chunk, keywords))
+            if position == 0:
+                score += LEAD_BONUS * rank_weight
+            scored.append((score, rank, position, chunk))
+    headers = [f"## {title}\n" for title, _ in articles]
+    counts = _count_all(count_tokens, [c[3] for c in scored] + headers)
+    header_tokens = counts[len(scored) :]
+    # (score, rank, position, text, tokens)
+    candidates = [(*c, tokens) for c, tokens in zip(scored, counts)]
+    candidates.sort(key=lambda c: (-c[0], c[1], c[2]))
+
+    selected: dict[int, list[tuple[int, str]]] = {}
+    remaining = token_budget
+    for _score, rank, position, chunk, tokens in candidates:
+        cost = tokens + (0 if rank in selected else header_tokens[rank])
+        if cost <= remaining:
+            selected.setdefault(rank, []).append((position, chunk))
+            remaining -= cost
+        elif not selected and remaining > header_tokens[rank]:
+            # Nothing fits whole: keep a truncated head of the best chunk.
+            room = remaining - header_tokens[rank] - split_tokens("...")
+            head = _truncate(chunk, room, split_tokens)
+            if head:
+                selected[rank] = [(position, head + "...")]
+                remaining = 0
+        if remaining <= 0:
+            break
+
+    return [
+        {
+            "title": articles[rank][0],
+            "text": "\n\n".join(chunk for _, chunk in sorted(selected[rank])),
+        }
+        for rank in sorted(selected)
+    ]
+
+
+def _count_all(count_tokens: Callable[[str], int], texts: list[str]) -> list[int]:
+    count_many = getattr(count_tokens, "count_many", None)
+    if count_many is not None:
+        return count_many(texts)
+    return [count_tokens(t) for t in texts]
+
+
+def _coverage(text: str, question_keywords: frozenset[str]) -> float:
+    if not question_keywords:
+        return 0.0
+    words = {w.lower() for w in _WORD_RE.findall(text)}
+    return len(question_keywords & words) / len(question_keywords)
+
+
+def _truncate(text: str, max_tokens: int, count_tokens: Callable[[str], int]) -> str:
+    """Longest prefix of *text* with at most *max_tokens* tokens (binary search)."""
+    if max_tokens < 1:
+        return ""
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if count_tokens(text[:mid]) <= max_tokens:
+            lo = mid
+        else:
+            hi = mid - 1
+    return text[:lo].rstrip()
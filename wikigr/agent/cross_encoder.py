@@ -5,6 +5,8 @@ higher relevance precision than bi-encoder vector search alone.
 
 Design:
     - CPU-only inference (no GPU required)
+    - Model weights shared process-wide through the ModelRegistry, so every
+      agent and evaluator reuses one loaded cross-encoder
     - Graceful degradation: __init__ failure sets _model = None; rerank() returns
       results unchanged rather than raising
     - Shallow copies of result dicts with ce_score added (does not mutate caller's list)
@@ -53,9 +55,11 @@ class CrossEncoderReranker:
             )
         self._model = None
         try:
-            from sentence_transformers import CrossEncoder
+            from bootstrap.src.embeddings.registry import CROSS_ENCODER, get_model_registry
 
-            self._model = CrossEncoder(model_name)
+            self._model = get_model_registry().acquire(
+                model_name, device="cpu", backend=CROSS_ENCODER
+            )
             logger.info("CrossEncoderReranker loaded model: %s", model_name)
         except Exception as e:
             logger.warning(
@@ -64,6 +68,12 @@ class CrossEncoderReranker:
                 e,
             )
 
+    def close(self) -> None:
+        """Release this reranker's reference to the shared model."""
+        if self._model is not None:
+            self._model.release()
+            self._model = None
+
     def rerank(
         self,
         query: str,
@@ -0,0 +1,304 @@
+"""Federated retrieval and synthesis across several knowledge packs.
+
+A question such as "How do I call a LangChain tool from an asyncio task?"
+spans python-expert and langchain-expert.  :class:`FederatedQueryEngine`
+runs ``KnowledgeGraphAgent.retrieve()`` on every pack concurrently, using
+warm agents checked out of a :class:`~wikigr.agent.pool.PackAgentPool`,
+merges the passages into one ranked context and makes a single synthesis
+call.  Retrieval wall time is that of the slowest pack, not the sum.
+
+API Contract:
+    FederatedQueryEngine(pool, claude_client=None, synthesis_model=None, max_workers=8)
+        .retrieve(question, packs, max_results=10, max_passages=5) -> dict
+        .query(question, packs, max_results=10, max_passages=5) -> dict
+        .close() -> None
+    calibrate_passages(pack_results, rrf_k=2) -> list[dict]
+
+Design Philosophy:
+    - Raw similarities are not comparable across packs: a narrow pack scores
+      everything high.  Calibration is rank-based (reciprocal rank within the
+      pack) weighted by the pack's best similarity, so an off-topic pack's top
+      passage ranks below an on-topic pack's top passages.
+    - Packs whose confidence gate fired contribute nothing; a pack that fails
+      to open or query is reported in ``degraded_packs`` and skipped.
+    - The merged passages go through the same token-budget packer as
+      single-pack synthesis (``wikigr.agent.context_packer``).
+"""
+
+from __future__ import annotations
+
+import contextvars
+import logging
+import time
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from anthropic import Anthropic, APIConnectionError, APIStatusError, APITimeoutError
+
+from wikigr.agent import telemetry
+from wikigr.agent.context_packer import pack_context
+from wikigr.agent.kg_agent import KnowledgeGraphAgent
+from wikigr.agent.pool import PackAgentPool
+from wikigr.agent.synthesizer import build_minimal_prompt
+
+logger = logging.getLogger(__name__)
+
+# Small on purpose: with the usual 60 the pack weight alone would decide the
+# order, and every passage of the best pack would precede any other pack's.
+RRF_K = 2
+
+
+def calibrate_passages(pack_results: Mapping[str, dict], rrf_k: int = RRF_K) -> list[dict]:
+    """Merge the passages of several ``retrieve()`` results into one ranking.
+
+    A passage at rank *r* (0-based) of pack *p* scores
+    ``max_similarity(p) / (rrf_k + r + 1)``.  Results with ``confident``
+    False are skipped.
+
+    Args:
+        pack_results: ``{pack_name: retrieve() result}``.
+        rrf_k: Reciprocal-rank smoothing constant.
+
+    Returns:
+        ``[{"pack", "title", "text", "similarity", "score"}]`` best first;
+        ``similarity`` is the pack-local score from ``retrieve()``.
+    """
+    merged: list[dict] = []
+    for pack, result in pack_results.items():
+        if not result.get("confident", True):
+            continue
+        weight = float(result.get("max_similarity") or 0.0)
+        for rank, passage in enumerate(result.get("passages", [])):
+            merged.append(
+                {
+                    "pack": pack,
+                    "title": passage["title"],
+                    "text": passage.get("text", ""),
+                    "similarity": passage.get("score"),
+                    "score": round(weight / (rrf_k + rank + 1), 6),
+                }
+            )
+    merged.sort(key=lambda p: (-p["score"], -(p["similarity"] or 0.0)))
+    return merged
+
+
+class FederatedQueryEngine:
+    """Answer one question from several packs with a single synthesis call."""
+
+    DEFAULT_MAX_WORKERS = 8
+
+    def __init__(
+        self,
+        pool: PackAgentPool,
+        claude_client: Anthropic | None = None,
+        synthesis_model: str | None = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ):
+        """Initialize the engine.
+
+        Args:
+            pool: Pool the per-pack agents are checked out of.
+            claude_client: Anthropic client for synthesis (created on first
+                :meth:`query` when None).
+            synthesis_model: Claude model (default ``KnowledgeGraphAgent.DEFAULT_MODEL``).
+            max_workers: Packs retrieved concurrently.
+        """
+        if not isinstance(max_workers, int) or max_workers < 1:
+            raise ValueError(f"max_workers must be a positive integer, got {max_workers!r}")
+        self.pool = pool
+        self._claude = claude_client
+        self.synthesis_model = synthesis_model or KnowledgeGraphAgent.DEFAULT_MODEL
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="kg-federated"
+        )
+
+    @property
+    def claude(self) -> Anthropic:
+        if self._claude is None:
+            self._claude = Anthropic()
+        return self._claude
+
+    @telemetry.traced("federated_retrieve")
+    def retrieve(
+        self,
+        question: str,
+        packs: Mapping[str, str | Path],
+        max_results: int = 10,
+        max_passages: int = 5,
+    ) -> dict[str, Any]:
+        """Retrieve from every pack concurrently and merge the passages.
+
+        Args:
+            question: Natural language question.
+            packs: ``{pack_name: path to pack.db}``.
+            max_results: Per-pack ``max_results`` for ``retrieve()``.
+            max_passages: Per-pack passages, and passages kept after merging.
+
+        Returns:
+            {
+                "sources": ["Article 1", ...],          # merged ranking
+                "passages": [{"pack", "title", "text", "similarity", "score"}],
+                "facts": ["Fact 1", ...],
+                "packs": {"python-expert": {"max_similarity": 0.81,
+                          "confident": True, "sources": 5}},
+                "degraded_packs": ["broken-pack"],
+                "stage_timings": {"retrieve": 0.42}
+            }
+        """
+        if not packs:
+            raise ValueError("packs must name at least one pack")
+        t_start = time.perf_counter()
+        with telemetry.span("federated_retrieve"):
+            futures = {
+                name: self._executor.submit(
+                    contextvars.copy_context().run,
+                    self._retrieve_pack,
+                    name,
+                    str(db_path),
+                    question,
+                    max_results,
+                    max_passages,
+                )
+                for name, db_path in packs.items()
+            }
+            pack_results: dict[str, dict] = {}
+            degraded: list[str] = []
+            for name, future in futures.items():
+                try:
+                    pack_results[name] = future.result()
+                except (RuntimeError, OSError, ValueError) as e:
+                    logger.warning("Federated retrieval failed for pack %r: %s", name, e)
+                    degraded.append(name)
+
+        passages = calibrate_passages(pack_results)[:max_passages]
+        facts = list(
+            dict.fromkeys(
+                fact
+                for result in pack_results.values()
+                if result.get("confident", True)
+                for fact in result.get("facts", [])
+            )
+        )
+        return {
+            "sources": list(dict.fromkeys(p["title"] for p in passages)),
+            "passages": passages,
+            "facts": facts,
+            "packs": {
+                name: {
+                    "max_similarity": result.get("max_similarity"),
+                    "confident": result.get("confident", True),
+                    "sources": len(result.get("sources", [])),
+                }
+                for name, result in pack_results.items()
+            },
+            "degraded_packs": degraded,
+            "stage_timings": {"retrieve": round(time.perf_counter() - t_start, 4)},
+        }
+
+    @telemetry.traced("federated_query")
+    def query(
+        self,
+        question: str,
+        packs: Mapping[str, str | Path],
+        max_results: int = 10,
+        max_passages: int = 5,
+    ) -> dict[str, Any]:
+        """Answer *question* from the merged context of all *packs*.
+
+        Args and merged retrieval fields are those of :meth:`retrieve`.
+
+        Returns:
+            The :meth:`retrieve` result plus ``answer``, ``query_type``
+            (``"federated"``, or ``"training_only_response"`` when no pack
+            was confident) and ``token_usage`` of this call's synthesis (the
+            engine is shared by concurrent requests, so nothing accumulates
+            on it).
+        """
+        result = self.retrieve(question, packs, max_results, max_passages)
+        t_synth = time.perf_counter()
+        with telemetry.span("synthesis"):
+            if result["passages"]:
+                prompt = self._prompt(question, result)
+                fallback = f"Found relevant sources: {', '.join(result['sources'][:5])}"
+            else:
+                prompt = build_minimal_prompt(question)
+                fallback = "Unable to answer: API error."
+            answer, token_usage = self._synthesize(prompt, fallback)
+        result["stage_timings"]["synthesis"] = round(time.perf_counter() - t_synth, 4)
+        result["answer"] = answer
+        result["query_type"] = "federated" if result["passages"] else "training_only_response"
+        result["token_usage"] = token_usage
+        return result
+
+    def close(self) -> None:
+        """Shut down the retrieval workers (the pool is owned by the caller)."""
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _retrieve_pack(
+        self, name: str, db_path: str, question: str, max_results: int, max_passages: int
+    ) -> dict[str, Any]:
+        with self.pool.acquire(name, db_path) as agent:
+            return agent.retrieve(question, max_results=max_results, max_passages=max_passages)
+
+    def _prompt(self, question: str, result: dict[str, Any]) -> str:
+        articles = [
+            (f"{p['title']} [{p['pack']}]", [p["text"]]) for p in result["passages"] if p["text"]
+        ]
+        keywords = frozenset(
+            w for w in question.lower().split() if w not in KnowledgeGraphAgent.STOP_WORDS
+        )
+        budget = KnowledgeGraphAgent.CONTEXT_TOKEN_BUDGET
+        packed = (
+            pack_context(articles, keywords, budget)
+            if budget is not None and articles
+            else [{"title": title, "text": texts[0]} for title, texts in articles]
+        )
+        source_text = "\n\n".join(f"## {p['title']}\n{p['text']}" for p in packed)
+        facts = "\n".join(f"- {fact}" for fact in result["facts"][:10])
+        return f"""You are a knowledgeable expert. Answer the question below using BOTH your own expertise AND content retrieved from {len(result["packs"])} knowledge packs ({", ".join(result["packs"])}).
+
+When the retrieved content provides specific, detailed, or up-to-date information, prefer it and cite the source articles with their pack in brackets. When it is limited or irrelevant, draw on your own knowledge.
+
+Question: {question}
+
+Facts:
+{facts}
+
+Retrieved Article Text:
+{source_text}
+
+Provide a clear, accurate, comprehensive answer."""
+
+    def _synthesize(self, prompt: str, fallback: str) -> tuple[str, dict[str, int]]:
+        """Return (answer, token usage of this call)."""
+        token_usage = {"input_tokens": 0, "output_tokens": 0, "api_calls": 0}
+        try:
+            response = self.claude.messages.create(
+                model=self.synthesis_model,
+                max_tokens=KnowledgeGraphAgent.SYNTHESIS_MAX_TOKENS,
+                messages=[{"role": "user", "content": prompt}],
+            )
+        except (APIConnectionError, APIStatusError, APITimeoutError) as e:
+            logger.warning(f"Claude API error in federated synthesis: {e}")
+            return fallback, token_usage
+        telemetry.record_llm_call(response, default_model=self.synthesis_model)
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            token_usage["input_tokens"] = getattr(usage, "input_tokens", 0)
+            token_usage["output_tokens"] = getattr(usage, "output_tokens", 0)
+            token_usage["api_calls"] = 1
+        if not response.content:
+            return "Unable to synthesize answer: empty response from Claude.", token_usage
+        return response.content[0].text, token_usage
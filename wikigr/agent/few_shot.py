@@ -5,12 +5,15 @@ few-shot examples based on semantic similarity to queries.
 
 API Contract:
     FewShotManager(examples_path: Path) -> instance
-    find_similar_examples(query: str, k: int = 3) -> list[dict]
+    find_similar_examples(query: str, k: int = 3, query_embedding=None) -> list[dict]
 
 Design Philosophy:
-    - Sentence-transformers for semantic embeddings
+    - Sentence-transformers for semantic embeddings, shared with the rest of
+      the process through the ModelRegistry (one copy of BGE per process)
     - Cosine similarity for ranking
     - Precomputed embeddings cached in memory
+    - Examples and queries both carry the BGE query prefix, so the query
+      embedding computed for vector search can be reused here unchanged
     - Simple top-k retrieval
 """
 
@@ -22,12 +25,18 @@ from typing import Any
 import numpy as np
 from sentence_transformers import SentenceTransformer
 
+from bootstrap.src.embeddings.generator import BGE_QUERY_PREFIX
+from bootstrap.src.embeddings.query_cache import get_query_embedding_cache
+from bootstrap.src.embeddings.registry import get_model_registry
+
 logger = logging.getLogger(__name__)
 
 
 class FewShotManager:
     """Manages and retrieves few-shot examples using semantic similarity."""
 
+    MODEL_NAME = "BAAI/bge-base-en-v1.5"
+
     def __init__(self, examples_path: Path | str):
         """Initialize manager and load examples from JSON file.
 
@@ -57,24 +66,31 @@ class FewShotManager:
         if len(self.examples) > 1000:
             raise ValueError(f"Too many examples: {len(self.examples)} (max 1000)")
 
-        # Initialize embedding model (sentence-transformers)
-        self.model = SentenceTransformer("BAAI/bge-base-en-v1.5")
+        # Shared embedding model (same weights as the agent's EmbeddingGenerator)
+        self.model = get_model_registry().acquire(self.MODEL_NAME, loader=SentenceTransformer)
 
         # Precompute embeddings for all examples
         if self.examples:
             queries = [ex.get("query", ex.get("question", "")) for ex in self.examples]
-            self.embeddings = np.array(self.model.encode(queries))
+            self.embeddings = np.array(
+                self.model.encode([BGE_QUERY_PREFIX + q for q in queries]), dtype=np.float32
+            )
         else:
             self.embeddings = np.array([])
 
         logger.info(f"Loaded {len(self.examples)} few-shot examples from {self.examples_path}")
 
-    def find_similar_examples(self, query: str, k: int = 3) -> list[dict[str, Any]]:
+    def find_similar_examples(
+        self, query: str, k: int = 3, query_embedding: Any = None
+    ) -> list[dict[str, Any]]:
         """Find k most similar examples to query using cosine similarity.
 
         Args:
             query: Input query to match against examples
             k: Number of examples to return (default 3)
+            query_embedding: Precomputed BGE query embedding for *query* (with
+                the query prefix).  When None it is looked up in the shared
+                query-embedding cache and encoded only on a miss.
 
         Returns:
             List of dicts with example fields plus "score" (cosine similarity in [-1, 1])
@@ -96,8 +112,9 @@ class FewShotManager:
         if k == 0 or not self.examples:
             return []
 
-        # Compute query embedding
-        query_embedding = np.array(self.model.encode([query]))[0]
+        if query_embedding is None:
+            query_embedding = self._embed_query(query)
+        query_embedding = np.asarray(query_embedding)
 
         # Calculate cosine similarity with all examples
         similarities = self._cosine_similarity(query_embedding, self.embeddings)
@@ -116,6 +133,20 @@ class FewShotManager:
 
         return results
 
+    def _embed_query(self, query: str) -> np.ndarray:
+        """Return the prefixed query embedding, reusing the shared cache."""
+        return get_query_embedding_cache().get_or_encode(
+            self.MODEL_NAME,
+            BGE_QUERY_PREFIX,
+            [query],
+            lambda texts: np.array(self.model.encode([BGE_QUERY_PREFIX + t for t in texts])),
+        )[0]
+
+    def close(self) -> None:
+        """Release this manager's reference to the shared embedding model."""
+        if hasattr(self.model, "release"):
+            self.model.release()
+
     def _cosine_similarity(self, query_vec: np.ndarray, example_vecs: np.ndarray) -> np.ndarray:
         """Calculate cosine similarity between query and example vectors.
 
@@ -0,0 +1,377 @@
+"""In-memory CSR snapshot of a pack's article and entity graphs.
+
+``LINKS_TO`` and ``ENTITY_RELATION`` traversals used to run as Cypher from
+hybrid retrieval, the graph reranker, multi-doc expansion, ``graph_query``,
+``find_relationship_path`` and the backend graph endpoint: one round-trip
+per seed, and variable-length matches whose cost grows with the number of
+walks rather than the number of nodes.  A :class:`GraphSnapshot` loads both
+edge sets once when a read-only pack is opened and answers neighbourhoods,
+degrees and breadth-first searches from numpy arrays.
+
+API Contract:
+    CSRGraph(names, src, dst, labels=None)
+        .id(name) -> int | None, .names, len(graph), .num_edges
+        .neighbors(name, direction="out", limit=None) -> list[str]
+        .degree(name, direction="both") -> int
+        .k_hop(seeds, max_hops, direction="out", limit=None, where=None) -> list[(name, hop)]
+        .distance(source, target, max_hops, direction="out") -> int | None
+        .shortest_paths(source, target, max_hops, k=5, direction="out")
+            -> list[(nodes, relations)]
+    GraphSnapshot(articles, entities, has_content, version=None)
+    load_graph_snapshot(conn, version=None) -> GraphSnapshot | None
+
+Design Philosophy:
+    - Compressed sparse rows in both directions: ``indptr``/``indices`` for
+      outgoing edges and a transposed copy for incoming ones, so degrees are
+      ``indptr`` differences and a BFS level is one vectorized gather.
+    - Node ids follow sorted node names, and every BFS level is emitted in id
+      order, so results are ordered by (hop, name) like the
+      ``ORDER BY depth, title`` Cypher they replace.
+    - Paths come from a bidirectional BFS that grows the smaller frontier and
+      stops at the first level where both sides meet, so a 5-hop search
+      touches two ~2.5-hop neighbourhoods instead of every 5-hop walk.
+    - Articles are keyed by title and entities by name, the keys callers
+      already hold; duplicate entity names collapse into one node.
+    - Searches take ``limit`` / ``max_hops`` bounds, so work and memory stay
+      proportional to what the caller keeps.
+    - The snapshot is immutable and tagged with the pack's ``db_version``;
+      the owner rebuilds it when the version changes.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from bootstrap.src.query_result import fetch
+
+logger = logging.getLogger(__name__)
+
+DIRECTIONS = ("out", "in", "both")
+
+
+class CSRGraph:
+    """Directed graph in compressed sparse row form with a name <-> id map."""
+
+    def __init__(
+        self,
+        names: Iterable[str],
+        src: Sequence[int] | np.ndarray,
+        dst: Sequence[int] | np.ndarray,
+        labels: Sequence[str | None] | None = None,
+    ):
+        """Build the forward and reverse adjacency of ``src[i] -> dst[i]`` edges.
+
+        Args:
+            names: Node names; ``src``/``dst`` index into this sequence.
+                Names are re-numbered in sorted order.
+            src: Source node positions.
+            dst: Target node positions.
+            labels: Optional edge label per edge (e.g. the relation type).
+
+        Raises:
+            ValueError: If ``src``, ``dst`` and ``labels`` differ in length.
+        """
+        given = list(names)
+        self.names: list[str] = sorted(set(given))
+        self._ids: dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        renumber = np.fromiter((self._ids[n] for n in given), dtype=np.int64, count=len(given))
+
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        if len(src) != len(dst) or (labels is not None and len(labels) != len(src)):
+            raise ValueError("src, dst and labels must have the same length")
+        src, dst = renumber[src], renumber[dst]
+
+        label_names = sorted({label for label in labels if label}) if labels is not None else []
+        self.label_names: list[str] = label_names
+        codes = {label: i for i, label in enumerate(label_names)}
+        label_codes = (
+            np.fromiter((codes.get(label, -1) for label in labels), dtype=np.int32, count=len(src))
+            if labels is not None
+            else np.full(len(src), -1, dtype=np.int32)
+        )
+
+        n = len(self.names)
+        order = np.lexsort((dst, src))
+        self.indptr, self.indices = _csr(src[order], dst[order], n)
+        self.edge_labels = label_codes[order]
+        order = np.lexsort((src, dst))
+        self.rev_indptr, self.rev_indices = _csr(dst[order], src[order], n)
+        self.rev_edge_labels = label_codes[order]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.indices)
+
+    def id(self, name: str) -> int | None:
+        """Return the node id of *name*, or None if it is not in the graph."""
+        return self._ids.get(name)
+
+    def neighbors(self, name: str, direction: str = "out", limit: int | None = None) -> list[str]:
+        """Names adjacent to *name* in *direction*, sorted by name."""
+        i = self._ids.get(name)
+        if i is None:
+            return []
+        ids = self._expand(np.array([i]), direction)
+        return [self.names[j] for j in ids[:limit]]
+
+    def degree(self, name: str, direction: str = "both") -> int:
+        """Number of edges at *name* in *direction* (0 for unknown names)."""
+        i = self._ids.get(name)
+        if i is None:
+            return 0
+        _check_direction(direction)
+        out_degree = int(self.indptr[i + 1] - self.indptr[i])
+        in_degree = int(self.rev_indptr[i + 1] - self.rev_indptr[i])
+        return {"out": out_degree, "in": in_degree, "both": out_degree + in_degree}[direction]
+
+    def k_hop(
+        self,
+        seeds: Iterable[str],
+        max_hops: int,
+        direction: str = "out",
+        limit: int | None = None,
+        where: np.ndarray | None = None,
+    ) -> list[tuple[str, int]]:
+        """Breadth-first neighbourhood of *seeds* up to *max_hops* edges away.
+
+        Seeds themselves are not returned.  Unknown seeds are ignored.  With
+        *where* (a boolean mask over node ids) only nodes whose flag is set
+        are returned; the others are still traversed.
+
+        Returns:
+            ``[(name, hop)]`` ordered by hop, then name; at most *limit* entries.
+        """
+        _check_direction(direction)
+        seed_ids = [i for i in (self._ids.get(s) for s in seeds) if i is not None]
+        if not seed_ids or max_hops < 1:
+            return []
+        visited = np.zeros(len(self.names), dtype=bool)
+        frontier = np.unique(seed_ids)
+        visited[frontier] = True
+        found: list[tuple[str, int]] = []
+        for hop in range(1, max_hops + 1):
+            frontier = self._expand(frontier, direction)
+            frontier = frontier[~visited[frontier]]
+            if not len(frontier):
+                break
+            visited[frontier] = True
+            kept = frontier if where is None else frontier[where[frontier]]
+            found.extend((self.names[i], hop) for i in kept)
+            if limit is not None and len(found) >= limit:
+                return found[:limit]
+        return found
+
+    def distance(
+        self, source: str, target: str, max_hops: int, direction: str = "out"
+    ) -> int | None:
+        """Length of the shortest path from *source* to *target*, or None beyond *max_hops*."""
+        paths = self.shortest_paths(source, target, max_hops, k=1, direction=direction)
+        return len(paths[0][0]) - 1 if paths else None
+
+    def shortest_paths(
+        self,
+        source: str,
+        target: str,
+        max_hops: int,
+        k: int = 5,
+        direction: str = "out",
+    ) -> list[tuple[list[str], list[str | None]]]:
+        """Up to *k* shortest paths from *source* to *target*, by bidirectional BFS.
+
+        Each step expands whichever side has the smaller frontier; the search
+        stops at the first level where the sides meet or once *max_hops* is
+        reached.  Only paths of the minimum length are returned.  They are
+        enumerated lazily from the two distance layers, so at most *k* are
+        built however many shortest paths exist.
+
+        Returns:
+            ``[(nodes, relations)]``: node names from source to target, and the
+            label of the edge between consecutive nodes (the lowest label when
+            several edges connect them; for ``direction="both"`` the edge may
+            point backwards).  Empty when there is no path within *max_hops*.
+        """
+        _check_direction(direction)
+        s, t = self._ids.get(source), self._ids.get(target)
+        if s is None or t is None or k < 1:
+            return []
+        if s == t:
+            return [([source], [])]
+        backward = {"out": "in", "in": "out", "both": "both"}[direction]
+
+        dist_f = np.full(len(self.names), -1, dtype=np.int32)
+        dist_b = np.full(len(self.names), -1, dtype=np.int32)
+        dist_f[s] = dist_b[t] = 0
+        front_f, front_b = np.array([s]), np.array([t])
+        meet = np.zeros(0, dtype=np.int64)
+        for _ in range(max_hops):
+            if len(front_f) <= len(front_b):
+                front_f = self._bfs_step(front_f, dist_f, direction)
+                meet = front_f[dist_b[front_f] >= 0]
+            else:
+                front_b = self._bfs_step(front_b, dist_b, backward)
+                meet = front_b[dist_f[front_b] >= 0]
+            if len(meet) or not len(front_f) or not len(front_b):
+                break
+
+        paths: list[tuple[list[str], list[str | None]]] = []
+        for m in meet:
+            for head in self._walks(int(m), dist_f, backward):
+                for tail in self._walks(int(m), dist_b, direction):
+                    ids = head[::-1] + tail[1:]
+                    labels = [self._edge_label(u, v) for u, v in zip(ids, ids[1:])]
+                    paths.append(([self.names[i] for i in ids], labels))
+                    if len(paths) >= k:
+                        return paths
+        return paths
+
+    def _bfs_step(self, frontier: np.ndarray, dist: np.ndarray, direction: str) -> np.ndarray:
+        """Expand *frontier* by one level, recording the new ids' level in *dist*."""
+        level = dist[frontier[0]] + 1
+        frontier = self._expand(frontier, direction)
+        frontier = frontier[dist[frontier] < 0]
+        dist[frontier] = level
+        return frontier
+
+    def _walks(self, start: int, dist: np.ndarray, direction: str) -> Iterator[list[int]]:
+        """Yield every id walk from *start* down *dist* one level per step to level 0."""
+        level = dist[start]
+        if level == 0:
+            yield [start]
+            return
+        steps = self._expand(np.array([start]), direction)
+        for step in steps[dist[steps] == level - 1]:
+            for rest in self._walks(int(step), dist, direction):
+                yield [start, *rest]
+
+    def _edge_label(self, u: int, v: int) -> str | None:
+        """Label of the ``u -> v`` edge, or of ``v -> u`` if there is none."""
+        codes = self.edge_labels[self.indptr[u] : self.indptr[u + 1]][
+            self.indices[self.indptr[u] : self.indptr[u + 1]] == v
+        ]
+        if not len(codes):
+            codes = self.rev_edge_labels[self.rev_indptr[u] : self.rev_indptr[u + 1]][
+                self.rev_indices[self.rev_indptr[u] : self.rev_indptr[u + 1]] == v
+            ]
+        codes = codes[codes >= 0]
+        return self.label_names[int(codes.min())] if len(codes) else None
+
+    def _expand(self, frontier: np.ndarray, direction: str) -> np.ndarray:
+        """Sorted unique ids adjacent to any id in *frontier*."""
+        _check_direction(direction)
+        parts = []
+        if direction in ("out", "both"):
+            parts.append(_gather(self.indptr, self.indices, frontier))
+        if direction in ("in", "both"):
+            parts.append(_gather(self.rev_indptr, self.rev_indices, frontier))
+        return np.unique(np.concatenate(parts))
+
+
+def _check_direction(direction: str) -> None:
+    if direction not in DIRECTIONS:
+        raise ValueError(f"direction must be one of {DIRECTIONS}, got {direction!r}")
+
+
+def _csr(src: np.ndarray, dst: np.ndarray, n: int) -> tuple[np.ndarray, np.ndarray]:
+    """``indptr``/``indices`` arrays of edges already sorted by *src*."""
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+    return indptr, dst.astype(np.int32)
+
+
+def _gather(indptr: np.ndarray, indices: np.ndarray, frontier: np.ndarray) -> np.ndarray:
+    """Concatenate the adjacency rows of every id in *frontier* without a Python loop."""
+    starts = indptr[frontier]
+    counts = indptr[frontier + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int64)
+    offsets = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(total)
+    return indices[offsets].astype(np.int64)
+
+
+@dataclass(frozen=True)
+class GraphSnapshot:
+    """``LINKS_TO`` article graph and ``ENTITY_RELATION`` entity graph of one pack.
+
+    Attributes:
+        articles: Articles keyed by title.
+        entities: Entities keyed by name; edge labels are relation types.
+        has_content: Mask over article ids, True where ``word_count > 0``
+            (False for link-target stubs).
+        version: Pack ``db_version`` the snapshot was built from.
+    """
+
+    articles: CSRGraph
+    entities: CSRGraph
+    has_content: np.ndarray
+    version: object = None
+
+
+def _load_graph(conn, names: list[str], edge_cypher: str, what: str) -> CSRGraph:
+    """Build a CSRGraph over *names* from a (source, target[, label]) edge query."""
+    try:
+        edges = fetch(conn.execute(edge_cypher))
+    except RuntimeError as e:
+        logger.info("Graph snapshot has no %s edges: %s", what, e)
+        edges = []
+    names = list(dict.fromkeys(n for n in names if n))
+    positions = {name: i for i, name in enumerate(names)}
+    src: list[int] = []
+    dst: list[int] = []
+    labels: list[str | None] = []
+    for row in edges:
+        s, t = positions.get(row[0]), positions.get(row[1])
+        if s is not None and t is not None:
+            src.append(s)
+            dst.append(t)
+            labels.append(row[2] if len(row) > 2 else None)
+    return CSRGraph(names, src, dst, labels)
+
+
+def load_graph_snapshot(conn, version: object = None) -> GraphSnapshot | None:
+    """Load the article and entity graphs of the pack behind *conn*.
+
+    Four full scans (articles, ``LINKS_TO`` edges, entity names,
+    ``ENTITY_RELATION`` edges).  Packs without entity tables get an empty
+    entity graph; returns None if the article graph cannot be read.
+    """
+    try:
+        rows = fetch(
+            conn.execute("MATCH (a:Article) RETURN a.title AS title, a.word_count AS word_count")
+        )
+    except RuntimeError as e:
+        logger.warning("Graph snapshot unavailable: %s", e)
+        return None
+    word_counts = {title: word_count or 0 for title, word_count in rows if title}
+    articles = _load_graph(
+        conn,
+        list(word_counts),
+        "MATCH (a:Article)-[:LINKS_TO]->(b:Article) RETURN a.title AS source, b.title AS target",
+        "article",
+    )
+    try:
+        entity_names = [row[0] for row in fetch(conn.execute("MATCH (e:Entity) RETURN e.name"))]
+    except RuntimeError as e:
+        logger.info("Graph snapshot has no entities: %s", e)
+        entity_names = []
+    entities = _load_graph(
+        conn,
+        entity_names,
+        "MATCH (a:Entity)-[r:ENTITY_RELATION]->(b:Entity) "
+        "RETURN a.name AS source, b.name AS target, r.relation AS relation",
+        "entity",
+    )
+    has_content = np.fromiter(
+        (word_counts[title] > 0 for title in articles.names), dtype=bool, count=len(articles)
+    )
+    return GraphSnapshot(
+        articles=articles, entities=entities, has_content=has_content, version=version
+    )
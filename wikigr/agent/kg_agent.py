@@ -5,14 +5,32 @@ Simple library approach: direct LadybugDB access + Claude for synthesis.
 No MCP server, no daemon, just a Python class.
 """
 
+import asyncio
+import contextlib
+import contextvars
+import functools
 import json
 import logging
 import re
+import sqlite3
+import threading
 import time
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Any
 
 import real_ladybug as kuzu
-from anthropic import Anthropic, APIConnectionError, APIStatusError, APITimeoutError
+from anthropic import (
+    Anthropic,
+    APIConnectionError,
+    APIStatusError,
+    APITimeoutError,
+    AsyncAnthropic,
+)
+
+from bootstrap.src.query_result import QueryRows, fetch
+from wikigr.agent import telemetry
 
 # Pre-compiled regex used in _direct_title_lookup — avoids recompilation on every query() call.
 _QUESTION_PREFIX_RE = re.compile(
@@ -52,6 +70,15 @@ def _strip_markdown_fences(text: str) -> str:
     return text
 
 
+def _cosine(a: list[float], b: list[float] | None) -> float:
+    """Cosine similarity of *a* and *b*; -1.0 when *b* is missing or zero."""
+    if not b:
+        return -1.0
+    dot = sum(x * y for x, y in zip(a, b, strict=False))
+    norm = (sum(x * x for x in a) * sum(y * y for y in b)) ** 0.5
+    return dot / norm if norm else -1.0
+
+
 class KnowledgeGraphAgent:
     """Agent that queries WikiGR knowledge graph and synthesizes answers."""
 
@@ -62,10 +89,47 @@ class KnowledgeGraphAgent:
     VECTOR_CONFIDENCE_THRESHOLD = 0.6
     CONTEXT_CONFIDENCE_THRESHOLD = 0.5
     PLAN_CACHE_MAX_SIZE = 128
-    MAX_ARTICLE_CHARS = 3000
+    MAX_ARTICLE_CHARS = 3000  # per-article cut when CONTEXT_TOKEN_BUDGET is None
+    CONTEXT_TOKEN_BUDGET: int | None = 2500  # source text packed into synthesis prompts
+    # How the budget is counted: "claude" (Messages count_tokens, cached per
+    # chunk; estimates when the endpoint fails) or "estimate" (heuristic only)
+    CONTEXT_TOKEN_COUNTER = "claude"
     PLAN_MAX_TOKENS = 512
     SYNTHESIS_MAX_TOKENS = 1024
     SEED_EXTRACT_MAX_TOKENS = 256
+    SEARCH_WORKERS = 3  # concurrent vector-index lookups (original + 2 phrasings)
+
+    # --- Retrieval stage executor (see _retrieve_context) ---
+    STAGE_WORKERS = 4
+    QUERY_LATENCY_BUDGET_S = 60.0  # all retrieval stages; synthesis is not included
+    STAGE_TIMEOUTS_S: dict[str, float] = {
+        "vector": 45.0,  # includes the one-time embedding model load
+        "title": 5.0,
+        "hybrid": 15.0,
+        "few_shot": 10.0,
+        "rerank": 10.0,
+    }
+    # Vector index searched by semantic_search(): Section.embedding_idx or
+    # Chunk.chunk_embedding_idx (~500-token overlapping chunks)
+    RETRIEVAL_MODES = ("section", "chunk")
+    # Packs whose embedding sidecar has at most this many rows are searched
+    # exactly (memory-mapped matrix product) instead of through the HNSW index
+    EXACT_SEARCH_MAX_ROWS = 20_000
+    # Same for int8/binary sidecars (embedding_storage in the manifest): the
+    # quantized scan is cheaper, and candidates are rescored with float vectors
+    QUANTIZED_SEARCH_MAX_ROWS = 200_000
+    # graph_query(): neighbours traversed per seed, as a multiple of
+    # max_context_articles, before pruning by similarity to the question
+    GRAPH_FRONTIER_OVERSAMPLE = 3
+    # graph_query() seed resolution: "local" picks seeds from title mentions
+    # and vector hits, asking Claude only below SEED_CONFIDENCE_THRESHOLD;
+    # "llm" always asks Claude
+    SEED_RESOLUTION_MODES = ("local", "llm")
+    SEED_CONFIDENCE_THRESHOLD = 0.7
+    # Blocking DB work of aquery()/agraph_query() (one connection per worker)
+    ASYNC_DB_WORKERS = 8
+    # query_batch(): Message Batches status poll interval
+    BATCH_POLL_INTERVAL_S = 10.0
 
     # --- Content quality filtering ---
     CONTENT_QUALITY_THRESHOLD = 0.3
@@ -193,9 +257,18 @@ class KnowledgeGraphAgent:
         synthesis_model: str | None = None,
         cypher_pack_path: str | None = None,
         enable_multi_query: bool = False,
+        enable_answer_cache: bool = False,
+        answer_cache_threshold: float = 0.95,
+        answer_cache_dir: str | None = None,
+        retrieval_mode: str = "section",
+        enable_title_index: bool = True,
+        enable_bm25: bool = True,
+        seed_resolution: str = "local",
+        enable_graph_snapshot: bool = True,
         *,
         _conn: "kuzu.Connection | None" = None,
         _claude_client: "Anthropic | None" = None,
+        _async_claude_client: "AsyncAnthropic | None" = None,
     ):
         """
         Initialize agent with database connection and Claude API.
@@ -216,9 +289,55 @@ class KnowledgeGraphAgent:
             enable_multi_query: Generate alternative query phrasings via Claude Haiku to improve recall.
                 **Data notice:** when True, user questions are sent to the Anthropic API for expansion.
                 Keep False for deployments with data-residency, PII, or offline constraints.
+            enable_answer_cache: Serve repeated questions from a persistent per-pack answer
+                cache (requires db_path).  Entries are invalidated when the pack's
+                manifest.json changes.  Keep False for eval runs that must measure
+                fresh synthesis.
+            answer_cache_threshold: Minimum question-embedding cosine similarity for an
+                approximate cache hit (values above 1.0 allow exact matches only).
+            answer_cache_dir: Directory for answer cache files (default
+                ``$WIKIGR_ANSWER_CACHE_DIR`` or ``~/.wikigr/cache/answers``).
+            retrieval_mode: ``"section"`` searches the Section embedding index;
+                ``"chunk"`` searches the Chunk index, merges neighbouring hit
+                chunks and synthesizes from those passages instead of whole
+                sections (requires a pack built with chunks).
+            enable_title_index: Keep an in-memory index of all article titles so
+                direct title lookup and keyword matching need no DB scans.  Built
+                when the pack is opened and rebuilt when the database changes.
+            enable_bm25: Fuse BM25 full-text hits from the pack's FTS indexes on
+                ``Section.content`` / ``Fact.content`` with vector results (RRF) in
+                hybrid retrieval.  Packs built without FTS indexes are unaffected.
+            seed_resolution: How ``graph_query()`` picks its seed articles.
+                ``"local"`` combines article titles mentioned in the question
+                with the top vector hits and only asks Claude when neither is
+                confident; ``"llm"`` always asks Claude.
+            enable_graph_snapshot: For packs opened read-only, load the
+                ``LINKS_TO`` and ``ENTITY_RELATION`` edges into in-memory CSR
+                arrays (``wikigr.agent.graph_snapshot``) and serve graph
+                traversals, degrees and paths from them instead of Cypher.
+                Rebuilt when the database changes.
             _conn: Pre-existing LadybugDB connection (used by from_connection(); skips DB creation).
             _claude_client: Pre-existing Anthropic client (used by from_connection()).
+            _async_claude_client: Pre-existing AsyncAnthropic client for aquery() /
+                agraph_query() (used by from_connection(); created lazily when None).
         """
+        if retrieval_mode not in self.RETRIEVAL_MODES:
+            raise ValueError(
+                f"retrieval_mode must be one of {self.RETRIEVAL_MODES}, got {retrieval_mode!r}"
+            )
+        self.retrieval_mode = retrieval_mode
+        if seed_resolution not in self.SEED_RESOLUTION_MODES:
+            raise ValueError(
+                f"seed_resolution must be one of {self.SEED_RESOLUTION_MODES}, "
+                f"got {seed_resolution!r}"
+            )
+        self.seed_resolution = seed_resolution
+        # Concurrent vector search: worker threads each own a connection to self.db
+        self._search_executor: ThreadPoolExecutor | None = None
+        self._stage_executor: ThreadPoolExecutor | None = None
+        self._worker_local = threading.local()
+        self._worker_conns: list = []
+        self._worker_lock = threading.Lock()
         if _conn is not None:
             # External connection mode: caller manages DB lifecycle
             self.db = None
@@ -238,6 +357,12 @@ class KnowledgeGraphAgent:
         self.synthesis_model = synthesis_model or self.DEFAULT_MODEL
         self._embedding_generator = None
         self._plan_cache: dict[str, dict] = {}
+        # asyncio API: AsyncAnthropic for Claude calls, bounded pool for DB work
+        self._async_claude = _async_claude_client
+        self._owns_async_claude = _async_claude_client is None
+        self._anthropic_api_key = anthropic_api_key
+        self._db_executor: ThreadPoolExecutor | None = None
+        self._token_counter: Any = None
         self.token_usage = {"input_tokens": 0, "output_tokens": 0, "api_calls": 0}
         self.use_enhancements = use_enhancements
         self.enable_reranker = enable_reranker
@@ -245,6 +370,26 @@ class KnowledgeGraphAgent:
         self.enable_fewshot = enable_fewshot
         self.enable_cross_encoder = enable_cross_encoder
         self.enable_multi_query = enable_multi_query
+        self.answer_cache = (
+            self._open_answer_cache(db_path, answer_cache_threshold, answer_cache_dir)
+            if enable_answer_cache and db_path is not None
+            else None
+        )
+        self.enable_title_index = enable_title_index
+        self.enable_bm25 = enable_bm25
+        self._db_path = db_path
+        self._title_index = None
+        self._exact_indexes: dict[str, Any] = {}
+        if enable_title_index and db_path is not None:
+            self._get_title_index()
+        self.enable_graph_snapshot = enable_graph_snapshot and read_only and db_path is not None
+        self._graph_snapshot = None
+        # Replaced by the enhancement modules below; a rebuilt snapshot is
+        # handed to whichever of them exist.
+        self.reranker = None
+        self.synthesizer = None
+        if self.enable_graph_snapshot:
+            self._get_graph_snapshot()
 
         # Warn if enable_* flags are set but use_enhancements=False (they have no effect)
         if not use_enhancements and any(
@@ -266,8 +411,17 @@ class KnowledgeGraphAgent:
             from wikigr.agent.multi_doc_synthesis import MultiDocSynthesizer
             from wikigr.agent.reranker import GraphReranker
 
-            self.reranker = GraphReranker(self.conn) if enable_reranker else None
-            self.synthesizer = MultiDocSynthesizer(self.conn) if enable_multidoc else None
+            article_graph = self._article_graph()
+            self.reranker = (
+                GraphReranker(
+                    self.conn, centrality=self._load_centrality(db_path), graph=article_graph
+                )
+                if enable_reranker
+                else None
+            )
+            self.synthesizer = (
+                MultiDocSynthesizer(self.conn, graph=article_graph) if enable_multidoc else None
+            )
             if enable_fewshot:
                 resolved_path = self._resolve_few_shot_path(few_shot_path, db_path)
                 if resolved_path is not None:
@@ -299,8 +453,6 @@ class KnowledgeGraphAgent:
             ]
             logger.info(f"Phase 1 enhancements enabled: {', '.join(active) or 'none'}")
         else:
-            self.reranker = None
-            self.synthesizer = None
             self.few_shot = None
             self.cross_encoder = None
 
@@ -311,6 +463,32 @@ class KnowledgeGraphAgent:
             f"KnowledgeGraphAgent initialized with db: {db_path} (read_only={read_only}, use_enhancements={use_enhancements})"
         )
 
+    @staticmethod
+    def _open_answer_cache(
+        db_path: str, similarity_threshold: float, cache_dir: str | None = None
+    ) -> Any:
+        """Open the answer cache of the pack at *db_path*, or None if it cannot be created."""
+        from wikigr.agent.answer_cache import AnswerCache
+
+        try:
+            return AnswerCache(
+                Path(db_path).parent,
+                similarity_threshold=similarity_threshold,
+                cache_dir=cache_dir,
+            )
+        except (OSError, sqlite3.Error) as e:
+            logger.warning("Answer cache disabled for %s: %s", db_path, e)
+            return None
+
+    @staticmethod
+    def _load_centrality(db_path: str | None) -> Any:
+        """Load the pack's precomputed centrality sidecar, or None if it has none."""
+        if db_path is None:
+            return None
+        from wikigr.packs.centrality import load_centrality
+
+        return load_centrality(Path(db_path).parent)
+
     def _load_extensions(self):
         """Load required LadybugDB extensions."""
         from bootstrap.schema.ryugraph_schema import load_extensions
@@ -424,8 +602,13 @@ class KnowledgeGraphAgent:
             logger.warning("CypherRAG initialization failed: %s", e)
             return None
 
-    def _track_response(self, response) -> None:
-        """Accumulate token usage from a Claude API response."""
+    def _track_response(self, response, stage: str | None = None) -> None:
+        """Accumulate token usage from a Claude API response.
+
+        The call is also recorded in the query's telemetry trace, attributed
+        to *stage* or else the enclosing span (synthesis, seed_articles, ...).
+        """
+        telemetry.record_llm_call(response, default_model=self.synthesis_model, stage=stage)
         if not hasattr(self, "token_usage"):
             self.token_usage = {"input_tokens": 0, "output_tokens": 0, "api_calls": 0}
         if hasattr(response, "usage"):
@@ -435,13 +618,17 @@ class KnowledgeGraphAgent:
 
     @classmethod
     def from_connection(
-        cls, conn: kuzu.Connection, claude_client: Anthropic
+        cls,
+        conn: kuzu.Connection,
+        claude_client: Anthropic,
+        async_claude_client: "AsyncAnthropic | None" = None,
     ) -> "KnowledgeGraphAgent":
         """Create an agent from an existing connection (no DB lifecycle management).
 
         Use this when the connection is managed externally (e.g., FastAPI dependency
         injection). All attributes are properly initialized via __init__ with the
-        _conn and _claude_client keyword-only parameters.
+        _conn and _claude_client keyword-only parameters.  Pass a shared
+        ``async_claude_client`` when the agent is used through ``aquery()``.
 
         **Data notice:** if you set ``agent.enable_multi_query = True`` after construction,
         user questions will be sent to the Anthropic API for query expansion.  Keep the
@@ -451,6 +638,7 @@ class KnowledgeGraphAgent:
             use_enhancements=False,
             _conn=conn,
             _claude_client=claude_client,
+            _async_claude_client=async_claude_client,
         )
 
     def _check_open(self) -> None:
@@ -470,30 +658,49 @@ class KnowledgeGraphAgent:
             self._embedding_generator = EmbeddingGenerator()
         return self._embedding_generator
 
-    def _safe_query(self, cypher: str, params: dict | None = None, *, log_context: str = "") -> Any:
-        """Execute Cypher and return DataFrame, or None on failure.
+    def _embed_query(self, question: str) -> list[float]:
+        """Return the BGE query embedding for *question*.
+
+        Served from the process-wide query-embedding cache, so once any stage
+        has encoded the question every later stage reuses the same vector.
+        """
+        with telemetry.span("embed"):
+            return self._get_embedding_generator().generate_query([question])[0].tolist()
+
+    def _safe_query(
+        self, cypher: str, params: dict | None = None, *, log_context: str = ""
+    ) -> QueryRows | None:
+        """Execute Cypher and return its rows, or None on failure or no rows.
 
         Delegates to the standalone ``_safe_query`` in ``retriever.py`` to
-        avoid duplicating the try/execute/get_as_df/except pattern.
+        avoid duplicating the try/execute/fetch/except pattern.
         """
         from wikigr.agent.retriever import _safe_query as _sq
 
         return _sq(self.conn, cypher, params, log_context=log_context)
 
+    @telemetry.traced("query")
     def query(
         self,
         question: str,
         max_results: int = 10,
         use_graph_rag: bool = False,
+        latency_budget_s: float | None = None,
     ) -> dict[str, Any]:
         """
         Answer a question using the knowledge graph.
 
+        Independent retrieval stages run concurrently (see ``_retrieve_context``);
+        a stage that misses its timeout or the latency budget is dropped and
+        the answer is synthesized from whatever the other stages returned.
+
         Args:
             question: Natural language question
             max_results: Maximum number of results to retrieve from graph (1-1000)
             use_graph_rag: If True, delegate to graph_query() for multi-hop
                 retrieval that follows LINKS_TO edges before synthesizing.
+            latency_budget_s: Overall retrieval budget in seconds (excludes
+                synthesis).  Defaults to ``QUERY_LATENCY_BUDGET_S``.
 
         Returns:
             {
@@ -501,184 +708,501 @@ class KnowledgeGraphAgent:
                 "sources": ["Article 1", "Article 2"],
                 "entities": [{"name": "...", "type": "..."}],
                 "facts": ["Fact 1", "Fact 2"],
-                "cypher_query": "MATCH ... (for transparency)"
+                "cypher_query": "MATCH ... (for transparency)",
+                "stage_timings": {"vector": 0.21, "title": 0.01, ...},
+                "degraded_stages": ["hybrid"]  # stages that timed out or failed
             }
         """
         self._check_open()
         if use_graph_rag:
             return self.graph_query(question)
-        if not isinstance(max_results, int) or not (1 <= max_results <= 1000):
-            raise ValueError(
-                f"max_results must be an integer between 1 and 1000, got {max_results!r}"
+        self._validate_max_results(max_results)
+        cache_params = self._query_cache_params(max_results)
+        cached = self._cached_answer("query", question, cache_params)
+        if cached is not None:
+            return cached
+
+        t_start = time.perf_counter()
+        ctx = self._retrieve_context(question, max_results, latency_budget_s)
+
+        if ctx["gated"]:
+            with telemetry.span("synthesis"):
+                answer, synthesized = self._synthesize_answer_minimal(question)
+            result = self._gated_result(ctx, answer)
+        else:
+            # Synthesize answer with Claude
+            t_synth_start = time.perf_counter()
+            with telemetry.span("synthesis"):
+                answer, synthesized = self._synthesize_answer(
+                    question,
+                    ctx["kg_results"],
+                    ctx["query_plan"],
+                    few_shot_examples=ctx["few_shot_examples"],
+                )
+            result = self._query_result(
+                question, ctx, answer, t_start, time.perf_counter() - t_synth_start
             )
+        self._store_answer("query", question, cache_params, result, synthesized)
+        return result
+
+    @telemetry.traced("query")
+    async def aquery(
+        self,
+        question: str,
+        max_results: int = 10,
+        use_graph_rag: bool = False,
+        latency_budget_s: float | None = None,
+    ) -> dict[str, Any]:
+        """Async twin of :meth:`query` for asyncio servers.
+
+        Claude calls await ``AsyncAnthropic``; blocking database work
+        (retrieval stages, source-text fetch) runs on a bounded pool of
+        ``ASYNC_DB_WORKERS`` threads.  No thread is held while Claude
+        generates, so one process can serve many in-flight questions.
+
+        Args and return value are identical to :meth:`query`.
+        """
+        self._check_open()
+        if use_graph_rag:
+            return await self.agraph_query(question)
+        self._validate_max_results(max_results)
+        cache_params = self._query_cache_params(max_results)
+        cached = await self._acached_answer("query", question, cache_params)
+        if cached is not None:
+            return cached
 
         t_start = time.perf_counter()
+        ctx = await self._run_db(self._retrieve_context, question, max_results, latency_budget_s)
+
+        if ctx["gated"]:
+            with telemetry.span("synthesis"):
+                answer, synthesized = await self._asynthesize_answer_minimal(question)
+            result = self._gated_result(ctx, answer)
+        else:
+            t_synth_start = time.perf_counter()
+            with telemetry.span("synthesis"):
+                answer, synthesized = await self._asynthesize_answer(
+                    question,
+                    ctx["kg_results"],
+                    ctx["query_plan"],
+                    few_shot_examples=ctx["few_shot_examples"],
+                )
+            result = self._query_result(
+                question, ctx, answer, t_start, time.perf_counter() - t_synth_start
+            )
+        await self._astore_answer("query", question, cache_params, result, synthesized)
+        return result
 
-        # Step 1: Vector search is ALWAYS the primary retrieval
-        # Experiment 2: Remove LLM Cypher entirely — vector + hybrid only.
-        t_plan_start = time.perf_counter()
-        vector_kg_results, max_similarity = self._vector_primary_retrieve(question, max_results)
+    @telemetry.traced("retrieve")
+    def retrieve(
+        self,
+        question: str,
+        max_results: int = 10,
+        max_passages: int = 5,
+        latency_budget_s: float | None = None,
+    ) -> dict[str, Any]:
+        """Run the retrieval stages of :meth:`query` and stop before synthesis.
 
-        if vector_kg_results is not None:
-            kg_results = vector_kg_results
-            query_plan = {
-                "type": "vector_search",
-                "cypher": f"CALL QUERY_VECTOR_INDEX('Section', 'embedding_idx', $emb, {max_results * 3}) RETURN *",
-                "cypher_params": {"emb": "<embedding_vector>"},
+        No Claude call is made (unless ``enable_multi_query`` expands the
+        question), so callers that generate their own answer -- the pack
+        evaluators, MCP clients, skills -- pay for one generation, not two.
+
+        Args:
+            question: Natural language question
+            max_results: Maximum number of results to retrieve from graph (1-1000)
+            max_passages: Number of top sources whose text is returned as passages (0-50)
+            latency_budget_s: Overall retrieval budget in seconds.  Defaults to
+                ``QUERY_LATENCY_BUDGET_S``.
+
+        Returns:
+            {
+                "sources": ["Article 1", "Article 2"],      # ranked
+                "passages": [{"title": "Article 1", "text": "...", "score": 0.83}],
+                "entities": [{"name": "...", "type": "..."}],
+                "facts": ["Fact 1", "Fact 2"],
+                "scores": {"Article 1": 0.83},               # vector similarity
+                "max_similarity": 0.83,
+                "confident": True,  # False when the confidence gate fired (no pack context)
+                "query_type": "vector_search",
+                "cypher_query": "CALL QUERY_VECTOR_INDEX(...)",
+                "stage_timings": {"vector": 0.21, ..., "passages": 0.03},
+                "degraded_stages": []
             }
-            logger.info(
-                f"Vector retrieval: {len(kg_results.get('sources', []))} sources (max_similarity={max_similarity:.3f})"
+        """
+        self._check_open()
+        self._validate_max_results(max_results)
+        if not isinstance(max_passages, int) or not (0 <= max_passages <= 50):
+            raise ValueError(
+                f"max_passages must be an integer between 0 and 50, got {max_passages!r}"
             )
 
-            # Confidence gate: skip all pack context injection when similarity is too low
-            if max_similarity < self.CONTEXT_CONFIDENCE_THRESHOLD:
-                return {
-                    "answer": self._synthesize_answer_minimal(question),
-                    "sources": [],
-                    "entities": [],
-                    "facts": [],
-                    "cypher_query": query_plan["cypher"],
-                    "query_type": "training_only_response",
-                    "token_usage": dict(self.token_usage),
-                }
-        else:
-            # Vector search failed entirely — use empty results (hybrid will fill in)
-            kg_results = {"sources": [], "entities": [], "facts": [], "raw": []}
-            query_plan = {"type": "vector_search", "cypher": "N/A", "cypher_params": {}}
-            logger.warning("Vector search returned no results")
+        ctx = self._retrieve_context(question, max_results, latency_budget_s)
+        kg_results = ctx["kg_results"]
+        scores = {r["title"]: r["score"] for r in kg_results.get("raw", []) if "title" in r}
+
+        t_passages = time.perf_counter()
+        with telemetry.span("passages"):
+            passages = self._fetch_source_passages(
+                kg_results.get("sources", []),
+                max_articles=max_passages,
+                question=question,
+                sections=self._passage_sections(kg_results, limit=max_passages),
+            )
+        stage_timings = {
+            **ctx["stage_timings"],
+            "passages": round(time.perf_counter() - t_passages, 4),
+        }
+        for passage in passages:
+            passage["score"] = scores.get(passage["title"])
 
-        t_plan = time.perf_counter() - t_plan_start
+        return {
+            "sources": kg_results.get("sources", []),
+            "passages": passages,
+            "entities": kg_results.get("entities", []),
+            "facts": kg_results.get("facts", []),
+            "scores": scores,
+            "max_similarity": ctx["max_similarity"],
+            "confident": not ctx["gated"],
+            "query_type": ctx["query_plan"]["type"],
+            "cypher_query": ctx["query_plan"]["cypher"],
+            "stage_timings": stage_timings,
+            "degraded_stages": ctx["degraded_stages"],
+        }
 
-        # Step 2: No LLM Cypher execution — vector results are used directly
-        t_exec_start = time.perf_counter()
+    @telemetry.traced("retrieve")
+    async def aretrieve(
+        self,
+        question: str,
+        max_results: int = 10,
+        max_passages: int = 5,
+        latency_budget_s: float | None = None,
+    ) -> dict[str, Any]:
+        """Async twin of :meth:`retrieve`; the work runs on the agent's DB pool."""
+        self._check_open()
+        return await self._run_db(
+            self.retrieve, question, max_results, max_passages, latency_budget_s
+        )
 
-        # Direct title matching as primary retrieval boost
-        try:
-            direct_results = self._direct_title_lookup(question)
-            existing_sources = set(kg_results.get("sources", []))
-            for src in direct_results:
-                if src not in existing_sources:
-                    kg_results.setdefault("sources", []).insert(0, src)  # Prepend direct matches
-                    existing_sources.add(src)
-        except RuntimeError as e:
-            logger.debug(f"Direct title lookup failed: {e}")
+    @telemetry.traced("query_batch")
+    def query_batch(
+        self,
+        questions: list[str],
+        max_results: int = 10,
+        *,
+        batch_client: Any = None,
+        poll_interval_s: float | None = None,
+        timeout_s: float | None = None,
+    ) -> list[dict[str, Any]]:
+        """Answer many questions at once for offline workloads (eval, pack QA).
+
+        All questions are encoded in one batched forward pass and their
+        vector-index lookups run together (see ``_batch_vector_search``); the
+        remaining query() stages run per question.  Source sections are
+        fetched once for the union of sources, and every synthesis prompt is
+        submitted as a single Anthropic Message Batch (half price, no
+        per-request rate limit).  Results can take minutes to hours; use
+        query() for interactive traffic.
 
-        # ALWAYS augment with hybrid retrieval (no skip for any query type).
-        # Pass precomputed vector results to avoid a duplicate semantic_search call.
-        _precomputed = (
-            [{"title": r["title"], "similarity": r["score"]} for r in kg_results.get("raw", [])]
-            if vector_kg_results is not None
-            else None
+        Args:
+            questions: Natural language questions.
+            max_results: Maximum number of results to retrieve per question (1-1000)
+            batch_client: Client exposing ``messages.batches`` (default: the
+                agent's Anthropic client).  Pass
+                ``wikigr.agent.batch_synthesis.LocalBatchClient`` in tests.
+            poll_interval_s: Seconds between batch status polls
+                (default ``BATCH_POLL_INTERVAL_S``).
+            timeout_s: Cancel the batch after this many seconds; unanswered
+                questions get the fallback answer.  None waits for the API.
+
+        Returns:
+            One result per question, in input order, shaped like query()'s.
+            Questions whose batch request failed get the sources fallback and
+            ``"synthesis"`` in ``degraded_stages``.
+        """
+        from wikigr.agent.batch_synthesis import BatchPrompt, run_message_batch
+        from wikigr.agent.synthesizer import (
+            build_minimal_prompt,
+            build_synthesis_context,
+            sources_fallback,
+        )
+
+        self._check_open()
+        self._validate_max_results(max_results)
+        if isinstance(questions, str):
+            raise ValueError("questions must be a list of strings, not a single string")
+        questions = list(questions)
+        t_start = time.perf_counter()
+
+        cache_params = self._query_cache_params(max_results)
+        results: list[dict[str, Any] | None] = [
+            self._cached_answer("query", q, cache_params) for q in questions
+        ]
+        pending = [i for i, cached in enumerate(results) if cached is None]
+        if not pending:
+            return results  # type: ignore[return-value]
+
+        vector_results = self._batch_vector_search(
+            list(dict.fromkeys(questions[i] for i in pending)), max_results
+        )
+        contexts = {
+            i: self._retrieve_context(
+                questions[i], max_results, vector_results=vector_results.get(questions[i])
+            )
+            for i in pending
+        }
+
+        # Section text for the union of every question's synthesis sources, fetched once.
+        titles = dict.fromkeys(
+            title
+            for ctx in contexts.values()
+            if not ctx["gated"]
+            for title in ctx["kg_results"].get("sources", [])[:5]
         )
+        sections = self._fetch_article_sections(list(titles))
+
+        prompts = []
+        for i in pending:
+            ctx = contexts[i]
+            fetch_text = functools.partial(
+                self._fetch_source_text,
+                sections=self._passage_sections(ctx["kg_results"], sections=sections),
+            )
+            prompt = (
+                build_minimal_prompt(questions[i])
+                if ctx["gated"]
+                else build_synthesis_context(
+                    fetch_text,
+                    questions[i],
+                    ctx["kg_results"],
+                    ctx["query_plan"],
+                    ctx["few_shot_examples"],
+                )
+            )
+            prompts.append(BatchPrompt(f"q{i}", prompt, self.SYNTHESIS_MAX_TOKENS))
+
+        t_synth_start = time.perf_counter()
         try:
-            hybrid_results = self._hybrid_retrieve(
-                question, max_results, _precomputed_vector=_precomputed
+            with telemetry.span("synthesis"):
+                outcomes = run_message_batch(
+                    batch_client if batch_client is not None else self.claude,
+                    self.synthesis_model,
+                    prompts,
+                    poll_interval_s=poll_interval_s or self.BATCH_POLL_INTERVAL_S,
+                    timeout_s=timeout_s,
+                )
+        except (APIConnectionError, APIStatusError, APITimeoutError) as e:
+            logger.warning("query_batch: message batch submission failed: %s", e)
+            outcomes = {}
+        synthesis_s = time.perf_counter() - t_synth_start
+
+        synthesized = set()
+        for i in pending:
+            ctx = contexts[i]
+            outcome = outcomes.get(f"q{i}")
+            if outcome is not None and outcome.text is not None:
+                synthesized.add(i)
+                self._track_response(outcome.message, stage="synthesis")
+                answer = outcome.text
+            else:
+                logger.warning(
+                    "query_batch: synthesis failed for %r: %s",
+                    questions[i][:80],
+                    outcome.error if outcome is not None else "not submitted",
+                )
+                ctx["degraded_stages"] = [*ctx["degraded_stages"], "synthesis"]
+                answer = (
+                    "Unable to answer: API error."
+                    if ctx["gated"]
+                    else sources_fallback(ctx["kg_results"])
+                )
+            results[i] = (
+                self._gated_result(ctx, answer)
+                if ctx["gated"]
+                else self._query_result(questions[i], ctx, answer, t_start, synthesis_s)
             )
-            # Merge hybrid sources into KG results (deduplicated)
-            existing_sources = set(kg_results.get("sources", []))
-            for src in hybrid_results.get("sources", []):
-                if src not in existing_sources:
-                    kg_results.setdefault("sources", []).append(src)
-                    existing_sources.add(src)
-            # Add hybrid facts
-            existing_facts = set(kg_results.get("facts", []))
-            for fact in hybrid_results.get("facts", []):
-                if fact not in existing_facts:
-                    kg_results.setdefault("facts", []).append(fact)
-        except RuntimeError as e:
-            logger.debug(f"Hybrid retrieval augmentation failed: {e}")
+        for i in pending:
+            self._store_answer("query", questions[i], cache_params, results[i], i in synthesized)
+        return results  # type: ignore[return-value]
+
+    def _batch_vector_search(self, questions: list[str], max_results: int) -> dict[str, list]:
+        """Vector-search every question of a batch together, keyed by question.
+
+        One forward pass encodes all questions.  When the agent owns a
+        Database and multi-query expansion is off, the index lookups also run
+        concurrently through :meth:`_search_many`; otherwise the encoding only
+        warms the query-embedding cache and an empty dict is returned, so each
+        question runs its own vector stage.
+        """
+        from wikigr.agent.retriever import vector_candidate_k
+
+        try:
+            if self.db is not None and not self.enable_multi_query:
+                top_k = vector_candidate_k(self.cross_encoder, max_results)
+                return dict(zip(questions, self._search_many(questions, top_k)))
+            with telemetry.span("embed"):
+                self._get_embedding_generator().generate_query(questions)
+        except (RuntimeError, OSError) as e:
+            logger.warning("query_batch: batched vector search failed: %s", e)
+        return {}
 
-        t_exec = time.perf_counter() - t_exec_start
+    @telemetry.traced("query_stream")
+    def query_stream(
+        self,
+        question: str,
+        max_results: int = 10,
+        latency_budget_s: float | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Answer a question, streaming synthesis tokens as Claude generates them.
 
-        # Step 2.5: Apply Phase 1 enhancements (ADAPTIVE approach)
-        # Key insight: enhancements should AUGMENT good retrieval, not replace it.
-        # We preserve original sources and only ADD enhanced results via fusion.
-        few_shot_examples = []
-        if self.use_enhancements:
-            t_enhance_start = time.perf_counter()
-            try:
-                original_sources = list(kg_results.get("sources", []))
-
-                # Enhancement 1: Reciprocal Rank Fusion (RRF) instead of replacement
-                # Combine original vector ranking with graph centrality ranking
-                # RRF formula: score = sum(1 / (k + rank_i)) across all rankings
-                if original_sources:
-                    rrf_k = 60  # Standard RRF constant
-                    rrf_scores: dict[str, float] = {}
-
-                    # Original vector ranking contribution
-                    for rank, src in enumerate(original_sources[:10]):
-                        rrf_scores[src] = rrf_scores.get(src, 0) + 1.0 / (rrf_k + rank)
-
-                    # Graph centrality ranking contribution (lower weight)
-                    if self.reranker is not None:
-                        try:
-                            centrality = self.reranker.calculate_centrality(original_sources[:10])
-                            sorted_by_centrality = sorted(
-                                centrality.items(), key=lambda x: x[1], reverse=True
-                            )
-                            for rank, (src, _score) in enumerate(sorted_by_centrality):
-                                rrf_scores[src] = rrf_scores.get(src, 0) + 0.5 / (rrf_k + rank)
-                        except RuntimeError as e:
-                            logger.debug(f"Centrality calculation failed: {e}")
-
-                    # Sort by fused score, but PRESERVE original top result
-                    fused = sorted(rrf_scores.items(), key=lambda x: x[1], reverse=True)
-                    fused_sources = [src for src, _ in fused[:5]]
-
-                    # Adaptive: only use fused ranking if top result changed AND
-                    # original top result is still in top 3 (don't lose good matches)
-                    if original_sources and original_sources[0] in fused_sources[:3]:
-                        kg_results["sources"] = fused_sources
-                    else:
-                        # Original top result would be demoted too far - keep original
-                        logger.debug("RRF would demote top result, keeping original ranking")
-
-                # Enhancement 2: Conditional multi-doc expansion
-                # Only expand if we have a HIGH-CONFIDENCE top result (appears in both rankings)
-                if self.synthesizer is not None and len(kg_results.get("sources", [])) >= 1:
-                    seed_title = kg_results["sources"][0]
-                    df = self._safe_query(
-                        "MATCH (a:Article {title: $title})-[:LINKS_TO]->(b:Article) "
-                        "RETURN b.title AS title LIMIT 2",
-                        {"title": seed_title},
-                        log_context="multi-doc expansion",
-                    )
-                    if df is not None:
-                        existing = set(kg_results["sources"])
-                        for rt in df["title"].tolist():
-                            if rt not in existing and len(kg_results["sources"]) < 7:
-                                kg_results["sources"].append(rt)
-                                existing.add(rt)
-
-                # Enhancement 3: Few-shot examples (always safe - they guide format, not content)
-                if self.few_shot is not None:
-                    few_shot_examples = self.few_shot.find_similar_examples(question, k=2)
-
-                t_enhance = time.perf_counter() - t_enhance_start
-                logger.info(f"Adaptive enhancements applied in {t_enhance:.2f}s")
-            except (RuntimeError, OSError) as e:
-                logger.warning(f"Enhancement pipeline failed, using standard retrieval: {e}")
-                few_shot_examples = []
+        Retrieval is identical to :meth:`query`.  Its sources are emitted as
+        soon as retrieval finishes, then the answer arrives as text deltas
+        (``messages.stream``), so time to first output is retrieval time
+        rather than the full synthesis time.
+
+        Args:
+            question: Natural language question
+            max_results: Maximum number of results to retrieve from graph (1-1000)
+            latency_budget_s: Overall retrieval budget in seconds (excludes
+                synthesis).  Defaults to ``QUERY_LATENCY_BUDGET_S``.
+
+        Yields:
+            {"type": "sources", "sources": [...], "query_type": "..."}
+            {"type": "token", "text": "..."}            (one per text delta)
+            {"type": "done", "query_type": "...", "token_usage": {...},
+             "stage_timings": {...}, "degraded_stages": [...]}
+        """
+        from wikigr.agent.synthesizer import stream_synthesis
+
+        self._check_open()
+        self._validate_max_results(max_results)
+
+        ctx = self._retrieve_context(question, max_results, latency_budget_s)
+        yield self._sources_event(ctx)
+
+        prompt, fallback = self._stream_prompt(question, ctx)
+        t_synth_start = time.perf_counter()
+        for text in stream_synthesis(
+            self.claude,
+            self.synthesis_model,
+            self.SYNTHESIS_MAX_TOKENS,
+            functools.partial(self._track_response, stage="synthesis"),
+            prompt,
+            fallback,
+        ):
+            yield {"type": "token", "text": text}
+        synthesis_s = time.perf_counter() - t_synth_start
+        telemetry.record_span("synthesis", synthesis_s)
+        yield self._done_event(ctx, synthesis_s)
+
+    @telemetry.traced("query_stream")
+    async def aquery_stream(
+        self,
+        question: str,
+        max_results: int = 10,
+        latency_budget_s: float | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Async twin of :meth:`query_stream` (same events).
+
+        Retrieval and prompt building run on the bounded DB pool; tokens
+        are read from an ``AsyncAnthropic`` stream on the event loop.
+        """
+        from wikigr.agent.synthesizer import astream_synthesis
+
+        self._check_open()
+        self._validate_max_results(max_results)
+
+        ctx = await self._run_db(self._retrieve_context, question, max_results, latency_budget_s)
+        yield self._sources_event(ctx)
 
-        # Step 3: Synthesize answer with Claude
+        prompt, fallback = await self._run_db(self._stream_prompt, question, ctx)
         t_synth_start = time.perf_counter()
-        answer = self._synthesize_answer(
-            question, kg_results, query_plan, few_shot_examples=few_shot_examples
+        async for text in astream_synthesis(
+            self.async_claude,
+            self.synthesis_model,
+            self.SYNTHESIS_MAX_TOKENS,
+            functools.partial(self._track_response, stage="synthesis"),
+            prompt,
+            fallback,
+        ):
+            yield {"type": "token", "text": text}
+        synthesis_s = time.perf_counter() - t_synth_start
+        telemetry.record_span("synthesis", synthesis_s)
+        yield self._done_event(ctx, synthesis_s)
+
+    @staticmethod
+    def _validate_max_results(max_results: int) -> None:
+        if not isinstance(max_results, int) or not (1 <= max_results <= 1000):
+            raise ValueError(
+                f"max_results must be an integer between 1 and 1000, got {max_results!r}"
+            )
+
+    @staticmethod
+    def _stream_query_type(ctx: dict[str, Any]) -> str:
+        return "training_only_response" if ctx["gated"] else ctx["query_plan"]["type"]
+
+    def _stream_prompt(self, question: str, ctx: dict[str, Any]) -> tuple[str, str]:
+        """Return (synthesis prompt, API-failure fallback text) for a streamed answer."""
+        from wikigr.agent.synthesizer import build_minimal_prompt, sources_fallback
+
+        if ctx["gated"]:
+            return build_minimal_prompt(question), "Unable to answer: API error."
+        kg_results = ctx["kg_results"]
+        prompt = self._build_synthesis_context(
+            question, kg_results, ctx["query_plan"], few_shot_examples=ctx["few_shot_examples"]
         )
-        t_synth = time.perf_counter() - t_synth_start
+        return prompt, sources_fallback(kg_results)
+
+    def _sources_event(self, ctx: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "type": "sources",
+            "sources": ctx["kg_results"].get("sources", []),
+            "query_type": self._stream_query_type(ctx),
+        }
+
+    def _done_event(self, ctx: dict[str, Any], synthesis_s: float) -> dict[str, Any]:
+        return {
+            "type": "done",
+            "query_type": self._stream_query_type(ctx),
+            "token_usage": dict(self.token_usage),
+            "stage_timings": {**ctx["stage_timings"], "synthesis": synthesis_s},
+            "degraded_stages": ctx["degraded_stages"],
+        }
+
+    def _gated_result(self, ctx: dict[str, Any], answer: str) -> dict[str, Any]:
+        """Result of a query whose confidence gate fired (no pack context used)."""
+        return {
+            "answer": answer,
+            "sources": [],
+            "entities": [],
+            "facts": [],
+            "cypher_query": ctx["query_plan"]["cypher"],
+            "query_type": "training_only_response",
+            "token_usage": dict(self.token_usage),
+            "stage_timings": ctx["stage_timings"],
+            "degraded_stages": ctx["degraded_stages"],
+        }
 
-        t_total = time.perf_counter() - t_start
+    def _query_result(
+        self,
+        question: str,
+        ctx: dict[str, Any],
+        answer: str,
+        t_start: float,
+        synthesis_s: float,
+    ) -> dict[str, Any]:
+        """Assemble (and log) the result dict of query()/aquery()."""
+        kg_results = ctx["kg_results"]
+        query_plan = ctx["query_plan"]
+        stage_timings = {**ctx["stage_timings"], "synthesis": synthesis_s}
 
         # Structured monitoring log
         logger.debug(
-            "query_monitor: type=%s total=%.2fs plan=%.2fs exec=%.2fs synth=%.2fs "
+            "query_monitor: type=%s total=%.2fs stages=%s degraded=%s "
             "sources=%d entities=%d facts=%d question=%r",
             query_plan.get("type", "unknown"),
-            t_total,
-            t_plan,
-            t_exec,
-            t_synth,
+            time.perf_counter() - t_start,
+            {k: round(v, 3) for k, v in stage_timings.items()},
+            ctx["degraded_stages"],
             len(kg_results.get("sources", [])),
             len(kg_results.get("entities", [])),
             len(kg_results.get("facts", [])),
@@ -693,83 +1217,561 @@ class KnowledgeGraphAgent:
             "cypher_query": query_plan["cypher"],
             "query_type": query_plan["type"],
             "token_usage": dict(self.token_usage),
+            "stage_timings": stage_timings,
+            "degraded_stages": ctx["degraded_stages"],
         }
 
     # ------------------------------------------------------------------
-    # Graph-Aware RAG (multi-hop retrieval)
+    # Answer cache
     # ------------------------------------------------------------------
 
-    def graph_query(
+    def _query_cache_params(self, max_results: int) -> dict[str, Any]:
+        """query() parameters that change the answer (part of the cache key)."""
+        params = {"max_results": max_results, "use_enhancements": self.use_enhancements}
+        if self.retrieval_mode != "section":
+            params["retrieval_mode"] = self.retrieval_mode
+        return params
+
+    def _cached_answer(
+        self, kind: str, question: str, params: dict[str, Any]
+    ) -> dict[str, Any] | None:
+        """Return a cached result for *question*, or None (also when caching is off).
+
+        A query() hit reports the agent's current ``token_usage`` and no stage
+        timings, since no stage ran and no Claude call was made.
+        """
+        cache = self.answer_cache
+        if cache is None:
+            return None
+        hit = cache.get(kind, question, self.synthesis_model, params, embed_fn=self._embed_query)
+        if hit is None:
+            return None
+        logger.debug(
+            "answer_cache: %s hit (%.3f) for %r",
+            hit["answer_cache"]["match"],
+            hit["answer_cache"]["similarity"],
+            question[:80],
+        )
+        if kind == "query":
+            hit["token_usage"] = dict(self.token_usage)
+            hit["stage_timings"] = {}
+        return hit
+
+    def _store_answer(
         self,
+        kind: str,
         question: str,
-        max_hops: int = 2,
-        max_context_articles: int = 5,
+        params: dict[str, Any],
+        result: dict[str, Any],
+        synthesized: bool,
+    ) -> None:
+        """Cache *result* unless a stage degraded or its answer is a fallback.
+
+        *synthesized* is the flag returned by synthesis: False when Claude
+        did not produce the answer.  Degraded and fallback answers are not
+        representative of the pack and would otherwise be replayed until the
+        manifest changes.
+        """
+        cache = self.answer_cache
+        if cache is None or not synthesized or result.get("degraded_stages"):
+            return
+        try:
+            embedding = self._embed_query(question)
+        except (RuntimeError, OSError) as e:
+            logger.warning("Answer cache: storing %r without an embedding: %s", question[:80], e)
+            embedding = None
+        cache.put(kind, question, self.synthesis_model, params, result, embedding=embedding)
+
+    async def _acached_answer(
+        self, kind: str, question: str, params: dict[str, Any]
+    ) -> dict[str, Any] | None:
+        if self.answer_cache is None:
+            return None
+        return await self._run_db(self._cached_answer, kind, question, params)
+
+    async def _astore_answer(
+        self,
+        kind: str,
+        question: str,
+        params: dict[str, Any],
+        result: dict[str, Any],
+        synthesized: bool,
+    ) -> None:
+        if self.answer_cache is None:
+            return
+        await self._run_db(self._store_answer, kind, question, params, result, synthesized)
+
+    # ------------------------------------------------------------------
+    # Retrieval stage graph
+    # ------------------------------------------------------------------
+
+    def _retrieve_context(
+        self,
+        question: str,
+        max_results: int,
+        latency_budget_s: float | None = None,
+        vector_results: list[dict] | None = None,
     ) -> dict[str, Any]:
-        """Answer using graph-aware multi-hop retrieval.
+        """Run the retrieval stages of ``query()`` and assemble synthesis context.
 
-        Follows LINKS_TO edges from seed articles to gather context from
-        related articles before synthesizing an answer.  This produces
-        richer responses by exploiting the knowledge graph structure.
+        Stage graph (arrows are data dependencies)::
 
-        Steps:
-            1. Use Claude to identify seed entity/article names from the question.
-            2. Traverse LINKS_TO edges up to *max_hops* to gather related articles.
-            3. Collect the lead section content from each traversed article.
-            4. Synthesize an answer using all gathered context.
+            vector ──┬──> hybrid ──┐
+                     └──> few_shot ├──> rerank
+            title ─────────────────┘
 
-        Args:
-            question: Natural language question.
-            max_hops: Maximum depth of LINKS_TO traversal (1-10).
-            max_context_articles: Maximum number of related articles to
-                collect per seed (1-50).
+        ``vector`` and ``title`` start together; ``hybrid`` and ``few_shot``
+        start as soon as vector search returns (hybrid reuses its results,
+        few-shot reuses the cached question embedding).  ``rerank`` (RRF
+        centrality fusion + multi-doc expansion) runs last on the calling
+        thread.  Parallel stages use per-thread connections; agents without a
+        Database (``from_connection``) run every stage inline.  With
+        ``vector_results`` (prefetched by ``query_batch``) the vector stage
+        skips its search.
 
         Returns:
-            Dictionary with keys: answer, sources, hops_traversed,
-            articles_consulted, cypher_queries.
+            Dict with kg_results, query_plan, max_similarity, gated (True when
+            the confidence gate fired), few_shot_examples, stage_timings and
+            degraded_stages.
         """
-        self._check_open()
-
-        if not isinstance(max_hops, int) or not (1 <= max_hops <= 10):
-            raise ValueError(f"max_hops must be an integer between 1 and 10, got {max_hops!r}")
-        if not isinstance(max_context_articles, int) or not (1 <= max_context_articles <= 50):
-            raise ValueError(
-                f"max_context_articles must be an integer between 1 and 50, "
-                f"got {max_context_articles!r}"
-            )
-
-        t_start = time.perf_counter()
-        cypher_queries: list[str] = []
+        runner = self._stage_runner(latency_budget_s)
 
-        # ------------------------------------------------------------------
-        # Step 1: Ask Claude to extract seed article titles from the question
-        # ------------------------------------------------------------------
-        seed_titles = self._identify_seed_articles(question)
-        logger.info(f"Graph RAG seeds identified: {seed_titles}")
+        # Step 1: Vector search is ALWAYS the primary retrieval; direct title
+        # matching runs alongside it.
+        vector_stage = self._vector_primary_retrieve
+        if vector_results is not None:
+            vector_stage = functools.partial(vector_stage, vector_results=vector_results)
+        runner.submit("vector", vector_stage, question, max_results, default=(None, 0.0))
+        runner.submit("title", self._direct_title_lookup, question, default=[])
+        vector_kg_results, max_similarity = runner.result("vector")
 
-        # ------------------------------------------------------------------
-        # Step 2: Traverse LINKS_TO edges from each seed
-        # ------------------------------------------------------------------
-        all_related_titles: list[str] = []
-        for seed_title in seed_titles:
-            traversal_cypher = (
-                f"MATCH (seed:Article)"
-                f"-[:LINKS_TO*1..{max_hops}]->"
-                f"(related:Article) "
-                f"WHERE lower(seed.title) = lower($title) AND related.word_count > 0 "
-                f"RETURN DISTINCT related.title AS title "
-                f"LIMIT $limit"
-            )
-            cypher_queries.append(traversal_cypher)
-            df = self._safe_query(
-                traversal_cypher,
-                {"title": seed_title, "limit": max_context_articles},
-                log_context=f"traversal for seed '{seed_title}'",
+        if vector_kg_results is not None:
+            kg_results = vector_kg_results
+            query_plan = {
+                "type": "vector_search",
+                "cypher": self._vector_index_cypher(max_results),
+                "cypher_params": {"emb": "<embedding_vector>"},
+            }
+            logger.info(
+                f"Vector retrieval: {len(kg_results.get('sources', []))} sources (max_similarity={max_similarity:.3f})"
             )
-            if df is not None:
-                all_related_titles.extend(df["title"].tolist())
 
-        # Deduplicate while preserving order; include seeds themselves
-        # Cap total articles to prevent excessive API costs
+            # Confidence gate: skip all pack context injection when similarity is too low
+            if max_similarity < self.CONTEXT_CONFIDENCE_THRESHOLD:
+                return {
+                    "kg_results": {"sources": [], "entities": [], "facts": [], "raw": []},
+                    "query_plan": query_plan,
+                    "max_similarity": max_similarity,
+                    "gated": True,
+                    "few_shot_examples": [],
+                    "stage_timings": dict(runner.timings),
+                    "degraded_stages": runner.degraded,
+                }
+        else:
+            # Vector search failed entirely — use empty results (hybrid will fill in)
+            kg_results = {"sources": [], "entities": [], "facts": [], "raw": []}
+            query_plan = {"type": "vector_search", "cypher": "N/A", "cypher_params": {}}
+            logger.warning("Vector search returned no results")
+
+        # Step 2: Hybrid (graph + keyword) and few-shot start once vector results exist.
+        # Pass precomputed vector results to avoid a duplicate semantic_search call.
+        _precomputed = (
+            [{"title": r["title"], "similarity": r["score"]} for r in kg_results.get("raw", [])]
+            if vector_kg_results is not None
+            else None
+        )
+        runner.submit(
+            "hybrid",
+            self._hybrid_retrieve,
+            question,
+            max_results,
+            _precomputed_vector=_precomputed,
+            default={},
+        )
+        use_few_shot = self.use_enhancements and self.few_shot is not None
+        if use_few_shot:
+            runner.submit("few_shot", self._few_shot_examples, question, default=[])
+
+        # Direct title matches are prepended as a primary retrieval boost
+        existing_sources = set(kg_results.get("sources", []))
+        for src in runner.result("title"):
+            if src not in existing_sources:
+                kg_results.setdefault("sources", []).insert(0, src)
+                existing_sources.add(src)
+
+        # ALWAYS augment with hybrid retrieval: merge sources and facts (deduplicated)
+        hybrid_results = runner.result("hybrid")
+        for src in hybrid_results.get("sources", []):
+            if src not in existing_sources:
+                kg_results.setdefault("sources", []).append(src)
+                existing_sources.add(src)
+        existing_facts = set(kg_results.get("facts", []))
+        for fact in hybrid_results.get("facts", []):
+            if fact not in existing_facts:
+                kg_results.setdefault("facts", []).append(fact)
+
+        # Step 3: Phase 1 enhancements (ADAPTIVE approach) — augment, never replace
+        few_shot_examples: list[dict] = []
+        if self.use_enhancements:
+            sources = list(kg_results.get("sources", []))
+            kg_results["sources"] = runner.run(
+                "rerank", self._rerank_and_expand_sources, sources, default=sources
+            )
+            if use_few_shot:
+                few_shot_examples = runner.result("few_shot")
+
+        return {
+            "kg_results": kg_results,
+            "query_plan": query_plan,
+            "max_similarity": max_similarity,
+            "gated": False,
+            "few_shot_examples": few_shot_examples,
+            "stage_timings": dict(runner.timings),
+            "degraded_stages": runner.degraded,
+        }
+
+    def _rerank_and_expand_sources(self, original_sources: list[str]) -> list[str]:
+        """Fuse vector and centrality rankings (RRF), then expand the top source.
+
+        Key insight: enhancements should AUGMENT good retrieval, not replace it.
+        Original sources are preserved and enhanced results only ADDED via fusion.
+
+        Returns:
+            A new source list; *original_sources* is not modified.
+        """
+        sources = list(original_sources)
+        article_graph = self._article_graph()  # also refreshes the components' snapshot
+
+        # Enhancement 1: Reciprocal Rank Fusion (RRF) instead of replacement
+        # Combine original vector ranking with graph centrality ranking
+        # RRF formula: score = sum(1 / (k + rank_i)) across all rankings
+        if original_sources:
+            rrf_k = 60  # Standard RRF constant
+            rrf_scores: dict[str, float] = {}
+
+            # Original vector ranking contribution
+            for rank, src in enumerate(original_sources[:10]):
+                rrf_scores[src] = rrf_scores.get(src, 0) + 1.0 / (rrf_k + rank)
+
+            # Graph centrality ranking contribution (lower weight)
+            if self.reranker is not None:
+                try:
+                    centrality = self.reranker.calculate_centrality(
+                        original_sources[:10], conn=self.conn
+                    )
+                    sorted_by_centrality = sorted(
+                        centrality.items(), key=lambda x: x[1], reverse=True
+                    )
+                    for rank, (src, _score) in enumerate(sorted_by_centrality):
+                        rrf_scores[src] = rrf_scores.get(src, 0) + 0.5 / (rrf_k + rank)
+                except RuntimeError as e:
+                    logger.debug(f"Centrality calculation failed: {e}")
+
+            # Sort by fused score, but PRESERVE original top result
+            fused = sorted(rrf_scores.items(), key=lambda x: x[1], reverse=True)
+            fused_sources = [src for src, _ in fused[:5]]
+
+            # Adaptive: only use fused ranking if top result changed AND
+            # original top result is still in top 3 (don't lose good matches)
+            if original_sources[0] in fused_sources[:3]:
+                sources = fused_sources
+            else:
+                # Original top result would be demoted too far - keep original
+                logger.debug("RRF would demote top result, keeping original ranking")
+
+        # Enhancement 2: Conditional multi-doc expansion
+        # Only expand if we have a HIGH-CONFIDENCE top result (appears in both rankings)
+        if self.synthesizer is not None and sources:
+            if article_graph is not None:
+                related = self.synthesizer.related_titles(
+                    [sources[0]], max_articles=2, conn=self.conn
+                )
+            else:
+                rows = self._safe_query(
+                    "MATCH (a:Article {title: $title})-[:LINKS_TO]->(b:Article) "
+                    "RETURN b.title AS title LIMIT 2",
+                    {"title": sources[0]},
+                    log_context="multi-doc expansion",
+                )
+                related = rows.column("title") if rows is not None else []
+            if related:
+                existing = set(sources)
+                for rt in related:
+                    if rt not in existing and len(sources) < 7:
+                        sources.append(rt)
+                        existing.add(rt)
+
+        return sources
+
+    def _few_shot_examples(self, question: str) -> list[dict]:
+        """Enhancement 3: few-shot examples (always safe - they guide format, not content)."""
+        # Reuse the question embedding from vector search (cache hit)
+        # instead of running the transformer a second time.
+        query_embedding = (
+            self._embed_query(question) if self._embedding_generator is not None else None
+        )
+        return self.few_shot.find_similar_examples(question, k=2, query_embedding=query_embedding)
+
+    def _stage_runner(self, latency_budget_s: float | None = None):
+        """Create a StageRunner for one query.
+
+        Stages run on the agent's stage pool when it owns a Database (each
+        worker thread gets its own connection); otherwise they run inline.
+        """
+        from wikigr.agent.stage_executor import StageRunner
+
+        budget = self.QUERY_LATENCY_BUDGET_S if latency_budget_s is None else latency_budget_s
+        executor = self._get_stage_executor() if self.db is not None else None
+        return StageRunner(executor=executor, budget_s=budget, timeouts=self.STAGE_TIMEOUTS_S)
+
+    def _get_stage_executor(self) -> ThreadPoolExecutor:
+        """Lazily create the thread pool used for concurrent retrieval stages.
+
+        Kept separate from the search pool: a vector stage may itself fan out
+        to the search pool (multi-query), which must never wait on its own pool.
+        """
+        with self._worker_lock:
+            if self._stage_executor is None:
+                self._stage_executor = ThreadPoolExecutor(
+                    max_workers=self.STAGE_WORKERS,
+                    thread_name_prefix="kg-stage",
+                    initializer=self._mark_worker_thread,
+                )
+            return self._stage_executor
+
+    # ------------------------------------------------------------------
+    # Graph-Aware RAG (multi-hop retrieval)
+    # ------------------------------------------------------------------
+
+    @telemetry.traced("graph_query")
+    def graph_query(
+        self,
+        question: str,
+        max_hops: int = 2,
+        max_context_articles: int = 5,
+    ) -> dict[str, Any]:
+        """Answer using graph-aware multi-hop retrieval.
+
+        Follows LINKS_TO edges from seed articles to gather context from
+        related articles before synthesizing an answer.  This produces
+        richer responses by exploiting the knowledge graph structure.
+
+        Steps:
+            1. Pick seed articles from title mentions and vector hits, or
+               use Claude to identify them when those are not confident.
+            2. Traverse LINKS_TO edges up to *max_hops* from all seeds in one
+               query, keeping each seed's neighbours most similar to the question.
+            3. Collect the lead section content of all articles in one query.
+            4. Synthesize an answer using all gathered context.
+
+        Args:
+            question: Natural language question.
+            max_hops: Maximum depth of LINKS_TO traversal (1-10).
+            max_context_articles: Maximum number of related articles to
+                collect per seed (1-50).
+
+        Returns:
+            Dictionary with keys: answer, sources, hops_traversed,
+            articles_consulted, cypher_queries.
+        """
+        self._check_open()
+        self._validate_graph_query_args(max_hops, max_context_articles)
+        cache_params = {"max_hops": max_hops, "max_context_articles": max_context_articles}
+        cached = self._cached_answer("graph_query", question, cache_params)
+        if cached is not None:
+            return cached
+        t_start = time.perf_counter()
+
+        # Step 1: Resolve seed article titles locally, or ask Claude
+        with telemetry.span("seed_articles"):
+            seed_titles = self._resolve_local_seeds(question) or self._identify_seed_articles(
+                question
+            )
+        logger.info(f"Graph RAG seeds identified: {seed_titles}")
+
+        # Steps 2-3: traverse and gather lead sections
+        with telemetry.span("graph_context"):
+            gathered = self._gather_graph_context(
+                seed_titles, max_hops, max_context_articles, question
+            )
+        unique_titles, context_parts, _ = gathered
+
+        # Step 4: Synthesize the answer with Claude
+        combined_context = "\n\n".join(context_parts) if context_parts else "(no context found)"
+        with telemetry.span("synthesis"):
+            answer, synthesized = self._synthesize_graph_rag_answer(
+                question, combined_context, unique_titles
+            )
+
+        result = self._graph_query_result(
+            question, answer, seed_titles, gathered, max_hops, t_start
+        )
+        self._store_answer("graph_query", question, cache_params, result, synthesized)
+        return result
+
+    @telemetry.traced("graph_query")
+    async def agraph_query(
+        self,
+        question: str,
+        max_hops: int = 2,
+        max_context_articles: int = 5,
+    ) -> dict[str, Any]:
+        """Async twin of :meth:`graph_query`.
+
+        Seed extraction and synthesis await ``AsyncAnthropic``; the graph
+        traversal runs on the agent's bounded DB pool.  Args and return value
+        are identical to :meth:`graph_query`.
+        """
+        self._check_open()
+        self._validate_graph_query_args(max_hops, max_context_articles)
+        cache_params = {"max_hops": max_hops, "max_context_articles": max_context_articles}
+        cached = await self._acached_answer("graph_query", question, cache_params)
+        if cached is not None:
+            return cached
+        t_start = time.perf_counter()
+
+        with telemetry.span("seed_articles"):
+            seed_titles = await self._run_db(
+                self._resolve_local_seeds, question
+            ) or await self._aidentify_seed_articles(question)
+        logger.info(f"Graph RAG seeds identified: {seed_titles}")
+
+        with telemetry.span("graph_context"):
+            gathered = await self._run_db(
+                self._gather_graph_context, seed_titles, max_hops, max_context_articles, question
+            )
+        unique_titles, context_parts, _ = gathered
+
+        combined_context = "\n\n".join(context_parts) if context_parts else "(no context found)"
+        with telemetry.span("synthesis"):
+            answer, synthesized = await self._asynthesize_graph_rag_answer(
+                question, combined_context, unique_titles
+            )
+
+        result = self._graph_query_result(
+            question, answer, seed_titles, gathered, max_hops, t_start
+        )
+        await self._astore_answer("graph_query", question, cache_params, result, synthesized)
+        return result
+
+    @staticmethod
+    def _validate_graph_query_args(max_hops: int, max_context_articles: int) -> None:
+        if not isinstance(max_hops, int) or not (1 <= max_hops <= 10):
+            raise ValueError(f"max_hops must be an integer between 1 and 10, got {max_hops!r}")
+        if not isinstance(max_context_articles, int) or not (1 <= max_context_articles <= 50):
+            raise ValueError(
+                f"max_context_articles must be an integer between 1 and 50, "
+                f"got {max_context_articles!r}"
+            )
+
+    def _gather_graph_context(
+        self,
+        seed_titles: list[str],
+        max_hops: int,
+        max_context_articles: int,
+        question: str | None = None,
+    ) -> tuple[list[str], list[str], list[str]]:
+        """Traverse LINKS_TO from the seeds and collect lead-section content.
+
+        Two round-trips regardless of the number of seeds and hops: one
+        UNWIND traversal over all seeds, and one ``IN $titles`` fetch of the
+        lead sections of the whole frontier.  With a graph snapshot the
+        traversal is an in-memory BFS and only the section fetch hits the
+        database.  When a seed reaches more than
+        *max_context_articles* articles, its neighbours are ranked by the
+        cosine similarity of their lead-section embedding to *question*.
+
+        Returns:
+            (unique_titles, context_parts, cypher_queries)
+        """
+        cypher_queries: list[str] = []
+        seed_titles = self._resolve_seed_titles(seed_titles)
+
+        # ------------------------------------------------------------------
+        # Step 2: Traverse LINKS_TO edges from all seeds at once
+        # ------------------------------------------------------------------
+        frontier: dict[str, list[str]] = {}
+        frontier_limit = max_context_articles * self.GRAPH_FRONTIER_OVERSAMPLE
+        snapshot = self._get_graph_snapshot()
+        if snapshot is not None and self._get_title_index() is not None:
+            # Seeds carry the stored title, so the in-memory BFS can key on it
+            for seed_title in seed_titles:
+                neighbourhood = snapshot.articles.k_hop(
+                    [seed_title], max_hops, limit=frontier_limit, where=snapshot.has_content
+                )
+                if neighbourhood:
+                    frontier[seed_title.lower()] = [title for title, _hop in neighbourhood]
+        else:
+            if self._get_title_index() is not None:
+                # Seeds already carry the stored title: primary-key lookup
+                seed_match = "MATCH path = (seed:Article {title: seed_title})"
+                seed_filter = ""
+            else:
+                seed_match = "MATCH path = (seed:Article)"
+                seed_filter = "lower(seed.title) = lower(seed_title) AND "
+            # Keep each seed's nearest neighbours, ordered by (hop, title) like
+            # the snapshot BFS.  LadybugDB only allows ORDER BY in WITH before
+            # SKIP/LIMIT, so the collected list is sorted on a zero-padded
+            # "hop + title" key (max_hops <= 10) and the prefix stripped again.
+            traversal_cypher = (
+                f"UNWIND $titles AS seed_title "
+                f"{seed_match}-[:LINKS_TO*1..{max_hops}]->(related:Article) "
+                f"WHERE {seed_filter}related.word_count > 0 "
+                f"WITH seed, related.title AS title, min(length(path)) AS hop "
+                f"WITH seed, collect(lpad(CAST(hop AS STRING), 2, '0') + title) AS keys "
+                f"WITH seed, list_sort(keys)[..$per_seed] AS ranked "
+                f"RETURN seed.title AS seed, "
+                f"list_transform(ranked, key -> substring(key, 3, size(key))) AS titles"
+            )
+            cypher_queries.append(traversal_cypher)
+            if seed_titles:
+                rows = self._safe_query(
+                    traversal_cypher,
+                    {"titles": seed_titles, "per_seed": frontier_limit},
+                    log_context=f"traversal for seeds {seed_titles}",
+                )
+                if rows is not None:
+                    for seed, titles in rows:
+                        frontier.setdefault(seed.lower(), []).extend(titles)
+
+        # ------------------------------------------------------------------
+        # Step 3: Gather lead sections of seeds and frontier in one query
+        # ------------------------------------------------------------------
+        candidates = list(
+            dict.fromkeys(seed_titles + [t for titles in frontier.values() for t in titles])
+        )
+        section_cypher = (
+            "MATCH (a:Article)-[:HAS_SECTION {section_index: 0}]->(s:Section) "
+            "WHERE a.title IN $titles "
+            "RETURN a.title AS title, s.content AS content, s.embedding AS embedding"
+        )
+        cypher_queries.append(section_cypher)
+        sections: dict[str, tuple[str, list[float] | None]] = {}
+        if candidates:
+            rows = self._safe_query(
+                section_cypher, {"titles": candidates}, log_context="lead section fetch"
+            )
+            if rows is not None:
+                for title, content, embedding in rows:
+                    sections.setdefault(title, (content, embedding))
+
+        # Prune each seed's frontier to its max_context_articles best neighbours
+        all_related_titles: list[str] = []
+        query_embedding = None
+        for seed_title in seed_titles:
+            related = frontier.get(seed_title.lower(), [])
+            if len(related) > max_context_articles and question:
+                if query_embedding is None:
+                    query_embedding = self._embed_query(question)
+                related = sorted(
+                    related,
+                    key=lambda t: _cosine(query_embedding, sections.get(t, ("", None))[1]),
+                    reverse=True,
+                )
+            all_related_titles.extend(related[:max_context_articles])
+
+        # Deduplicate while preserving order; include seeds themselves
+        # Cap total articles to prevent excessive API costs
         max_total_articles = 15
         seen: set[str] = set()
         unique_titles: list[str] = []
@@ -780,41 +1782,48 @@ class KnowledgeGraphAgent:
             if len(unique_titles) >= max_total_articles:
                 break
 
-        # ------------------------------------------------------------------
-        # Step 3: Gather lead-section content from each article
-        # ------------------------------------------------------------------
         context_parts: list[str] = []
-        section_cypher = (
-            "MATCH (a:Article {title: $title})"
-            "-[:HAS_SECTION {section_index: 0}]->(s:Section) "
-            "RETURN s.content AS content"
-        )
-        cypher_queries.append(section_cypher)
         for title in unique_titles:
-            df = self._safe_query(
-                section_cypher, {"title": title}, log_context=f"section fetch for '{title}'"
-            )
-            if df is not None:
-                sect_content = df.iloc[0]["content"]
-                if sect_content:
-                    context_parts.append(f"## {title}\n{sect_content}")
+            sect_content = sections.get(title, (None, None))[0]
+            if sect_content:
+                context_parts.append(f"## {title}\n{sect_content}")
 
-        # ------------------------------------------------------------------
-        # Step 4: Synthesize the answer with Claude
-        # ------------------------------------------------------------------
-        combined_context = "\n\n".join(context_parts) if context_parts else "(no context found)"
-        answer = self._synthesize_graph_rag_answer(question, combined_context, unique_titles)
+        return unique_titles, context_parts, cypher_queries
+
+    def _resolve_seed_titles(self, seed_titles: list[str]) -> list[str]:
+        """Map seed titles to their stored spelling via the title index.
 
-        t_total = time.perf_counter() - t_start
+        Seeds without a case-insensitive exact match (or all seeds, when the
+        index is unavailable) are returned unchanged.
+        """
+        index = self._get_title_index()
+        if index is None:
+            return list(seed_titles)
+        resolved = []
+        for title in seed_titles:
+            matches = index.exact(title)
+            resolved.append(matches[0] if matches else title)
+        return resolved
+
+    @staticmethod
+    def _graph_query_result(
+        question: str,
+        answer: str,
+        seed_titles: list[str],
+        gathered: tuple[list[str], list[str], list[str]],
+        max_hops: int,
+        t_start: float,
+    ) -> dict[str, Any]:
+        """Assemble (and log) the result dict of graph_query()/agraph_query()."""
+        unique_titles, context_parts, cypher_queries = gathered
         logger.debug(
             "graph_query_monitor: total=%.2fs hops=%d seeds=%d articles=%d question=%r",
-            t_total,
+            time.perf_counter() - t_start,
             max_hops,
             len(seed_titles),
             len(context_parts),
             question[:80],
         )
-
         return {
             "answer": answer,
             "sources": unique_titles,
@@ -823,13 +1832,9 @@ class KnowledgeGraphAgent:
             "cypher_queries": cypher_queries,
         }
 
-    def _identify_seed_articles(self, question: str) -> list[str]:
-        """Use Claude to extract likely Wikipedia article titles from a question.
-
-        Raises APIConnectionError, APIStatusError, or APITimeoutError on Claude API failure.
-        Raises ValueError if the API returns an empty or unparseable response.
-        """
-        prompt = (
+    @staticmethod
+    def _seed_articles_prompt(question: str) -> str:
+        return (
             "You are an assistant that identifies Wikipedia article titles "
             "relevant to a user question.  Given the question below, return a JSON list of "
             "1-3 Wikipedia article titles that are most likely to appear in a knowledge graph "
@@ -839,17 +1844,9 @@ class KnowledgeGraphAgent:
             f"Question: {question}"
         )
 
-        try:
-            response = self.claude.messages.create(
-                model=self.synthesis_model,
-                max_tokens=self.SEED_EXTRACT_MAX_TOKENS,
-                messages=[{"role": "user", "content": prompt}],
-            )
-            self._track_response(response)
-        except (APIConnectionError, APIStatusError, APITimeoutError):
-            logger.warning("Claude API error in _identify_seed_articles")
-            raise
-
+    @staticmethod
+    def _parse_seed_articles(response) -> list[str]:
+        """Parse the seed-title JSON array out of a Claude response."""
         if not response.content:
             raise ValueError("Empty response from Claude API in _identify_seed_articles")
 
@@ -864,18 +1861,69 @@ class KnowledgeGraphAgent:
 
         raise ValueError(f"Unexpected response format from _identify_seed_articles: {text[:200]}")
 
-    def _synthesize_graph_rag_answer(self, question: str, context: str, sources: list[str]) -> str:
-        """Synthesize an answer from multi-hop graph context.
+    def _resolve_local_seeds(self, question: str) -> list[str]:
+        """Pick up to 3 seed titles without an LLM call.
 
-        Args:
-            question: The original user question.
-            context: Combined section content from traversed articles.
-            sources: List of article titles used as context.
+        Titles mentioned verbatim in the question (title index) come first,
+        followed by the articles of the top vector hits.  Returns an empty
+        list when the agent is set to ``seed_resolution="llm"``, or when no
+        title is mentioned and the best vector hit is below
+        ``SEED_CONFIDENCE_THRESHOLD``; the caller then asks Claude.
+        """
+        if self.seed_resolution != "local":
+            return []
+        from wikigr.agent.retriever import title_mentions
 
-        Returns:
-            Natural language answer string.
+        index = self._get_title_index()
+        seeds = title_mentions(question, index, self.STOP_WORDS) if index is not None else []
+        try:
+            hits = self.semantic_search(question, top_k=3)
+        except RuntimeError as e:
+            logger.debug("Vector search failed during seed resolution: %s", e)
+            hits = []
+        confident = [h["title"] for h in hits if h["similarity"] >= self.SEED_CONFIDENCE_THRESHOLD]
+        if not seeds and not confident:
+            logger.info("Local seed resolution not confident; asking Claude")
+            return []
+        return list(dict.fromkeys(seeds + confident))[:3]
+
+    def _identify_seed_articles(self, question: str) -> list[str]:
+        """Use Claude to extract likely Wikipedia article titles from a question.
+
+        Raises APIConnectionError, APIStatusError, or APITimeoutError on Claude API failure.
+        Raises ValueError if the API returns an empty or unparseable response.
         """
-        prompt = (
+        try:
+            response = self.claude.messages.create(
+                model=self.synthesis_model,
+                max_tokens=self.SEED_EXTRACT_MAX_TOKENS,
+                messages=[{"role": "user", "content": self._seed_articles_prompt(question)}],
+            )
+            self._track_response(response)
+        except (APIConnectionError, APIStatusError, APITimeoutError):
+            logger.warning("Claude API error in _identify_seed_articles")
+            raise
+
+        return self._parse_seed_articles(response)
+
+    async def _aidentify_seed_articles(self, question: str) -> list[str]:
+        """Async twin of :meth:`_identify_seed_articles` (same errors)."""
+        try:
+            response = await self.async_claude.messages.create(
+                model=self.synthesis_model,
+                max_tokens=self.SEED_EXTRACT_MAX_TOKENS,
+                messages=[{"role": "user", "content": self._seed_articles_prompt(question)}],
+            )
+            self._track_response(response)
+        except (APIConnectionError, APIStatusError, APITimeoutError):
+            logger.warning("Claude API error in _aidentify_seed_articles")
+            raise
+
+        return self._parse_seed_articles(response)
+
+    @staticmethod
+    def _graph_rag_prompt(question: str, context: str, sources: list[str]) -> str:
+        return (
             "Using the following context gathered by traversing a Wikipedia "
             "knowledge graph, answer the question below.  Cite specific article titles "
             "where possible.\n\n"
@@ -885,25 +1933,67 @@ class KnowledgeGraphAgent:
             "Provide a clear, factual answer. If the context is insufficient, say so."
         )
 
+    @staticmethod
+    def _graph_rag_fallback(sources: list[str]) -> str:
+        return (
+            f"Found {len(sources)} related articles: {', '.join(sources[:5])}"
+            if sources
+            else "No results found."
+        )
+
+    def _synthesize_graph_rag_answer(
+        self, question: str, context: str, sources: list[str]
+    ) -> tuple[str, bool]:
+        """Synthesize an answer from multi-hop graph context.
+
+        Args:
+            question: The original user question.
+            context: Combined section content from traversed articles.
+            sources: List of article titles used as context.
+
+        Returns:
+            ``(answer, ok)``; *ok* is False for the API-error and
+            empty-response fallbacks.
+        """
         try:
             response = self.claude.messages.create(
                 model=self.synthesis_model,
                 max_tokens=self.SYNTHESIS_MAX_TOKENS,
-                messages=[{"role": "user", "content": prompt}],
+                messages=[
+                    {"role": "user", "content": self._graph_rag_prompt(question, context, sources)}
+                ],
             )
             self._track_response(response)
         except (APIConnectionError, APIStatusError, APITimeoutError) as e:
             logger.warning(f"Claude API error in _synthesize_graph_rag_answer: {e}")
-            return (
-                f"Found {len(sources)} related articles: {', '.join(sources[:5])}"
-                if sources
-                else "No results found."
+            return self._graph_rag_fallback(sources), False
+
+        if not response.content:
+            return "Unable to synthesize answer: empty response from Claude.", False
+
+        return response.content[0].text, True
+
+    async def _asynthesize_graph_rag_answer(
+        self, question: str, context: str, sources: list[str]
+    ) -> tuple[str, bool]:
+        """Async twin of :meth:`_synthesize_graph_rag_answer`."""
+        try:
+            response = await self.async_claude.messages.create(
+                model=self.synthesis_model,
+                max_tokens=self.SYNTHESIS_MAX_TOKENS,
+                messages=[
+                    {"role": "user", "content": self._graph_rag_prompt(question, context, sources)}
+                ],
             )
+            self._track_response(response)
+        except (APIConnectionError, APIStatusError, APITimeoutError) as e:
+            logger.warning(f"Claude API error in _asynthesize_graph_rag_answer: {e}")
+            return self._graph_rag_fallback(sources), False
 
         if not response.content:
-            return "Unable to synthesize answer: empty response from Claude."
+            return "Unable to synthesize answer: empty response from Claude.", False
 
-        return response.content[0].text
+        return response.content[0].text, True
 
     # ------------------------------------------------------------------
     # Retrieval helpers — delegate to wikigr.agent.retriever
@@ -918,7 +2008,64 @@ class KnowledgeGraphAgent:
         """
         from wikigr.agent.retriever import direct_title_lookup
 
-        return direct_title_lookup(self.conn, question)
+        return direct_title_lookup(self.conn, question, self._get_title_index())
+
+    def _get_title_index(self) -> Any:
+        """Return the in-memory title index, rebuilding it if the database changed.
+
+        Returns None when the index is disabled or cannot be loaded, in which
+        case title matching falls back to Cypher scans.  Concurrent callers
+        may both rebuild a stale index; the last one wins.
+        """
+        if not self.enable_title_index:
+            return None
+        from wikigr.agent.retriever import load_title_index
+        from wikigr.agent.title_index import db_version
+
+        version = db_version(self._db_path)
+        index = self._title_index
+        if index is None or index.version != version:
+            index = load_title_index(self.conn, version)
+            self._title_index = index
+            if index is not None:
+                logger.info("Title index built: %d articles", len(index))
+        return index
+
+    def _get_graph_snapshot(self) -> Any:
+        """Return the in-memory graph snapshot, rebuilding it if the database changed.
+
+        Returns None when the snapshot is disabled (or the pack was opened
+        for writing) or cannot be loaded, in which case traversals fall back
+        to Cypher.  A rebuilt snapshot is handed to the reranker and the
+        multi-doc synthesizer as well.
+        """
+        if not self.enable_graph_snapshot:
+            return None
+        from wikigr.agent.graph_snapshot import load_graph_snapshot
+        from wikigr.agent.title_index import db_version
+
+        version = db_version(self._db_path)
+        snapshot = self._graph_snapshot
+        if snapshot is None or snapshot.version != version:
+            snapshot = load_graph_snapshot(self.conn, version)
+            self._graph_snapshot = snapshot
+            if snapshot is not None:
+                logger.info(
+                    "Graph snapshot built: %d articles, %d links, %d entities, %d relations",
+                    len(snapshot.articles),
+                    snapshot.articles.num_edges,
+                    len(snapshot.entities),
+                    snapshot.entities.num_edges,
+                )
+            for component in (self.reranker, self.synthesizer):
+                if component is not None:
+                    component.graph = snapshot.articles if snapshot is not None else None
+        return snapshot
+
+    def _article_graph(self) -> Any:
+        """The ``LINKS_TO`` CSR graph of the snapshot, or None without a snapshot."""
+        snapshot = self._get_graph_snapshot()
+        return snapshot.articles if snapshot is not None else None
 
     def _multi_query_retrieve(self, question: str, max_results: int = 5) -> list[dict]:
         """Retrieve results using original question plus 2 alternative phrasings.
@@ -936,22 +2083,110 @@ class KnowledgeGraphAgent:
         """
         from wikigr.agent.retriever import multi_query_retrieve
 
-        return multi_query_retrieve(
-            self.claude,
-            self.semantic_search,
-            self._track_response,
-            question,
-            max_results,
-        )
+        # Batched encode + concurrent index lookups need a Database to open
+        # worker connections on; agents built from a bare connection search serially.
+        with telemetry.span("multi_query"):
+            return multi_query_retrieve(
+                self.claude,
+                self.semantic_search,
+                self._track_response,
+                question,
+                max_results,
+                search_many_fn=self._search_many if self.db is not None else None,
+            )
+
+    def _search_many(self, queries: list[str], top_k: int) -> list[list[dict]]:
+        """Vector-search several queries with one encoder pass and concurrent lookups.
+
+        All queries are embedded in a single ``generate_query`` batch (cache
+        hits skip the model), then each ``QUERY_VECTOR_INDEX`` call runs on a
+        worker thread with its own connection to ``self.db``.
+
+        Args:
+            queries: Query strings.
+            top_k: Articles per query.
+
+        Returns:
+            One result list per query, in input order.  A query whose lookup
+            fails yields an empty list.
+        """
+        self._check_open()
+        with telemetry.span("embed"):
+            embeddings = self._get_embedding_generator().generate_query(list(queries))
+        search_fn = self._vector_search_fn()
+
+        def _search(embedding) -> list[dict]:
+            return search_fn(self._worker_conn(), embedding, top_k)
+
+        futures = [self._get_search_executor().submit(_search, emb) for emb in embeddings]
+        results: list[list[dict]] = []
+        for query, future in zip(queries, futures):
+            try:
+                results.append(future.result())
+            except (RuntimeError, OSError) as e:
+                logger.warning(f"Concurrent vector search failed for query {query[:100]!r}: {e}")
+                results.append([])
+        return results
+
+    def _get_search_executor(self) -> ThreadPoolExecutor:
+        """Lazily create the thread pool used for concurrent vector search."""
+        with self._worker_lock:
+            if self._search_executor is None:
+                self._search_executor = ThreadPoolExecutor(
+                    max_workers=self.SEARCH_WORKERS,
+                    thread_name_prefix="kg-search",
+                    initializer=self._mark_worker_thread,
+                )
+            return self._search_executor
+
+    def _mark_worker_thread(self) -> None:
+        """Thread-pool initializer: ``self.conn`` resolves to a private connection here."""
+        self._worker_local.is_worker = True
+
+    @property
+    def conn(self) -> "kuzu.Connection":
+        """The connection for the calling thread.
+
+        The agent's own connection, except on stage/search worker threads,
+        which each get a private connection to ``self.db`` (LadybugDB
+        connections must not be shared across threads).
+        """
+        local = self._worker_local
+        if local is not None and getattr(local, "is_worker", False):
+            return self._worker_conn()
+        return self._conn  # type: ignore[return-value]
+
+    @conn.setter
+    def conn(self, value: "kuzu.Connection | None") -> None:
+        self._conn = value
+
+    def _worker_conn(self) -> "kuzu.Connection":
+        """Return the calling worker thread's private connection to ``self.db``.
+
+        LadybugDB connections must not be shared across threads, so each
+        search worker opens (and keeps) its own, with extensions loaded.
+        """
+        conn = getattr(self._worker_local, "conn", None)
+        if conn is None:
+            from bootstrap.schema.ryugraph_schema import load_extensions
+
+            conn = kuzu.Connection(self.db)
+            load_extensions(conn)
+            self._worker_local.conn = conn
+            with self._worker_lock:
+                self._worker_conns.append(conn)
+        return conn
 
     def _vector_primary_retrieve(
-        self, question: str, max_results: int
+        self, question: str, max_results: int, vector_results: list[dict] | None = None
     ) -> tuple[dict | None, float]:
         """Attempt vector search as primary retrieval.
 
         Args:
             question: Natural language question.
             max_results: Maximum results to return.
+            vector_results: Search results already fetched for *question*
+                (``query_batch``); skips the search.
 
         Returns:
             (kg_results_dict, max_similarity) or (None, 0.0) on failure.
@@ -966,6 +2201,7 @@ class KnowledgeGraphAgent:
             self.enable_multi_query,
             question,
             max_results,
+            vector_results,
         )
 
     def _hybrid_retrieve(
@@ -979,6 +2215,9 @@ class KnowledgeGraphAgent:
     ) -> dict[str, Any]:
         """Combine vector, graph, and keyword retrieval for richer results.
 
+        With ``enable_bm25`` the vector ranking is first fused (RRF) with BM25
+        full-text hits from the pack's FTS indexes.
+
         Args:
             question: Natural language question.
             max_results: Maximum articles to return.
@@ -1004,6 +2243,9 @@ class KnowledgeGraphAgent:
             graph_weight,
             keyword_weight,
             _precomputed_vector,
+            title_index=self._get_title_index(),
+            use_bm25=self.enable_bm25,
+            graph=self._article_graph(),
         )
 
     def _score_section_quality(
@@ -1034,6 +2276,7 @@ class KnowledgeGraphAgent:
         source_titles: list[str],
         max_articles: int = 5,
         question: str | None = None,
+        sections: dict[str, list[str]] | None = None,
     ) -> str:
         """Fetch section text for source articles (batched, single query).
 
@@ -1042,13 +2285,70 @@ class KnowledgeGraphAgent:
         Falls back to article-level content if sections aren't available.
 
         When ``question`` is provided, sections below CONTENT_QUALITY_THRESHOLD
-        are filtered out before inclusion.
+        are filtered out before inclusion.  ``sections`` (prefetched by
+        :meth:`_fetch_article_sections`) skips the section query.  The best
+        chunks of all sources are packed into ``CONTEXT_TOKEN_BUDGET`` tokens
+        (see ``wikigr.agent.context_packer``).
         """
         self._check_open()
 
         from wikigr.agent.retriever import fetch_source_text
 
-        return fetch_source_text(
+        with telemetry.span("fetch_source_text"):
+            return fetch_source_text(
+                self.conn,
+                self._score_section_quality,
+                self.STOP_WORDS,
+                self.MAX_ARTICLE_CHARS,
+                self.CONTENT_QUALITY_THRESHOLD,
+                source_titles,
+                max_articles,
+                question,
+                sections=sections,
+                token_budget=self.CONTEXT_TOKEN_BUDGET,
+                count_tokens=self._context_token_counter(),
+            )
+
+    def _context_token_counter(self) -> Any:
+        """Counter for ``CONTEXT_TOKEN_BUDGET``, or None for the estimate.
+
+        With ``CONTEXT_TOKEN_COUNTER = "claude"`` the budget is counted in
+        the synthesis model's tokens by a per-agent
+        :class:`~wikigr.agent.context_packer.ClaudeTokenCounter`, whose
+        cache outlives individual queries.
+        """
+        if self.CONTEXT_TOKEN_COUNTER != "claude":
+            return None
+        with self._worker_lock:
+            counter = self._token_counter
+            if counter is None or counter.model != self.synthesis_model:
+                from wikigr.agent.context_packer import ClaudeTokenCounter
+
+                counter = ClaudeTokenCounter(self.claude, self.synthesis_model)
+                self._token_counter = counter
+            return counter
+
+    def _fetch_article_sections(self, titles: list[str]) -> dict[str, list[str]]:
+        """Cleaned section texts per article for *titles*, in one query."""
+        self._check_open()
+
+        from wikigr.agent.retriever import fetch_article_sections
+
+        return fetch_article_sections(self.conn, titles)
+
+    def _fetch_source_passages(
+        self,
+        source_titles: list[str],
+        max_articles: int = 5,
+        question: str | None = None,
+        sections: dict[str, list[str]] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Per-article variant of :meth:`_fetch_source_text` used by :meth:`retrieve`."""
+        self._check_open()
+
+        from wikigr.agent.retriever import fetch_source_passages
+
+        return fetch_source_passages(
             self.conn,
             self._score_section_quality,
             self.STOP_WORDS,
@@ -1057,8 +2357,36 @@ class KnowledgeGraphAgent:
             source_titles,
             max_articles,
             question,
+            sections=sections,
         )
 
+    def _passage_sections(
+        self,
+        kg_results: dict,
+        limit: int = 5,
+        sections: dict[str, list[str]] | None = None,
+    ) -> dict[str, list[str]] | None:
+        """Section texts to synthesize from when retrieval returned chunk passages.
+
+        Titles among the first *limit* sources that have merged chunk
+        passages (chunk retrieval mode) use those passages; the rest (title
+        and hybrid matches) use their full sections, taken from *sections*
+        or fetched.  Returns *sections* unchanged when there are no passages.
+        """
+        passages = kg_results.get("passages")
+        if not passages:
+            return sections
+        merged = dict(sections or {})
+        missing = [
+            t
+            for t in kg_results.get("sources", [])[:limit]
+            if t not in passages and t not in merged
+        ]
+        if missing:
+            merged.update(self._fetch_article_sections(missing))
+        merged.update(passages)
+        return merged
+
     # ------------------------------------------------------------------
     # Synthesis helpers — delegate to wikigr.agent.synthesizer
     # ------------------------------------------------------------------
@@ -1078,15 +2406,16 @@ class KnowledgeGraphAgent:
         """
         from wikigr.agent.synthesizer import build_synthesis_context
 
+        sections = self._passage_sections(kg_results)
         return build_synthesis_context(
-            self._fetch_source_text,
+            functools.partial(self._fetch_source_text, sections=sections),
             question,
             kg_results,
             query_plan,
             few_shot_examples,
         )
 
-    def _synthesize_answer_minimal(self, question: str) -> str:
+    def _synthesize_answer_minimal(self, question: str) -> tuple[str, bool]:
         """Synthesize answer using Claude's own knowledge when pack has no relevant content."""
         from wikigr.agent.synthesizer import synthesize_answer_minimal
 
@@ -1104,7 +2433,7 @@ class KnowledgeGraphAgent:
         kg_results: dict,
         query_plan: dict,
         few_shot_examples: list[dict] | None = None,
-    ) -> str:
+    ) -> tuple[str, bool]:
         """Use Claude to synthesize natural language answer from KG results."""
         from wikigr.agent.synthesizer import synthesize_answer
 
@@ -1120,6 +2449,100 @@ class KnowledgeGraphAgent:
             few_shot_examples,
         )
 
+    # ------------------------------------------------------------------
+    # asyncio support — AsyncAnthropic + bounded DB pool
+    # ------------------------------------------------------------------
+
+    @property
+    def async_claude(self) -> AsyncAnthropic:
+        """AsyncAnthropic client used by aquery()/agraph_query() (created on first use)."""
+        client = self._async_claude
+        if client is None:
+            client = AsyncAnthropic(api_key=self._anthropic_api_key)
+            self._async_claude = client
+            self._owns_async_claude = True
+        return client
+
+    async def _run_db(self, fn, *args: Any, **kwargs: Any) -> Any:
+        """Await blocking database work on the agent's bounded DB pool.
+
+        The work runs in a copy of the caller's context so telemetry spans
+        land in the calling query's trace.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_db_executor(),
+            functools.partial(contextvars.copy_context().run, fn, *args, **kwargs),
+        )
+
+    def _get_db_executor(self) -> ThreadPoolExecutor:
+        """Lazily create the thread pool that runs DB work for the async API.
+
+        With a Database, each worker gets its own connection (like the stage
+        pool), so up to ``ASYNC_DB_WORKERS`` questions retrieve in parallel.
+        Agents built from a single connection get one worker: that connection
+        is used serially, exactly as by the blocking API.
+        """
+        with self._worker_lock:
+            if self._db_executor is None:
+                has_db = self.db is not None
+                self._db_executor = ThreadPoolExecutor(
+                    max_workers=self.ASYNC_DB_WORKERS if has_db else 1,
+                    thread_name_prefix="kg-db",
+                    initializer=self._mark_worker_thread if has_db else None,
+                )
+            return self._db_executor
+
+    async def _abuild_synthesis_context(
+        self,
+        question: str,
+        kg_results: dict,
+        query_plan: dict,
+        few_shot_examples: list[dict] | None = None,
+    ) -> str:
+        """Build the synthesis prompt on the DB pool (it fetches source text)."""
+        return await self._run_db(
+            self._build_synthesis_context,
+            question,
+            kg_results,
+            query_plan,
+            few_shot_examples=few_shot_examples,
+        )
+
+    async def _asynthesize_answer_minimal(self, question: str) -> tuple[str, bool]:
+        """Async twin of :meth:`_synthesize_answer_minimal`."""
+        from wikigr.agent.synthesizer import asynthesize_answer_minimal
+
+        return await asynthesize_answer_minimal(
+            self.async_claude,
+            self.synthesis_model,
+            self.SYNTHESIS_MAX_TOKENS,
+            self._track_response,
+            question,
+        )
+
+    async def _asynthesize_answer(
+        self,
+        question: str,
+        kg_results: dict,
+        query_plan: dict,
+        few_shot_examples: list[dict] | None = None,
+    ) -> tuple[str, bool]:
+        """Async twin of :meth:`_synthesize_answer`."""
+        from wikigr.agent.synthesizer import asynthesize_answer
+
+        return await asynthesize_answer(
+            self.async_claude,
+            self.synthesis_model,
+            self.SYNTHESIS_MAX_TOKENS,
+            self._track_response,
+            self._abuild_synthesis_context,
+            question,
+            kg_results,
+            query_plan,
+            few_shot_examples,
+        )
+
     # ------------------------------------------------------------------
     # Entity and relationship methods
     # ------------------------------------------------------------------
@@ -1135,7 +2558,7 @@ class KnowledgeGraphAgent:
             Entity details with type, properties, and source articles
         """
         self._check_open()
-        df = self._safe_query(
+        rows = self._safe_query(
             """
             MATCH (e:Entity {name: $name})
             OPTIONAL MATCH (a:Article)-[:HAS_ENTITY]->(e)
@@ -1145,10 +2568,10 @@ class KnowledgeGraphAgent:
             {"name": entity_name},
             log_context="find_entity",
         )
-        if df is None:
+        if rows is None:
             return None
 
-        row = df.iloc[0]
+        row = rows.records()[0]
         return {
             "name": row["name"],
             "type": row["type"],
@@ -1157,51 +2580,64 @@ class KnowledgeGraphAgent:
         }
 
     def find_relationship_path(
-        self, source_entity: str, target_entity: str, max_hops: int = 3
+        self, source_entity: str, target_entity: str, max_hops: int = 3, max_paths: int = 5
     ) -> list[dict]:
         """
-        Find relationship paths between two entities.
+        Find the shortest relationship paths between two entities.
+
+        With a graph snapshot the paths come from a bidirectional BFS over the
+        in-memory ``ENTITY_RELATION`` adjacency; otherwise from an
+        ``ALL SHORTEST`` Cypher match.
 
         Args:
             source_entity: Source entity name
             target_entity: Target entity name
             max_hops: Maximum path length
+            max_paths: Maximum number of paths returned
 
         Returns:
-            List of paths with relationships
+            List of paths of the minimum length, each
+            ``{"source", "target", "hops", "path": [entity names],
+            "relations": [relation per hop]}``
         """
         self._check_open()
         if not isinstance(max_hops, int) or not (1 <= max_hops <= 10):
             raise ValueError(f"max_hops must be an integer between 1 and 10, got {max_hops!r}")
+        if not isinstance(max_paths, int) or not (1 <= max_paths <= 100):
+            raise ValueError(f"max_paths must be an integer between 1 and 100, got {max_paths!r}")
 
-        # Simplified query without path list comprehensions (LadybugDB limitation)
-        df = self._safe_query(
-            f"""
-            MATCH path = (src:Entity {{name: $src}})-[:ENTITY_RELATION*1..{max_hops}]->(tgt:Entity {{name: $tgt}})
-            RETURN src.name AS source, tgt.name AS target, length(path) AS hops
-            ORDER BY hops ASC
-            LIMIT 5
-            """,
-            {"src": source_entity, "tgt": target_entity},
-            log_context="find_relationship_path",
-        )
-        if df is None:
-            return []
+        snapshot = self._get_graph_snapshot()
+        if snapshot is not None:
+            found = snapshot.entities.shortest_paths(
+                source_entity, target_entity, max_hops, k=max_paths
+            )
+        else:
+            # NOTE: max_hops is interpolated because LadybugDB does not support
+            # parameterised path bounds; it is validated to int 1-10 above.
+            rows = self._safe_query(
+                f"""
+                MATCH path = (src:Entity {{name: $src}})-[:ENTITY_RELATION* ALL SHORTEST 1..{max_hops}]->(tgt:Entity {{name: $tgt}})
+                RETURN properties(nodes(path), 'name') AS path,
+                       properties(rels(path), 'relation') AS relations
+                LIMIT $limit
+                """,
+                {"src": source_entity, "tgt": target_entity, "limit": max_paths},
+                log_context="find_relationship_path",
+            )
+            found = [] if rows is None else [(names, relations) for names, relations in rows]
 
-        paths = [
+        return [
             {
-                "source": source,
-                "target": target,
-                "hops": hops,
-                "note": "Full path details require multiple queries in LadybugDB",
+                "source": source_entity,
+                "target": target_entity,
+                "hops": len(names) - 1,
+                "path": names,
+                "relations": relations,
             }
-            for source, target, hops in zip(
-                df["source"].tolist(), df["target"].tolist(), df["hops"].tolist()
-            )
+            for names, relations in found
+            if len(names) > 1
         ]
 
-        return paths
-
     def get_entity_facts(self, entity_or_article: str) -> list[str]:
         """
         Get all facts about an entity or article.
@@ -1214,7 +2650,7 @@ class KnowledgeGraphAgent:
         """
         self._check_open()
         # Try as article first
-        df = self._safe_query(
+        rows = self._safe_query(
             """
             MATCH (a:Article {title: $name})-[:HAS_FACT]->(f:Fact)
             RETURN f.content AS fact
@@ -1222,11 +2658,11 @@ class KnowledgeGraphAgent:
             {"name": entity_or_article},
             log_context="get_entity_facts (article)",
         )
-        if df is not None:
-            return df["fact"].tolist()
+        if rows is not None:
+            return rows.column("fact")
 
         # Try as entity
-        df = self._safe_query(
+        rows = self._safe_query(
             """
             MATCH (e:Entity {name: $name})<-[:HAS_ENTITY]-(a:Article)-[:HAS_FACT]->(f:Fact)
             RETURN DISTINCT f.content AS fact
@@ -1234,20 +2670,25 @@ class KnowledgeGraphAgent:
             {"name": entity_or_article},
             log_context="get_entity_facts (entity)",
         )
-        return df["fact"].tolist() if df is not None else []
+        return rows.column("fact") if rows is not None else []
 
-    def semantic_search(self, query: str, top_k: int = 10) -> list[dict]:
+    def semantic_search(
+        self, query: str, top_k: int = 10, query_embedding: list[float] | None = None
+    ) -> list[dict]:
         """
-        Semantic search over article sections.
+        Semantic search over article sections (or chunks, with ``retrieval_mode="chunk"``).
 
         Supports both article title lookups (fast path) and arbitrary free-text
         queries. When the query matches an existing article title, the embedding
         from that article's first section is used directly. Otherwise, an
-        embedding is generated on the fly using sentence-transformers.
+        embedding is generated on the fly using sentence-transformers (served
+        from the query-embedding cache for repeated questions).
 
         Args:
             query: Search query -- an article title or arbitrary free text
             top_k: Number of results
+            query_embedding: Precomputed query embedding.  When given, both the
+                title fast path and embedding generation are skipped.
 
         Returns:
             List of similar articles with similarity scores
@@ -1256,58 +2697,111 @@ class KnowledgeGraphAgent:
         if not isinstance(top_k, int) or not (1 <= top_k <= 500):
             raise ValueError(f"top_k must be an integer between 1 and 500, got {top_k!r}")
 
-        # Fast path: use an existing article's section embedding
-        result = self.conn.execute(
-            """
-            MATCH (a:Article {title: $query})-[:HAS_SECTION]->(s:Section)
-            RETURN s.embedding AS embedding
-            LIMIT 1
-            """,
-            {"query": query},
-        )
+        if query_embedding is None:
+            # Fast path: use an existing article's section embedding
+            result = self.conn.execute(
+                """
+                MATCH (a:Article {title: $query})-[:HAS_SECTION]->(s:Section)
+                RETURN s.embedding AS embedding
+                LIMIT 1
+                """,
+                {"query": query},
+            )
 
-        df = result.get_as_df()
-        if not df.empty:
-            query_embedding = df.iloc[0]["embedding"]
-        else:
-            # Fallback: generate embedding on the fly for free-text queries
-            logger.info(f"No article titled {query!r}; generating embedding on the fly")
-            generator = self._get_embedding_generator()
-            embeddings = generator.generate_query([query])
-            query_embedding = embeddings[0].tolist()
-
-        # Vector search
-        result = self.conn.execute(
-            """
-            CALL QUERY_VECTOR_INDEX('Section', 'embedding_idx', $emb, $k)
-            RETURN *
-            """,
-            {"emb": query_embedding, "k": top_k * 3},
-        )
+            rows = fetch(result)
+            if not rows.empty:
+                query_embedding = rows.scalar("embedding")
+            else:
+                # Fallback: generate embedding on the fly for free-text queries
+                logger.info(f"No article titled {query!r}; generating embedding on the fly")
+                generator = self._get_embedding_generator()
+                with telemetry.span("embed"):
+                    embeddings = generator.generate_query([query])
+                query_embedding = embeddings[0].tolist()
 
-        df = result.get_as_df()
-        if df.empty:
-            return []
+        return self._vector_search_fn()(self.conn, query_embedding, top_k)
 
-        # Aggregate by article, keeping best-matching section content.
-        # Iterate column lists directly — faster than df.iterrows() which boxes each row.
-        articles = {}
-        for node, distance in zip(df["node"].tolist(), df["distance"].tolist()):
-            section_id = node.get("section_id", "")
-            article_title = section_id.split("#")[0]
-            content = node.get("content", "")
-
-            if article_title not in articles or distance < articles[article_title]["distance"]:
-                articles[article_title] = {
-                    "title": article_title,
-                    "similarity": max(0.0, min(1.0, 1.0 - distance)),
-                    "distance": distance,
-                    "content": content or "",
-                }
+    def _vector_search_fn(self):
+        """Index search for the agent's retrieval mode: (conn, embedding, top_k) -> results.
+
+        Uses exact search over the pack's embedding sidecar when it is small
+        enough (see ``_exact_index``), otherwise the HNSW vector index.
+        """
+        from wikigr.agent.retriever import chunk_vector_search, vector_search
+
+        search = chunk_vector_search if self.retrieval_mode == "chunk" else vector_search
+        exact_index = self._exact_index()
+        if exact_index is None:
+            return search
+        return functools.partial(search, exact_index=exact_index)
+
+    def _exact_index(self) -> Any:
+        """Return the exact-search sidecar for the retrieval mode, or None.
+
+        Loaded once per mode.  The sidecar is used only when it has at most
+        ``EXACT_SEARCH_MAX_ROWS`` rows (``QUANTIZED_SEARCH_MAX_ROWS`` for an
+        int8 or binary sidecar) and as many rows as the database has
+        embedded nodes; otherwise (or for agents without a db_path) search
+        goes through the vector index.
+        """
+        if self._db_path is None:
+            return None
+        kind = self.retrieval_mode
+        if kind not in self._exact_indexes:
+            self._exact_indexes[kind] = self._load_exact_index(self._db_path, kind)
+        return self._exact_indexes[kind]
 
-        # Sort by similarity
-        results = sorted(articles.values(), key=lambda x: x["similarity"], reverse=True)
-        return results[:top_k]
+    def _load_exact_index(self, db_path: str, kind: str) -> Any:
+        from wikigr.packs.embedding_sidecar import SIDECAR_KINDS, load_exact_index
+
+        index = load_exact_index(Path(db_path).parent, kind)
+        if index is None:
+            return None
+        max_rows = (
+            self.EXACT_SEARCH_MAX_ROWS
+            if index.storage == "float32"
+            else self.QUANTIZED_SEARCH_MAX_ROWS
+        )
+        if len(index) > max_rows:
+            logger.info(
+                "%s %s sidecar has %d rows (> %d); using the vector index",
+                kind,
+                index.storage,
+                len(index),
+                max_rows,
+            )
+            return None
+        table, _key = SIDECAR_KINDS[kind]
+        rows = self._safe_query(
+            f"MATCH (n:{table}) WHERE n.embedding IS NOT NULL RETURN count(n) AS count",
+            log_context="embedding sidecar check",
+        )
+        count = int(rows.scalar("count")) if rows is not None else -1
+        if count != len(index):
+            logger.warning(
+                "Ignoring stale %s embedding sidecar (%d rows, database has %d)",
+                kind,
+                len(index),
+                count,
+            )
+            return None
+        logger.info(
+            "In-memory %s search over %d memory-mapped %s embeddings",
+            kind,
+            len(index),
+            index.storage,
+        )
+        return index
+
+    def _vector_index_cypher(self, max_results: int) -> str:
+        if self.retrieval_mode == "chunk":
+            return (
+                "CALL QUERY_VECTOR_INDEX('Chunk', 'chunk_embedding_idx', $emb, "
+                f"{max_results * 4}) RETURN *"
+            )
+        return (
+            f"CALL QUERY_VECTOR_INDEX('Section', 'embedding_idx', $emb, {max_results * 3}) RETURN *"
+        )
 
     def __enter__(self):
         return self
@@ -1315,9 +2809,51 @@ class KnowledgeGraphAgent:
     def __exit__(self, *args):
         self.close()
 
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Async close: close an agent-owned AsyncAnthropic client, then :meth:`close`.
+
+        The blocking part runs off the event loop because it waits for
+        in-flight DB work to finish before worker connections are closed.
+        """
+        client = self._async_claude
+        if client is not None and self._owns_async_claude:
+            await client.close()
+        self._async_claude = None
+        await asyncio.to_thread(self.close)
+
     def close(self) -> None:
-        """Close database connection and release embedding model if loaded."""
+        """Close database connection and release shared models if loaded."""
+        for attr in ("_db_executor", "_stage_executor", "_search_executor"):
+            executor = getattr(self, attr, None)
+            if executor is not None:
+                executor.shutdown(wait=True)
+                setattr(self, attr, None)
+        for worker_conn in getattr(self, "_worker_conns", []):
+            with contextlib.suppress(Exception):
+                worker_conn.close()
+        self._worker_conns = []
         self.conn = None  # type: ignore[assignment]
         self.db = None  # type: ignore[assignment]
+        # Drop this agent's references in the process-wide ModelRegistry.
+        for component in (
+            self._embedding_generator,
+            getattr(self, "few_shot", None),
+            getattr(self, "cross_encoder", None),
+        ):
+            if component is not None and hasattr(component, "close"):
+                component.close()
         self._embedding_generator = None
         self._plan_cache.clear()
+        self._title_index = None
+        self._graph_snapshot = None
+        self._exact_indexes = {}
+        answer_cache = self.answer_cache
+        if answer_cache is not None:
+            answer_cache.close()
+            self.answer_cache = None
@@ -4,11 +4,18 @@ This module provides MultiDocSynthesizer which expands search results by
 traversing the knowledge graph (BFS) and synthesizes content with citations.
 
 API Contract:
-    MultiDocSynthesizer(kuzu_conn) -> instance
+    MultiDocSynthesizer(kuzu_conn, graph=None) -> instance
+    related_titles(
+        seed_titles: list[str],
+        max_hops: int = 1,
+        max_articles: int = 10,
+        conn=None
+    ) -> list[str]
     expand_to_related_articles(
         seed_articles: list[int],
         max_hops: int = 1,
-        max_articles: int = 50
+        max_articles: int = 50,
+        conn=None
     ) -> dict[int, dict]
     synthesize_with_citations(
         articles: dict[int, dict],
@@ -20,32 +27,88 @@ Design Philosophy:
     - Markdown citations for clear source attribution
     - Content truncation at 500 chars for context windows
     - Simple sequential numbering: [1], [2], [3]...
+    - Title expansion reads the in-memory graph snapshot when one is attached
+    - Queries run on ``conn`` when given, so a synthesizer shared across
+      threads can use each caller's own connection
 """
 
+from __future__ import annotations
+
 import logging
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import real_ladybug as kuzu
 
+from bootstrap.src.query_result import fetch
+
+if TYPE_CHECKING:
+    from wikigr.agent.graph_snapshot import CSRGraph
+
 logger = logging.getLogger(__name__)
 
 
 class MultiDocSynthesizer:
     """Expands and synthesizes content from multiple graph articles."""
 
-    def __init__(self, kuzu_conn: kuzu.Connection):
+    def __init__(self, kuzu_conn: kuzu.Connection, graph: CSRGraph | None = None):
         """Initialize synthesizer with LadybugDB connection.
 
         Args:
             kuzu_conn: Active LadybugDB connection for graph traversal
+            graph: In-memory ``LINKS_TO`` graph (``GraphSnapshot.articles``)
+                used by :meth:`related_titles` instead of Cypher
         """
         self.conn = kuzu_conn
+        self.graph = graph
+
+    def related_titles(
+        self,
+        seed_titles: list[str],
+        max_hops: int = 1,
+        max_articles: int = 10,
+        conn: kuzu.Connection | None = None,
+    ) -> list[str]:
+        """Titles reachable from *seed_titles* within *max_hops* links.
+
+        Ordered by hop distance, then title; seeds are not included.  Cypher
+        runs on *conn* when given, else on the connection given at construction.
+
+        Raises:
+            ValueError: If parameters are out of valid ranges
+        """
+        if not isinstance(max_hops, int) or not (1 <= max_hops <= 3):
+            raise ValueError("max_hops must be 1-3")
+        if not isinstance(max_articles, int) or not (1 <= max_articles <= 100):
+            raise ValueError("max_articles must be 1-100")
+        if not seed_titles:
+            return []
+
+        if self.graph is not None:
+            return [t for t, _hop in self.graph.k_hop(seed_titles, max_hops, limit=max_articles)]
+
+        cypher = f"""
+        UNWIND $titles AS seed_title
+        MATCH path = (seed:Article {{title: seed_title}})-[:LINKS_TO*1..{max_hops}]->(neighbor:Article)
+        WHERE NOT neighbor.title IN $titles
+        WITH neighbor.title AS title, min(length(path)) AS hop
+        RETURN title
+        ORDER BY hop, title
+        LIMIT $limit
+        """
+        conn = self.conn if conn is None else conn
+        try:
+            rows = fetch(conn.execute(cypher, {"titles": seed_titles, "limit": max_articles}))
+            return rows.column("title")
+        except Exception as e:
+            logger.error(f"Related title traversal failed: {e}")
+            return []
 
     def expand_to_related_articles(
         self,
         seed_articles: list[int],
         max_hops: int = 1,
         max_articles: int = 50,
+        conn: kuzu.Connection | None = None,
     ) -> dict[int, dict[str, Any]]:
         """Expand seed articles by traversing graph relationships.
 
@@ -56,6 +119,7 @@ class MultiDocSynthesizer:
             seed_articles: List of starting article IDs
             max_hops: Maximum graph distance to traverse (0 = seeds only)
             max_articles: Maximum total articles to return
+            conn: Connection to query instead of the one given at construction
 
         Raises:
             ValueError: If parameters are out of valid ranges
@@ -79,6 +143,7 @@ class MultiDocSynthesizer:
 
         if not seed_articles:
             return {}
+        conn = self.conn if conn is None else conn
 
         # BFS traversal to discover neighbors (single query for all hops)
         discovered = set(seed_articles)
@@ -101,11 +166,11 @@ class MultiDocSynthesizer:
             }
 
             try:
-                result = self.conn.execute(cypher, params)
-                df = result.get_as_df()
+                result = conn.execute(cypher, params)
+                rows = fetch(result)
 
                 # Add discovered neighbors (respecting max_articles limit)
-                for _, row in df.iterrows():
+                for row in rows.records():
                     neighbor_id = int(row["article_id"])
                     hop_level = int(row["hop"])
 
@@ -119,13 +184,16 @@ class MultiDocSynthesizer:
         # Fetch content for all discovered articles (seeds + neighbors)
         # Respect max_articles limit
         discovered_list = list(discovered)[:max_articles]
-        return self._fetch_article_content(discovered_list)
+        return self._fetch_article_content(discovered_list, conn)
 
-    def _fetch_article_content(self, article_ids: list[int]) -> dict[int, dict[str, Any]]:
+    def _fetch_article_content(
+        self, article_ids: list[int], conn: kuzu.Connection | None = None
+    ) -> dict[int, dict[str, Any]]:
         """Fetch title and content for article IDs.
 
         Args:
             article_ids: List of article IDs to fetch
+            conn: Connection to query instead of the one given at construction
 
         Returns:
             Dictionary mapping article_id -> {title, content}
@@ -140,14 +208,15 @@ class MultiDocSynthesizer:
         RETURN a.id AS article_id, a.title AS title, a.content AS content
         """
 
+        conn = self.conn if conn is None else conn
         try:
-            result = self.conn.execute(cypher, {"article_ids": article_ids})
-            df = result.get_as_df()
+            result = conn.execute(cypher, {"article_ids": article_ids})
+            rows = fetch(result)
 
             articles = {}
             # Only take up to len(article_ids) results
             max_results = len(article_ids)
-            for _, row in df.iterrows():
+            for row in rows.records():
                 if len(articles) >= max_results:
                     break
                 article_id = int(row["article_id"])
@@ -0,0 +1,345 @@
+"""Warm, process-wide pool of pack-backed KnowledgeGraphAgent instances.
+
+Opening a pack agent is expensive: the LadybugDB database is opened, the
+VECTOR/FTS extensions are loaded, and (with enhancements on) few-shot
+embeddings are computed.  ``PackAgentPool`` keeps those agents warm between
+requests so pack chat latency is bounded by retrieval + synthesis rather
+than cold start.
+
+API Contract:
+    PackAgentPool(max_agents=8, max_bytes=None, idle_ttl_s=600.0, agent_factory=None)
+    acquire(pack_name: str, db_path: str) -> context manager yielding an agent
+    evict_idle() -> int
+    stats() -> dict
+    prometheus_text() -> str
+    close() -> None
+    open_pack_agent(db_path: str, **agent_kwargs) -> KnowledgeGraphAgent
+
+Design Philosophy:
+    - Agents are checked out exclusively: a LadybugDB connection is not
+      thread-safe, so two requests never share one agent at the same time.
+      Concurrent requests for the same pack open additional agents.
+    - LRU eviction of idle agents once ``max_agents`` or ``max_bytes`` is
+      exceeded; agents idle for longer than ``idle_ttl_s`` are closed lazily
+      on the next acquire (no background thread).
+    - An agent is discarded instead of reused when its pack database changed
+      on disk (re-install/update) or when it was closed by the caller.
+    - Memory is estimated from the on-disk size of ``pack.db``, which bounds
+      the LadybugDB buffer pool footprint of a read-only pack.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+def open_pack_agent(db_path: str, **agent_kwargs: Any) -> Any:
+    """Open a read-only KnowledgeGraphAgent for a pack database.
+
+    This is the pool's default factory.  Callers that need different agent
+    options (e.g. ``enable_answer_cache``) bind them with
+    ``functools.partial(open_pack_agent, ...)`` instead of writing their own.
+
+    Args:
+        db_path: Path to the pack's ``pack.db``.
+        **agent_kwargs: Extra ``KnowledgeGraphAgent`` keyword arguments.
+    """
+    from wikigr.agent.kg_agent import KnowledgeGraphAgent
+
+    return KnowledgeGraphAgent(db_path, read_only=True, **agent_kwargs)
+
+
+def _db_signature(db_path: str) -> tuple[int, int]:
+    """Return (mtime_ns, size_bytes) for a pack database file or directory."""
+    path = Path(db_path)
+    try:
+        if path.is_dir():
+            size = sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+        else:
+            size = path.stat().st_size
+        return path.stat().st_mtime_ns, size
+    except OSError:
+        return 0, 0
+
+
+# (metric name, type, help, stats() key) exported by PackAgentPool.prometheus_text().
+_PROMETHEUS_METRICS = (
+    ("wikigr_pack_pool_hits_total", "counter", "Checkouts served by a warm agent.", "hits"),
+    ("wikigr_pack_pool_misses_total", "counter", "Checkouts that opened an agent.", "misses"),
+    ("wikigr_pack_pool_evictions_total", "counter", "Agents closed by eviction.", "evictions"),
+    ("wikigr_pack_pool_idle_agents", "gauge", "Idle agents in the pool.", "idle"),
+    ("wikigr_pack_pool_in_use_agents", "gauge", "Agents checked out.", "in_use"),
+    (
+        "wikigr_pack_pool_resident_bytes",
+        "gauge",
+        "Estimated size of open agents.",
+        "resident_bytes",
+    ),
+    ("wikigr_pack_pool_max_agents", "gauge", "Configured agent cap.", "max_agents"),
+)
+
+
+@dataclass
+class _PoolEntry:
+    """A pooled agent plus the bookkeeping needed for LRU/TTL eviction."""
+
+    pack_name: str
+    db_path: str
+    agent: Any
+    signature: tuple[int, int]
+    last_used: float = field(default_factory=time.monotonic)
+
+    @property
+    def size_bytes(self) -> int:
+        return self.signature[1]
+
+
+class PackAgentPool:
+    """LRU pool of warm KnowledgeGraphAgent instances keyed by pack name."""
+
+    DEFAULT_MAX_AGENTS = 8
+    DEFAULT_IDLE_TTL_S = 600.0
+
+    def __init__(
+        self,
+        max_agents: int = DEFAULT_MAX_AGENTS,
+        max_bytes: int | None = None,
+        idle_ttl_s: float = DEFAULT_IDLE_TTL_S,
+        agent_factory: Callable[[str], Any] | None = None,
+    ):
+        """Initialize an empty pool.
+
+        Args:
+            max_agents: Maximum number of open agents (idle + checked out).
+                Idle agents beyond this cap are evicted least-recently-used
+                first.  Checked-out agents are never evicted.
+            max_bytes: Optional cap on the estimated resident size of all
+                open agents (sum of pack.db sizes).  None disables the cap.
+            idle_ttl_s: Seconds an agent may sit idle before it is closed.
+            agent_factory: Callable ``(db_path) -> agent``.  Defaults to
+                :func:`open_pack_agent`.
+        """
+        if not isinstance(max_agents, int) or max_agents < 1:
+            raise ValueError(f"max_agents must be a positive integer, got {max_agents!r}")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError(f"max_bytes must be positive or None, got {max_bytes!r}")
+        if idle_ttl_s <= 0:
+            raise ValueError(f"idle_ttl_s must be positive, got {idle_ttl_s!r}")
+
+        self.max_agents = max_agents
+        self.max_bytes = max_bytes
+        self.idle_ttl_s = idle_ttl_s
+        self._factory = agent_factory or open_pack_agent
+
+        self._lock = threading.Lock()
+        self._idle: dict[str, list[_PoolEntry]] = {}
+        self._in_use = 0
+        self._open_bytes = 0
+        self._closed = False
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def acquire(self, pack_name: str, db_path: str) -> Iterator[Any]:
+        """Check out a warm agent for *pack_name*, opening one on a miss.
+
+        The agent is returned to the pool when the ``with`` block exits.
+
+        Args:
+            pack_name: Pack identifier used as the pool key.
+            db_path: Path to the pack's ``pack.db`` (used to open agents and
+                detect on-disk changes).
+
+        Yields:
+            A KnowledgeGraphAgent (or whatever ``agent_factory`` returns).
+
+        Raises:
+            RuntimeError: If the pool has been closed.
+        """
+        entry = self._checkout(pack_name, db_path)
+        try:
+            yield entry.agent
+        finally:
+            self._checkin(entry)
+
+    def evict_idle(self) -> int:
+        """Close agents idle for longer than ``idle_ttl_s``.
+
+        Returns:
+            Number of agents evicted.
+        """
+        with self._lock:
+            evicted = self._pop_expired_locked(time.monotonic())
+        self._close_entries(evicted)
+        return len(evicted)
+
+    def stats(self) -> dict[str, Any]:
+        """Return pool counters for monitoring.
+
+        Returns:
+            Dict with hits, misses, evictions, hit_rate, idle, in_use,
+            open_agents, resident_bytes and the configured caps.
+        """
+        with self._lock:
+            idle = sum(len(entries) for entries in self._idle.values())
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "idle": idle,
+                "in_use": self._in_use,
+                "open_agents": idle + self._in_use,
+                "resident_bytes": self._open_bytes,
+                "max_agents": self.max_agents,
+                "max_bytes": self.max_bytes,
+                "packs": sorted(name for name, entries in self._idle.items() if entries),
+            }
+
+    def prometheus_text(self) -> str:
+        """Render :meth:`stats` in the Prometheus text exposition format (0.0.4)."""
+        stats = self.stats()
+        lines = []
+        for name, kind, help_text, key in _PROMETHEUS_METRICS:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name} {stats[key]}")
+        return "\n".join(lines) + "\n"
+
+    def close(self) -> None:
+        """Close every idle agent and stop pooling.
+
+        Agents that are checked out when ``close()`` is called are closed as
+        soon as they are returned.
+        """
+        with self._lock:
+            self._closed = True
+            entries = [e for pack_entries in self._idle.values() for e in pack_entries]
+            self._idle.clear()
+            for entry in entries:
+                self._open_bytes -= entry.size_bytes
+        self._close_entries(entries)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(entries) for entries in self._idle.values()) + self._in_use
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _checkout(self, pack_name: str, db_path: str) -> _PoolEntry:
+        signature = _db_signature(db_path)
+        stale: list[_PoolEntry] = []
+        entry: _PoolEntry | None = None
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("PackAgentPool is closed")
+            stale.extend(self._pop_expired_locked(time.monotonic()))
+            entries = self._idle.get(pack_name, [])
+            while entries:
+                candidate = entries.pop()
+                if candidate.signature == signature and candidate.db_path == db_path:
+                    entry = candidate
+                    break
+                # Pack was re-installed or moved: never serve the old database.
+                self._open_bytes -= candidate.size_bytes
+                self.evictions += 1
+                stale.append(candidate)
+            if entry is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+            self._in_use += 1
+
+        self._close_entries(stale)
+
+        if entry is None:
+            try:
+                agent = self._factory(db_path)
+            except BaseException:
+                with self._lock:
+                    self._in_use -= 1
+                raise
+            entry = _PoolEntry(pack_name, db_path, agent, signature)
+            with self._lock:
+                self._open_bytes += entry.size_bytes
+            logger.info("PackAgentPool: opened agent for pack '%s'", pack_name)
+
+        return entry
+
+    def _checkin(self, entry: _PoolEntry) -> None:
+        entry.last_used = time.monotonic()
+        to_close: list[_PoolEntry] = []
+
+        with self._lock:
+            self._in_use -= 1
+            if self._closed or getattr(entry.agent, "conn", True) is None:
+                # Pool shut down, or the caller closed the agent: don't recycle it.
+                self._open_bytes -= entry.size_bytes
+                to_close.append(entry)
+            else:
+                self._idle.setdefault(entry.pack_name, []).append(entry)
+                to_close.extend(self._pop_over_capacity_locked())
+
+        self._close_entries(to_close)
+
+    def _pop_expired_locked(self, now: float) -> list[_PoolEntry]:
+        expired: list[_PoolEntry] = []
+        for pack_name, entries in list(self._idle.items()):
+            keep = [e for e in entries if now - e.last_used <= self.idle_ttl_s]
+            expired.extend(e for e in entries if now - e.last_used > self.idle_ttl_s)
+            if keep:
+                self._idle[pack_name] = keep
+            else:
+                del self._idle[pack_name]
+        for entry in expired:
+            self._open_bytes -= entry.size_bytes
+        self.evictions += len(expired)
+        return expired
+
+    def _pop_over_capacity_locked(self) -> list[_PoolEntry]:
+        evicted: list[_PoolEntry] = []
+        while True:
+            idle = [e for entries in self._idle.values() for e in entries]
+            if not idle:
+                break
+            over_count = len(idle) + self._in_use > self.max_agents
+            over_bytes = self.max_bytes is not None and self._open_bytes > self.max_bytes
+            if not (over_count or over_bytes):
+                break
+            lru = min(idle, key=lambda e: e.last_used)
+            self._idle[lru.pack_name].remove(lru)
+            if not self._idle[lru.pack_name]:
+                del self._idle[lru.pack_name]
+            self._open_bytes -= lru.size_bytes
+            self.evictions += 1
+            evicted.append(lru)
+        return evicted
+
+    @staticmethod
+    def _close_entries(entries: list[_PoolEntry]) -> None:
+        for entry in entries:
+            try:
+                entry.agent.close()
+            except Exception as e:
+                logger.debug("PackAgentPool: error closing agent for '%s': %s", entry.pack_name, e)
+            else:
+                logger.info("PackAgentPool: closed agent for pack '%s'", entry.pack_name)
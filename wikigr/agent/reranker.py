@@ -4,12 +4,13 @@ This module provides GraphReranker which combines vector similarity scores
 with graph centrality metrics to improve retrieval quality in knowledge graphs.
 
 API Contract:
-    GraphReranker(kuzu_conn) -> instance
-    calculate_centrality(article_ids: list[int]) -> dict[int, float]
+    GraphReranker(kuzu_conn, centrality=None, metric="degree", graph=None) -> instance
+    calculate_centrality(article_ids: list[int], conn=None) -> dict[int, float]
     rerank(
         vector_results: list[dict],
         vector_weight: float = 0.6,
-        graph_weight: float = 0.4
+        graph_weight: float = 0.4,
+        conn=None
     ) -> list[dict]
 
 Design Philosophy:
@@ -17,44 +18,84 @@ Design Philosophy:
     - Uses PageRank-style centrality from LadybugDB
     - Preserves all metadata from input results
     - Handles missing graph nodes gracefully (zero centrality)
+    - Reads precomputed centrality (``centrality.json``, see
+      ``wikigr.packs.centrality``) from memory when the pack has it, then
+      degrees from the in-memory graph snapshot, falling back to per-query
+      Cypher aggregation otherwise
+    - Queries run on ``conn`` when given, so a reranker shared across
+      threads can use each caller's own connection
 """
 
+from __future__ import annotations
+
 import logging
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import real_ladybug as kuzu
 
+from bootstrap.src.query_result import fetch
+
+if TYPE_CHECKING:
+    from wikigr.agent.graph_snapshot import CSRGraph
+    from wikigr.packs.centrality import PackCentrality
+
 logger = logging.getLogger(__name__)
 
 
 class GraphReranker:
     """Combines vector similarity with graph centrality for better ranking."""
 
-    def __init__(self, kuzu_conn: kuzu.Connection):
+    def __init__(
+        self,
+        kuzu_conn: kuzu.Connection,
+        centrality: PackCentrality | None = None,
+        metric: str = "degree",
+        graph: CSRGraph | None = None,
+    ):
         """Initialize reranker with LadybugDB connection.
 
         Args:
             kuzu_conn: Active LadybugDB connection for centrality queries
+            centrality: Precomputed pack centrality; when given, no centrality
+                or density queries are run
+            metric: Precomputed metric to rank by, "degree" or "pagerank"
+            graph: In-memory ``LINKS_TO`` graph (``GraphSnapshot.articles``);
+                without precomputed centrality, degrees and density are read
+                from it instead of queried
+
+        Raises:
+            ValueError: If metric is not a known centrality metric
         """
+        from wikigr.packs.centrality import CENTRALITY_METRICS
+
+        if metric not in CENTRALITY_METRICS:
+            raise ValueError(f"metric must be one of {CENTRALITY_METRICS}, got {metric!r}")
         self.conn = kuzu_conn
+        self.centrality = centrality
+        self.metric = metric
+        self.graph = graph
         self._sparse_graph: bool | None = None  # Cached density check (None = not yet checked)
 
-    def _check_graph_density(self) -> float:
+    def _check_graph_density(self, conn: kuzu.Connection | None = None) -> float:
         """Check average LINKS_TO edges per Article node.
 
+        Args:
+            conn: Connection to query instead of the one given at construction
+
         Returns:
             Average links per article (float). Returns 0.0 on error.
         """
+        if self.centrality is not None:
+            return self.centrality.avg_links
+        if self.graph is not None:
+            return self.graph.num_edges / len(self.graph) if len(self.graph) else 0.0
+        conn = self.conn if conn is None else conn
         try:
-            result = self.conn.execute("MATCH ()-[:LINKS_TO]->() RETURN count(*) AS total_links")
-            links_df = result.get_as_df()
-            total_links = int(links_df.iloc[0]["total_links"]) if not links_df.empty else 0
-
-            result = self.conn.execute("MATCH (a:Article) RETURN count(a) AS total_articles")
-            articles_df = result.get_as_df()
-            total_articles = (
-                int(articles_df.iloc[0]["total_articles"]) if not articles_df.empty else 0
-            )
+            result = conn.execute("MATCH ()-[:LINKS_TO]->() RETURN count(*) AS total_links")
+            total_links = int(fetch(result).scalar("total_links", 0))
+
+            result = conn.execute("MATCH (a:Article) RETURN count(a) AS total_articles")
+            total_articles = int(fetch(result).scalar("total_articles", 0))
 
             if total_articles == 0:
                 return 0.0
@@ -63,14 +104,18 @@ class GraphReranker:
             logger.warning(f"Graph density check failed: {e}")
             return 0.0
 
-    def calculate_centrality(self, article_ids: list[str]) -> dict[str, float]:
+    def calculate_centrality(
+        self, article_ids: list[str], conn: kuzu.Connection | None = None
+    ) -> dict[str, float]:
         """Calculate normalized centrality scores for articles.
 
-        Uses degree centrality (in-degree + out-degree) normalized to [0, 1].
+        Uses degree centrality (in-degree + out-degree), or the precomputed
+        ``metric`` when the reranker has pack centrality, normalized to [0, 1].
         Articles not in the graph receive centrality of 0.0.
 
         Args:
             article_ids: List of article titles to calculate centrality for
+            conn: Connection to query instead of the one given at construction
 
         Returns:
             Dictionary mapping article_id -> centrality score in [0, 1]
@@ -82,6 +127,19 @@ class GraphReranker:
         if not article_ids:
             return {}
 
+        if self.centrality is not None:
+            raw = {aid: self.centrality.get(aid, self.metric) or 0.0 for aid in article_ids}
+            max_raw = max(raw.values())
+            return {aid: value / max_raw if max_raw > 0 else 0.0 for aid, value in raw.items()}
+
+        if self.graph is not None:
+            degrees = {aid: self.graph.degree(aid) for aid in article_ids}
+            max_degree = max(degrees.values())
+            return {
+                aid: degree / max_degree if max_degree > 0 else 0.0
+                for aid, degree in degrees.items()
+            }
+
         # Build Cypher query for raw degree centrality per article.
         # Normalization is done in Python to avoid LadybugDB nested-aggregation errors
         # when collect() and max() both operate on aggregated values.
@@ -95,20 +153,20 @@ class GraphReranker:
         RETURN a.title AS article_id, out_degree + in_degree AS degree
         """
 
+        conn = self.conn if conn is None else conn
         try:
-            result = self.conn.execute(cypher, {"article_ids": article_ids})
-            df = result.get_as_df()
+            result = conn.execute(cypher, {"article_ids": article_ids})
+            rows = fetch(result)
 
-            if df.empty:
+            if rows.empty:
                 # No articles found in graph
                 return dict.fromkeys(article_ids, 0.0)
 
             # Normalize in Python to avoid LadybugDB nested-aggregation errors
-            max_degree = float(df["degree"].max()) if not df.empty else 0.0
+            max_degree = float(max(rows.column("degree")))
             centrality = {}
-            for _, row in df.iterrows():
-                article_id = row["article_id"]
-                raw_degree = float(row["degree"])
+            for article_id, degree in zip(rows.column("article_id"), rows.column("degree")):
+                raw_degree = float(degree)
                 centrality[article_id] = raw_degree / max_degree if max_degree > 0 else 0.0
 
             # Fill in missing articles with 0.0
@@ -128,6 +186,7 @@ class GraphReranker:
         vector_results: list[dict[str, Any]],
         vector_weight: float = 0.6,
         graph_weight: float = 0.4,
+        conn: kuzu.Connection | None = None,
     ) -> list[dict[str, Any]]:
         """Rerank vector search results using graph centrality.
 
@@ -138,6 +197,7 @@ class GraphReranker:
             vector_results: List of dicts with at least {article_id, score, ...}
             vector_weight: Weight for vector similarity (default 0.6)
             graph_weight: Weight for graph centrality (default 0.4)
+            conn: Connection to query instead of the one given at construction
 
         Returns:
             Reranked results sorted by combined score (descending)
@@ -171,7 +231,7 @@ class GraphReranker:
 
         # Check graph density once per session; disable centrality for sparse graphs
         if self._sparse_graph is None:
-            avg_links = self._check_graph_density()
+            avg_links = self._check_graph_density(conn)
             self._sparse_graph = avg_links < 2.0
             if self._sparse_graph:
                 logger.warning(
@@ -183,7 +243,7 @@ class GraphReranker:
         if self._sparse_graph:
             centrality = dict.fromkeys(article_ids, 0.0)
         else:
-            centrality = self.calculate_centrality(article_ids)
+            centrality = self.calculate_centrality(article_ids, conn)
 
         # Compute combined scores
         reranked = []
@@ -10,11 +10,16 @@ from __future__ import annotations
 
 import json
 import logging
+import re
+from collections.abc import Callable, Collection
 from typing import Any
 
 from anthropic import APIConnectionError, APIStatusError, APITimeoutError
 
+from bootstrap.src.query_result import QueryRows, fetch
+from wikigr.agent.graph_snapshot import CSRGraph
 from wikigr.agent.kg_agent import _QUESTION_PREFIX_RE, _strip_markdown_fences
+from wikigr.agent.title_index import TitleIndex
 
 logger = logging.getLogger(__name__)
 
@@ -24,12 +29,18 @@ logger = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 
 
-def _safe_query(conn, cypher: str, params: dict | None = None, *, log_context: str = "") -> Any:
-    """Execute Cypher and return DataFrame, or None on failure."""
+def _safe_query(
+    conn, cypher: str, params: dict | None = None, *, log_context: str = ""
+) -> QueryRows | None:
+    """Execute Cypher and return its rows, or None on failure or an empty result.
+
+    Rows are read with :func:`bootstrap.src.query_result.fetch` rather than
+    ``get_as_df()``; building a DataFrame costs more than the small queries
+    on the retrieval path.
+    """
     try:
-        result = conn.execute(cypher, params or {})
-        df = result.get_as_df()
-        return df if not df.empty else None
+        rows = fetch(conn.execute(cypher, params or {}))
+        return rows if not rows.empty else None
     except RuntimeError as e:
         logger.debug("Query failed%s: %s", f" ({log_context})" if log_context else "", e)
         return None
@@ -40,41 +51,391 @@ def _safe_query(conn, cypher: str, params: dict | None = None, *, log_context: s
 # ---------------------------------------------------------------------------
 
 
-def direct_title_lookup(conn, question: str) -> list[str]:
+def load_title_index(conn, version: object = None) -> TitleIndex | None:
+    """Build an in-memory :class:`TitleIndex` of every Article title.
+
+    One full scan of the Article table; returns None if the query fails so
+    callers fall back to Cypher title matching.
+    """
+    rows = _safe_query(
+        conn,
+        "MATCH (a:Article) RETURN a.title AS title",
+        log_context="title index load",
+    )
+    if rows is None or "title" not in rows.columns:
+        return None
+    return TitleIndex(rows.column("title"), version=version)
+
+
+def direct_title_lookup(conn, question: str, title_index: TitleIndex | None = None) -> list[str]:
     """Phase 2: Direct article title matching for better retrieval.
 
     Extracts key noun phrases from the question and looks up articles
     with matching titles. This catches cases where the LLM query planner
     generates bad Cypher but the answer is in an obviously-named article.
+    With a *title_index* the lookup is answered from memory without any
+    DB round-trip.
     """
     cleaned = _QUESTION_PREFIX_RE.sub("", question.lower()).rstrip("?. ")
+    if not cleaned:
+        return []
+
+    if title_index is not None:
+        return (title_index.exact(cleaned) or title_index.contains(cleaned, limit=3))[:3]
 
     candidates = []
     # Exact match (case-insensitive)
-    df = _safe_query(
+    rows = _safe_query(
         conn,
         "MATCH (a:Article) WHERE lower(a.title) = $q RETURN a.title",
         {"q": cleaned},
         log_context="direct title exact match",
     )
-    if df is not None:
-        candidates.extend(df["a.title"].tolist())
+    if rows is not None:
+        candidates.extend(rows.column("a.title"))
 
     # Partial match if no exact match
     if not candidates:
-        df = _safe_query(
+        rows = _safe_query(
             conn,
             "MATCH (a:Article) WHERE lower(a.title) CONTAINS $q "
             "RETURN a.title ORDER BY length(a.title) ASC LIMIT 3",
             {"q": cleaned},
             log_context="direct title partial match",
         )
-        if df is not None:
-            candidates.extend(df["a.title"].tolist())
+        if rows is not None:
+            candidates.extend(rows.column("a.title"))
 
     return candidates[:3]
 
 
+_WORD_RE = re.compile(r"[\w][\w'+#.-]*")
+
+
+def title_mentions(
+    question: str,
+    title_index: TitleIndex,
+    stop_words: Collection[str] = (),
+    max_words: int = 5,
+    limit: int = 3,
+) -> list[str]:
+    """Return article titles spelled out in *question*, longest mention first.
+
+    Every run of up to *max_words* consecutive words is looked up in the
+    title index (case-insensitive exact match).  Longer runs win, and words
+    already claimed by a match are not reused, so "machine learning" yields
+    "Machine learning" rather than also "Machine" and "Learning".  Single
+    words in *stop_words* never match.
+    """
+    words = [w.rstrip(".-") for w in _WORD_RE.findall(question)]
+    claimed = [False] * len(words)
+    mentions: list[str] = []
+    for size in range(min(max_words, len(words)), 0, -1):
+        for start in range(len(words) - size + 1):
+            if any(claimed[start : start + size]):
+                continue
+            span = " ".join(words[start : start + size])
+            if size == 1 and span.lower() in stop_words:
+                continue
+            matches = title_index.exact(span)
+            if matches:
+                mentions.append(matches[0])
+                claimed[start : start + size] = [True] * size
+    # Spans are visited longest first, then in question order
+    return list(dict.fromkeys(mentions))[:limit]
+
+
+# ---------------------------------------------------------------------------
+# Vector index search
+# ---------------------------------------------------------------------------
+
+
+def vector_search(conn, query_embedding, top_k: int, *, exact_index=None) -> list[dict]:
+    """Query ``Section.embedding_idx`` and aggregate hits by article.
+
+    Args:
+        conn: LadybugDB connection with the VECTOR extension loaded.
+        query_embedding: Query vector (list of floats or 1-D array).
+        top_k: Number of articles to return; ``top_k * 3`` sections are fetched
+            so that several sections of one article do not crowd out others.
+        exact_index: Section ``ExactSearchIndex`` or ``QuantizedSearchIndex``
+            (embedding sidecar).  When given, the top sections come from an
+            in-memory search and only their content is read from the
+            database; quantized candidates are first rescored with their
+            float embeddings.
+
+    Returns:
+        List of {"title", "similarity", "distance", "content"} dicts sorted
+        by similarity descending, keeping each article's best section.
+    """
+    if exact_index is not None:
+        ranked = exact_index.search(
+            query_embedding, top_k * 3, rescore=_embedding_fetcher(conn, "Section", "section_id")
+        )
+        nodes = _fetch_nodes(
+            conn,
+            "MATCH (s:Section) WHERE s.section_id IN $ids "
+            "RETURN s.section_id AS section_id, s.content AS content",
+            "section_id",
+            [node_id for node_id, _ in ranked],
+        )
+        pairs = [(nodes[i], 1.0 - sim) for i, sim in ranked if i in nodes]
+    else:
+        if hasattr(query_embedding, "tolist"):
+            query_embedding = query_embedding.tolist()
+        result = conn.execute(
+            """
+            CALL QUERY_VECTOR_INDEX('Section', 'embedding_idx', $emb, $k)
+            RETURN *
+            """,
+            {"emb": query_embedding, "k": top_k * 3},
+        )
+
+        rows = fetch(result)
+        if rows.empty:
+            return []
+        pairs = list(zip(rows.column("node"), rows.column("distance")))
+
+    # Aggregate by article, keeping best-matching section content.
+    # Iterate column lists directly rather than boxing each row.
+    articles = {}
+    for node, distance in pairs:
+        section_id = node.get("section_id", "")
+        article_title = section_id.split("#")[0]
+        content = node.get("content", "")
+
+        if article_title not in articles or distance < articles[article_title]["distance"]:
+            articles[article_title] = {
+                "title": article_title,
+                "similarity": max(0.0, min(1.0, 1.0 - distance)),
+                "distance": distance,
+                "content": content or "",
+            }
+
+    # Sort by similarity
+    results = sorted(articles.values(), key=lambda x: x["similarity"], reverse=True)
+    return results[:top_k]
+
+
+def chunk_vector_search(conn, query_embedding, top_k: int, *, exact_index=None) -> list[dict]:
+    """Query ``Chunk.chunk_embedding_idx`` and aggregate hits to passages and articles.
+
+    Hit chunks that are neighbours in the same section (consecutive
+    ``chunk_index``) are merged into one passage, dropping the text the
+    chunker duplicated between them.  Articles are ranked by their best
+    passage.
+
+    Args:
+        conn: LadybugDB connection with the VECTOR extension loaded.
+        query_embedding: Query vector (list of floats or 1-D array).
+        top_k: Number of articles to return; ``top_k * 4`` chunks are fetched.
+        exact_index: Chunk ``ExactSearchIndex`` or ``QuantizedSearchIndex``
+            (embedding sidecar); see :func:`vector_search`.
+
+    Returns:
+        Same shape as :func:`vector_search` (``content`` is the best
+        passage) plus ``"passages"``: ``[{"section_index", "chunk_indices",
+        "text", "similarity"}]`` sorted by similarity descending.
+    """
+    if exact_index is not None:
+        ranked = exact_index.search(
+            query_embedding, top_k * 4, rescore=_embedding_fetcher(conn, "Chunk", "chunk_id")
+        )
+        nodes = _fetch_nodes(
+            conn,
+            "MATCH (c:Chunk) WHERE c.chunk_id IN $ids "
+            "RETURN c.chunk_id AS chunk_id, c.article_title AS article_title, "
+            "c.section_index AS section_index, c.chunk_index AS chunk_index, "
+            "c.content AS content",
+            "chunk_id",
+            [node_id for node_id, _ in ranked],
+        )
+        pairs = [(nodes[i], 1.0 - sim) for i, sim in ranked if i in nodes]
+    else:
+        if hasattr(query_embedding, "tolist"):
+            query_embedding = query_embedding.tolist()
+        result = conn.execute(
+            """
+            CALL QUERY_VECTOR_INDEX('Chunk', 'chunk_embedding_idx', $emb, $k)
+            RETURN *
+            """,
+            {"emb": query_embedding, "k": top_k * 4},
+        )
+
+        rows = fetch(result)
+        if rows.empty:
+            return []
+        pairs = list(zip(rows.column("node"), rows.column("distance")))
+
+    # (article, section) -> {chunk_index: (content, distance)}
+    hits: dict[tuple[str, int], dict[int, tuple[str, float]]] = {}
+    for node, distance in pairs:
+        title = node.get("article_title") or node.get("chunk_id", "").split("|")[0]
+        content = node.get("content") or ""
+        if not title or not content:
+            continue
+        key = (title, int(node.get("section_index") or 0))
+        index = int(node.get("chunk_index") or 0)
+        best = hits.setdefault(key, {}).get(index)
+        if best is None or distance < best[1]:
+            hits[key][index] = (content, distance)
+
+    articles: dict[str, dict] = {}
+    for (title, section_index), chunks in hits.items():
+        for run in _neighbour_runs(sorted(chunks)):
+            text = chunks[run[0]][0]
+            for index in run[1:]:
+                text = _merge_overlapping(text, chunks[index][0])
+            distance = min(chunks[i][1] for i in run)
+            passage = {
+                "section_index": section_index,
+                "chunk_indices": run,
+                "text": text,
+                "similarity": max(0.0, min(1.0, 1.0 - distance)),
+            }
+            article = articles.setdefault(
+                title, {"title": title, "distance": distance, "passages": []}
+            )
+            article["passages"].append(passage)
+            article["distance"] = min(article["distance"], distance)
+
+    results = []
+    for article in articles.values():
+        article["passages"].sort(key=lambda p: p["similarity"], reverse=True)
+        article["similarity"] = article["passages"][0]["similarity"]
+        article["content"] = article["passages"][0]["text"]
+        results.append(article)
+    results.sort(key=lambda x: x["similarity"], reverse=True)
+    return results[:top_k]
+
+
+def _fetch_nodes(conn, cypher: str, key: str, ids: list[str]) -> dict[str, dict]:
+    """Fetch the rows of *ids* (one ``IN $ids`` query) as dicts keyed by *key*."""
+    if not ids:
+        return {}
+    rows = _safe_query(conn, cypher, {"ids": ids}, log_context="exact search content fetch")
+    if rows is None:
+        return {}
+    return {row[key]: row for row in rows.records()}
+
+
+def _embedding_fetcher(conn, table: str, key: str):
+    """Return ``ids -> {id: embedding}`` reading *table* embeddings in one query."""
+
+    def fetch_embeddings(ids: list[str]) -> dict[str, list[float]]:
+        if not ids:
+            return {}
+        rows = _safe_query(
+            conn,
+            f"MATCH (n:{table}) WHERE n.{key} IN $ids RETURN n.{key} AS id, n.embedding AS embedding",
+            {"ids": ids},
+            log_context="quantized search rescoring",
+        )
+        return dict(rows) if rows is not None else {}
+
+    return fetch_embeddings
+
+
+def _neighbour_runs(indices: list[int]) -> list[list[int]]:
+    """Group sorted chunk indices into runs of consecutive values."""
+    runs: list[list[int]] = []
+    for index in indices:
+        if runs and index == runs[-1][-1] + 1:
+            runs[-1].append(index)
+        else:
+            runs.append([index])
+    return runs
+
+
+def _merge_overlapping(first: str, second: str, min_overlap: int = 20) -> str:
+    """Join neighbour chunks, dropping the overlap the chunker repeated.
+
+    The chunker starts each chunk ``overlap`` characters (400 by default)
+    before the previous one ends, so the longest suffix of *first* that is
+    a prefix of *second* is removed once.
+    """
+    for k in range(min(len(first), len(second), 800), min_overlap - 1, -1):
+        if first.endswith(second[:k]):
+            return first + second[k:]
+    return f"{first} {second}"
+
+
+# ---------------------------------------------------------------------------
+# BM25 full-text search and rank fusion
+# ---------------------------------------------------------------------------
+
+RRF_K = 60  # standard Reciprocal Rank Fusion constant
+
+
+def reciprocal_rank_fusion(rankings: list[list[str]], k: int = RRF_K) -> list[tuple[str, float]]:
+    """Fuse ranked title lists with RRF: ``score = sum(1 / (k + rank))``.
+
+    Ranks are 1-based; a title missing from a list contributes nothing for
+    it.  Returns ``(title, score)`` pairs, best first.
+    """
+    scores: dict[str, float] = {}
+    for ranking in rankings:
+        for rank, title in enumerate(ranking, start=1):
+            scores[title] = scores.get(title, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda x: x[1], reverse=True)
+
+
+def bm25_search(conn, query: str, top_k: int, *, include_facts: bool = True) -> list[dict]:
+    """Query the FTS (BM25) indexes on ``Section.content`` and ``Fact.content``.
+
+    Lexical matching finds exact API names, error codes and flags that
+    embeddings blur.  Section hits are aggregated by article (best section
+    wins); fact hits are mapped to their article through ``HAS_FACT`` and
+    the two article rankings are fused with :func:`reciprocal_rank_fusion`.
+
+    Args:
+        conn: LadybugDB connection with the FTS extension loaded.
+        query: Free-text query (tokenized and stemmed by the index).
+        top_k: Number of articles to return; ``top_k * 3`` sections and
+            ``top_k`` facts are fetched.
+        include_facts: Also search ``Fact.fact_fts_idx``.
+
+    Returns:
+        List of {"title", "score", "content"} dicts, best first, where score
+        is the best BM25 score of the article's sections (0.0 for articles
+        found through facts only).  Empty when the pack has no FTS index.
+    """
+    best: dict[str, dict] = {}
+    rows = _safe_query(
+        conn,
+        f"CALL QUERY_FTS_INDEX('Section', 'section_fts_idx', $q, top := {int(top_k) * 3}) "
+        "RETURN node.section_id AS section_id, node.content AS content, score "
+        "ORDER BY score DESC",
+        {"q": query},
+        log_context="BM25 section search",
+    )
+    if rows is not None:
+        for section_id, content, score in rows:
+            title = (section_id or "").split("#")[0]
+            if title and (title not in best or score > best[title]["score"]):
+                best[title] = {"title": title, "score": float(score), "content": content or ""}
+    section_ranking = sorted(best, key=lambda t: best[t]["score"], reverse=True)
+
+    fact_ranking: list[str] = []
+    if include_facts:
+        rows = _safe_query(
+            conn,
+            f"CALL QUERY_FTS_INDEX('Fact', 'fact_fts_idx', $q, top := {int(top_k)}) "
+            "WITH node, score MATCH (a:Article)-[:HAS_FACT]->(node) "
+            "RETURN a.title AS title, node.content AS content, score ORDER BY score DESC",
+            {"q": query},
+            log_context="BM25 fact search",
+        )
+        if rows is not None:
+            for title, content in zip(rows.column("title"), rows.column("content")):
+                if title and title not in fact_ranking:
+                    fact_ranking.append(title)
+                    best.setdefault(title, {"title": title, "score": 0.0, "content": content or ""})
+
+    fused = reciprocal_rank_fusion([section_ranking, fact_ranking])
+    return [best[title] for title, _score in fused[:top_k]]
+
+
 # ---------------------------------------------------------------------------
 # Multi-query retrieval
 # ---------------------------------------------------------------------------
@@ -86,6 +447,7 @@ def multi_query_retrieve(
     track_response_fn,
     question: str,
     max_results: int = 5,
+    search_many_fn=None,
 ) -> list[dict]:
     """Retrieve results using original question plus 2 alternative phrasings.
 
@@ -99,6 +461,10 @@ def multi_query_retrieve(
         track_response_fn: Callable to track token usage from API responses.
         question: Original natural language question.
         max_results: Maximum results per query (deduplication reduces final count).
+        search_many_fn: Optional batched search, Callable (queries, top_k) ->
+            list[list[dict]] in query order.  Used to encode all phrasings in
+            one forward pass and query the vector index concurrently.  Falls
+            back to serial ``semantic_search_fn`` calls if it raises.
 
     Returns:
         Deduplicated list of result dicts sorted by similarity descending.
@@ -148,18 +514,27 @@ def multi_query_retrieve(
     all_queries = [question] + alternatives
     merged: dict[str, dict] = {}
 
+    def _merge(results: list[dict]) -> None:
+        for result in results:
+            title = result.get("title", "")
+            if not title:
+                continue
+            existing = merged.get(title)
+            if existing is None or result.get("similarity", 0.0) > existing.get("similarity", 0.0):
+                merged[title] = result
+
+    if search_many_fn is not None and len(all_queries) > 1:
+        try:
+            for results in search_many_fn(all_queries, max_results):
+                _merge(results)
+            return sorted(merged.values(), key=lambda r: r.get("similarity", 0.0), reverse=True)
+        except (RuntimeError, OSError) as e:
+            logger.warning(f"Batched multi-query search failed, searching serially: {e}")
+            merged.clear()
+
     for query in all_queries:
         try:
-            results = semantic_search_fn(query, top_k=max_results)
-            for result in results:
-                title = result.get("title", "")
-                if not title:
-                    continue
-                existing = merged.get(title)
-                if existing is None or result.get("similarity", 0.0) > existing.get(
-                    "similarity", 0.0
-                ):
-                    merged[title] = result
+            _merge(semantic_search_fn(query, top_k=max_results))
         except (RuntimeError, OSError) as e:
             logger.warning(
                 f"Multi-query search failed for query '{query[:100]}{'...' if len(query) > 100 else ''}': {e}"
@@ -173,6 +548,11 @@ def multi_query_retrieve(
 # ---------------------------------------------------------------------------
 
 
+def vector_candidate_k(cross_encoder, max_results: int) -> int:
+    """Number of vector hits to fetch: doubled (max 40) for cross-encoder reranking."""
+    return min(max_results * 2, 40) if cross_encoder is not None else max_results
+
+
 def vector_primary_retrieve(
     semantic_search_fn,
     multi_query_retrieve_fn,
@@ -180,6 +560,7 @@ def vector_primary_retrieve(
     enable_multi_query: bool,
     question: str,
     max_results: int,
+    vector_results: list[dict] | None = None,
 ) -> tuple[dict | None, float]:
     """Attempt vector search as primary retrieval.
 
@@ -190,16 +571,19 @@ def vector_primary_retrieve(
         enable_multi_query: Whether multi-query expansion is enabled.
         question: Natural language question.
         max_results: Maximum results to return.
+        vector_results: Search results already fetched for *question* (with
+            ``vector_candidate_k`` hits); skips the search.
 
     Returns:
         (kg_results_dict, max_similarity) or (None, 0.0) on failure.
     """
     try:
-        candidate_k = min(max_results * 2, 40) if cross_encoder is not None else max_results
-        if enable_multi_query:
-            vector_results = multi_query_retrieve_fn(question, max_results=candidate_k)
-        else:
-            vector_results = semantic_search_fn(question, top_k=candidate_k)
+        if vector_results is None:
+            candidate_k = vector_candidate_k(cross_encoder, max_results)
+            if enable_multi_query:
+                vector_results = multi_query_retrieve_fn(question, max_results=candidate_k)
+            else:
+                vector_results = semantic_search_fn(question, top_k=candidate_k)
         if not vector_results:
             return None, 0.0
 
@@ -218,14 +602,24 @@ def vector_primary_retrieve(
             content = r.get("content", "")
             if content:
                 facts.append(f"[{title}] {content[:500]}")
-        return {
+        kg_results = {
             "sources": sources,
             "entities": [],
             "facts": facts,
             "raw": [
                 {"title": r["title"], "score": r.get("similarity", 0.0)} for r in vector_results
             ],
-        }, max_similarity
+        }
+        # Chunk-mode results carry merged passages; synthesis uses them
+        # instead of the articles' full section text.
+        passages = {
+            r["title"]: [p["text"] for p in r["passages"]]
+            for r in vector_results
+            if r.get("passages")
+        }
+        if passages:
+            kg_results["passages"] = passages
+        return kg_results, max_similarity
     except (RuntimeError, OSError) as e:
         logger.warning(f"Vector primary retrieve failed: {e}")
         return None, 0.0
@@ -246,6 +640,9 @@ def hybrid_retrieve(
     graph_weight: float = 0.3,
     keyword_weight: float = 0.2,
     _precomputed_vector: list[dict] | None = None,
+    title_index: TitleIndex | None = None,
+    use_bm25: bool = False,
+    graph: CSRGraph | None = None,
 ) -> dict[str, Any]:
     """Combine vector, graph, and keyword retrieval for richer results.
 
@@ -260,13 +657,21 @@ def hybrid_retrieve(
         keyword_weight: Weight for keyword match signal (0-1).
         _precomputed_vector: Pre-computed semantic_search results to avoid a
             duplicate DB call when the caller already ran vector retrieval.
+        title_index: In-memory title index; when given, the keyword signal
+            matches titles from memory instead of ``CONTAINS`` scans.
+        use_bm25: Fuse a BM25 full-text ranking (:func:`bm25_search`) with
+            the vector ranking via RRF for the first signal.  Packs without
+            FTS indexes fall back to the vector ranking alone.
+        graph: In-memory ``LINKS_TO`` graph (``GraphSnapshot.articles``);
+            when given, the graph signal reads neighbours from memory
+            instead of one traversal query per seed.
 
     Returns:
         KG results dict with sources, entities, facts, raw.
     """
     scored: dict[str, float] = {}
 
-    # Signal 1: Vector search
+    # Signal 1: Vector search (fused with BM25 full-text search when enabled)
     if _precomputed_vector is not None:
         vector_results = _precomputed_vector
     else:
@@ -275,40 +680,60 @@ def hybrid_retrieve(
         except (RuntimeError, OSError) as e:
             logger.warning(f"Vector search failed in hybrid retrieve: {e}")
             vector_results = []
-    for r in vector_results:
-        title = r.get("article", r.get("title", ""))
-        if title:
-            scored[title] = scored.get(title, 0) + vector_weight * r.get("similarity", 0.5)
+    bm25_results = bm25_search(conn, question, max_results) if use_bm25 else []
+    if bm25_results:
+        # Fuse vector and BM25 rankings via RRF, normalised so an article
+        # ranked first by both scores the full vector_weight.
+        vector_ranking: list[str] = []
+        for r in sorted(vector_results, key=lambda r: r.get("similarity", 0.5), reverse=True):
+            title = r.get("article", r.get("title", ""))
+            if title and title not in vector_ranking:
+                vector_ranking.append(title)
+        top_score = 2.0 / (RRF_K + 1)
+        fused = reciprocal_rank_fusion([vector_ranking, [r["title"] for r in bm25_results]])
+        for title, score in fused:
+            scored[title] = vector_weight * score / top_score
+    else:
+        for r in vector_results:
+            title = r.get("article", r.get("title", ""))
+            if title:
+                scored[title] = scored.get(title, 0) + vector_weight * r.get("similarity", 0.5)
 
     # Signal 2: Graph traversal
     seed_titles = list(scored.keys())[:3]
     for seed in seed_titles:
-        df = _safe_query(
-            conn,
-            "MATCH (seed:Article {title: $title})-[:LINKS_TO]->(neighbor:Article) "
-            "RETURN neighbor.title AS title LIMIT $limit",
-            {"title": seed, "limit": max_results},
-            log_context=f"hybrid graph traversal for '{seed}'",
-        )
-        if df is not None:
-            for title in df["title"].tolist():
-                if title:
-                    scored[title] = scored.get(title, 0) + graph_weight * 0.5
+        if graph is not None:
+            neighbors = graph.neighbors(seed, limit=max_results)
+        else:
+            rows = _safe_query(
+                conn,
+                "MATCH (seed:Article {title: $title})-[:LINKS_TO]->(neighbor:Article) "
+                "RETURN neighbor.title AS title LIMIT $limit",
+                {"title": seed, "limit": max_results},
+                log_context=f"hybrid graph traversal for '{seed}'",
+            )
+            neighbors = rows.column("title") if rows is not None else []
+        for title in neighbors:
+            if title:
+                scored[title] = scored.get(title, 0) + graph_weight * 0.5
 
     # Signal 3: Keyword match
     keywords = [w for w in question.split() if len(w) > 3 and w.lower() not in stop_words]
     for kw in keywords[:3]:
-        df = _safe_query(
-            conn,
-            "MATCH (a:Article) WHERE lower(a.title) CONTAINS lower($kw) "
-            "RETURN a.title AS title LIMIT $limit",
-            {"kw": kw, "limit": max_results},
-            log_context=f"hybrid keyword search for '{kw}'",
-        )
-        if df is not None:
-            for title in df["title"].tolist():
-                if title:
-                    scored[title] = scored.get(title, 0) + keyword_weight * 0.7
+        if title_index is not None:
+            matches = title_index.contains(kw, limit=max_results)
+        else:
+            rows = _safe_query(
+                conn,
+                "MATCH (a:Article) WHERE lower(a.title) CONTAINS lower($kw) "
+                "RETURN a.title AS title LIMIT $limit",
+                {"kw": kw, "limit": max_results},
+                log_context=f"hybrid keyword search for '{kw}'",
+            )
+            matches = rows.column("title") if rows is not None else []
+        for title in matches:
+            if title:
+                scored[title] = scored.get(title, 0) + keyword_weight * 0.7
 
     ranked = sorted(scored.items(), key=lambda x: x[1], reverse=True)[:max_results]
     source_titles = [title for title, _score in ranked]
@@ -316,7 +741,7 @@ def hybrid_retrieve(
     # Fetch facts for top sources
     facts: list[str] = []
     if source_titles:
-        df = _safe_query(
+        rows = _safe_query(
             conn,
             "MATCH (a:Article)-[:HAS_FACT]->(f:Fact) "
             "WHERE a.title IN $titles "
@@ -324,8 +749,8 @@ def hybrid_retrieve(
             {"titles": source_titles[:5]},
             log_context="hybrid facts batch",
         )
-        if df is not None and "content" in df.columns:
-            facts = df["content"].dropna().tolist()
+        if rows is not None and "content" in rows.columns:
+            facts = [f for f in rows.column("content") if f is not None]
 
     return {
         "sources": source_titles,
@@ -396,6 +821,9 @@ def fetch_source_text(
     source_titles: list[str],
     max_articles: int = 5,
     question: str | None = None,
+    sections: dict[str, list[str]] | None = None,
+    token_budget: int | None = None,
+    count_tokens: Callable[[str], int] | None = None,
 ) -> str:
     """Fetch section text for source articles (batched, single query).
 
@@ -404,67 +832,147 @@ def fetch_source_text(
     Falls back to article-level content if sections aren't available.
 
     When ``question`` is provided, sections below content_quality_threshold
-    are filtered out before inclusion.
+    are filtered out before inclusion.  ``sections`` (from
+    :func:`fetch_article_sections`) skips the section query.  With
+    ``token_budget`` the text is packed by
+    :func:`wikigr.agent.context_packer.pack_context` instead of being cut
+    at ``max_article_chars`` per article, counting the budget with
+    ``count_tokens`` (default: the ``context_packer`` estimate).
     """
-    titles = source_titles[:max_articles]
-    if not titles:
-        return ""
+    passages = fetch_source_passages(
+        conn,
+        score_section_quality_fn,
+        stop_words,
+        max_article_chars,
+        content_quality_threshold,
+        source_titles,
+        max_articles,
+        question,
+        sections=sections,
+        token_budget=token_budget,
+        count_tokens=count_tokens,
+    )
+    return "\n\n".join(f"## {p['title']}\n{p['text']}" for p in passages)
 
-    texts: list[str] = []
 
-    df = _safe_query(
+def fetch_article_sections(conn, titles: list[str]) -> dict[str, list[str]]:
+    """Return cleaned section texts per article for *titles* (one batched query)."""
+    if not titles:
+        return {}
+    rows = _safe_query(
         conn,
         "MATCH (a:Article)-[:HAS_SECTION]->(s:Section) "
         "WHERE a.title IN $titles "
         "RETURN a.title AS title, s.content AS content "
         "ORDER BY a.title",
-        {"titles": titles},
+        {"titles": list(titles)},
         log_context="fetch source sections",
     )
-    if df is not None:
-        from wikigr.packs.content_cleaner import clean_content
+    if rows is None:
+        return {}
 
-        q_keywords: frozenset[str] | None = None
-        if question is not None:
-            q_keywords = frozenset(
-                lw for w in question.split() if (lw := w.lower()) not in stop_words
-            )
+    from wikigr.packs.content_cleaner import clean_content
 
-        by_article: dict[str, list[str]] = {}
-        for title, sect_content in zip(df["title"].tolist(), df["content"].tolist()):
-            if title and sect_content:
-                cleaned = clean_content(sect_content)
-                if q_keywords is not None and (
-                    score_section_quality_fn(cleaned, question, _q_keywords=q_keywords)
-                    < content_quality_threshold
-                ):
-                    continue
-                by_article.setdefault(title, []).append(cleaned)
-
-        for title in titles:
-            sections = by_article.get(title, [])
-            if sections:
-                combined = "\n\n".join(sections)
-                truncated = combined[:max_article_chars] + (
-                    "..." if len(combined) > max_article_chars else ""
-                )
-                texts.append(f"## {title}\n{truncated}")
+    by_article: dict[str, list[str]] = {}
+    for title, sect_content in rows:
+        if title and sect_content:
+            by_article.setdefault(title, []).append(clean_content(sect_content))
+    return by_article
+
+
+def fetch_source_passages(
+    conn,
+    score_section_quality_fn,
+    stop_words: frozenset[str],
+    max_article_chars: int,
+    content_quality_threshold: float,
+    source_titles: list[str],
+    max_articles: int = 5,
+    question: str | None = None,
+    sections: dict[str, list[str]] | None = None,
+    token_budget: int | None = None,
+    count_tokens: Callable[[str], int] | None = None,
+) -> list[dict[str, str]]:
+    """Fetch cleaned, quality-filtered source text per article.
+
+    Same selection as :func:`fetch_source_text`, returned as
+    ``[{"title": ..., "text": ...}]`` in source order.  Pass ``sections``
+    prefetched by :func:`fetch_article_sections` to skip the section query
+    (``query_batch`` fetches sections once for every question's sources).
+    ``token_budget`` packs the best chunks of all articles into that many
+    tokens instead of truncating each article to ``max_article_chars``;
+    ``count_tokens`` counts the packed chunks (chunking itself always uses
+    the cheap estimate).
+    """
+    titles = source_titles[:max_articles]
+    if not titles:
+        return []
+
+    if sections is None:
+        sections = fetch_article_sections(conn, titles)
+
+    q_keywords: frozenset[str] | None = None
+    if question is not None:
+        q_keywords = frozenset(lw for w in question.split() if (lw := w.lower()) not in stop_words)
+
+    passages: list[dict[str, str]] = []
+    candidates: list[tuple[str, list[str]]] = []
+    for title in titles:
+        kept = [
+            cleaned
+            for cleaned in sections.get(title, [])
+            if q_keywords is None
+            or score_section_quality_fn(cleaned, question, _q_keywords=q_keywords)
+            >= content_quality_threshold
+        ]
+        if kept:
+            candidates.append((title, kept))
+    if token_budget is not None:
+        passages = _pack(candidates, q_keywords, token_budget, count_tokens)
+    else:
+        for title, kept in candidates:
+            combined = "\n\n".join(kept)
+            truncated = combined[:max_article_chars] + (
+                "..." if len(combined) > max_article_chars else ""
+            )
+            passages.append({"title": title, "text": truncated})
 
     # Fallback: try article.content directly if no sections found
-    if not texts:
-        df = _safe_query(
+    if not passages:
+        rows = _safe_query(
             conn,
             "MATCH (a:Article) WHERE a.title IN $titles "
             "RETURN a.title AS title, a.content AS content",
             {"titles": titles},
             log_context="fetch source article content fallback",
         )
-        if df is not None:
-            for title, content in zip(df["title"].tolist(), df["content"].tolist()):
-                if title and content:
-                    truncated = content[:max_article_chars] + (
-                        "..." if len(content) > max_article_chars else ""
-                    )
-                    texts.append(f"## {title}\n{truncated}")
-
-    return "\n\n".join(texts)
+        if rows is not None:
+            articles = [(title, content) for title, content in rows if title and content]
+            if token_budget is not None:
+                return _pack(
+                    [(t, [c]) for t, c in articles], q_keywords, token_budget, count_tokens
+                )
+            for title, content in articles:
+                truncated = content[:max_article_chars] + (
+                    "..." if len(content) > max_article_chars else ""
+                )
+                passages.append({"title": title, "text": truncated})
+
+    return passages
+
+
+def _pack(
+    candidates: list[tuple[str, list[str]]],
+    q_keywords: frozenset[str] | None,
+    token_budget: int,
+    count_tokens: Callable[[str], int] | None = None,
+) -> list[dict[str, str]]:
+    from wikigr.agent.context_packer import estimate_tokens, pack_context
+
+    return pack_context(
+        candidates,
+        q_keywords or frozenset(),
+        token_budget,
+        count_tokens=count_tokens or estimate_tokens,
+        split_tokens=estimate_tokens,
+    )
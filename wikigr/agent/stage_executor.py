@@ -0,0 +1,215 @@
+"""Concurrent retrieval-stage executor with per-stage timeouts and a latency budget.
+
+``KnowledgeGraphAgent.query()`` is a small graph of retrieval stages (vector
+search, direct title lookup, hybrid graph/keyword retrieval, few-shot
+lookup, reranking).  ``StageRunner`` runs the independent ones in parallel
+on a thread pool and lets the caller wait on each stage in dependency order.
+
+API Contract:
+    StageRunner(executor=None, budget_s=None, timeouts=None)
+    submit(name, fn, *args, default=None, **kwargs) -> None
+    result(name) -> Any
+    run(name, fn, *args, default=None, **kwargs) -> Any   (always on the calling thread)
+    timings -> dict[str, float]
+    statuses -> dict[str, str]
+    degraded -> list[str]
+
+Design Philosophy:
+    - Dependencies are expressed by call order: ``submit`` independent stages,
+      then ``result`` the one a later stage needs before submitting it.
+    - A stage that fails (RuntimeError/OSError), misses its own timeout or
+      the overall budget yields its ``default`` instead of failing the query.
+      Timed-out work is abandoned, not killed; its result is ignored.
+    - With ``executor=None`` stages run inline on the calling thread (used by
+      agents without a Database to open per-thread connections on, and by
+      tests), with the same timing, budget and degradation semantics.
+    - Every stage runs as a telemetry span of the same name, in a copy of the
+      submitting thread's context, so it reports into the caller's query trace.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import logging
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any
+
+from wikigr.agent import telemetry
+
+logger = logging.getLogger(__name__)
+
+OK = "ok"
+TIMEOUT = "timeout"
+ERROR = "error"
+SKIPPED = "skipped"
+
+
+class StageRunner:
+    """Runs named retrieval stages, recording timings and degradations."""
+
+    def __init__(
+        self,
+        executor: Executor | None = None,
+        budget_s: float | None = None,
+        timeouts: dict[str, float] | None = None,
+    ):
+        """Initialize a runner for one query.
+
+        Args:
+            executor: Thread pool to run stages on, or None to run inline.
+            budget_s: Overall latency budget for all stages, in seconds.
+                None means unbounded.
+            timeouts: Per-stage timeouts in seconds keyed by stage name.
+                Stages without an entry are bounded only by the budget.
+
+        Raises:
+            ValueError: If budget_s is not positive.
+        """
+        if budget_s is not None and budget_s <= 0:
+            raise ValueError(f"budget_s must be positive or None, got {budget_s!r}")
+        self._executor = executor
+        self._budget_s = budget_s
+        self._timeouts = dict(timeouts or {})
+        self._t0 = time.perf_counter()
+        self._lock = threading.Lock()
+        self._pending: dict[str, tuple[Future, Any, float]] = {}
+        self._results: dict[str, Any] = {}
+        self._worker_elapsed: dict[str, float] = {}
+        self.timings: dict[str, float] = {}
+        self.statuses: dict[str, str] = {}
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def remaining(self) -> float | None:
+        """Seconds left in the overall budget (None when unbounded)."""
+        if self._budget_s is None:
+            return None
+        return max(0.0, self._budget_s - (time.perf_counter() - self._t0))
+
+    def submit(
+        self, name: str, fn: Callable[..., Any], *args: Any, default: Any = None, **kwargs: Any
+    ) -> None:
+        """Start stage *name*.  Inline runners execute it immediately."""
+        if name in self._pending or name in self._results:
+            raise ValueError(f"Stage {name!r} already submitted")
+        remaining = self.remaining()
+        if remaining is not None and remaining <= 0:
+            self._finish(name, default, SKIPPED, 0.0)
+            logger.warning("Stage %s skipped: latency budget exhausted", name)
+            return
+
+        if self._executor is None:
+            self._run_inline(name, fn, args, kwargs, default, remaining)
+            return
+
+        start = time.perf_counter()
+        future = self._executor.submit(
+            contextvars.copy_context().run, self._timed, name, fn, args, kwargs
+        )
+        self._pending[name] = (future, default, start)
+
+    def result(self, name: str) -> Any:
+        """Wait for stage *name* and return its value (or its default on degradation)."""
+        if name in self._results:
+            return self._results[name]
+        if name not in self._pending:
+            raise KeyError(f"Stage {name!r} was never submitted")
+
+        future, default, start = self._pending.pop(name)
+        timeout = self._deadline(name, self.remaining(), started_at=start)
+        try:
+            value = future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            logger.warning("Stage %s missed its deadline (%.2fs); degrading", name, timeout)
+            self._finish(name, default, TIMEOUT, time.perf_counter() - start)
+            return default
+        except (RuntimeError, OSError) as e:
+            logger.warning("Stage %s failed: %s", name, e)
+            self._finish(name, default, ERROR, time.perf_counter() - start)
+            return default
+        with self._lock:
+            elapsed = self._worker_elapsed.get(name, time.perf_counter() - start)
+        self._finish(name, value, OK, elapsed)
+        return value
+
+    def run(
+        self, name: str, fn: Callable[..., Any], *args: Any, default: Any = None, **kwargs: Any
+    ) -> Any:
+        """Run stage *name* on the calling thread and return its value.
+
+        For sequential stages that must share the caller's connection; an
+        overrun is reported as a timeout but cannot be preempted.
+        """
+        if name in self._pending or name in self._results:
+            raise ValueError(f"Stage {name!r} already submitted")
+        remaining = self.remaining()
+        if remaining is not None and remaining <= 0:
+            self._finish(name, default, SKIPPED, 0.0)
+            logger.warning("Stage %s skipped: latency budget exhausted", name)
+            return default
+        self._run_inline(name, fn, args, kwargs, default, remaining)
+        return self._results[name]
+
+    @property
+    def degraded(self) -> list[str]:
+        """Names of stages that timed out, failed or were skipped."""
+        return [name for name, status in self.statuses.items() if status != OK]
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _deadline(
+        self, name: str, remaining: float | None, started_at: float | None = None
+    ) -> float | None:
+        stage_timeout = self._timeouts.get(name)
+        if stage_timeout is not None and started_at is not None:
+            # Time already spent while the caller waited on other stages counts.
+            stage_timeout = max(0.0, stage_timeout - (time.perf_counter() - started_at))
+        candidates = [t for t in (stage_timeout, remaining) if t is not None]
+        return min(candidates) if candidates else None
+
+    def _run_inline(
+        self,
+        name: str,
+        fn: Callable[..., Any],
+        args: tuple,
+        kwargs: dict,
+        default: Any,
+        remaining: float | None,
+    ) -> None:
+        start = time.perf_counter()
+        try:
+            with telemetry.span(name):
+                value, status = fn(*args, **kwargs), OK
+        except (RuntimeError, OSError) as e:
+            logger.warning("Stage %s failed: %s", name, e)
+            value, status = default, ERROR
+        elapsed = time.perf_counter() - start
+        timeout = self._deadline(name, remaining)
+        if status == OK and timeout is not None and elapsed > timeout:
+            logger.warning("Stage %s overran its deadline (%.2fs > %.2fs)", name, elapsed, timeout)
+            status = TIMEOUT
+        self._finish(name, value, status, elapsed)
+
+    def _timed(self, name: str, fn: Callable[..., Any], args: tuple, kwargs: dict) -> Any:
+        start = time.perf_counter()
+        try:
+            with telemetry.span(name):
+                return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._worker_elapsed[name] = time.perf_counter() - start
+
+    def _finish(self, name: str, value: Any, status: str, elapsed: float) -> None:
+        with self._lock:
+            self._results[name] = value
+            self.timings[name] = round(elapsed, 4)
+            self.statuses[name] = status
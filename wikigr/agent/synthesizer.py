@@ -4,18 +4,51 @@ All functions take explicit parameters instead of ``self``, enabling
 independent testing and reuse.  The parent ``KnowledgeGraphAgent`` class
 wraps each function so that its public (and private) method API is
 unchanged.
+
+Blocking and async synthesis functions return ``(answer, ok)``: *ok* is
+False when *answer* is a fallback (API error, empty response, failed
+query) rather than text Claude generated, so callers never cache it.
+
+``asynthesize_answer`` / ``asynthesize_answer_minimal`` are the asyncio
+twins used by ``KnowledgeGraphAgent.aquery()``: same prompts and fallbacks,
+but they await an ``AsyncAnthropic`` client so no thread is held while
+Claude generates.  ``stream_synthesis`` / ``astream_synthesis`` yield the
+answer text incrementally (``messages.stream``) for the streaming query API.
 """
 
 from __future__ import annotations
 
 import json
 import logging
+from collections.abc import AsyncIterator, Iterator
 
 from anthropic import APIConnectionError, APIStatusError, APITimeoutError
 
 logger = logging.getLogger(__name__)
 
 
+def build_minimal_prompt(question: str) -> str:
+    """Prompt for answering from Claude's own knowledge (no pack context)."""
+    return (
+        "The knowledge pack for this query contained no relevant content. "
+        "Answer the following question using your own expertise:\n\n"
+        f"Question: {question}"
+    )
+
+
+def sources_fallback(kg_results: dict) -> str:
+    """Answer returned when the synthesis call fails: just name the sources."""
+    sources = ", ".join(kg_results.get("sources", [])[:5])
+    return f"Found relevant sources: {sources}" if sources else "No results found."
+
+
+def _response_text(response) -> tuple[str, bool]:
+    """Extract ``(answer text, ok)`` from a Claude response."""
+    if not response.content:
+        return "Unable to synthesize answer: empty response from Claude.", False
+    return response.content[0].text, True
+
+
 # ---------------------------------------------------------------------------
 # Build synthesis context
 # ---------------------------------------------------------------------------
@@ -100,7 +133,7 @@ def synthesize_answer_minimal(
     synthesis_max_tokens: int,
     track_response_fn,
     question: str,
-) -> str:
+) -> tuple[str, bool]:
     """Synthesize answer using Claude's own knowledge when pack has no relevant content.
 
     Args:
@@ -111,13 +144,9 @@ def synthesize_answer_minimal(
         question: User question.
 
     Returns:
-        Answer string.
+        ``(answer, ok)``; *ok* is False for the API-error fallback.
     """
-    prompt = (
-        "The knowledge pack for this query contained no relevant content. "
-        "Answer the following question using your own expertise:\n\n"
-        f"Question: {question}"
-    )
+    prompt = build_minimal_prompt(question)
     try:
         response = claude_client.messages.create(
             model=synthesis_model,
@@ -127,12 +156,9 @@ def synthesize_answer_minimal(
         track_response_fn(response)
     except (APIConnectionError, APIStatusError, APITimeoutError) as e:
         logger.warning(f"Claude API error in _synthesize_answer_minimal: {e}")
-        return "Unable to answer: API error."
+        return "Unable to answer: API error.", False
 
-    if not response.content:
-        return "Unable to synthesize answer: empty response from Claude."
-
-    return response.content[0].text
+    return _response_text(response)
 
 
 # ---------------------------------------------------------------------------
@@ -150,7 +176,7 @@ def synthesize_answer(
     kg_results: dict,
     query_plan: dict,
     few_shot_examples: list[dict] | None = None,
-) -> str:
+) -> tuple[str, bool]:
     """Use Claude to synthesize natural language answer from KG results.
 
     Args:
@@ -165,11 +191,11 @@ def synthesize_answer(
         few_shot_examples: Optional list of few-shot example dicts.
 
     Returns:
-        Answer string.
+        ``(answer, ok)``; *ok* is False for the error and sources fallbacks.
     """
     # Handle error case
     if "error" in kg_results:
-        return f"Query execution failed: {kg_results['error']}"
+        return f"Query execution failed: {kg_results['error']}", False
 
     prompt = build_synthesis_context_fn(
         question, kg_results, query_plan, few_shot_examples=few_shot_examples or []
@@ -184,10 +210,166 @@ def synthesize_answer(
         track_response_fn(response)
     except (APIConnectionError, APIStatusError, APITimeoutError) as e:
         logger.warning(f"Claude API error in _synthesize_answer: {e}")
-        sources = ", ".join(kg_results.get("sources", [])[:5])
-        return f"Found relevant sources: {sources}" if sources else "No results found."
+        return sources_fallback(kg_results), False
+
+    return _response_text(response)
+
+
+# ---------------------------------------------------------------------------
+# Async synthesis (AsyncAnthropic)
+# ---------------------------------------------------------------------------
+
+
+async def asynthesize_answer_minimal(
+    async_claude_client,
+    synthesis_model: str,
+    synthesis_max_tokens: int,
+    track_response_fn,
+    question: str,
+) -> tuple[str, bool]:
+    """Async twin of :func:`synthesize_answer_minimal`.
+
+    Args:
+        async_claude_client: AsyncAnthropic client instance.
+        synthesis_model: Model identifier for Claude.
+        synthesis_max_tokens: Maximum tokens for synthesis response.
+        track_response_fn: Callable to track token usage from API responses.
+        question: User question.
+
+    Returns:
+        ``(answer, ok)`` as for :func:`synthesize_answer_minimal`.
+    """
+    try:
+        response = await async_claude_client.messages.create(
+            model=synthesis_model,
+            max_tokens=synthesis_max_tokens,
+            messages=[{"role": "user", "content": build_minimal_prompt(question)}],
+        )
+        track_response_fn(response)
+    except (APIConnectionError, APIStatusError, APITimeoutError) as e:
+        logger.warning(f"Claude API error in _asynthesize_answer_minimal: {e}")
+        return "Unable to answer: API error.", False
+
+    return _response_text(response)
+
+
+async def asynthesize_answer(
+    async_claude_client,
+    synthesis_model: str,
+    synthesis_max_tokens: int,
+    track_response_fn,
+    abuild_synthesis_context_fn,
+    question: str,
+    kg_results: dict,
+    query_plan: dict,
+    few_shot_examples: list[dict] | None = None,
+) -> tuple[str, bool]:
+    """Async twin of :func:`synthesize_answer`.
+
+    Args:
+        async_claude_client: AsyncAnthropic client instance.
+        synthesis_model: Model identifier for Claude.
+        synthesis_max_tokens: Maximum tokens for synthesis response.
+        track_response_fn: Callable to track token usage from API responses.
+        abuild_synthesis_context_fn: Coroutine function building the full
+            synthesis prompt (it reads source text from the database, so the
+            caller decides where that blocking work runs).
+        question: User question.
+        kg_results: Dictionary with sources, entities, facts, raw results.
+        query_plan: Dictionary with type and other plan metadata.
+        few_shot_examples: Optional list of few-shot example dicts.
+
+    Returns:
+        ``(answer, ok)`` as for :func:`synthesize_answer`.
+    """
+    if "error" in kg_results:
+        return f"Query execution failed: {kg_results['error']}", False
+
+    prompt = await abuild_synthesis_context_fn(
+        question, kg_results, query_plan, few_shot_examples=few_shot_examples or []
+    )
+
+    try:
+        response = await async_claude_client.messages.create(
+            model=synthesis_model,
+            max_tokens=synthesis_max_tokens,
+            messages=[{"role": "user", "content": prompt}],
+        )
+        track_response_fn(response)
+    except (APIConnectionError, APIStatusError, APITimeoutError) as e:
+        logger.warning(f"Claude API error in _asynthesize_answer: {e}")
+        return sources_fallback(kg_results), False
+
+    return _response_text(response)
+
+
+# ---------------------------------------------------------------------------
+# Streaming synthesis (messages.stream)
+# ---------------------------------------------------------------------------
+
+
+def stream_synthesis(
+    claude_client,
+    synthesis_model: str,
+    synthesis_max_tokens: int,
+    track_response_fn,
+    prompt: str,
+    fallback: str,
+) -> Iterator[str]:
+    """Stream the answer to a prebuilt synthesis prompt as text deltas.
+
+    Args:
+        claude_client: Anthropic client instance.
+        synthesis_model: Model identifier for Claude.
+        synthesis_max_tokens: Maximum tokens for synthesis response.
+        track_response_fn: Callable to track token usage (called with the
+            final message once the stream completes).
+        prompt: Full synthesis prompt (``build_synthesis_context`` /
+            ``build_minimal_prompt``).
+        fallback: Text yielded instead when the API fails before any text
+            was produced.
+
+    Yields:
+        Answer text chunks in order.
+    """
+    produced = False
+    try:
+        with claude_client.messages.stream(
+            model=synthesis_model,
+            max_tokens=synthesis_max_tokens,
+            messages=[{"role": "user", "content": prompt}],
+        ) as stream:
+            for text in stream.text_stream:
+                produced = True
+                yield text
+            track_response_fn(stream.get_final_message())
+    except (APIConnectionError, APIStatusError, APITimeoutError) as e:
+        logger.warning(f"Claude API error in stream_synthesis: {e}")
+        if not produced:
+            yield fallback
 
-    if not response.content:
-        return "Unable to synthesize answer: empty response from Claude."
 
-    return response.content[0].text
+async def astream_synthesis(
+    async_claude_client,
+    synthesis_model: str,
+    synthesis_max_tokens: int,
+    track_response_fn,
+    prompt: str,
+    fallback: str,
+) -> AsyncIterator[str]:
+    """Async twin of :func:`stream_synthesis` for an AsyncAnthropic client."""
+    produced = False
+    try:
+        async with async_claude_client.messages.stream(
+            model=synthesis_model,
+            max_tokens=synthesis_max_tokens,
+            messages=[{"role": "user", "content": prompt}],
+        ) as stream:
+            async for text in stream.text_stream:
+                produced = True
+                yield text
+            track_response_fn(await stream.get_final_message())
+    except (APIConnectionError, APIStatusError, APITimeoutError) as e:
+        logger.warning(f"Claude API error in astream_synthesis: {e}")
+        if not produced:
+            yield fallback
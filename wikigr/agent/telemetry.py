@@ -0,0 +1,502 @@
+"""Per-stage latency and token/cost telemetry for the query pipeline.
+
+Every ``KnowledgeGraphAgent`` query runs inside a :class:`QueryTrace` that
+collects timed spans (embed, vector, title, hybrid, rerank,
+fetch_source_text, synthesis, ...) and one entry per Claude call (stage,
+model, tokens, cost).  The trace summary is returned in the result dict
+under ``"telemetry"``; spans and calls are also aggregated into the
+process-wide :class:`TelemetryRegistry` for latency histograms and export.
+
+API Contract:
+    trace_query(kind) -> ContextManager[QueryTrace]
+    traced(kind)                                 (decorator; adds result["telemetry"])
+    span(name) -> ContextManager[None]          (registry only outside a trace)
+    record_span(name, seconds) -> None
+    record_llm_call(response, default_model=None, stage=None) -> None
+    current_trace() -> QueryTrace | None
+    get_telemetry_registry() -> TelemetryRegistry
+    TelemetryRegistry.observe(stage, seconds) / record_llm_call(...) / snapshot()
+    TelemetryRegistry.prometheus_text() -> str
+    TelemetryRegistry.enable_opentelemetry(meter=None) -> None
+    estimate_cost_usd(model, input_tokens, output_tokens) -> float | None
+
+Design Philosophy:
+    - The active trace and span live in ``contextvars`` so concurrent queries
+      never mix; ``StageRunner`` and the async DB pool run work in a copy of
+      the caller's context so stage threads report into the right trace.
+    - Histograms use fixed Prometheus-style buckets: constant memory, cheap
+      to export, and percentiles are interpolated from bucket counts.
+    - OpenTelemetry is optional: ``enable_opentelemetry`` imports it lazily
+      and raises ImportError with an install hint when it is missing.
+"""
+
+from __future__ import annotations
+
+import bisect
+import contextlib
+import contextvars
+import functools
+import inspect
+import math
+import threading
+import time
+from collections.abc import Callable, Iterator
+from typing import Any
+
+# USD per million tokens: (input, output).  Unknown models get cost None.
+MODEL_PRICING_PER_MTOK: dict[str, tuple[float, float]] = {
+    "claude-opus-4-6": (5.0, 25.0),
+    "claude-sonnet-4-5": (3.0, 15.0),
+    "claude-haiku-4-5": (1.0, 5.0),
+}
+
+# Latency histogram bucket upper bounds, in seconds (+Inf is implicit).
+LATENCY_BUCKETS_S: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+_PERCENTILES = (0.5, 0.95, 0.99)
+
+
+def estimate_cost_usd(model: str, input_tokens: int, output_tokens: int) -> float | None:
+    """Return the USD cost of one call, or None for a model without known pricing.
+
+    Dated model ids (``claude-haiku-4-5-20251001``) match their undated entry.
+    """
+    pricing = MODEL_PRICING_PER_MTOK.get(model)
+    if pricing is None:
+        pricing = next(
+            (p for name, p in MODEL_PRICING_PER_MTOK.items() if model.startswith(name + "-")),
+            None,
+        )
+    if pricing is None:
+        return None
+    return (input_tokens * pricing[0] + output_tokens * pricing[1]) / 1_000_000
+
+
+# ---------------------------------------------------------------------------
+# Per-query trace
+# ---------------------------------------------------------------------------
+
+
+class QueryTrace:
+    """Spans and Claude calls of one query (thread-safe: stages run concurrently)."""
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self._lock = threading.Lock()
+        self.spans: dict[str, float] = {}
+        self.llm_calls: list[dict[str, Any]] = []
+
+    def add_span(self, name: str, seconds: float) -> None:
+        """Add *seconds* to span *name* (repeated spans accumulate)."""
+        with self._lock:
+            self.spans[name] = self.spans.get(name, 0.0) + seconds
+
+    def add_llm_call(self, stage: str, model: str, input_tokens: int, output_tokens: int) -> None:
+        with self._lock:
+            self.llm_calls.append(
+                {
+                    "stage": stage,
+                    "model": model,
+                    "input_tokens": input_tokens,
+                    "output_tokens": output_tokens,
+                    "cost_usd": estimate_cost_usd(model, input_tokens, output_tokens),
+                }
+            )
+
+    def summary(self) -> dict[str, Any]:
+        """Return ``{"spans", "llm_calls", "input_tokens", "output_tokens", "cost_usd"}``."""
+        with self._lock:
+            calls = [dict(c) for c in self.llm_calls]
+            spans = {name: round(seconds, 4) for name, seconds in self.spans.items()}
+        costs = [c["cost_usd"] for c in calls if c["cost_usd"] is not None]
+        return {
+            "spans": spans,
+            "llm_calls": calls,
+            "input_tokens": sum(c["input_tokens"] for c in calls),
+            "output_tokens": sum(c["output_tokens"] for c in calls),
+            "cost_usd": round(sum(costs), 6) if costs else (None if calls else 0.0),
+        }
+
+
+_current_trace: contextvars.ContextVar[QueryTrace | None] = contextvars.ContextVar(
+    "wikigr_query_trace", default=None
+)
+_current_span: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "wikigr_query_span", default=None
+)
+
+
+def current_trace() -> QueryTrace | None:
+    """Return the trace of the query running in this context, if any."""
+    return _current_trace.get()
+
+
+@contextlib.contextmanager
+def trace_query(kind: str) -> Iterator[QueryTrace]:
+    """Run a query under a fresh trace; its wall time is observed as ``<kind>.total``.
+
+    Nested calls (``query(use_graph_rag=True)`` delegating to ``graph_query``)
+    reuse the outer trace.
+    """
+    outer = _current_trace.get()
+    if outer is not None:
+        yield outer
+        return
+    trace = QueryTrace(kind)
+    token = _current_trace.set(trace)
+    start = time.perf_counter()
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+        get_telemetry_registry().observe(f"{kind}.total", time.perf_counter() - start)
+
+
+def traced(kind: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorate a query method (sync or async) to run under :func:`trace_query`.
+
+    A dict result gets the trace summary under ``"telemetry"``.  Generator
+    methods (streaming queries) are traced until they finish; their
+    ``{"type": "done"}`` event gets the summary.
+    """
+
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        if inspect.isasyncgenfunction(fn):
+
+            @functools.wraps(fn)
+            async def async_gen_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with _stream_trace(kind) as trace:
+                    events = fn(*args, **kwargs)
+                    try:
+                        while True:
+                            with _activate(trace):
+                                try:
+                                    event = await events.__anext__()
+                                except StopAsyncIteration:
+                                    return
+                            yield _attach_done_summary(event, trace)
+                    finally:
+                        await events.aclose()
+
+            return async_gen_wrapper
+
+        if inspect.isgeneratorfunction(fn):
+
+            @functools.wraps(fn)
+            def gen_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with _stream_trace(kind) as trace:
+                    events = fn(*args, **kwargs)
+                    try:
+                        while True:
+                            with _activate(trace):
+                                try:
+                                    event = next(events)
+                                except StopIteration:
+                                    return
+                            yield _attach_done_summary(event, trace)
+                    finally:
+                        events.close()
+
+            return gen_wrapper
+
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with trace_query(kind) as trace:
+                    result = await fn(*args, **kwargs)
+                return _attach_summary(result, trace)
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with trace_query(kind) as trace:
+                result = fn(*args, **kwargs)
+            return _attach_summary(result, trace)
+
+        return wrapper
+
+    return decorator
+
+
+def _attach_summary(result: Any, trace: QueryTrace) -> Any:
+    if isinstance(result, dict):
+        result["telemetry"] = trace.summary()
+    return result
+
+
+def _attach_done_summary(event: Any, trace: QueryTrace) -> Any:
+    if isinstance(event, dict) and event.get("type") == "done":
+        event["telemetry"] = trace.summary()
+    return event
+
+
+@contextlib.contextmanager
+def _stream_trace(kind: str) -> Iterator[QueryTrace]:
+    """Trace of a streaming query; its wall time is observed as ``<kind>.total``.
+
+    Unlike :func:`trace_query` the trace is not left active: consumers may
+    resume a stream from another thread or context between events, so each
+    step activates it with :func:`_activate`.
+    """
+    outer = _current_trace.get()
+    if outer is not None:
+        yield outer
+        return
+    start = time.perf_counter()
+    try:
+        yield QueryTrace(kind)
+    finally:
+        get_telemetry_registry().observe(f"{kind}.total", time.perf_counter() - start)
+
+
+@contextlib.contextmanager
+def _activate(trace: QueryTrace) -> Iterator[None]:
+    token = _current_trace.set(trace)
+    try:
+        yield
+    finally:
+        _current_trace.reset(token)
+
+
+@contextlib.contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time the enclosed block as span *name* of the current trace.
+
+    Claude calls recorded inside the block are attributed to *name*.
+    Outside a trace the block still runs and the time goes to the registry.
+    """
+    token = _current_span.set(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _current_span.reset(token)
+        record_span(name, time.perf_counter() - start)
+
+
+def record_span(name: str, seconds: float) -> None:
+    """Record an already-measured span (e.g. StageRunner timings)."""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add_span(name, seconds)
+    get_telemetry_registry().observe(name, seconds)
+
+
+def record_llm_call(
+    response: Any, default_model: str | None = None, stage: str | None = None
+) -> None:
+    """Record the token usage of a Claude *response* against *stage* or the current span."""
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    model = getattr(response, "model", None)
+    if not isinstance(model, str):
+        model = default_model or "unknown"
+    input_tokens = int(getattr(usage, "input_tokens", 0) or 0)
+    output_tokens = int(getattr(usage, "output_tokens", 0) or 0)
+    stage = stage or _current_span.get() or "unattributed"
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add_llm_call(stage, model, input_tokens, output_tokens)
+    get_telemetry_registry().record_llm_call(stage, model, input_tokens, output_tokens)
+
+
+# ---------------------------------------------------------------------------
+# Process-wide aggregation and export
+# ---------------------------------------------------------------------------
+
+
+class _Histogram:
+    __slots__ = ("counts", "count", "total")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_S) + 1)  # last bucket is +Inf
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_S, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def quantile(self, q: float) -> float:
+        """Linear interpolation inside the bucket holding the q-th observation."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if seen + n >= rank and n:
+                lower = LATENCY_BUCKETS_S[i - 1] if i else 0.0
+                upper = LATENCY_BUCKETS_S[i] if i < len(LATENCY_BUCKETS_S) else lower
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+        return LATENCY_BUCKETS_S[-1]
+
+
+class TelemetryRegistry:
+    """Latency histograms per span and token/cost counters per (stage, model)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: dict[str, _Histogram] = {}
+        self._calls: dict[tuple[str, str], list[float]] = {}  # [calls, in, out, cost]
+        self._otel: dict[str, Any] | None = None
+
+    def observe(self, stage: str, seconds: float) -> None:
+        """Add one latency observation for *stage*."""
+        with self._lock:
+            hist = self._histograms.get(stage)
+            if hist is None:
+                hist = self._histograms[stage] = _Histogram()
+            hist.observe(seconds)
+            otel = self._otel
+        if otel is not None:
+            otel["latency"].record(seconds, {"stage": stage})
+
+    def record_llm_call(
+        self, stage: str, model: str, input_tokens: int, output_tokens: int
+    ) -> None:
+        """Add one Claude call to the token and cost counters."""
+        cost = estimate_cost_usd(model, input_tokens, output_tokens) or 0.0
+        with self._lock:
+            entry = self._calls.setdefault((stage, model), [0, 0, 0, 0.0])
+            entry[0] += 1
+            entry[1] += input_tokens
+            entry[2] += output_tokens
+            entry[3] += cost
+            otel = self._otel
+        if otel is not None:
+            attrs = {"stage": stage, "model": model}
+            otel["tokens"].add(input_tokens, {**attrs, "direction": "input"})
+            otel["tokens"].add(output_tokens, {**attrs, "direction": "output"})
+            otel["cost"].add(cost, attrs)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return latency percentiles per stage and token/cost totals per (stage, model)."""
+        with self._lock:
+            latency = {
+                stage: {
+                    "count": h.count,
+                    "sum_s": round(h.total, 4),
+                    **{f"p{int(q * 100)}_s": round(h.quantile(q), 4) for q in _PERCENTILES},
+                }
+                for stage, h in sorted(self._histograms.items())
+            }
+            calls = [
+                {
+                    "stage": stage,
+                    "model": model,
+                    "calls": int(c[0]),
+                    "input_tokens": int(c[1]),
+                    "output_tokens": int(c[2]),
+                    "cost_usd": round(c[3], 6),
+                }
+                for (stage, model), c in sorted(self._calls.items())
+            ]
+        return {"latency": latency, "llm_calls": calls}
+
+    def prometheus_text(self) -> str:
+        """Render all metrics in the Prometheus text exposition format (0.0.4)."""
+        lines = [
+            "# HELP wikigr_stage_latency_seconds Query pipeline stage latency.",
+            "# TYPE wikigr_stage_latency_seconds histogram",
+        ]
+        with self._lock:
+            for stage, h in sorted(self._histograms.items()):
+                label = _label_value(stage)
+                cumulative = 0
+                for bound, n in zip((*LATENCY_BUCKETS_S, math.inf), h.counts):
+                    cumulative += n
+                    le = "+Inf" if bound == math.inf else repr(bound)
+                    lines.append(
+                        f'wikigr_stage_latency_seconds_bucket{{stage="{label}",le="{le}"}} '
+                        f"{cumulative}"
+                    )
+                lines.append(f'wikigr_stage_latency_seconds_sum{{stage="{label}"}} {h.total!r}')
+                lines.append(f'wikigr_stage_latency_seconds_count{{stage="{label}"}} {h.count}')
+            calls = sorted(self._calls.items())
+
+        counters = (
+            ("wikigr_llm_calls_total", "Claude API calls.", 0),
+            ("wikigr_llm_input_tokens_total", "Claude input tokens.", 1),
+            ("wikigr_llm_output_tokens_total", "Claude output tokens.", 2),
+            ("wikigr_llm_cost_usd_total", "Estimated Claude cost in USD.", 3),
+        )
+        for name, help_text, index in counters:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for (stage, model), c in calls:
+                value = c[index] if index == 3 else int(c[index])
+                lines.append(
+                    f'{name}{{stage="{_label_value(stage)}",model="{_label_value(model)}"}} '
+                    f"{value!r}"
+                )
+        return "\n".join(lines) + "\n"
+
+    def enable_opentelemetry(self, meter: Any = None) -> None:
+        """Also record every observation through OpenTelemetry instruments.
+
+        Args:
+            meter: An ``opentelemetry.metrics.Meter``; defaults to
+                ``metrics.get_meter("wikigr.agent")`` on the global provider.
+
+        Raises:
+            ImportError: If ``opentelemetry-api`` is not installed.
+        """
+        if meter is None:
+            try:
+                from opentelemetry import metrics
+            except ImportError as e:
+                raise ImportError(
+                    "OpenTelemetry export requires opentelemetry-api "
+                    "(pip install opentelemetry-api opentelemetry-sdk)"
+                ) from e
+            meter = metrics.get_meter("wikigr.agent")
+        instruments = {
+            "latency": meter.create_histogram(
+                "wikigr.stage.latency", unit="s", description="Query pipeline stage latency"
+            ),
+            "tokens": meter.create_counter(
+                "wikigr.llm.tokens", unit="{token}", description="Claude tokens"
+            ),
+            "cost": meter.create_counter(
+                "wikigr.llm.cost", unit="USD", description="Estimated Claude cost"
+            ),
+        }
+        with self._lock:
+            self._otel = instruments
+
+    def reset(self) -> None:
+        """Drop all aggregated metrics (OpenTelemetry export stays enabled)."""
+        with self._lock:
+            self._histograms.clear()
+            self._calls.clear()
+
+
+def _label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_registry = TelemetryRegistry()
+
+
+def get_telemetry_registry() -> TelemetryRegistry:
+    """Return the process-wide TelemetryRegistry."""
+    return _registry
@@ -0,0 +1,127 @@
+"""In-memory article title index for DB-free title matching.
+
+``direct_title_lookup`` and the keyword signal of ``hybrid_retrieve`` used
+to run ``lower(a.title) = $q`` / ``lower(a.title) CONTAINS $q`` against the
+pack, each a full Article scan with per-row lowercasing.  A
+:class:`TitleIndex` is built once from all article titles when an agent
+opens a pack and answers the same questions from memory.
+
+API Contract:
+    TitleIndex(titles, version=None)
+        .exact(query) -> list[str]
+        .prefix(query, limit=None) -> list[str]
+        .contains(query, limit=None) -> list[str]
+        .version, len(index)
+    db_version(db_path) -> tuple | None
+
+Design Philosophy:
+    - Exact matches come from a lower-cased hash map; prefix matches from a
+      sorted list of lower-cased titles (bisect); substring matches from a
+      trigram inverted index whose rarest trigram yields the candidates,
+      each verified with ``in`` so results equal the Cypher ``CONTAINS``.
+    - Matches mirror the Cypher they replace: case-insensitive, and
+      ``contains`` orders by title length like the partial-match query.
+    - The index is immutable and tagged with the pack's ``db_version``;
+      the owner rebuilds it when the version changes.
+"""
+
+from __future__ import annotations
+
+import bisect
+import os
+from collections.abc import Iterable
+
+_GRAM = 3
+
+
+def db_version(db_path: str | os.PathLike | None) -> tuple | None:
+    """Return a cheap change signature for the database at *db_path*.
+
+    ``(mtime_ns, size)`` of the database path and of its write-ahead log,
+    so both checkpointed and uncheckpointed writes change the signature.
+    Returns None when *db_path* is None.
+    """
+    if db_path is None:
+        return None
+    signature: list[tuple[int, int]] = []
+    for path in (os.fspath(db_path), os.fspath(db_path) + ".wal"):
+        try:
+            st = os.stat(path)
+        except OSError:
+            signature.append((0, 0))
+        else:
+            signature.append((st.st_mtime_ns, st.st_size))
+    return tuple(signature)
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i : i + _GRAM] for i in range(len(text) - _GRAM + 1)}
+
+
+class TitleIndex:
+    """Case-insensitive exact, prefix and substring lookup over article titles."""
+
+    def __init__(self, titles: Iterable[str], version: object = None):
+        """Index *titles* (duplicates and empty titles are dropped).
+
+        Args:
+            titles: Article titles as stored in the pack.
+            version: Opaque pack version the index was built from (see
+                :func:`db_version`); the owner compares it to decide when to rebuild.
+        """
+        self.version = version
+        # Ordered by (length, lower-cased title) so every lookup that walks
+        # ids in order returns the shortest titles first.
+        unique = {t for t in titles if t}
+        self._titles: list[str] = sorted(unique, key=lambda t: (len(t), t.lower(), t))
+        self._lower: list[str] = [t.lower() for t in self._titles]
+
+        self._by_lower: dict[str, list[str]] = {}
+        self._grams: dict[str, list[int]] = {}
+        for i, (title, low) in enumerate(zip(self._titles, self._lower, strict=True)):
+            self._by_lower.setdefault(low, []).append(title)
+            for gram in _trigrams(low):
+                self._grams.setdefault(gram, []).append(i)
+
+        self._sorted_lower: list[tuple[str, int]] = sorted(
+            (low, i) for i, low in enumerate(self._lower)
+        )
+
+    def __len__(self) -> int:
+        return len(self._titles)
+
+    def exact(self, query: str) -> list[str]:
+        """Titles equal to *query*, ignoring case."""
+        return list(self._by_lower.get(query.lower(), ()))
+
+    def prefix(self, query: str, limit: int | None = None) -> list[str]:
+        """Titles starting with *query* (ignoring case), shortest first."""
+        q = query.lower()
+        start = bisect.bisect_left(self._sorted_lower, (q, -1))
+        ids: list[int] = []
+        for low, i in self._sorted_lower[start:]:
+            if not low.startswith(q):
+                break
+            ids.append(i)
+        return self._take(sorted(ids), limit)
+
+    def contains(self, query: str, limit: int | None = None) -> list[str]:
+        """Titles containing *query* (ignoring case), shortest first."""
+        q = query.lower()
+        if len(q) < _GRAM:
+            candidates: Iterable[int] = range(len(self._lower))
+        else:
+            postings = [self._grams.get(g) for g in _trigrams(q)]
+            if any(p is None for p in postings):
+                return []
+            candidates = min(postings, key=len)
+        ids = (i for i in candidates if q in self._lower[i])
+        return self._take(ids, limit)
+
+    def _take(self, ids: Iterable[int], limit: int | None) -> list[str]:
+        out: list[str] = []
+        for i in ids:
+            if limit is not None and len(out) >= limit:
+                break
+            out.append(self._titles[i])
+        return out
@@ -1038,6 +1038,23 @@ def cmd_pack_create(args: argparse.Namespace) -> None:
         eval_scores=None,
     )
 
+    # Precompute graph centrality for the reranker (read from memory at query time)
+    from wikigr.packs.centrality import compute_centrality, save_centrality
+
+    centrality_path = save_centrality(compute_centrality(conn_stats), output_dir)
+    print(f"Centrality computed: {centrality_path}")
+
+    # Export embeddings for exact search on small packs
+    from wikigr.packs.embedding_sidecar import export_embeddings
+
+    for embedding_path in export_embeddings(conn_stats, output_dir):
+        print(f"Embeddings exported: {embedding_path}")
+
+    # Summarize the section embeddings for routing questions across packs
+    from wikigr.packs.router import compute_routing_profile
+
+    manifest.routing = compute_routing_profile(conn_stats)
+
     save_manifest(manifest, output_dir)
     print(f"Manifest created: {output_dir / 'manifest.json'}")
 
@@ -1332,6 +1349,107 @@ def cmd_pack_validate(args: argparse.Namespace) -> None:
         sys.exit(1)
 
 
+def cmd_pack_optimize(args: argparse.Namespace) -> None:
+    """Execute 'pack optimize' subcommand: precompute query-time sidecars."""
+    from wikigr.packs.centrality import build_pack_centrality
+    from wikigr.packs.embedding_sidecar import export_pack_embeddings
+    from wikigr.packs.router import build_pack_routing
+
+    pack_path = Path(args.pack_dir)
+
+    if not (pack_path / "pack.db").exists():
+        print(f"Error: pack database not found: {pack_path / 'pack.db'}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.embedding_storage and (pack_path / "manifest.json").exists():
+        from wikigr.packs.manifest import load_manifest, save_manifest
+
+        manifest = load_manifest(pack_path)
+        manifest.embedding_storage = args.embedding_storage
+        save_manifest(manifest, pack_path)
+
+    print(f"Optimizing pack at {pack_path}...")
+    try:
+        path = build_pack_centrality(pack_path)
+        embedding_paths = export_pack_embeddings(pack_path, storage=args.embedding_storage)
+        routing = build_pack_routing(pack_path) if (pack_path / "manifest.json").exists() else None
+    except RuntimeError as e:
+        print(f"Error optimizing pack: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"Centrality written: {path}")
+    for embedding_path in embedding_paths:
+        print(f"Embeddings exported: {embedding_path}")
+    if routing is not None:
+        print(f"Routing profile written: {len(routing['representatives'])} representatives")
+
+
+def cmd_pack_quantization_report(args: argparse.Namespace) -> None:
+    """Execute 'pack quantization-report' subcommand: recall vs. size per storage."""
+    from wikigr.packs.embedding_sidecar import pack_quantization_report
+
+    pack_path = Path(args.pack_dir)
+
+    if not (pack_path / "pack.db").exists():
+        print(f"Error: pack database not found: {pack_path / 'pack.db'}", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        report = pack_quantization_report(pack_path, k=args.k, sample=args.sample)
+    except RuntimeError as e:
+        print(f"Error measuring pack embeddings: {e}", file=sys.stderr)
+        sys.exit(1)
+    report_path = pack_path / "quantization_report.json"
+    report_path.write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.format == "json":
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"Pack: {pack_path.name} (embedding_storage: {report['embedding_storage']})")
+    print(
+        f"pack.db: {report['pack_db_bytes'] / 1024:.1f}KB, "
+        f"sidecars: {report['sidecar_bytes'] / 1024:.1f}KB"
+    )
+    if not report["kinds"]:
+        print("No embeddings found.")
+    for kind, kind_report in report["kinds"].items():
+        print(
+            f"\n{kind}: {kind_report['rows']} rows x {kind_report['dim']} dims, "
+            f"column {kind_report['column_type']} "
+            f"({kind_report['column_bytes'] / 1024:.1f}KB in pack.db), "
+            f"recall@{kind_report['k']} over {kind_report['sample']} queries"
+        )
+        print(f"  {'storage':<10}{'sidecar':>12}{'total':>12}{'recall':>10}{'rescored':>10}")
+        for storage, stats in kind_report["storages"].items():
+            print(
+                f"  {storage:<10}{stats['bytes'] / 1024:>10.1f}KB"
+                f"{stats['pack_bytes'] / 1024:>10.1f}KB"
+                f"{stats['recall']:>10.3f}{stats['recall_rescored']:>10.3f}"
+            )
+    print(f"\nReport written: {report_path}")
+
+
+def cmd_pack_route(args: argparse.Namespace) -> None:
+    """Execute 'pack route' subcommand: rank installed packs for a question."""
+    from wikigr.packs.router import PackRouter
+
+    packs_dir = Path(os.environ.get("HOME", Path.home().as_posix())) / ".wikigr/packs"
+    router = PackRouter.from_directory(packs_dir)
+    if not len(router):
+        print(
+            "No installed pack has a routing profile. Run 'wikigr pack optimize' on your packs.",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+    ranked = router.route(args.question, k=args.k)
+    if args.format == "json":
+        print(json.dumps([{"name": name, "score": round(score, 4)} for name, score in ranked]))
+        return
+    for name, score in ranked:
+        print(f"  {name:<30} {score:.3f}")
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         prog="wikigr",
@@ -1568,6 +1686,50 @@ def main() -> None:
     )
     pack_validate_parser.set_defaults(func=cmd_pack_validate)
 
+    # pack optimize
+    pack_optimize_parser = pack_subparsers.add_parser(
+        "optimize", help="Precompute centrality and embedding sidecars for faster queries"
+    )
+    pack_optimize_parser.add_argument("pack_dir", type=str, help="Path to pack directory")
+    pack_optimize_parser.add_argument(
+        "--embedding-storage",
+        type=str,
+        choices=["float32", "int8", "binary"],
+        default=None,
+        help="Embedding sidecar representation; recorded in manifest.json "
+        "(default: the manifest setting, else float32)",
+    )
+    pack_optimize_parser.set_defaults(func=cmd_pack_optimize)
+
+    # pack route
+    pack_route_parser = pack_subparsers.add_parser(
+        "route", help="Rank installed packs for a question by embedding similarity"
+    )
+    pack_route_parser.add_argument("question", type=str, help="Question to route")
+    pack_route_parser.add_argument(
+        "--k", type=int, default=3, help="Number of packs to return (default: 3)"
+    )
+    pack_route_parser.add_argument(
+        "--format", type=str, choices=["text", "json"], default="text", help="Output format"
+    )
+    pack_route_parser.set_defaults(func=cmd_pack_route)
+
+    # pack quantization-report
+    pack_quant_parser = pack_subparsers.add_parser(
+        "quantization-report", help="Compare recall and size of embedding storages"
+    )
+    pack_quant_parser.add_argument("pack_dir", type=str, help="Path to pack directory")
+    pack_quant_parser.add_argument(
+        "--k", type=int, default=10, help="Neighbours per query for recall@k (default: 10)"
+    )
+    pack_quant_parser.add_argument(
+        "--sample", type=int, default=100, help="Number of sample queries (default: 100)"
+    )
+    pack_quant_parser.add_argument(
+        "--format", type=str, choices=["text", "json"], default="text", help="Output format"
+    )
+    pack_quant_parser.set_defaults(func=cmd_pack_quantization_report)
+
     args = parser.parse_args()
 
     # Configure logging
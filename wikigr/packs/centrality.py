@@ -0,0 +1,211 @@
+"""Precomputed graph centrality for knowledge packs.
+
+Degree and PageRank over the ``LINKS_TO`` graph are computed once when a
+pack is built (or later with ``wikigr pack optimize``) and stored next to
+the database as ``centrality.json``.  ``GraphReranker`` reads them from
+memory instead of running degree aggregations on every query.
+
+API Contract:
+    compute_centrality(conn, damping=0.85, max_iter=100, tol=1e-10) -> PackCentrality
+    save_centrality(centrality, pack_dir) -> Path
+    load_centrality(pack_dir) -> PackCentrality | None
+    build_pack_centrality(pack_dir) -> Path
+
+Design Philosophy:
+    - Two full scans (titles, edges) and a numpy power iteration; no
+      per-article queries.
+    - Degree is in-degree + out-degree, the same value the reranker's
+      Cypher aggregation returned, so rankings do not change.
+    - The sidecar is plain JSON with column lists (titles, degree,
+      pagerank), small enough to load at agent start-up.
+    - The sidecar is a snapshot: re-run the build step after the graph changes.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from bootstrap.src.query_result import fetch
+
+logger = logging.getLogger(__name__)
+
+CENTRALITY_FILENAME = "centrality.json"
+CENTRALITY_FORMAT_VERSION = 1
+CENTRALITY_METRICS = ("degree", "pagerank")
+
+
+@dataclass
+class PackCentrality:
+    """Per-article degree and PageRank of a pack's ``LINKS_TO`` graph.
+
+    Attributes:
+        titles: Article titles.
+        degree: In-degree + out-degree, aligned with ``titles``.
+        pagerank: PageRank scores (sum to 1.0), aligned with ``titles``.
+        total_links: Number of ``LINKS_TO`` edges between articles.
+    """
+
+    titles: list[str]
+    degree: list[int]
+    pagerank: list[float]
+    total_links: int
+    _positions: dict[str, int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if not len(self.titles) == len(self.degree) == len(self.pagerank):
+            raise ValueError("titles, degree and pagerank must have the same length")
+        self._positions = {title: i for i, title in enumerate(self.titles)}
+
+    @property
+    def avg_links(self) -> float:
+        """Average ``LINKS_TO`` edges per article (0.0 for an empty graph)."""
+        return self.total_links / len(self.titles) if self.titles else 0.0
+
+    def get(self, title: str, metric: str = "degree") -> float | None:
+        """Return *title*'s *metric* value, or None if the article is unknown."""
+        if metric not in CENTRALITY_METRICS:
+            raise ValueError(f"metric must be one of {CENTRALITY_METRICS}, got {metric!r}")
+        i = self._positions.get(title)
+        if i is None:
+            return None
+        return float(getattr(self, metric)[i])
+
+
+def compute_centrality(
+    conn, damping: float = 0.85, max_iter: int = 100, tol: float = 1e-10
+) -> PackCentrality:
+    """Compute degree and PageRank for every Article from an open connection.
+
+    Args:
+        conn: LadybugDB connection to the pack database.
+        damping: PageRank damping factor.
+        max_iter: Maximum power iterations.
+        tol: Stop when the L1 change between iterations falls below this.
+
+    Returns:
+        PackCentrality covering every Article.
+    """
+    title_rows = fetch(conn.execute("MATCH (a:Article) RETURN a.title AS title"))
+    titles = [t for t in title_rows.column("title") if t]
+    positions = {title: i for i, title in enumerate(titles)}
+
+    edge_rows = fetch(
+        conn.execute(
+            "MATCH (a:Article)-[:LINKS_TO]->(b:Article) RETURN a.title AS source, b.title AS target"
+        )
+    )
+    pairs = [
+        (positions[s], positions[t]) for s, t in edge_rows if s in positions and t in positions
+    ]
+    src = np.fromiter((s for s, _ in pairs), dtype=np.int64, count=len(pairs))
+    dst = np.fromiter((t for _, t in pairs), dtype=np.int64, count=len(pairs))
+
+    n = len(titles)
+    out_degree = np.bincount(src, minlength=n)
+    in_degree = np.bincount(dst, minlength=n)
+    pagerank = _pagerank(src, dst, out_degree, n, damping, max_iter, tol)
+
+    return PackCentrality(
+        titles=titles,
+        degree=(out_degree + in_degree).tolist(),
+        pagerank=pagerank.tolist(),
+        total_links=len(pairs),
+    )
+
+
+def _pagerank(
+    src: np.ndarray,
+    dst: np.ndarray,
+    out_degree: np.ndarray,
+    n: int,
+    damping: float,
+    max_iter: int,
+    tol: float,
+) -> np.ndarray:
+    """Power-iteration PageRank; dangling articles spread their rank uniformly."""
+    if n == 0:
+        return np.zeros(0)
+    rank = np.full(n, 1.0 / n)
+    dangling = out_degree == 0
+    edge_weight = 1.0 / np.maximum(out_degree[src], 1)
+    for _ in range(max_iter):
+        flow = np.bincount(dst, weights=rank[src] * edge_weight, minlength=n)
+        new_rank = (1.0 - damping) / n + damping * (flow + rank[dangling].sum() / n)
+        converged = np.abs(new_rank - rank).sum() < tol
+        rank = new_rank
+        if converged:
+            break
+    return rank
+
+
+def save_centrality(centrality: PackCentrality, pack_dir: str | Path) -> Path:
+    """Write *centrality* to ``<pack_dir>/centrality.json`` and return the path."""
+    path = Path(pack_dir) / CENTRALITY_FILENAME
+    payload = {
+        "format_version": CENTRALITY_FORMAT_VERSION,
+        "total_links": centrality.total_links,
+        "titles": centrality.titles,
+        "degree": centrality.degree,
+        "pagerank": centrality.pagerank,
+    }
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(payload))
+    tmp.replace(path)
+    return path
+
+
+def load_centrality(pack_dir: str | Path) -> PackCentrality | None:
+    """Load ``<pack_dir>/centrality.json``, or return None if absent or unreadable."""
+    path = Path(pack_dir) / CENTRALITY_FILENAME
+    try:
+        payload = json.loads(path.read_text())
+    except FileNotFoundError:
+        return None
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning("Ignoring unreadable centrality sidecar %s: %s", path, e)
+        return None
+    if payload.get("format_version") != CENTRALITY_FORMAT_VERSION:
+        logger.warning("Ignoring centrality sidecar %s with unknown format version", path)
+        return None
+    try:
+        return PackCentrality(
+            titles=payload["titles"],
+            degree=payload["degree"],
+            pagerank=payload["pagerank"],
+            total_links=int(payload["total_links"]),
+        )
+    except (KeyError, TypeError, ValueError) as e:
+        logger.warning("Ignoring malformed centrality sidecar %s: %s", path, e)
+        return None
+
+
+def build_pack_centrality(pack_dir: str | Path) -> Path:
+    """Compute centrality for ``<pack_dir>/pack.db`` and write the sidecar.
+
+    Raises:
+        FileNotFoundError: If the pack has no pack.db.
+    """
+    import real_ladybug as kuzu
+
+    pack_dir = Path(pack_dir)
+    db_path = pack_dir / "pack.db"
+    if not db_path.exists():
+        raise FileNotFoundError(f"Pack database not found: {db_path}")
+    db = kuzu.Database(str(db_path), read_only=True)
+    try:
+        centrality = compute_centrality(kuzu.Connection(db))
+    finally:
+        db.close()
+    path = save_centrality(centrality, pack_dir)
+    logger.info(
+        "Centrality sidecar written: %s (%d articles, %d links)",
+        path,
+        len(centrality.titles),
+        centrality.total_links,
+    )
+    return path
@@ -0,0 +1,572 @@
+"""Memory-mapped embedding sidecar for exact vector search on small packs.
+
+Most packs hold a few thousand sections.  At that size an exact matrix
+product over all embeddings is faster than a ``QUERY_VECTOR_INDEX`` call
+whose result materialises every hit node (content included) through
+pandas.  A pack build (or ``wikigr pack optimize``) exports the L2-normalized
+Section and Chunk embeddings to ``embeddings/<kind>.npy`` plus an id map
+``embeddings/<kind>_ids.json``; the agent memory-maps them and only fetches
+content for the top-k winners.
+
+Packs can instead store the sidecar quantized (``embedding_storage`` in the
+manifest): ``int8`` codes with a per-row scale (4x smaller than float32) or
+``binary`` sign bits (32x smaller).  Search is two-phase: the quantized
+matrix ranks ``k * RESCORE_OVERSAMPLE`` candidates and their float
+embeddings, fetched from the database, rescore them exactly.  The database
+column itself is ``FLOAT[768]`` (``EMBEDDING_COLUMN_TYPE`` in the schema),
+so an int8 pack stores 5 bytes per dimension where a float64 column alone
+took 8.
+
+API Contract:
+    export_embeddings(conn, pack_dir, kinds=("section", "chunk"), storage="float32") -> list[Path]
+    export_pack_embeddings(pack_dir, storage=None) -> list[Path]
+    load_exact_index(pack_dir, kind) -> ExactSearchIndex | QuantizedSearchIndex | None
+    ExactSearchIndex.search(query_embedding, k, rescore=None) -> list[(id, similarity)]
+    QuantizedSearchIndex.search(query_embedding, k, rescore=None) -> list[(id, similarity)]
+    embedding_column_type(conn, kind) -> str | None
+    count_embedded(conn, kind) -> int
+    iter_embedding_batches(conn, kind, count) -> Iterator[(ids, normalized float32 rows)]
+    normalize_rows(rows) -> np.ndarray
+    quantization_report(conn, kind, k=10, sample=100) -> dict | None
+    pack_quantization_report(pack_dir, k=10, sample=100) -> dict
+
+Design Philosophy:
+    - float32 rows normalized at export, so cosine similarity is a single
+      matrix-vector product; ``argpartition`` selects the top-k in O(n).
+    - ``np.load(mmap_mode="r")`` keeps start-up cheap and lets the OS page
+      cache share the matrix between agents that serve the same pack.
+    - Quantized sidecars never answer alone when a ``rescore`` callable is
+      given: the database keeps the float embeddings, so final scores (and
+      the ``distance`` reported to callers) are exact.
+    - The sidecar is a snapshot; callers compare its row count with the
+      database to detect a stale one.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+import numpy as np
+
+from bootstrap.src.query_result import fetch
+from wikigr.packs.manifest import EMBEDDING_STORAGES
+
+logger = logging.getLogger(__name__)
+
+SIDECAR_DIRNAME = "embeddings"
+SIDECAR_FORMAT_VERSION = 1
+EXPORT_BATCH_ROWS = 2048
+RESCORE_OVERSAMPLE = 4
+SCAN_BLOCK_ROWS = 8192
+
+# kind -> (node table, primary key property)
+SIDECAR_KINDS: dict[str, tuple[str, str]] = {
+    "section": ("Section", "section_id"),
+    "chunk": ("Chunk", "chunk_id"),
+}
+
+# storage -> sidecar file name templates (the first one is the main matrix)
+_STORAGE_FILES: dict[str, tuple[str, ...]] = {
+    "float32": ("{kind}.npy",),
+    "int8": ("{kind}.int8.npy", "{kind}.int8_scale.npy"),
+    "binary": ("{kind}.binary.npy",),
+}
+
+# Bytes per element of embedding column base types, for size reports.
+_COLUMN_ITEMSIZE = {"FLOAT": 4, "DOUBLE": 8}
+
+# Set bits per byte value, for Hamming distances over packed sign bits.
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+Rescorer = Callable[[list[str]], dict[str, list[float]]]
+
+
+def _paths(pack_dir: str | Path, kind: str, storage: str = "float32") -> tuple[list[Path], Path]:
+    """Return the *storage* matrix files and the id map of the *kind* sidecar."""
+    if kind not in SIDECAR_KINDS:
+        raise ValueError(f"kind must be one of {tuple(SIDECAR_KINDS)}, got {kind!r}")
+    if storage not in EMBEDDING_STORAGES:
+        raise ValueError(f"storage must be one of {EMBEDDING_STORAGES}, got {storage!r}")
+    directory = Path(pack_dir) / SIDECAR_DIRNAME
+    files = [directory / name.format(kind=kind) for name in _STORAGE_FILES[storage]]
+    return files, directory / f"{kind}_ids.json"
+
+
+def normalize_rows(rows: np.ndarray) -> np.ndarray:
+    """L2-normalize each row; all-zero rows are left as they are."""
+    norms = np.linalg.norm(rows, axis=1, keepdims=True)
+    return rows / np.where(norms > 0, norms, 1.0)
+
+
+def quantize_int8(rows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Symmetric per-row int8 quantization: ``rows ~= codes * scale[:, None]``."""
+    rows = np.asarray(rows, dtype=np.float32)
+    scale = np.abs(rows).max(axis=1) / 127.0
+    scale = np.where(scale > 0, scale, 1.0).astype(np.float32)
+    codes = np.clip(np.rint(rows / scale[:, None]), -127, 127).astype(np.int8)
+    return codes, scale
+
+
+def quantize_binary(rows: np.ndarray) -> np.ndarray:
+    """Pack the sign bit of every component, 8 dimensions per byte."""
+    return np.packbits(np.asarray(rows) > 0, axis=1)
+
+
+class ExactSearchIndex:
+    """Brute-force cosine top-k over a (memory-mapped) matrix of normalized rows."""
+
+    storage = "float32"
+
+    def __init__(self, embeddings: np.ndarray, ids: list[str]):
+        """Wrap *embeddings* (n x dim, L2-normalized rows) and their node *ids*.
+
+        Raises:
+            ValueError: If the number of rows and ids differ.
+        """
+        if embeddings.ndim != 2 or embeddings.shape[0] != len(ids):
+            raise ValueError(f"embeddings shape {embeddings.shape} does not match {len(ids)} ids")
+        self.embeddings = embeddings
+        self.ids = ids
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def search(
+        self,
+        query_embedding,
+        k: int,
+        rescore: Rescorer | None = None,  # noqa: ARG002
+    ) -> list[tuple[str, float]]:
+        """Return the *k* ids most similar to *query_embedding*, best first.
+
+        Similarity is cosine similarity, so ``1 - similarity`` equals the
+        cosine distance ``QUERY_VECTOR_INDEX`` reports.  *rescore* is
+        accepted for parity with :class:`QuantizedSearchIndex`; exact scores
+        need no rescoring.
+        """
+        n = len(self.ids)
+        if n == 0 or k < 1:
+            return []
+        query = normalize_rows(np.asarray(query_embedding, dtype=np.float32).reshape(1, -1))[0]
+        scores = self.embeddings @ query
+        return [(self.ids[i], float(scores[i])) for i in _top(scores, k)]
+
+
+class QuantizedSearchIndex:
+    """Two-phase search over int8 or binary codes with optional exact rescoring."""
+
+    def __init__(self, codes: np.ndarray, ids: list[str], scale: np.ndarray | None = None):
+        """Wrap quantized *codes* and their node *ids*.
+
+        Args:
+            codes: int8 codes (n x dim) when *scale* is given, otherwise
+                packed sign bits (n x ceil(dim / 8), uint8).
+            ids: Node ids aligned with the rows of *codes*.
+            scale: Per-row int8 scale (see :func:`quantize_int8`).
+
+        Raises:
+            ValueError: If the number of rows, scales and ids differ.
+        """
+        if codes.ndim != 2 or codes.shape[0] != len(ids):
+            raise ValueError(f"codes shape {codes.shape} does not match {len(ids)} ids")
+        if scale is not None and scale.shape != (len(ids),):
+            raise ValueError(f"scale shape {scale.shape} does not match {len(ids)} ids")
+        self.codes = codes
+        self.ids = ids
+        self.scale = scale
+        self.storage = "int8" if scale is not None else "binary"
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def approximate_scores(self, query_embedding) -> np.ndarray:
+        """Approximate cosine similarity of every row to *query_embedding*."""
+        query = normalize_rows(np.asarray(query_embedding, dtype=np.float32).reshape(1, -1))
+        scores = np.empty(len(self.ids), dtype=np.float32)
+        # Scan in blocks so the float upcast of int8 codes stays small.
+        for start in range(0, len(self.ids), SCAN_BLOCK_ROWS):
+            block = self.codes[start : start + SCAN_BLOCK_ROWS]
+            if self.scale is not None:
+                scores[start : start + len(block)] = (block @ query[0]) * self.scale[
+                    start : start + len(block)
+                ]
+            else:
+                distance = _POPCOUNT[block ^ quantize_binary(query)].sum(axis=1, dtype=np.int32)
+                scores[start : start + len(block)] = 1.0 - 2.0 * distance / (block.shape[1] * 8)
+        return scores
+
+    def search(
+        self,
+        query_embedding,
+        k: int,
+        rescore: Rescorer | None = None,
+        oversample: int = RESCORE_OVERSAMPLE,
+    ) -> list[tuple[str, float]]:
+        """Return the *k* best ids for *query_embedding*, best first.
+
+        Args:
+            query_embedding: Query vector.
+            k: Number of ids to return.
+            rescore: Callable mapping candidate ids to their float
+                embeddings.  When given, ``k * oversample`` candidates are
+                rescored with exact cosine similarity; candidates it does
+                not return keep their approximate score.
+            oversample: Candidate multiplier for rescoring.
+        """
+        n = len(self.ids)
+        if n == 0 or k < 1:
+            return []
+        approx = self.approximate_scores(query_embedding)
+        if rescore is None:
+            return [(self.ids[i], float(approx[i])) for i in _top(approx, k)]
+
+        candidates = _top(approx, k * max(1, oversample))
+        vectors = rescore([self.ids[i] for i in candidates])
+        query = normalize_rows(np.asarray(query_embedding, dtype=np.float32).reshape(1, -1))[0]
+        rescored = []
+        for i in candidates:
+            vector = vectors.get(self.ids[i])
+            if vector is None:
+                similarity = float(approx[i])
+            else:
+                similarity = float(
+                    normalize_rows(np.asarray([vector], dtype=np.float32))[0] @ query
+                )
+            rescored.append((self.ids[i], similarity))
+        rescored.sort(key=lambda hit: hit[1], reverse=True)
+        return rescored[:k]
+
+
+def _top(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the *k* highest *scores*, best first."""
+    n = len(scores)
+    k = min(k, n)
+    top = np.argpartition(-scores, k - 1)[:k] if k < n else np.arange(n)
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+def count_embedded(conn, kind: str) -> int:
+    """Number of *kind* nodes (``section`` or ``chunk``) that have an embedding."""
+    table, _key = SIDECAR_KINDS[kind]
+    return int(
+        fetch(
+            conn.execute(
+                f"MATCH (n:{table}) WHERE n.embedding IS NOT NULL RETURN count(n) AS count"
+            )
+        ).scalar("count", 0)
+    )
+
+
+def iter_embedding_batches(conn, kind: str, count: int) -> Iterator[tuple[list[str], np.ndarray]]:
+    """Yield (ids, normalized float32 rows) for *kind* in ``EXPORT_BATCH_ROWS`` batches."""
+    table, key = SIDECAR_KINDS[kind]
+    for offset in range(0, count, EXPORT_BATCH_ROWS):
+        batch = fetch(
+            conn.execute(
+                f"MATCH (n:{table}) WHERE n.embedding IS NOT NULL "
+                f"RETURN n.{key} AS id, n.embedding AS embedding "
+                f"ORDER BY n.{key} SKIP {offset} LIMIT {EXPORT_BATCH_ROWS}"
+            )
+        )
+        if batch.empty:
+            return
+        yield (
+            batch.column("id"),
+            normalize_rows(np.asarray(batch.column("embedding"), dtype=np.float32)),
+        )
+
+
+def export_embeddings(
+    conn,
+    pack_dir: str | Path,
+    kinds: tuple[str, ...] = ("section", "chunk"),
+    storage: str = "float32",
+) -> list[Path]:
+    """Export normalized embeddings of *kinds* from *conn* into *pack_dir*.
+
+    Rows are streamed in batches straight into ``.npy`` memmaps, so memory
+    stays bounded for large packs.  Kinds whose table is missing or empty
+    are skipped.  Sidecar files of other storages for the same kind are
+    removed.
+
+    Args:
+        conn: LadybugDB connection to the pack database.
+        pack_dir: Pack directory; files go to ``<pack_dir>/embeddings``.
+        kinds: Sidecar kinds to export (see ``SIDECAR_KINDS``).
+        storage: ``"float32"``, ``"int8"`` or ``"binary"``.
+
+    Returns:
+        Paths of the main ``.npy`` files written.
+    """
+    written = []
+    for kind in kinds:
+        files, ids_path = _paths(pack_dir, kind, storage)
+        try:
+            count = count_embedded(conn, kind)
+        except RuntimeError as e:
+            logger.info("Skipping %s embedding export: %s", kind, e)
+            continue
+        if count == 0:
+            continue
+
+        column_type = embedding_column_type(conn, kind)
+        if storage != "float32" and column_type and column_type.startswith("DOUBLE"):
+            logger.warning(
+                "%s embeddings are stored as %s in pack.db; rebuild the pack with the "
+                "current schema (FLOAT column) for the %s sidecar to make it smaller",
+                kind,
+                column_type,
+                storage,
+            )
+
+        files[0].parent.mkdir(parents=True, exist_ok=True)
+        for other in EMBEDDING_STORAGES:
+            if other != storage:
+                for stale in _paths(pack_dir, kind, other)[0]:
+                    stale.unlink(missing_ok=True)
+
+        matrices: list[np.memmap] = []
+        ids: list[str] = []
+        for batch_ids, rows in iter_embedding_batches(conn, kind, count):
+            if not matrices:
+                matrices = _open_matrices(files, storage, count, rows.shape[1])
+            rows_slice = slice(len(ids), len(ids) + len(rows))
+            if storage == "int8":
+                matrices[0][rows_slice], matrices[1][rows_slice] = quantize_int8(rows)
+            elif storage == "binary":
+                matrices[0][rows_slice] = quantize_binary(rows)
+            else:
+                matrices[0][rows_slice] = rows
+            ids.extend(batch_ids)
+        if not matrices:
+            continue
+        for matrix in matrices:
+            matrix.flush()
+        del matrices
+        ids_path.write_text(
+            json.dumps({"format_version": SIDECAR_FORMAT_VERSION, "storage": storage, "ids": ids})
+        )
+        written.append(files[0])
+        logger.info("Exported %d %s embeddings (%s) to %s", count, kind, storage, files[0])
+    return written
+
+
+def _open_matrices(files: list[Path], storage: str, count: int, dim: int) -> list[np.memmap]:
+    open_memmap = np.lib.format.open_memmap
+    if storage == "int8":
+        return [
+            open_memmap(files[0], mode="w+", dtype=np.int8, shape=(count, dim)),
+            open_memmap(files[1], mode="w+", dtype=np.float32, shape=(count,)),
+        ]
+    if storage == "binary":
+        return [open_memmap(files[0], mode="w+", dtype=np.uint8, shape=(count, (dim + 7) // 8))]
+    return [open_memmap(files[0], mode="w+", dtype=np.float32, shape=(count, dim))]
+
+
+def pack_embedding_storage(pack_dir: str | Path) -> str:
+    """Return the ``embedding_storage`` recorded in the pack manifest (default float32)."""
+    try:
+        manifest = json.loads((Path(pack_dir) / "manifest.json").read_text())
+    except (OSError, json.JSONDecodeError):
+        return "float32"
+    storage = manifest.get("embedding_storage") if isinstance(manifest, dict) else None
+    return storage if storage in EMBEDDING_STORAGES else "float32"
+
+
+def export_pack_embeddings(pack_dir: str | Path, storage: str | None = None) -> list[Path]:
+    """Open ``<pack_dir>/pack.db`` read-only and export its embeddings.
+
+    Args:
+        pack_dir: Pack directory containing pack.db.
+        storage: Sidecar storage; defaults to the manifest's ``embedding_storage``.
+
+    Raises:
+        FileNotFoundError: If the pack has no pack.db.
+    """
+    import real_ladybug as kuzu
+
+    pack_dir = Path(pack_dir)
+    db_path = pack_dir / "pack.db"
+    if not db_path.exists():
+        raise FileNotFoundError(f"Pack database not found: {db_path}")
+    storage = storage or pack_embedding_storage(pack_dir)
+    db = kuzu.Database(str(db_path), read_only=True)
+    try:
+        return export_embeddings(kuzu.Connection(db), pack_dir, storage=storage)
+    finally:
+        db.close()
+
+
+def load_exact_index(
+    pack_dir: str | Path, kind: str
+) -> ExactSearchIndex | QuantizedSearchIndex | None:
+    """Memory-map the *kind* sidecar of *pack_dir*, or return None if absent or invalid."""
+    _files, ids_path = _paths(pack_dir, kind)
+    if not ids_path.exists():
+        return None
+    try:
+        meta = json.loads(ids_path.read_text())
+        if meta.get("format_version") != SIDECAR_FORMAT_VERSION:
+            logger.warning("Ignoring %s sidecar with unknown format version", ids_path)
+            return None
+        files, _ = _paths(pack_dir, kind, meta.get("storage", "float32"))
+        if not all(path.exists() for path in files):
+            return None
+        matrices = [np.load(path, mmap_mode="r") for path in files]
+        if meta.get("storage") == "int8":
+            return QuantizedSearchIndex(matrices[0], meta["ids"], scale=matrices[1])
+        if meta.get("storage") == "binary":
+            return QuantizedSearchIndex(matrices[0], meta["ids"])
+        return ExactSearchIndex(matrices[0], meta["ids"])
+    except (OSError, KeyError, ValueError) as e:
+        logger.warning("Ignoring unreadable embedding sidecar %s: %s", ids_path, e)
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Recall-vs-size report
+# ---------------------------------------------------------------------------
+
+
+def embedding_column_type(conn, kind: str) -> str | None:
+    """Return the declared type of the *kind* embedding column (e.g. ``"FLOAT[768]"``)."""
+    table, _key = SIDECAR_KINDS[kind]
+    try:
+        columns = fetch(conn.execute(f"CALL TABLE_INFO('{table}') RETURN *")).records()
+    except RuntimeError:
+        return None
+    return next((str(c["type"]) for c in columns if c["name"] == "embedding"), None)
+
+
+def _disk_bytes(path: Path) -> int:
+    """Size of a file, or the total size of the files under a directory."""
+    if path.is_file():
+        return path.stat().st_size
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+
+
+def quantization_report(
+    conn,
+    kind: str,
+    k: int = 10,
+    sample: int = 100,
+    oversample: int = RESCORE_OVERSAMPLE,
+    seed: int = 0,
+) -> dict | None:
+    """Measure recall@k and size of each sidecar storage for one *kind*.
+
+    Queries are the normalized midpoints of random pairs of stored
+    embeddings; the exact top-k over the stored column is the ground truth.
+    Loads the *kind* embeddings into memory, so run it offline.
+
+    Returns:
+        ``{"kind", "rows", "dim", "k", "sample", "column_type",
+        "column_bytes", "storages": {storage: {"bytes", "pack_bytes",
+        "recall", "recall_rescored"}}}``, or None when the pack has no
+        embedded *kind* rows.  ``column_bytes`` is the size of the embedding
+        column in pack.db, ``bytes`` that of the storage's sidecar and
+        ``pack_bytes`` their sum.
+    """
+    try:
+        count = count_embedded(conn, kind)
+    except RuntimeError:
+        return None
+    if count == 0:
+        return None
+    ids: list[str] = []
+    blocks: list[np.ndarray] = []
+    for batch_ids, rows in iter_embedding_batches(conn, kind, count):
+        ids.extend(batch_ids)
+        blocks.append(rows)
+    matrix = np.concatenate(blocks)
+    n, dim = matrix.shape
+
+    rng = np.random.default_rng(seed)
+    pairs = rng.integers(0, n, size=(sample, 2))
+    queries = normalize_rows(matrix[pairs[:, 0]] + matrix[pairs[:, 1]])
+
+    exact = ExactSearchIndex(matrix, ids)
+    codes, scale = quantize_int8(matrix)
+    indexes = {
+        "float32": exact,
+        "int8": QuantizedSearchIndex(codes, ids, scale=scale),
+        "binary": QuantizedSearchIndex(quantize_binary(matrix), ids),
+    }
+    sizes = {
+        "float32": n * dim * 4,
+        "int8": n * dim + n * 4,
+        "binary": n * ((dim + 7) // 8),
+    }
+    column_type = embedding_column_type(conn, kind)
+    base_type = (column_type or "").split("[")[0]
+    column_bytes = n * dim * _COLUMN_ITEMSIZE.get(base_type, 8)
+    positions = {node_id: i for i, node_id in enumerate(ids)}
+
+    def rescore(candidates: list[str]) -> dict[str, np.ndarray]:
+        return {node_id: matrix[positions[node_id]] for node_id in candidates}
+
+    truth = [{node_id for node_id, _ in exact.search(q, k)} for q in queries]
+    storages = {}
+    for storage, index in indexes.items():
+        recall = recall_rescored = 0.0
+        for query, expected in zip(queries, truth, strict=True):
+            recall += len(expected & {i for i, _ in index.search(query, k)}) / len(expected)
+            hits = (
+                index.search(query, k, rescore=rescore, oversample=oversample)
+                if isinstance(index, QuantizedSearchIndex)
+                else index.search(query, k)
+            )
+            recall_rescored += len(expected & {i for i, _ in hits}) / len(expected)
+        storages[storage] = {
+            "bytes": sizes[storage],
+            "pack_bytes": column_bytes + sizes[storage],
+            "recall": round(recall / len(queries), 4),
+            "recall_rescored": round(recall_rescored / len(queries), 4),
+        }
+    return {
+        "kind": kind,
+        "rows": n,
+        "dim": dim,
+        "k": k,
+        "sample": len(queries),
+        "column_type": column_type,
+        "column_bytes": column_bytes,
+        "storages": storages,
+    }
+
+
+def pack_quantization_report(pack_dir: str | Path, k: int = 10, sample: int = 100) -> dict:
+    """Run :func:`quantization_report` for every sidecar kind of ``<pack_dir>/pack.db``.
+
+    Returns:
+        ``{"embedding_storage": <manifest setting>, "pack_db_bytes": <on-disk
+        size of pack.db>, "sidecar_bytes": <on-disk size of embeddings/>,
+        "kinds": {kind: report}}``.
+
+    Raises:
+        FileNotFoundError: If the pack has no pack.db.
+    """
+    import real_ladybug as kuzu
+
+    pack_dir = Path(pack_dir)
+    db_path = pack_dir / "pack.db"
+    if not db_path.exists():
+        raise FileNotFoundError(f"Pack database not found: {db_path}")
+    db = kuzu.Database(str(db_path), read_only=True)
+    try:
+        conn = kuzu.Connection(db)
+        reports = {
+            kind: quantization_report(conn, kind, k=k, sample=sample) for kind in SIDECAR_KINDS
+        }
+    finally:
+        db.close()
+    sidecar_dir = pack_dir / SIDECAR_DIRNAME
+    return {
+        "embedding_storage": pack_embedding_storage(pack_dir),
+        "pack_db_bytes": _disk_bytes(db_path),
+        "sidecar_bytes": _disk_bytes(sidecar_dir) if sidecar_dir.exists() else 0,
+        "kinds": {kind: report for kind, report in reports.items() if report is not None},
+    }
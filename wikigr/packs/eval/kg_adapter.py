@@ -39,6 +39,9 @@ def validate_question(question: str) -> str:
 def retrieve_from_pack(question: str, pack_path: Path, top_k: int = 5) -> str:
     """Retrieve context from pack's knowledge graph using KG Agent.
 
+    Uses ``KnowledgeGraphAgent.retrieve()``, which stops before synthesis:
+    the evaluator's own Claude call is the only generation per question.
+
     Args:
         question: Natural language question to retrieve context for
         pack_path: Path to knowledge pack directory
@@ -59,10 +62,10 @@ def retrieve_from_pack(question: str, pack_path: Path, top_k: int = 5) -> str:
         logger.error(f"KG retrieval failed: Database not found at {db_path}")
         raise FileNotFoundError("Knowledge graph unavailable. Please check configuration.")
 
-    # Query KG agent with read-only access
+    # Retrieve with read-only access (no synthesis call)
     try:
         with KnowledgeGraphAgent(db_path=str(db_path), read_only=True) as kg_agent:
-            result = kg_agent.query(question, max_results=top_k)
+            result = kg_agent.retrieve(question, max_results=top_k)
             return format_context_as_markdown(result)
     except FileNotFoundError:
         # Re-raise with sanitized message
@@ -76,7 +79,8 @@ def format_context_as_markdown(result: dict) -> str:
     """Format KG Agent results as markdown for LLM consumption.
 
     Args:
-        result: Dictionary from KG Agent containing answer, sources, entities, facts
+        result: Dictionary from ``KnowledgeGraphAgent.retrieve()`` (or ``query()``)
+            containing sources, passages, entities, facts
 
     Returns:
         Formatted markdown string with all context information
@@ -91,6 +95,17 @@ def format_context_as_markdown(result: dict) -> str:
             parts.append(f"- {source}")
         parts.append("")
 
+    # Add source passages (grounding text)
+    passages = result.get("passages", [])
+    if passages:
+        parts.append("## Passages")
+        for passage in passages[:5]:
+            text = str(passage.get("text", "")).strip()
+            if text:
+                parts.append(f"### {passage.get('title', 'Unknown')}")
+                parts.append(text)
+                parts.append("")
+
     # Add entities found
     entities = result.get("entities", [])
     if entities:
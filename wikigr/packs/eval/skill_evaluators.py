@@ -32,7 +32,7 @@ QUERY_TOOL = {
     "name": "query_knowledge_pack",
     "description": (
         "Query the domain knowledge graph for relevant information. "
-        "Returns sources, entities, facts, and a synthesized answer "
+        "Returns ranked sources, source passages, entities and facts "
         "from the knowledge pack's graph database."
     ),
     "input_schema": {
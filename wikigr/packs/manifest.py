@@ -13,6 +13,7 @@ from typing import Any
 
 PACK_NAME_RE = re.compile(r"^[a-zA-Z0-9][a-zA-Z0-9_-]{0,63}$")
 _SEMVER_RE = re.compile(r"^\d+\.\d+\.\d+(-[\w\.]+)?(\+[\w\.]+)?$")
+EMBEDDING_STORAGES = ("float32", "int8", "binary")
 
 
 @dataclass
@@ -63,6 +64,10 @@ class PackManifest:
         created_at: ISO 8601 timestamp when pack was created (primary field)
         author: Pack author (optional)
         topics: List of topics covered by the pack (optional)
+        embedding_storage: Embedding sidecar representation, one of
+            EMBEDDING_STORAGES (optional, float32 when absent)
+        routing: Routing profile (centroid and cluster representatives of
+            the section embeddings) used by ``wikigr.packs.router`` (optional)
     """
 
     name: str
@@ -76,6 +81,8 @@ class PackManifest:
     created_at: str | None = None  # Primary timestamp field (optional for backward compat)
     author: str | None = None
     topics: list[str] | None = None
+    embedding_storage: str | None = None
+    routing: dict[str, Any] | None = None
 
     def __post_init__(self):
         """Handle backward compatibility for created → created_at migration."""
@@ -105,6 +112,10 @@ class PackManifest:
             result["author"] = self.author
         if self.topics is not None:
             result["topics"] = self.topics
+        if self.embedding_storage is not None:
+            result["embedding_storage"] = self.embedding_storage
+        if self.routing is not None:
+            result["routing"] = self.routing
         # Backwards compat
         if self.created is not None:
             result["created"] = self.created
@@ -135,6 +146,8 @@ class PackManifest:
             created=data.get("created"),
             author=data.get("author"),
             topics=data.get("topics"),
+            embedding_storage=data.get("embedding_storage"),
+            routing=data.get("routing"),
         )
 
 
@@ -242,6 +255,26 @@ def validate_manifest(manifest: PackManifest) -> list[str]:
     except (ValueError, AttributeError):
         errors.append(f"Invalid ISO 8601 timestamp for created_at: {manifest.created_at}")
 
+    # Validate embedding storage - optional
+    if (
+        manifest.embedding_storage is not None
+        and manifest.embedding_storage not in EMBEDDING_STORAGES
+    ):
+        errors.append(
+            f"embedding_storage must be one of {', '.join(EMBEDDING_STORAGES)}, "
+            f"got '{manifest.embedding_storage}'"
+        )
+
+    # Validate routing profile - optional
+    if manifest.routing is not None:
+        routing = manifest.routing if isinstance(manifest.routing, dict) else {}
+        centroid = routing.get("centroid")
+        representatives = routing.get("representatives")
+        if not isinstance(centroid, list) or not centroid or not isinstance(representatives, list):
+            errors.append("routing must contain a non-empty centroid and a representatives list")
+        elif any(not isinstance(r, list) or len(r) != len(centroid) for r in representatives):
+            errors.append("routing representatives must have the same dimension as the centroid")
+
     # Validate license
     if not manifest.license or not manifest.license.strip():
         errors.append("Pack license cannot be empty")
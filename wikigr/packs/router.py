@@ -0,0 +1,249 @@
+"""Embedding-based routing of questions to installed knowledge packs.
+
+With dozens of packs installed, picking the one to ask is manual or driven by
+trigger keywords derived from the pack name.  Instead, a pack build (or
+``wikigr pack optimize``) summarizes the pack's section embeddings as a
+*routing profile* stored in ``manifest.json``: the normalized centroid plus a
+handful of spherical k-means cluster representatives.  :class:`PackRouter`
+stacks every installed pack's representatives into one matrix and ranks the
+packs for a question embedding with a single matrix-vector product.
+
+API Contract:
+    compute_routing_profile(conn, clusters=8, iterations=10, sample_rows=20000) -> dict | None
+    build_pack_routing(pack_dir) -> dict | None
+    PackRouter(profiles, embedder=None)
+        .route_embedding(query_embedding, k=3) -> list[(pack_name, score)]
+        .route(question, k=3) -> list[(pack_name, score)]
+    PackRouter.from_packs(packs, embedder=None) -> PackRouter
+    PackRouter.from_directory(packs_dir, embedder=None) -> PackRouter
+
+Design Philosophy:
+    - Routing never opens a ``pack.db``: profiles live in the manifests, which
+      discovery reads anyway.  Ranking 50 packs is a (~450 x 768) @ (768,)
+      product, well under a millisecond.
+    - A pack scores the best cosine similarity of the question to any of its
+      representatives, so a broad pack with several sub-topics is matched on
+      the closest one rather than on a blurred centroid.
+    - The centroid is computed over every embedded section; k-means runs on an
+      evenly strided sample so profile building stays bounded on large packs.
+    - Profiles are snapshots: re-run the build step after the pack changes.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from wikigr.packs.embedding_sidecar import count_embedded, iter_embedding_batches, normalize_rows
+from wikigr.packs.models import PackInfo
+
+logger = logging.getLogger(__name__)
+
+ROUTING_FORMAT_VERSION = 1
+ROUTING_CLUSTERS = 8
+ROUTING_KMEANS_ITERATIONS = 10
+ROUTING_SAMPLE_ROWS = 20000
+# Manifest floats are rounded; 4 decimals keep cosine scores exact to ~1e-3.
+ROUTING_DECIMALS = 4
+
+
+def compute_routing_profile(
+    conn,
+    clusters: int = ROUTING_CLUSTERS,
+    iterations: int = ROUTING_KMEANS_ITERATIONS,
+    sample_rows: int = ROUTING_SAMPLE_ROWS,
+) -> dict[str, Any] | None:
+    """Summarize the Section embeddings of an open pack as a routing profile.
+
+    Args:
+        conn: LadybugDB connection to the pack database.
+        clusters: Cluster representatives to keep (fewer for tiny packs).
+        iterations: Spherical k-means iterations.
+        sample_rows: Maximum embeddings clustered by k-means.
+
+    Returns:
+        ``{"format_version", "sections", "centroid", "representatives",
+        "weights"}`` where ``weights`` is each representative's share of the
+        sample, or None if the pack has no embedded sections.
+    """
+    try:
+        count = count_embedded(conn, "section")
+    except RuntimeError as e:
+        logger.info("No routing profile: %s", e)
+        return None
+    if count == 0:
+        return None
+
+    step = max(1, math.ceil(count / sample_rows))
+    total: np.ndarray | None = None
+    sample: list[np.ndarray] = []
+    seen = 0
+    for _ids, rows in iter_embedding_batches(conn, "section", count):
+        total = rows.sum(axis=0) if total is None else total + rows.sum(axis=0)
+        sample.append(rows[(-seen) % step :: step])
+        seen += len(rows)
+    if total is None:
+        return None
+
+    centroid = normalize_rows(total.reshape(1, -1))[0]
+    representatives, sizes = _spherical_kmeans(np.concatenate(sample), clusters, iterations)
+    return {
+        "format_version": ROUTING_FORMAT_VERSION,
+        "sections": seen,
+        "centroid": _rounded(centroid),
+        "representatives": [_rounded(row) for row in representatives],
+        "weights": _rounded(sizes / sizes.sum()),
+    }
+
+
+def _spherical_kmeans(
+    rows: np.ndarray, clusters: int, iterations: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Cluster normalized *rows*; return (normalized centers, cluster sizes).
+
+    Centers are seeded by farthest-point traversal from the first row, so the
+    result is deterministic for a given pack.  Empty clusters are dropped.
+    """
+    k = min(clusters, len(rows))
+    seeds = [0]
+    closest = rows @ rows[0]
+    for _ in range(1, k):
+        seeds.append(int(np.argmin(closest)))
+        closest = np.maximum(closest, rows @ rows[seeds[-1]])
+    centers = rows[seeds]
+    for _ in range(iterations):
+        assignment = np.argmax(rows @ centers.T, axis=1)
+        sums = np.zeros_like(centers)
+        np.add.at(sums, assignment, rows)
+        moved = normalize_rows(sums)
+        if np.allclose(moved, centers):
+            break
+        centers = moved
+    sizes = np.bincount(np.argmax(rows @ centers.T, axis=1), minlength=len(centers))
+    keep = sizes > 0
+    return centers[keep], sizes[keep].astype(np.float64)
+
+
+def _rounded(values: np.ndarray) -> list[float]:
+    return np.round(values.astype(np.float64), ROUTING_DECIMALS).tolist()
+
+
+def build_pack_routing(pack_dir: str | Path) -> dict[str, Any] | None:
+    """Compute the routing profile of ``<pack_dir>/pack.db`` and store it in the manifest.
+
+    The manifest is left unchanged when the pack has no embedded sections.
+
+    Raises:
+        FileNotFoundError: If the pack has no pack.db or manifest.json.
+    """
+    import real_ladybug as kuzu
+
+    from wikigr.packs.manifest import load_manifest, save_manifest
+
+    pack_dir = Path(pack_dir)
+    db_path = pack_dir / "pack.db"
+    if not db_path.exists():
+        raise FileNotFoundError(f"Pack database not found: {db_path}")
+    manifest = load_manifest(pack_dir)
+    db = kuzu.Database(str(db_path), read_only=True)
+    try:
+        profile = compute_routing_profile(kuzu.Connection(db))
+    finally:
+        db.close()
+    if profile is not None:
+        manifest.routing = profile
+        save_manifest(manifest, pack_dir)
+        logger.info(
+            "Routing profile written to %s (%d sections, %d representatives)",
+            pack_dir / "manifest.json",
+            profile["sections"],
+            len(profile["representatives"]),
+        )
+    return profile
+
+
+class PackRouter:
+    """Rank packs for a question by similarity to their routing profiles."""
+
+    def __init__(self, profiles: Mapping[str, dict[str, Any]], embedder=None):
+        """Stack the *profiles* into one representative matrix.
+
+        Args:
+            profiles: ``{pack_name: routing profile}`` as produced by
+                :func:`compute_routing_profile`.  Profiles whose dimension
+                differs from the first one are skipped with a warning.
+            embedder: Object with ``generate_query(list[str])`` used by
+                :meth:`route`; an ``EmbeddingGenerator`` is created on first
+                use when None.
+        """
+        self._embedder = embedder
+        self.names: list[str] = []
+        blocks: list[np.ndarray] = []
+        for name, profile in profiles.items():
+            try:
+                block = np.asarray(
+                    [profile["centroid"], *profile["representatives"]], dtype=np.float32
+                )
+            except (KeyError, TypeError, ValueError) as e:
+                logger.warning("Ignoring malformed routing profile of pack %r: %s", name, e)
+                continue
+            if block.ndim != 2 or (blocks and block.shape[1] != blocks[0].shape[1]):
+                logger.warning("Ignoring routing profile of pack %r: dimension mismatch", name)
+                continue
+            self.names.append(name)
+            blocks.append(normalize_rows(block))
+        if blocks:
+            self._matrix = np.concatenate(blocks)
+            self._starts = np.cumsum([0] + [len(b) for b in blocks[:-1]])
+        else:
+            self._matrix = np.zeros((0, 0), dtype=np.float32)
+            self._starts = np.zeros(0, dtype=np.int64)
+
+    @classmethod
+    def from_packs(cls, packs: Iterable[PackInfo], embedder=None) -> PackRouter:
+        """Build a router from discovered packs; packs without a profile are skipped."""
+        profiles = {p.name: p.manifest.routing for p in packs if p.manifest.routing}
+        return cls(profiles, embedder=embedder)
+
+    @classmethod
+    def from_directory(
+        cls, packs_dir: Path = Path.home() / ".wikigr/packs", embedder=None
+    ) -> PackRouter:
+        """Build a router over every valid pack installed in *packs_dir*."""
+        from wikigr.packs.discovery import discover_packs
+
+        return cls.from_packs(discover_packs(packs_dir), embedder=embedder)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def route_embedding(self, query_embedding, k: int = 3) -> list[tuple[str, float]]:
+        """Return the *k* packs closest to *query_embedding*, best first.
+
+        A pack's score is the highest cosine similarity between the query and
+        its centroid or cluster representatives.
+        """
+        if not self.names or k < 1:
+            return []
+        query = np.asarray(query_embedding, dtype=np.float32).reshape(1, -1)
+        if query.shape[1] != self._matrix.shape[1]:
+            raise ValueError(
+                f"query embedding has {query.shape[1]} dimensions, "
+                f"routing profiles have {self._matrix.shape[1]}"
+            )
+        scores = np.maximum.reduceat(self._matrix @ normalize_rows(query)[0], self._starts)
+        order = np.argsort(-scores, kind="stable")[:k]
+        return [(self.names[i], float(scores[i])) for i in order]
+
+    def route(self, question: str, k: int = 3) -> list[tuple[str, float]]:
+        """Embed *question* and return the *k* closest packs, best first."""
+        if self._embedder is None:
+            from bootstrap.src.embeddings.generator import EmbeddingGenerator
+
+            self._embedder = EmbeddingGenerator()
+        return self.route_embedding(self._embedder.generate_query([question])[0], k=k)
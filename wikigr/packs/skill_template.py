@@ -120,8 +120,8 @@ def generate_skill_md(manifest: PackManifest, kg_config_path: Path) -> str:
             "# Initialize KG Agent with pack database",
             f'pack_db = Path("{pack_db_path}").resolve()',
             "with KnowledgeGraphAgent(db_path=str(pack_db), read_only=True) as kg_agent:",
-            "    result = kg_agent.query(user_question, max_results=5)",
-            '    # Use result["answer"] and result["sources"] in your response',
+            "    result = kg_agent.retrieve(user_question, max_results=5)",
+            '    # Answer from result["passages"] and cite result["sources"]',
             "```",
             "",
             "**Retrieval Strategy:**",